@@ -0,0 +1,258 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: AccessList.py
+# Author: Nicholas Russo
+# Description: This file includes classes that represent a router-style
+#  access list: an ordered list of entries (action, address, wildcard mask)
+#  where the first matching entry wins and unmatched addresses are implicitly
+#  denied. The list is compiled into a decision structure: entries with
+#  contiguous wildcards (ordinary prefixes) go into a binary trie, while
+#  non-contiguous wildcards are grouped by mask into hash tables that are
+#  scanned in rule order. Hit counters are kept for every entry.
+###############################################################################
+
+from NetAddress import NetAddress
+
+# Actions supported by access list entries
+PERMIT = "permit"
+DENY = "deny"
+
+# Rule index reported when no entry matches (the implicit deny)
+IMPLICIT_DENY = -1
+
+# Defines a single access list entry (ACE)
+class AccessListEntry(object):
+
+    # Builds an entry from an action, the integer value of the address and
+    #  the integer value of the wildcard mask (1 bits are "don't care").
+    #  Bits of the address covered by the wildcard are cleared.
+    def __init__(self, action, addressClass, value, wildcard):
+        if ( action != PERMIT and action != DENY ):
+            raise ValueError( "action is not permit or deny: " + str( action ) )
+        self._action = action
+        self._addressClass = addressClass
+        self._wildcard = wildcard
+        self._value = value & ~wildcard
+
+    # Parses an entry in IOS-like syntax for the class "addressClass":
+    #  "permit 10.0.0.0 0.0.0.255", "deny host 10.1.1.1", "permit any"
+    #  and "permit 10.0.0.0/8" are all accepted
+    @staticmethod
+    def fromString( ruleString, addressClass ):
+
+        # Test for a null reference; raise error
+        if( ruleString is None or len( ruleString.split() ) < 2 ):
+            raise AttributeError( "ruleString is None or incomplete" )
+
+        tokens = ruleString.split()
+        action = tokens[0].lower()
+        allOnes = ( 1 << addressClass._maxAddrLen ) - 1
+
+        if( tokens[1] == "any" and len( tokens ) == 2 ):
+            return AccessListEntry( action, addressClass, 0, allOnes )
+
+        elif( tokens[1] == "host" and len( tokens ) == 3 ):
+            return AccessListEntry( action, addressClass,
+                addressClass( tokens[2] ).toInteger(), 0 )
+
+        elif( len( tokens ) == 2 and "/" in tokens[1] ):
+            addressString, addrLen = tokens[1].split( "/", 1 )
+            address = addressClass( addressString, int( addrLen ) )
+            return AccessListEntry( action, addressClass, address.toInteger(),
+                ( 1 << address.getHostLen() ) - 1 )
+
+        elif( len( tokens ) == 3 ):
+            return AccessListEntry( action, addressClass,
+                addressClass( tokens[1] ).toInteger(),
+                addressClass( tokens[2] ).toInteger() )
+
+        raise ValueError( "Unable to parse rule: " + ruleString )
+
+    # Returns "permit" or "deny"
+    def getAction(self):
+        return self._action
+
+    # Returns the address of the entry (with wildcard bits cleared)
+    def getAddress(self):
+        return self._addressClass.fromInteger( self._value )
+
+    # Returns the integer value of the wildcard mask
+    def getWildcard(self):
+        return self._wildcard
+
+    # Returns the prefix length if the wildcard is contiguous (all of its 1s
+    #  are low-order bits, like 0.0.0.255), otherwise returns -1
+    def getPrefixLen(self):
+        hostLen = self._wildcard.bit_length()
+        if( self._wildcard != ( 1 << hostLen ) - 1 ):
+            return -1
+        return self._addressClass._maxAddrLen - hostLen
+
+    # Returns true if the integer "value" matches this entry
+    def matches(self, value):
+        return ( value & ~self._wildcard ) == self._value
+
+    # Return the entry in IOS-like syntax (e.g. permit 10.0.0.0 0.0.0.255)
+    def toString(self):
+        return ( self._action + " " + self.getAddress().toString() + " " +
+            self._addressClass.fromInteger( self._wildcard ).toString() )
+
+    def __str__(self):
+        return self.toString()
+
+# Defines an ordered access list for a single address family
+class AccessList(object):
+
+    # Builds an empty access list for "addressClass" (e.g. IPv4Address),
+    #  then appends each rule string in "rules", if any
+    def __init__(self, addressClass, rules = None):
+        self._addressClass = addressClass
+        self._entries = []
+        self._hitCounts = []
+        self._implicitDenyCount = 0
+        self._compiled = False
+        if( rules is not None ):
+            for ruleString in rules:
+                self.addEntry( ruleString )
+
+    # Appends an entry, given either as an AccessListEntry or a rule string.
+    #  The decision structure is rebuilt lazily on the next lookup.
+    def addEntry(self, entry):
+        if( not isinstance( entry, AccessListEntry ) ):
+            entry = AccessListEntry.fromString( entry, self._addressClass )
+        self._entries.append( entry )
+        self._hitCounts.append( 0 )
+        self._compiled = False
+
+    # Returns the entry at the 0-based index "ruleIndex"
+    def getEntry(self, ruleIndex):
+        return self._entries[ ruleIndex ]
+
+    # Implements the len() function by returning the number of entries
+    def __len__(self):
+        return len( self._entries )
+
+    # Builds the decision structure. Trie nodes are lists of
+    #  [ zero child, one child, rule index ending here, lowest rule index in
+    #  the subtree ] so that lookups can stop descending once no deeper entry
+    #  could beat the best match found so far.
+    def compile(self):
+        numBits = self._addressClass._maxAddrLen
+        noMatch = len( self._entries )
+        self._trie = [ None, None, noMatch, noMatch ]
+        groups = {}
+
+        for ruleIndex in range( 0, len( self._entries ) ):
+            entry = self._entries[ ruleIndex ]
+            prefixLen = entry.getPrefixLen()
+
+            # Non-contiguous wildcards: one hash table per distinct mask,
+            #  keeping only the first rule for each masked value
+            if( prefixLen < 0 ):
+                table = groups.setdefault( entry.getWildcard(), {} )
+                table.setdefault( entry._value, ruleIndex )
+                continue
+
+            # Contiguous wildcards: walk the prefix bits down the trie
+            node = self._trie
+            node[3] = min( node[3], ruleIndex )
+            for bitIndex in range( numBits - 1, numBits - 1 - prefixLen, -1 ):
+                bit = ( entry._value >> bitIndex ) & 1
+                if( node[bit] is None ):
+                    node[bit] = [ None, None, noMatch, noMatch ]
+                node = node[bit]
+                node[3] = min( node[3], ruleIndex )
+            node[2] = min( node[2], ruleIndex )
+
+        # Scan the groups in order of their first rule so that the scan can
+        #  stop as soon as a match is found before the next group's first rule
+        self._groups = sorted( [ ( min( table.values() ), ~wildcard, table )
+            for wildcard, table in groups.items() ] )
+        self._compiled = True
+
+    # Returns the 0-based index of the first matching entry for the integer
+    #  "value", or IMPLICIT_DENY. Hit counters are not updated.
+    def _lookup(self, value):
+        numBits = self._addressClass._maxAddrLen
+        best = len( self._entries )
+
+        # Walk the trie as long as the subtree could still hold a better rule
+        node = self._trie
+        bitIndex = numBits - 1
+        while( node is not None and node[3] < best ):
+            if( node[2] < best ):
+                best = node[2]
+            if( bitIndex < 0 ):
+                break
+            node = node[ ( value >> bitIndex ) & 1 ]
+            bitIndex -= 1
+
+        # Probe each group of non-contiguous wildcards in rule order
+        for firstRule, careMask, table in self._groups:
+            if( firstRule >= best ):
+                break
+            ruleIndex = table.get( value & careMask )
+            if( ruleIndex is not None and ruleIndex < best ):
+                best = ruleIndex
+
+        if( best == len( self._entries ) ):
+            return IMPLICIT_DENY
+        return best
+
+    # Records a hit for "ruleIndex" (including the implicit deny)
+    def _countHit(self, ruleIndex):
+        if( ruleIndex == IMPLICIT_DENY ):
+            self._implicitDenyCount += 1
+        else:
+            self._hitCounts[ ruleIndex ] += 1
+
+    # Returns the 0-based index of the first entry matching "address" (an
+    #  address object or an integer value), or IMPLICIT_DENY
+    def matchIndex(self, address):
+        if( not self._compiled ):
+            self.compile()
+        if( isinstance( address, NetAddress ) ):
+            address = address.toInteger()
+
+        ruleIndex = self._lookup( address )
+        self._countHit( ruleIndex )
+        return ruleIndex
+
+    # Returns the action ("permit" or "deny") for "address"
+    def match(self, address):
+        ruleIndex = self.matchIndex( address )
+        if( ruleIndex == IMPLICIT_DENY ):
+            return DENY
+        return self._entries[ ruleIndex ]._action
+
+    # Returns a list with the matching rule index for every integer in the
+    #  sequence "values" (IMPLICIT_DENY where nothing matched)
+    def matchAllIndices(self, values):
+        if( not self._compiled ):
+            self.compile()
+        lookup = self._lookup
+        ruleIndices = [ lookup( value ) for value in values ]
+
+        for ruleIndex in ruleIndices:
+            self._countHit( ruleIndex )
+        return ruleIndices
+
+    # Returns a list with the action for every integer in "values"
+    def matchAll(self, values):
+        actions = [ entry._action for entry in self._entries ] + [ DENY ]
+        return [ actions[ ruleIndex ]
+            for ruleIndex in self.matchAllIndices( values ) ]
+
+    # Returns the list of hit counts, one per entry in rule order
+    def getHitCounts(self):
+        return list( self._hitCounts )
+
+    # Returns the number of lookups that matched no entry
+    def getImplicitDenyCount(self):
+        return self._implicitDenyCount
+
+    # Resets all hit counters to zero
+    def resetHitCounts(self):
+        self._hitCounts = [ 0 ] * len( self._entries )
+        self._implicitDenyCount = 0
@@ -0,0 +1,106 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: AccessList_Test.py
+# Author: Nicholas Russo
+# Description: This file includes a class that represents a test case for the
+#  AccessList and AccessListEntry classes. Rule parsing, first-match
+#  semantics, hit counters, and agreement between the compiled decision
+#  structure and a plain linear scan are tested here.
+###############################################################################
+
+from AccessList import AccessList, AccessListEntry, IMPLICIT_DENY
+from IPv4Address import IPv4Address
+from IPv6Address import IPv6Address
+import random
+import unittest
+
+# Defines an access list test case
+class AccessList_Test( unittest.TestCase ):
+
+    # Builds a test suite from all of the methods defined in this class
+    @staticmethod
+    def buildTestSuite():
+        return unittest.TestLoader().loadTestsFromTestCase( AccessList_Test )
+
+    # Builds a small IPv4 access list mixing every supported rule format
+    def setUp(self):
+        self._accessList = AccessList( IPv4Address, [
+            "deny host 10.1.1.1",
+            "permit 10.1.0.0 0.0.255.255",
+            "deny 10.0.0.0/8",
+            "permit 192.168.0.1 0.0.255.0",
+            "permit 172.16.0.0 0.15.255.255" ] )
+
+    def tearDown(self):
+        self._accessList = None
+
+    # Ensures malformed rules raise errors
+    def test_invalidRules(self):
+        for bogusRule in ( None, "", "permit", "allow any", "permit 10.0.0.0",
+        "permit 10.0.0.0 0.0.0.255 extra", "permit 10.0.0.0/33" ):
+            self.assertRaises( ( AttributeError, ValueError ),
+                AccessListEntry.fromString, bogusRule, IPv4Address )
+
+    # Tests first-match semantics, including the non-contiguous wildcard
+    #  (192.168.x.1) and the implicit deny
+    def test_match(self):
+        expected = ( ( "10.1.1.1", "deny", 0 ), ( "10.1.2.3", "permit", 1 ),
+            ( "10.2.0.0", "deny", 2 ), ( "192.168.7.1", "permit", 3 ),
+            ( "192.168.7.2", "deny", IMPLICIT_DENY ),
+            ( "172.31.0.1", "permit", 4 ), ( "8.8.8.8", "deny", IMPLICIT_DENY ) )
+
+        for addressString, action, ruleIndex in expected:
+            address = IPv4Address( addressString )
+            self.assertTrue( self._accessList.match( address ) == action )
+            self.assertTrue( self._accessList.matchIndex( 
+                address.toInteger() ) == ruleIndex )
+
+        # Every lookup was performed twice above
+        self.assertTrue( self._accessList.getHitCounts() == [ 2, 2, 2, 2, 2 ] )
+        self.assertTrue( self._accessList.getImplicitDenyCount() == 4 )
+        self._accessList.resetHitCounts()
+        self.assertTrue( self._accessList.getHitCounts() == [ 0 ] * 5 )
+
+    # Tests the string form and prefix length of parsed entries
+    def test_entries(self):
+        self.assertTrue( self._accessList.getEntry( 2 ).toString() == 
+            "deny 10.0.0.0 0.255.255.255" )
+        self.assertTrue( self._accessList.getEntry( 2 ).getPrefixLen() == 8 )
+        self.assertTrue( self._accessList.getEntry( 3 ).getPrefixLen() == -1 )
+        self.assertTrue( AccessListEntry.fromString( "permit any",
+            IPv6Address ).getPrefixLen() == 0 )
+
+    # The compiled structure must agree with a linear first-match scan over
+    #  random rules and addresses, for both IPv4 and IPv6
+    def test_matchAllAgainstLinearScan(self):
+        generator = random.Random( 29 )
+        for addressClass in ( IPv4Address, IPv6Address ):
+            numBits = addressClass._maxAddrLen
+            accessList = AccessList( addressClass )
+
+            # Rules are drawn from a small space so that they overlap often
+            for i in range( 0, 200 ):
+                value = generator.getrandbits( 6 ) << ( numBits - 6 )
+                if( generator.random() < 0.7 ):
+                    wildcard = ( 1 << generator.randint( numBits - 8, numBits ) ) - 1
+                else:
+                    wildcard = generator.getrandbits( numBits ) | (
+                        generator.getrandbits( numBits - 6 ) )
+                accessList.addEntry( AccessListEntry( 
+                    generator.choice( ( "permit", "deny" ) ),
+                    addressClass, value, wildcard ) )
+
+            values = [ generator.getrandbits( numBits ) for i in range( 0, 2000 ) ]
+            expected = []
+            for value in values:
+                ruleIndex = IMPLICIT_DENY
+                for i in range( 0, len( accessList ) ):
+                    if( accessList.getEntry( i ).matches( value ) ):
+                        ruleIndex = i
+                        break
+                expected.append( ruleIndex )
+
+            self.assertTrue( accessList.matchAllIndices( values ) == expected )
+            self.assertTrue( sum( accessList.getHitCounts() ) + 
+                accessList.getImplicitDenyCount() == len( values ) )
@@ -0,0 +1,273 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: AddressConverter.py
+# Author: Nicholas Russo
+# Description: This file includes functions that convert streams of IPv4,
+#  IPv6 and MAC addresses (mixed families, optionally with "/len") into CSV
+#  or JSON Lines rows holding every representation and predicate of each
+#  address, e.g. the toString(), toStringHex() and toStringCisco() formats,
+#  the network and every is*() flag. Rows are read in batches; each address
+#  is parsed once into its integer value and every selected column is then
+#  computed for the whole batch from the integers, mirroring the methods of
+#  the address classes without building or querying objects per field.
+###############################################################################
+
+from NetAddressFactory import IPV4, IPV6, MAC, detectFamily, getAddressClass
+from PredicateRanges import getPredicateRanges
+from ReverseDNS import toReverseNames
+import bisect
+import csv
+import itertools
+import json
+
+# Output formats
+CSV = "csv"
+JSONL = "jsonl"
+
+# Default number of rows converted and written at once
+BATCH_SIZE = 4096
+
+# Representation columns in their default order; the is*() predicates of
+#  the address classes follow them
+_FIELD_COLUMNS = [ "input", "family", "string", "hex", "cisco", "integer",
+    "prefixLen", "network", "reverseName" ]
+
+# Bit ( counted from the low-order end ) and value tested by each predicate
+#  of MACAddress (the I/G and U/L bits of the first octet)
+_macBitPredicates = {
+    "isIGset": ( 40, 1 ),
+    "isMulticast": ( 40, 1 ),
+    "isUnicast": ( 40, 0 ),
+    "isULset": ( 41, 1 ) }
+
+# Cache of the predicate names of each family, built on first use
+_predicateNames = {}
+
+# Returns the names of the is*() predicates of the "family" address class,
+#  in alphabetical order
+def getPredicateNames( family ):
+    if( family not in _predicateNames ):
+        addressClass = getAddressClass( family )
+        _predicateNames[ family ] = [ name for name in dir( addressClass )
+            if name.startswith( "is" ) and callable( getattr( addressClass,
+            name ) ) ]
+    return _predicateNames[ family ]
+
+# Returns the list of every column name, in the default order
+def getColumns():
+    predicateNames = set()
+    for family in ( IPV4, IPV6, MAC ):
+        predicateNames.update( getPredicateNames( family ) )
+    return _FIELD_COLUMNS + sorted( predicateNames )
+
+# Returns the function that renders an integer of "family" as the string
+#  toString() returns for it, without building an address object
+def getFormatter( family ):
+    if( family == IPV4 ):
+        return lambda value: "%d.%d.%d.%d" % ( value >> 24,
+            ( value >> 16 ) & 0xFF, ( value >> 8 ) & 0xFF, value & 0xFF )
+    elif( family == IPV6 ):
+        def formatIPv6( value ):
+            digits = "%032x" % value
+            return ":".join( [ digits[ start:start + 4 ]
+                for start in xrange( 0, 32, 4 ) ] )
+        return formatIPv6
+    elif( family == MAC ):
+        from MACNormalizer import formatMacValue
+        return formatMacValue
+    raise ValueError( "Unknown address family: " + str( family ) )
+
+# Returns the list of values of predicate "name" for the "family" integers
+#  "values". Predicates with known integer ranges or bits are computed from
+#  the integers; any other predicate is called on an address object.
+def computePredicate( name, family, values, addrLens ):
+    if( name not in getPredicateNames( family ) ):
+        return [ None ] * len( values )
+
+    if( family == MAC and name in _macBitPredicates ):
+        bit, expected = _macBitPredicates[ name ]
+        return [ ( value >> bit ) & 1 == expected for value in values ]
+
+    try:
+        ranges = getPredicateRanges( name, getAddressClass( family )._maxAddrLen )
+    except ValueError:
+        fromInteger = getAddressClass( family ).fromInteger
+        return [ bool( getattr( fromInteger( value, addrLen ), name )() )
+            for value, addrLen in zip( values, addrLens ) ]
+
+    if( len( ranges ) == 1 ):
+        first, last = ranges[0]
+        return [ first <= value <= last for value in values ]
+
+    # The merged ranges alternate first and past-last boundaries, so a value
+    #  is inside when an odd number of boundaries are at or below it
+    boundaries = []
+    for first, last in sorted( ranges ):
+        if( len( boundaries ) > 0 and first <= boundaries[-1] ):
+            boundaries[-1] = max( boundaries[-1], last + 1 )
+        else:
+            boundaries.extend( ( first, last + 1 ) )
+    bisectRight = bisect.bisect_right
+    return [ bisectRight( boundaries, value ) & 1 == 1 for value in values ]
+
+# Returns the list of cells of column "column" for the "family" integers
+#  "values" with address lengths "addrLens", parsed from "inputStrings"
+def _computeColumn( column, family, inputStrings, values, addrLens ):
+    numBits = getAddressClass( family )._maxAddrLen
+    if( column == "input" ):
+        return inputStrings
+    elif( column == "family" ):
+        return [ family ] * len( values )
+    elif( column == "string" ):
+        return map( getFormatter( family ), values )
+    elif( column == "hex" ):
+        if( family != IPV4 ):
+            return [ None ] * len( values )
+        return [ "0x%08x" % value for value in values ]
+    elif( column == "cisco" ):
+        if( family != MAC ):
+            return [ None ] * len( values )
+        from MACNormalizer import formatMacValue, CISCO
+        return [ formatMacValue( value, CISCO ) for value in values ]
+    elif( column == "integer" ):
+        return values
+    elif( column == "prefixLen" ):
+        return addrLens
+    elif( column == "network" ):
+        formatter = getFormatter( family )
+        allOnes = ( 1 << numBits ) - 1
+        return [ formatter( value & ( allOnes ^ ( ( 1 << ( numBits -
+            addrLen ) ) - 1 ) ) ) + "/" + str( addrLen )
+            for value, addrLen in zip( values, addrLens ) ]
+    elif( column == "reverseName" ):
+        if( family == MAC ):
+            return [ None ] * len( values )
+        return toReverseNames( values, numBits )
+    return computePredicate( column, family, values, addrLens )
+
+# Returns the list of columns to compute for "columns" (None means all)
+def _checkColumns( columns ):
+    allColumns = getColumns()
+    if( columns is None ):
+        return allColumns
+    if( len( columns ) == 0 ):
+        raise ValueError( "No columns selected" )
+    for column in columns:
+        if( column not in allColumns ):
+            raise ValueError( "Unknown column: " + str( column ) )
+    return list( columns )
+
+# Converts the address strings "inputStrings" (surrounding whitespace is
+#  ignored; "/len" sets the address length). Returns a tuple of a list of
+#  rows, each a list of cells for "columns" (default: getColumns()), and a
+#  bytearray error mask. Invalid inputs have row None and mask 1. Cells
+#  that do not apply to the family of the address (e.g. "cisco" for IPv4)
+#  are None.
+def convertBatch( inputStrings, columns = None ):
+    columns = _checkColumns( columns )
+    errors = bytearray( len( inputStrings ) )
+
+    # Parse every input once with the address classes; group by family
+    groups = {}
+    for row, inputString in enumerate( inputStrings ):
+        try:
+            addressString = inputString.strip()
+            family = detectFamily( addressString )
+            pieces = addressString.split( "/", 1 )
+            addressClass = getAddressClass( family )
+            if( len( pieces ) == 1 ):
+                address = addressClass( pieces[0] )
+            else:
+                address = addressClass( pieces[0], int( pieces[1] ) )
+        except ( AttributeError, ValueError ):
+            errors[ row ] = 1
+            continue
+
+        if( family not in groups ):
+            groups[ family ] = ( [], [], [], [] )
+        rowNumbers, groupInputs, values, addrLens = groups[ family ]
+        rowNumbers.append( row )
+        groupInputs.append( addressString )
+        values.append( address.toInteger() )
+        addrLens.append( address.getAddrLen() )
+
+    # Compute each column for each family, then scatter the cells into rows
+    rows = [ None ] * len( inputStrings )
+    for family, ( rowNumbers, groupInputs, values, addrLens ) in \
+    groups.iteritems():
+        cellLists = [ _computeColumn( column, family, groupInputs, values,
+            addrLens ) for column in columns ]
+        for row, cells in itertools.izip( rowNumbers,
+        itertools.izip( *cellLists ) ):
+            rows[ row ] = list( cells )
+    return rows, errors
+
+# Returns the JSON text of the cell "cell"
+def _encodeJsonCell( cell, encode = json.JSONEncoder().encode ):
+    if( cell is True ):
+        return "true"
+    elif( cell is False ):
+        return "false"
+    elif( cell is None ):
+        return "null"
+    elif( isinstance( cell, ( int, long ) ) ):
+        return str( cell )
+    return encode( cell )
+
+# Returns the CSV cell for the cell "cell"; flags are written as true or
+#  false and missing cells are left empty
+def _encodeCsvCell( cell ):
+    if( cell is True ):
+        return "true"
+    elif( cell is False ):
+        return "false"
+    return cell
+
+# Converts every address string in the iterable "inputStrings" (e.g. an open
+#  file; blank rows are skipped) and writes one row per valid address to the
+#  file "outputFile" as CSV (with a header row unless "header" is false) or
+#  JSON Lines objects. Work is done "batchSize" rows at a time, so memory
+#  does not grow with the input. Invalid inputs are passed to the function
+#  "onError", if given, and skipped. Returns ( rows written, invalid rows ).
+def writeConverted( inputStrings, outputFile, outputFormat = CSV,
+columns = None, batchSize = BATCH_SIZE, header = True, onError = None ):
+    if( outputFormat not in ( CSV, JSONL ) ):
+        raise ValueError( "Unknown output format: " + str( outputFormat ) )
+    if( batchSize <= 0 ):
+        raise ValueError( "batchSize is not positive: " + str( batchSize ) )
+    columns = _checkColumns( columns )
+
+    if( outputFormat == CSV ):
+        writer = csv.writer( outputFile, lineterminator = "\n" )
+        if( header ):
+            writer.writerow( columns )
+    else:
+        keyPrefixes = [ json.dumps( column ) + ": " for column in columns ]
+
+    numWritten = 0
+    numInvalid = 0
+    nonBlank = ( inputString for inputString in inputStrings
+        if inputString.strip() )
+    while( True ):
+        batch = list( itertools.islice( nonBlank, batchSize ) )
+        if( len( batch ) == 0 ):
+            break
+
+        rows, errors = convertBatch( batch, columns )
+        if( 1 in errors ):
+            for inputString, error in zip( batch, errors ):
+                if( error ):
+                    numInvalid += 1
+                    if( onError is not None ):
+                        onError( inputString )
+            rows = [ row for row in rows if row is not None ]
+
+        if( outputFormat == CSV ):
+            writer.writerows( [ map( _encodeCsvCell, row ) for row in rows ] )
+        else:
+            outputFile.write( "".join( [ "{" + ", ".join( [ keyPrefix +
+                _encodeJsonCell( cell ) for keyPrefix, cell in itertools.izip(
+                keyPrefixes, row ) ] ) + "}\n" for row in rows ] ) )
+        numWritten += len( rows )
+    return numWritten, numInvalid
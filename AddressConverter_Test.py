@@ -0,0 +1,161 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: AddressConverter_Test.py
+# Author: Nicholas Russo
+# Description: This file includes a class that represents a test case for the
+#  address converter. Every column is compared with the methods of the
+#  address objects, and the CSV and JSON Lines output is read back. The
+#  formatters and the MAC bit predicates are compared with the classes.
+###############################################################################
+
+from AddressConverter import convertBatch, getColumns, writeConverted, CSV, JSONL
+from AddressConverter import computePredicate, getFormatter, getPredicateNames
+from AddressConverter import _macBitPredicates
+from NetAddressFactory import IPV4, IPV6, MAC
+from IPv4Address import IPv4Address
+from IPv6Address import IPv6Address
+from MACAddress import MACAddress
+import csv
+import json
+import random
+import StringIO
+import unittest
+
+# Defines an address converter test case
+class AddressConverter_Test( unittest.TestCase ):
+
+    # Builds a test suite from all of the methods defined in this class
+    @staticmethod
+    def buildTestSuite():
+        return unittest.TestLoader().loadTestsFromTestCase( AddressConverter_Test )
+
+    # Returns the expected cells of "columns" for the address object "address"
+    #  parsed from "inputString"
+    def getExpected(self, address, inputString, columns):
+        expected = []
+        for column in columns:
+            if( column == "input" ):
+                cell = inputString
+            elif( column == "family" ):
+                cell = { IPv4Address: "ipv4", IPv6Address: "ipv6",
+                    MACAddress: "mac" }[ address.__class__ ]
+            elif( column == "string" ):
+                cell = address.toString()
+            elif( column == "hex" ):
+                cell = address.toStringHex() if hasattr( address,
+                    "toStringHex" ) else None
+            elif( column == "cisco" ):
+                cell = address.toStringCisco() if hasattr( address,
+                    "toStringCisco" ) else None
+            elif( column == "integer" ):
+                cell = address.toInteger()
+            elif( column == "prefixLen" ):
+                cell = address.getAddrLen()
+            elif( column == "network" ):
+                cell = address.getNetwork().toString() + "/" + str(
+                    address.getAddrLen() )
+            elif( column == "reverseName" ):
+                cell = address.toReverseName() if hasattr( address,
+                    "toReverseName" ) else None
+            else:
+                cell = bool( getattr( address, column )() ) if hasattr(
+                    address, column ) else None
+            expected.append( cell )
+        return expected
+
+    # Every column matches the address methods, for every family
+    def test_columns(self):
+        generator = random.Random( 45 )
+        addresses = []
+        for addressClass in ( IPv4Address, IPv6Address, MACAddress ):
+            numBits = addressClass._maxAddrLen
+            for i in range( 0, 300 ):
+                # Bias the high-order bits towards the special ranges
+                value = generator.getrandbits( numBits )
+                if( i % 3 == 0 ):
+                    value = ( generator.choice( [ 0x0A, 0xA9, 0xAC, 0xC0, 0xE0,
+                        0xEF, 0xF0, 0x20, 0xFC, 0xFE, 0xFF, 0x01, 0x02, 0x03 ] ) <<
+                        ( numBits - 8 ) ) | ( value >> 8 )
+                addresses.append( addressClass.fromInteger( value,
+                    generator.randint( 0, numBits ) ) )
+
+        inputStrings = [ " " + address.toString() + "/" + str(
+            address.getAddrLen() ) + "\n" for address in addresses ]
+        columns = getColumns()
+        rows, errors = convertBatch( inputStrings )
+        self.assertTrue( errors == bytearray( len( addresses ) ) )
+        for address, inputString, row in zip( addresses, inputStrings, rows ):
+            self.assertTrue( row == self.getExpected( address,
+                inputString.strip(), columns ), inputString )
+
+        # Selected columns, in the order given
+        rows = convertBatch( [ "001b.2c3d.4e5f" ], [ "isULset", "cisco",
+            "string" ] )[0]
+        self.assertTrue( rows == [ [ False, "001b.2c3d.4e5f",
+            "00:1b:2c:3d:4e:5f" ] ] )
+
+    # CSV and JSON Lines output; invalid and blank rows
+    def test_write(self):
+        inputStrings = [ "10.1.2.3/8\n", "\n", "clown\n", "ff02:0:0:0:0:0:0:1\n",
+            "10.1.2.3/33\n", "01-00-5e-01-01-01\n" ]
+        columns = [ "input", "network", "isMulticast", "hex" ]
+        invalid = []
+
+        output = StringIO.StringIO()
+        result = writeConverted( iter( inputStrings ), output, CSV, columns,
+            batchSize = 2, onError = invalid.append )
+        self.assertTrue( result == ( 3, 2 ) )
+        self.assertTrue( invalid == [ "clown\n", "10.1.2.3/33\n" ] )
+        self.assertTrue( list( csv.reader( StringIO.StringIO(
+            output.getvalue() ) ) ) == [ columns,
+            [ "10.1.2.3/8", "10.0.0.0/8", "false", "0x0a010203" ],
+            [ "ff02:0:0:0:0:0:0:1", "ff02:0000:0000:0000:0000:0000:0000:0001/128",
+                "true", "" ],
+            [ "01-00-5e-01-01-01", "01:00:5e:01:01:01/48", "true", "" ] ] )
+
+        output = StringIO.StringIO()
+        self.assertTrue( writeConverted( inputStrings, output, JSONL ) ==
+            ( 3, 2 ) )
+        objects = [ json.loads( line ) for line in
+            output.getvalue().splitlines() ]
+        self.assertTrue( [ sorted( item.keys() ) for item in objects ] ==
+            [ sorted( getColumns() ) ] * 3 )
+        self.assertTrue( objects[0][ "integer" ] == 0x0A010203 )
+        self.assertTrue( objects[1][ "isMulticast" ] is True )
+        self.assertTrue( objects[2][ "hex" ] is None )
+
+        self.assertRaises( ValueError, writeConverted, inputStrings, output,
+            "xml" )
+        self.assertRaises( ValueError, writeConverted, inputStrings, output,
+            CSV, [ "string", "clown" ] )
+        self.assertRaises( ValueError, convertBatch, inputStrings, [] )
+
+    # Every formatter renders the same string as toString() of its class, at
+    #  the edges of the value range and for random values
+    def test_getFormatter(self):
+        generator = random.Random( 45 )
+        for family, addressClass in ( ( IPV4, IPv4Address ),
+        ( IPV6, IPv6Address ), ( MAC, MACAddress ) ):
+            numBits = addressClass._maxAddrLen
+            formatter = getFormatter( family )
+            values = [ 0, 1, 0xFF, ( 1 << numBits ) - 1, 1 << ( numBits - 1 ) ]
+            values.extend( [ generator.getrandbits( numBits )
+                for i in range( 0, 1000 ) ] )
+            for value in values:
+                self.assertTrue( formatter( value ) ==
+                    addressClass.fromInteger( value ).toString(), hex( value ) )
+        self.assertRaises( ValueError, getFormatter, "ipx" )
+
+    # The MAC predicates computed from bits match the MACAddress methods for
+    #  every value of the first octet
+    def test_macBitPredicates(self):
+        generator = random.Random( 45 )
+        values = [ ( firstOctet << 40 ) | generator.getrandbits( 40 )
+            for firstOctet in range( 0, 256 ) ]
+        for name in _macBitPredicates:
+            self.assertTrue( name in getPredicateNames( MAC ), name )
+            flags = computePredicate( name, MAC, values, [ 48 ] * len( values ) )
+            for value, flag in zip( values, flags ):
+                self.assertTrue( flag == getattr( MACAddress.fromInteger(
+                    value ), name )(), name + " " + hex( value ) )
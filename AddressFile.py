@@ -0,0 +1,415 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: AddressFile.py
+# Author: Nicholas Russo
+# Description: This file includes a writer and a reader for a compact binary
+#  file format holding a collection of IPv4, IPv6 or MAC addresses with their
+#  address lengths, so large collections load without re-parsing text. The
+#  records are grouped in blocks. Sorted collections store each block as
+#  varint deltas, others as fixed width values; blocks may be compressed
+#  with zlib. A block index at the end of the file gives random access by
+#  record number (and by value for sorted files). Files can be read as a
+#  stream or memory-mapped and decoded straight into integer arrays.
+###############################################################################
+
+from NetAddressFactory import IPV4, IPV6, MAC, getAddressClass
+import array
+import binascii
+import bisect
+import mmap
+import os
+import struct
+import sys
+import zlib
+
+# Default number of records per block; smaller blocks make random access
+#  cheaper, larger blocks compress better
+BLOCK_SIZE = 4096
+
+# File header: magic, version, family code, flags, records per block, number
+#  of records and offset of the block index
+_headerFormat = ">4sHBBIQQ"
+_headerSize = struct.calcsize( _headerFormat )
+_magic = "NAAF"
+_version = 1
+
+# Block index entry: offset and stored size of the block, number of records
+#  and the first value in the block (as high and low 64-bit halves)
+_indexFormat = ">QIIQQ"
+_indexSize = struct.calcsize( _indexFormat )
+
+# Header flags
+_FLAG_SORTED = 1
+_FLAG_COMPRESSED = 2
+
+# Family codes stored in the header
+_familyCodes = { IPV4: 4, IPV6: 6, MAC: 48 }
+_codeFamilies = dict( ( code, family )
+    for family, code in _familyCodes.iteritems() )
+
+# IPv4 blocks are converted with a 4-byte array type when there is one
+_WORD_TYPE = "I" if array.array( "I" ).itemsize == 4 else None
+
+# MAC values are returned in arrays of unsigned longs where those are 64 bits
+#  wide. Python 2 has no array type of 64 bits on every platform (on Windows
+#  and 32-bit builds "L" is 32 bits), so lists are used there.
+_LONG_TYPE = "L" if array.array( "L" ).itemsize >= 8 else None
+
+# Returns the "numBits" wide integers "values" (a list, or an array of 32-bit
+#  values) as an array of unsigned longs when they fit in one (see
+#  _LONG_TYPE), otherwise as the list itself
+def _toValues( values, numBits ):
+    if( numBits <= 32 or ( numBits <= 64 and _LONG_TYPE is not None ) ):
+        return array.array( "L", values )
+    return values
+
+# Returns the string of varints encoding the differences between the
+#  consecutive (non-decreasing) integers in "values", starting from zero
+def _encodeDeltas( values ):
+    output = bytearray()
+    append = output.append
+    previous = 0
+    for value in values:
+        delta = value - previous
+        if( delta < 0 ):
+            raise ValueError( "values are not sorted: " + str( value ) )
+        previous = value
+        while( delta >= 0x80 ):
+            append( ( delta & 0x7F ) | 0x80 )
+            delta >>= 7
+        append( delta )
+    return str( output )
+
+# Returns the list of integers encoded by _encodeDeltas() in "data"
+def _decodeDeltas( data ):
+    values = []
+    append = values.append
+    previous = 0
+    delta = 0
+    shift = 0
+    for byte in bytearray( data ):
+        delta |= ( byte & 0x7F ) << shift
+        if( byte & 0x80 ):
+            shift += 7
+        else:
+            previous += delta
+            append( previous )
+            delta = 0
+            shift = 0
+    return values
+
+# Returns the string of "numBits" wide big-endian integers in "values"
+def _encodeFixed( values, numBits ):
+    if( numBits == 32 and _WORD_TYPE is not None ):
+        words = array.array( _WORD_TYPE, values )
+        if( sys.byteorder == "little" ):
+            words.byteswap()
+        return words.tostring()
+    return binascii.unhexlify( "".join( "%0*x" % ( numBits / 4, value )
+        for value in values ) )
+
+# Returns the integers encoded by _encodeFixed() in "data", in the form
+#  returned by _toValues()
+def _decodeFixed( data, numBits ):
+    if( numBits == 32 and _WORD_TYPE is not None ):
+        words = array.array( _WORD_TYPE )
+        words.fromstring( data )
+        if( sys.byteorder == "little" ):
+            words.byteswap()
+        return _toValues( words, numBits )
+
+    digits = binascii.hexlify( data )
+    width = numBits / 4
+    return _toValues( [ int( digits[ start:start + width ], 16 )
+        for start in xrange( 0, len( digits ), width ) ], numBits )
+
+# Defines a streaming writer for the binary address file format. Records are
+#  buffered one block at a time; the index and header are written by close().
+class AddressFileWriter(object):
+
+    # Opens "path" for writing a collection of "family" addresses (IPV4, IPV6
+    #  or MAC). When "isSorted" is true, the values must be added in
+    #  non-decreasing order and are delta encoded; when "compress" is true,
+    #  every block is compressed with zlib.
+    def __init__(self, path, family, isSorted = False, compress = False,
+    blockSize = BLOCK_SIZE):
+        if( family not in _familyCodes ):
+            raise ValueError( "Unknown address family: " + str( family ) )
+        if( blockSize <= 0 ):
+            raise ValueError( "blockSize is not positive: " + str( blockSize ) )
+
+        self._family = family
+        self._addressClass = getAddressClass( family )
+        self._numBits = self._addressClass._maxAddrLen
+        self._flags = ( _FLAG_SORTED if isSorted else 0 ) | (
+            _FLAG_COMPRESSED if compress else 0 )
+        self._blockSize = blockSize
+        self._count = 0
+        self._lastValue = 0
+        self._values = []
+        self._prefixLens = []
+        self._index = []
+
+        # The header is rewritten with the final counts by close()
+        self._file = open( path, "wb" )
+        self._file.write( "\0" * _headerSize )
+
+    # Adds the address object "address", keeping its address length
+    def add(self, address):
+        if( address.__class__ != self._addressClass ):
+            raise ValueError( "address is not in the file family: " +
+                str( address ) )
+        self.addValue( address.toInteger(), address.getAddrLen() )
+
+    # Adds the integer "value" with the address length "prefixLen", which
+    #  defaults to the full width of the family
+    def addValue(self, value, prefixLen = None):
+        self._values.append( value )
+        self._prefixLens.append( self._numBits if prefixLen is None
+            else prefixLen )
+        if( len( self._values ) >= self._blockSize ):
+            self._writeBlock()
+
+    # Adds every integer in the sequence "values" (e.g. an array), with the
+    #  address lengths from the parallel sequence "prefixLens" if given
+    def addAll(self, values, prefixLens = None):
+        if( prefixLens is not None and len( prefixLens ) != len( values ) ):
+            raise ValueError( "values and prefixLens differ in length" )
+
+        start = 0
+        while( start < len( values ) ):
+            end = start + self._blockSize - len( self._values )
+            batch = values[ start:end ]
+            self._values.extend( batch )
+            if( prefixLens is None ):
+                self._prefixLens.extend( [ self._numBits ] * len( batch ) )
+            else:
+                self._prefixLens.extend( prefixLens[ start:end ] )
+            if( len( self._values ) >= self._blockSize ):
+                self._writeBlock()
+            start = end
+
+    # Encodes and writes the buffered records as one block. Values that are
+    #  out of range (or out of order in a sorted file) raise an error here.
+    def _writeBlock(self):
+        values = self._values
+        prefixLens = self._prefixLens
+        if( len( values ) == 0 ):
+            return
+        if( min( values ) < 0 or max( values ) >> self._numBits != 0 ):
+            raise ValueError( "value is out of range for " + self._family )
+        if( min( prefixLens ) < 0 or max( prefixLens ) > self._numBits ):
+            raise ValueError( "prefixLen is out of range for " + self._family )
+
+        # Address lengths come first, one byte each, then the values
+        if( self._flags & _FLAG_SORTED ):
+            if( values[0] < self._lastValue ):
+                raise ValueError( "values are not sorted: " + str( values[0] ) )
+            data = _encodeDeltas( values )
+            self._lastValue = values[-1]
+        else:
+            data = _encodeFixed( values, self._numBits )
+        data = array.array( "B", prefixLens ).tostring() + data
+        if( self._flags & _FLAG_COMPRESSED ):
+            data = zlib.compress( data )
+
+        self._index.append( ( self._file.tell(), len( data ), len( values ),
+            values[0] >> 64, values[0] & 0xFFFFFFFFFFFFFFFF ) )
+        self._file.write( data )
+        self._count += len( values )
+        self._values = []
+        self._prefixLens = []
+
+    # Writes the last block, the block index and the header, then closes
+    #  the file (the header stays blank if the last block is invalid)
+    def close(self):
+        if( self._file is None ):
+            return
+        try:
+            self._writeBlock()
+            indexOffset = self._file.tell()
+            for entry in self._index:
+                self._file.write( struct.pack( _indexFormat, *entry ) )
+            self._file.seek( 0 )
+            self._file.write( struct.pack( _headerFormat, _magic, _version,
+                _familyCodes[ self._family ], self._flags, self._blockSize,
+                self._count, indexOffset ) )
+        finally:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    # Closes the file, unless an error is already on its way up the stack
+    def __exit__(self, excType, excValue, traceback):
+        if( excType is None ):
+            self.close()
+        elif( self._file is not None ):
+            self._file.close()
+            self._file = None
+
+# Defines a reader for files written by AddressFileWriter. Blocks are decoded
+#  on demand, so the file can be streamed or accessed at random.
+class AddressFileReader(object):
+
+    # Opens the file at "path" and reads its header and block index. When
+    #  "useMmap" is true, the file is memory-mapped read-only; otherwise each
+    #  block is read from the file when it is needed.
+    def __init__(self, path, useMmap = True):
+        self._file = open( path, "rb" )
+        try:
+            header = self._file.read( _headerSize )
+            if( len( header ) != _headerSize ):
+                raise ValueError( "file is too short: " + path )
+
+            magic, version, familyCode, self._flags, self._blockSize, \
+                self._count, indexOffset = struct.unpack( _headerFormat, header )
+            if( magic != _magic or version != _version or
+            familyCode not in _codeFamilies ):
+                raise ValueError( "not an address file: " + path )
+
+            # Check the remaining header fields against the file before
+            #  they are used to size anything
+            fileSize = os.fstat( self._file.fileno() ).st_size
+            if( self._flags & ~( _FLAG_SORTED | _FLAG_COMPRESSED ) ):
+                raise ValueError( "unknown flags: " + str( self._flags ) )
+            if( self._blockSize <= 0 ):
+                raise ValueError( "blockSize is not positive: " +
+                    str( self._blockSize ) )
+            if( indexOffset < _headerSize or indexOffset > fileSize ):
+                raise ValueError( "index offset is out of range: " +
+                    str( indexOffset ) )
+
+            self._family = _codeFamilies[ familyCode ]
+            self._addressClass = getAddressClass( self._family )
+            self._numBits = self._addressClass._maxAddrLen
+
+            self._file.seek( indexOffset )
+            numBlocks = ( self._count + self._blockSize - 1 ) / self._blockSize
+            if( numBlocks * _indexSize > fileSize - indexOffset ):
+                raise ValueError( "block index is truncated: " + path )
+            indexData = self._file.read( numBlocks * _indexSize )
+            if( len( indexData ) != numBlocks * _indexSize ):
+                raise ValueError( "block index is truncated: " + path )
+            self._index = [ struct.unpack_from( _indexFormat, indexData,
+                block * _indexSize ) for block in xrange( 0, numBlocks ) ]
+            self._firstValues = [ ( high << 64 ) | low
+                for offset, size, count, high, low in self._index ]
+
+            self._data = None
+            if( useMmap ):
+                self._data = mmap.mmap( self._file.fileno(), 0,
+                    access = mmap.ACCESS_READ )
+        except:
+            self._file.close()
+            raise
+
+    # Returns the family (IPV4, IPV6 or MAC) of the addresses in the file
+    def getFamily(self):
+        return self._family
+
+    # Returns true if the values in the file are in non-decreasing order
+    def isSorted(self):
+        return ( self._flags & _FLAG_SORTED ) != 0
+
+    # Returns the number of blocks in the file
+    def getNumBlocks(self):
+        return len( self._index )
+
+    # Implements the len() function by returning the number of records
+    def __len__(self):
+        return self._count
+
+    # Returns the stored (possibly compressed) bytes of block "block"
+    def _readBlockData(self, block):
+        offset, size = self._index[ block ][ 0:2 ]
+        if( self._data is not None ):
+            return self._data[ offset:offset + size ]
+        self._file.seek( offset )
+        return self._file.read( size )
+
+    # Returns the values and address lengths of block "block" as a pair of
+    #  sequences: an array of unsigned longs (or a list for IPv6, and for
+    #  MACs where longs are 32 bits; see _toValues) and an array of bytes
+    def readBlock(self, block):
+        data = self._readBlockData( block )
+        if( self._flags & _FLAG_COMPRESSED ):
+            data = zlib.decompress( data )
+
+        count = self._index[ block ][2]
+        prefixLens = array.array( "B" )
+        prefixLens.fromstring( data[ 0:count ] )
+        if( self._flags & _FLAG_SORTED ):
+            values = _toValues( _decodeDeltas( data[ count: ] ),
+                self._numBits )
+        else:
+            values = _decodeFixed( data[ count: ], self._numBits )
+
+        if( len( values ) != count ):
+            raise ValueError( "block is corrupt: " + str( block ) )
+        return values, prefixLens
+
+    # Returns all of the values and address lengths in the file, in the same
+    #  form as readBlock()
+    def readArrays(self):
+        values = _toValues( [], self._numBits )
+        prefixLens = array.array( "B" )
+        for block in xrange( 0, len( self._index ) ):
+            blockValues, blockPrefixLens = self.readBlock( block )
+            values.extend( blockValues )
+            prefixLens.extend( blockPrefixLens )
+        return values, prefixLens
+
+    # Yields ( value, address length ) for every record, one block at a time
+    def iterValues(self):
+        for block in xrange( 0, len( self._index ) ):
+            values, prefixLens = self.readBlock( block )
+            for record in zip( values, prefixLens ):
+                yield record
+
+    # Yields an address object for every record
+    def __iter__(self):
+        fromInteger = self._addressClass.fromInteger
+        for value, prefixLen in self.iterValues():
+            yield fromInteger( value, prefixLen )
+
+    # Returns ( value, address length ) for record number "record"; only
+    #  the block holding the record is decoded
+    def getValue(self, record):
+        if( record < 0 or record >= self._count ):
+            raise ValueError( "record is out of range: " + str( record ) )
+        values, prefixLens = self.readBlock( record / self._blockSize )
+        return values[ record % self._blockSize ], \
+            prefixLens[ record % self._blockSize ]
+
+    # Returns the address object for record number "record"
+    def getAddress(self, record):
+        return self._addressClass.fromInteger( *self.getValue( record ) )
+
+    # Returns true if the integer "value" is in a sorted file. The block index
+    #  is searched first, so only one block is decoded.
+    def containsValue(self, value):
+        if( not self.isSorted() ):
+            raise ValueError( "file is not sorted" )
+
+        block = bisect.bisect_right( self._firstValues, value ) - 1
+        if( block < 0 ):
+            return False
+        values = self.readBlock( block )[0]
+        position = bisect.bisect_left( values, value )
+        return position < len( values ) and values[ position ] == value
+
+    # Closes the file (and its memory map, if any)
+    def close(self):
+        if( self._data is not None ):
+            self._data.close()
+            self._data = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
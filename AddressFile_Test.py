@@ -0,0 +1,160 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: AddressFile_Test.py
+# Author: Nicholas Russo
+# Description: This file includes a class that represents a test case for the
+#  AddressFileWriter and AddressFileReader classes. Round trips for every
+#  family and encoding, random access and invalid input are tested here.
+###############################################################################
+
+from AddressFile import AddressFileWriter, AddressFileReader
+import AddressFile
+from NetAddressFactory import IPV4, IPV6, MAC
+from IPv4Address import IPv4Address
+from IPv6Address import IPv6Address
+import array
+import os
+import random
+import struct
+import tempfile
+import unittest
+
+# Defines an address file test case
+class AddressFile_Test( unittest.TestCase ):
+
+    # Builds a test suite from all of the methods defined in this class
+    @staticmethod
+    def buildTestSuite():
+        return unittest.TestLoader().loadTestsFromTestCase( AddressFile_Test )
+
+    # Creates an empty temporary file for each test
+    def setUp(self):
+        handle, self._path = tempfile.mkstemp()
+        os.close( handle )
+
+    def tearDown(self):
+        os.remove( self._path )
+
+    # Writes "values" and "prefixLens" with the given options and returns them
+    #  as read back through a stream and through a memory map
+    def _roundTrip(self, family, values, prefixLens, isSorted, compress):
+        with AddressFileWriter( self._path, family, isSorted, compress,
+        blockSize = 100 ) as writer:
+            writer.addAll( values[ 0:150 ], prefixLens[ 0:150 ] )
+            for value, prefixLen in zip( values[ 150: ], prefixLens[ 150: ] ):
+                writer.addValue( value, prefixLen )
+
+        results = []
+        for useMmap in ( False, True ):
+            with AddressFileReader( self._path, useMmap ) as reader:
+                self.assertTrue( reader.getFamily() == family )
+                self.assertTrue( len( reader ) == len( values ) )
+                self.assertTrue( reader.getNumBlocks() ==
+                    ( len( values ) + 99 ) / 100 )
+                results.append( reader.readArrays() )
+                self.assertTrue( list( reader.iterValues() ) ==
+                    zip( *results[-1] ) )
+        return results
+
+    # Every family must round trip with and without sorting and compression,
+    #  with MAC values in arrays and in the lists used where unsigned longs
+    #  are too narrow
+    def test_roundTrip(self):
+        longType = AddressFile._LONG_TYPE
+        try:
+            for testType in ( longType, None ):
+                AddressFile._LONG_TYPE = testType
+                self.checkRoundTrip()
+        finally:
+            AddressFile._LONG_TYPE = longType
+
+    # Round trips random values of every family with every option
+    def checkRoundTrip(self):
+        generator = random.Random( 36 )
+        for family, numBits in ( ( IPV4, 32 ), ( IPV6, 128 ), ( MAC, 48 ) ):
+            values = [ generator.getrandbits( numBits ) for i in range( 0, 777 ) ]
+            values.extend( ( 0, ( 1 << numBits ) - 1 ) )
+            prefixLens = [ generator.randint( 0, numBits ) for value in values ]
+            for isSorted in ( False, True ):
+                if( isSorted ):
+                    values.sort()
+                for compress in ( False, True ):
+                    for readValues, readPrefixLens in self._roundTrip( family,
+                    values, prefixLens, isSorted, compress ):
+                        self.assertTrue( list( readValues ) == values )
+                        self.assertTrue( list( readPrefixLens ) == prefixLens )
+
+    # Address objects keep their class and address length; records can be
+    #  read at random and sorted files searched by value
+    def test_randomAccess(self):
+        addresses = [ IPv4Address.fromInteger( value * 7, 8 + value % 25 )
+            for value in range( 0, 1000 ) ]
+        with AddressFileWriter( self._path, IPV4, True, True, 64 ) as writer:
+            for address in addresses:
+                writer.add( address )
+
+        with AddressFileReader( self._path ) as reader:
+            self.assertTrue( reader.isSorted() )
+            self.assertTrue( list( reader ) == addresses )
+            for record in ( 0, 63, 64, 500, 999 ):
+                self.assertTrue( reader.getAddress( record ) ==
+                    addresses[ record ] )
+            self.assertRaises( ValueError, reader.getValue, 1000 )
+            for value in range( 0, 7100 ):
+                self.assertTrue( reader.containsValue( value ) ==
+                    ( value % 7 == 0 and value < 7000 ) )
+
+    # An empty collection is still a valid file
+    def test_empty(self):
+        AddressFileWriter( self._path, IPV6 ).close()
+        with AddressFileReader( self._path ) as reader:
+            self.assertTrue( len( reader ) == 0 )
+            self.assertTrue( reader.readArrays() == ( [], array.array( "B" ) ) )
+
+    # Invalid options, values and files must raise errors
+    def test_invalid(self):
+        self.assertRaises( ValueError, AddressFileWriter, self._path, "ipx" )
+        self.assertRaises( ValueError, AddressFileWriter, self._path, IPV4,
+            blockSize = 0 )
+
+        writer = AddressFileWriter( self._path, IPV4 )
+        self.assertRaises( ValueError, writer.add,
+            IPv6Address( "2001:0db8:0000:0000:0000:0000:0000:0001" ) )
+        writer.addValue( 1 << 32 )
+        self.assertRaises( ValueError, writer.close )
+
+        writer = AddressFileWriter( self._path, IPV4, isSorted = True,
+            blockSize = 2 )
+        self.assertRaises( ValueError, writer.addAll, [ 5, 6, 4, 7 ] )
+
+        # A writer that fails on close leaves no valid file
+        try:
+            with AddressFileWriter( self._path, IPV4, isSorted = True ) as writer:
+                writer.addAll( [ 2, 1 ] )
+        except ValueError:
+            pass
+        self.assertRaises( ValueError, AddressFileReader, self._path )
+
+        with AddressFileWriter( self._path, IPV4 ) as writer:
+            writer.addAll( [ 2, 1 ] )
+        with AddressFileReader( self._path ) as reader:
+            self.assertRaises( ValueError, reader.containsValue, 1 )
+
+    # Headers with fields that do not match the file raise errors rather
+    #  than failing later (e.g. dividing by a block size of 0)
+    def test_invalidHeader(self):
+        with AddressFileWriter( self._path, IPV4, blockSize = 10 ) as writer:
+            writer.addAll( range( 0, 25 ) )
+        with open( self._path, "rb" ) as inputFile:
+            data = inputFile.read()
+        fileSize = len( data )
+
+        # Offsets of the flags, records per block, count and index offset
+        for offset, fieldFormat, value in ( ( 7, ">B", 0x80 ), ( 8, ">I", 0 ),
+        ( 12, ">Q", 1 << 40 ), ( 20, ">Q", 4 ), ( 20, ">Q", fileSize + 1 ),
+        ( 20, ">Q", 1 << 62 ) ):
+            with open( self._path, "wb" ) as outputFile:
+                outputFile.write( data[ 0:offset ] + struct.pack( fieldFormat,
+                    value ) + data[ offset + struct.calcsize( fieldFormat ): ] )
+            self.assertRaises( ValueError, AddressFileReader, self._path )
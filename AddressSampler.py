@@ -0,0 +1,230 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: AddressSampler.py
+# Author: Nicholas Russo
+# Description: This file includes a seeded sampler that draws random IPv4 or
+#  IPv6 addresses from a set of prefixes, uniformly or with a weight per
+#  prefix, optionally without replacement. Excluded space (e.g. everything
+#  for which isPrivateAddress() or isMulticast() is true) is subtracted from
+#  the prefixes up front as integer ranges that mirror the predicates of the
+#  address classes (see PredicateRanges.py), so every draw is a single index
+#  into the remaining ranges and nothing is drawn and rejected. Results are
+#  integer arrays (see NetAddress.toInteger) or address objects.
+###############################################################################
+
+from PredicateRanges import getPredicateRanges
+import array
+import bisect
+import random
+
+# Values up to 64 bits wide (e.g. MACs) are returned in arrays of unsigned
+#  longs where those are 64 bits wide. Python 2 has no array type of 64 bits
+#  on every platform (on Windows and 32-bit builds "L" is 32 bits), so only
+#  values up to 32 bits use arrays there.
+_LONG_TYPE = "L" if array.array( "L" ).itemsize >= 8 else None
+
+# Returns the sorted list of disjoint ranges covering the ranges "ranges"
+def _mergeRanges( ranges ):
+    merged = []
+    for first, last in sorted( ranges ):
+        if( len( merged ) > 0 and first <= merged[-1][1] + 1 ):
+            merged[-1][1] = max( merged[-1][1], last )
+        else:
+            merged.append( [ first, last ] )
+    return [ ( first, last ) for first, last in merged ]
+
+# Returns the parts of the range ( "first", "last" ) outside of the sorted,
+#  disjoint "excluded" ranges
+def _subtractRanges( first, last, excluded ):
+    remaining = []
+    for excludedFirst, excludedLast in excluded:
+        if( excludedLast < first ):
+            continue
+        if( excludedFirst > last ):
+            break
+        if( excludedFirst > first ):
+            remaining.append( ( first, excludedFirst - 1 ) )
+        first = excludedLast + 1
+    if( first <= last ):
+        remaining.append( ( first, last ) )
+    return remaining
+
+# Defines a set of disjoint ranges indexed as one run of integers
+class _RangeSet(object):
+
+    def __init__(self, ranges):
+        self._firsts = []
+        self._countsBefore = []
+        self._count = 0
+        for first, last in ranges:
+            self._firsts.append( first )
+            self._countsBefore.append( self._count )
+            self._count += last - first + 1
+
+    # Returns the number of integers in the ranges
+    def getCount(self):
+        return self._count
+
+    # Returns the list of integers at the indices "indices" of the ranges;
+    #  a single range needs no search
+    def getValues(self, indices):
+        if( len( self._firsts ) == 1 ):
+            first = self._firsts[0]
+            return [ first + index for index in indices ]
+
+        firsts = self._firsts
+        countsBefore = self._countsBefore
+        bisectRight = bisect.bisect_right
+        values = []
+        for index in indices:
+            position = bisectRight( countsBefore, index ) - 1
+            values.append( firsts[ position ] + index - countsBefore[ position ] )
+        return values
+
+# Defines a seeded random address sampler over a set of prefixes
+class AddressSampler(object):
+
+    # Builds a sampler for the address objects with address lengths in
+    #  "prefixes" (e.g. IPv4Address( "10.0.0.0", 8 )), all of one class.
+    #  Addresses matching anything in "exclude" are never drawn; each entry
+    #  is a predicate name of the class (e.g. "isPrivateAddress") or another
+    #  prefix. With no "weights", every remaining address is equally likely
+    #  (overlapping prefixes count once); otherwise prefix i is picked with
+    #  probability weights[i] / sum( weights ), then an address within it.
+    #  The same "seed" always gives the same samples.
+    def __init__(self, prefixes, weights = None, exclude = (), seed = None):
+        if( prefixes is None or len( prefixes ) == 0 ):
+            raise AttributeError( "prefixes is None or empty" )
+        self._addressClass = prefixes[0].__class__
+        self._numBits = self._addressClass._maxAddrLen
+        for prefix in prefixes:
+            if( prefix.__class__ != self._addressClass ):
+                raise ValueError( "prefixes are of different classes: " +
+                    str( prefix ) )
+
+        excluded = []
+        for item in exclude:
+            if( isinstance( item, basestring ) ):
+                excluded.extend( getPredicateRanges( item, self._numBits ) )
+            else:
+                excluded.append( self._toRange( item ) )
+        excluded = _mergeRanges( excluded )
+
+        if( weights is None ):
+            merged = _mergeRanges( self._toRange( prefix ) for prefix in prefixes )
+            self._rangeSets = [ _RangeSet( [ piece for first, last in merged
+                for piece in _subtractRanges( first, last, excluded ) ] ) ]
+            self._cumulativeWeights = None
+        else:
+            if( len( weights ) != len( prefixes ) ):
+                raise ValueError( "prefixes and weights differ in length" )
+            self._rangeSets = [ _RangeSet( _subtractRanges( first, last,
+                excluded ) ) for first, last in ( self._toRange( prefix )
+                for prefix in prefixes ) ]
+
+            self._cumulativeWeights = []
+            totalWeight = 0.0
+            for weight, rangeSet in zip( weights, self._rangeSets ):
+                if( weight < 0 ):
+                    raise ValueError( "weight is negative: " + str( weight ) )
+                if( weight > 0 and rangeSet.getCount() == 0 ):
+                    raise ValueError( "weighted prefix is fully excluded" )
+                totalWeight += weight
+                self._cumulativeWeights.append( totalWeight )
+            if( totalWeight <= 0 ):
+                raise ValueError( "weights are not positive" )
+
+        if( self.getCount() == 0 ):
+            raise ValueError( "every address is excluded" )
+        self._random = random.Random( seed )
+
+    # Returns the range ( first, last ) covered by the prefix "prefix"
+    def _toRange(self, prefix):
+        if( prefix.__class__ != self._addressClass ):
+            raise ValueError( "prefix is of a different class: " + str( prefix ) )
+        hostLen = self._numBits - prefix.getAddrLen()
+        first = ( prefix.toInteger() >> hostLen ) << hostLen
+        return ( first, first | ( ( 1 << hostLen ) - 1 ) )
+
+    # Returns the number of addresses that can be drawn (with weights, an
+    #  address in several prefixes is counted once per prefix)
+    def getCount(self):
+        return sum( rangeSet.getCount() for rangeSet in self._rangeSets )
+
+    # Returns a list of "count" uniform integers in [0, "total"). Floats are
+    #  exact enough (and much faster) below 2^53; larger totals (IPv6) use
+    #  random bits.
+    def _drawIndices(self, total, count):
+        if( total < ( 1 << 53 ) ):
+            uniform = self._random.random
+            return [ int( uniform() * total ) for i in xrange( 0, count ) ]
+        randrange = self._random.randrange
+        return [ randrange( total ) for i in xrange( 0, count ) ]
+
+    # Returns a container for "numBits" wide values: an array of unsigned
+    #  longs when they fit in one (see _LONG_TYPE), or a list for wider values
+    def _newValues(self):
+        if( self._numBits <= 32 or ( self._numBits <= 64 and
+        _LONG_TYPE is not None ) ):
+            return array.array( "L" )
+        return []
+
+    # Returns "count" random integer values. With "replace" false, no value
+    #  is returned twice (Floyd's algorithm over the index space, so memory
+    #  is proportional to "count"); this needs uniform sampling.
+    def sampleValues(self, count, replace = True):
+        if( count < 0 ):
+            raise ValueError( "count is negative: " + str( count ) )
+        values = self._newValues()
+
+        if( not replace ):
+            if( self._cumulativeWeights is not None ):
+                raise ValueError( "sampling without replacement is uniform only" )
+            rangeSet = self._rangeSets[0]
+            total = rangeSet.getCount()
+            if( count > total ):
+                raise ValueError( "count is larger than the population: " +
+                    str( count ) )
+
+            # Floyd's algorithm picks a uniform subset; shuffle for the order
+            chosen = set()
+            randrange = self._random.randrange
+            for upper in ( total - count + i for i in xrange( 0, count ) ):
+                index = randrange( upper + 1 )
+                chosen.add( upper if index in chosen else index )
+            indices = list( chosen )
+            self._random.shuffle( indices )
+            values.extend( rangeSet.getValues( indices ) )
+            return values
+
+        if( self._cumulativeWeights is None ):
+            rangeSet = self._rangeSets[0]
+            values.extend( rangeSet.getValues( self._drawIndices(
+                rangeSet.getCount(), count ) ) )
+            return values
+
+        # Pick the prefix of every draw, then draw each prefix's share at once
+        #  and put the values back in draw order
+        uniform = self._random.random
+        cumulativeWeights = self._cumulativeWeights
+        totalWeight = cumulativeWeights[-1]
+        positions = [ [] for rangeSet in self._rangeSets ]
+        for position in xrange( 0, count ):
+            positions[ bisect.bisect_right( cumulativeWeights,
+                uniform() * totalWeight ) ].append( position )
+
+        results = [ 0 ] * count
+        for rangeSet, setPositions in zip( self._rangeSets, positions ):
+            if( len( setPositions ) > 0 ):
+                for position, value in zip( setPositions, rangeSet.getValues(
+                self._drawIndices( rangeSet.getCount(), len( setPositions ) ) ) ):
+                    results[ position ] = value
+        values.extend( results )
+        return values
+
+    # Returns "count" random address objects with full address lengths
+    def sample(self, count, replace = True):
+        fromInteger = self._addressClass.fromInteger
+        return [ fromInteger( value ) for value in self.sampleValues( count,
+            replace ) ]
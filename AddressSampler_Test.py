@@ -0,0 +1,115 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: AddressSampler_Test.py
+# Author: Nicholas Russo
+# Description: This file includes a class that represents a test case for the
+#  AddressSampler class. Sampling is checked for exclusions, seeding,
+#  weights and sampling without replacement.
+###############################################################################
+
+from AddressSampler import AddressSampler
+from IPv4Address import IPv4Address
+from IPv6Address import IPv6Address
+from MACAddress import MACAddress
+import AddressSampler as AddressSamplerModule
+import array
+import unittest
+
+# Defines an address sampler test case
+class AddressSampler_Test( unittest.TestCase ):
+
+    # Builds a test suite from all of the methods defined in this class
+    @staticmethod
+    def buildTestSuite():
+        return unittest.TestLoader().loadTestsFromTestCase( AddressSampler_Test )
+
+    # Samples stay inside the prefixes and outside the exclusions, and the
+    #  same seed gives the same samples
+    def test_sampleExcluded(self):
+        prefixes = [ IPv4Address( "192.0.0.0", 2 ), IPv4Address( "10.0.0.0", 7 ) ]
+        exclude = [ "isPrivateAddress", "isMulticast", "isLinkLocalAddress",
+            IPv4Address( "128.0.0.0", 2 ) ]
+        sampler = AddressSampler( prefixes, exclude = exclude, seed = 1 )
+        values = sampler.sampleValues( 20000 )
+        self.assertTrue( isinstance( values, array.array ) )
+        self.assertTrue( values == AddressSampler( prefixes, exclude = exclude,
+            seed = 1 ).sampleValues( 20000 ) )
+
+        for address in sampler.sample( 2000 ) + [ IPv4Address.fromInteger( value )
+        for value in values ]:
+            self.assertTrue( address.getOctet( 1 ) == 11 or
+                192 <= address.getOctet( 1 ) <= 223 or
+                address.getOctet( 1 ) >= 240 )
+            self.assertFalse( address.isPrivateAddress() or address.isMulticast()
+                or address.isLinkLocalAddress() )
+
+        # 11/8 is drawn in proportion to its share of the remaining addresses
+        share = sum( 1 for value in values if value >> 24 == 11 ) / 20000.0
+        expected = float( 1 << 24 ) / sampler.getCount()
+        self.assertTrue( abs( share - expected ) < 0.02 )
+
+    # Weighted prefixes are picked in proportion to their weights
+    def test_sampleWeighted(self):
+        prefixes = [ IPv6Address( "2001:0db8:0000:0000:0000:0000:0000:0000", 32 ),
+            IPv6Address( "fe80:0000:0000:0000:0000:0000:0000:0000", 10 ),
+            IPv6Address( "2002:0000:0000:0000:0000:0000:0000:0000", 16 ) ]
+        sampler = AddressSampler( prefixes, [ 3, 1, 0 ], seed = 2 )
+        values = sampler.sampleValues( 20000 )
+        self.assertTrue( isinstance( values, list ) )
+        share = sum( 1 for value in values if value >> 96 == 0x20010db8 ) / 20000.0
+        self.assertTrue( abs( share - 0.75 ) < 0.02 )
+        self.assertTrue( all( value >> 96 == 0x20010db8 or
+            IPv6Address.fromInteger( value ).isLinkLocalAddress()
+            for value in values ) )
+
+        self.assertRaises( ValueError, AddressSampler, prefixes, [ 1, 1, 1 ],
+            [ "is6to4" ] )
+        self.assertRaises( ValueError, AddressSampler, prefixes, [ 1, 1 ] )
+        self.assertRaises( ValueError, AddressSampler, prefixes, [ 0, 0, 0 ] )
+        self.assertRaises( ValueError, sampler.sampleValues, 1, False )
+
+    # Sampling without replacement never repeats and can drain the population
+    def test_sampleWithoutReplacement(self):
+        prefixes = [ IPv4Address( "10.1.0.0", 22 ), IPv4Address( "10.1.2.0", 24 ),
+            IPv4Address( "10.9.9.0", 30 ) ]
+        sampler = AddressSampler( prefixes, exclude = [ IPv4Address( "10.1.1.0",
+            24 ) ], seed = 3 )
+        self.assertTrue( sampler.getCount() == 3 * 256 + 4 )
+        values = sampler.sampleValues( 500, False )
+        self.assertTrue( len( set( values ) ) == 500 )
+        values = sampler.sampleValues( sampler.getCount(), False )
+        self.assertTrue( sorted( values ) == range( 0x0A010000, 0x0A010100 ) +
+            range( 0x0A010200, 0x0A010400 ) + range( 0x0A090900, 0x0A090904 ) )
+        self.assertRaises( ValueError, sampler.sampleValues,
+            sampler.getCount() + 1, False )
+
+        sampler = AddressSampler( [ IPv6Address(
+            "2001:0db8:0000:0000:0000:0000:0000:0000", 32 ) ], seed = 4 )
+        self.assertTrue( len( set( sampler.sampleValues( 1000, False ) ) ) == 1000 )
+
+    # 48-bit MAC samples are the same in arrays and in the lists used where
+    #  unsigned longs are too narrow
+    def test_sampleMacs(self):
+        prefix = MACAddress( "ff:ff:ff:00:00:00", 24 )
+        longType = AddressSamplerModule._LONG_TYPE
+        try:
+            samples = []
+            for testType in ( longType, None ):
+                AddressSamplerModule._LONG_TYPE = testType
+                samples.append( list( AddressSampler( [ prefix ],
+                    seed = 1 ).sampleValues( 1000 ) ) )
+        finally:
+            AddressSamplerModule._LONG_TYPE = longType
+        self.assertTrue( samples[0] == samples[1] )
+        self.assertTrue( all( value >> 24 == 0xffffff for value in samples[0] ) )
+
+    # Invalid prefixes and exclusions must raise errors
+    def test_invalidInstances(self):
+        self.assertRaises( AttributeError, AddressSampler, [] )
+        self.assertRaises( ValueError, AddressSampler, [ IPv4Address( "10.0.0.0", 8 ),
+            IPv6Address( "2001:0db8:0000:0000:0000:0000:0000:0000", 32 ) ] )
+        self.assertRaises( ValueError, AddressSampler,
+            [ IPv4Address( "10.0.0.0", 8 ) ], exclude = [ "isPrivateAddress" ] )
+        self.assertRaises( ValueError, AddressSampler,
+            [ IPv4Address( "10.0.0.0", 8 ) ], exclude = [ "isBogus" ] )
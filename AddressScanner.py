@@ -0,0 +1,171 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: AddressScanner.py
+# Author: Nicholas Russo
+# Description: This file includes functions that find IPv4, IPv6 and MAC
+#  addresses in unstructured text such as syslog or configuration dumps.
+#  Candidates are found in one pass with precompiled patterns, then
+#  validated with the parsing rules of the address classes (noise such as
+#  999.1.1.1 is dropped). Files are memory-mapped; other streams are read in
+#  chunks. Every result carries the byte offset where the address starts.
+###############################################################################
+
+from NetAddressFactory import IPV4, IPV6, MAC, getAddressClass
+import mmap
+import os
+import re
+
+# One alternation per family. The lookarounds stop candidates from being cut
+#  out of longer tokens (e.g. the "2.3.4.5" inside "1.2.3.4.5"). IPv6 must be
+#  fully extended since that is the format the address class parses. MACs
+#  may be colon or dash separated (aa:bb:cc:dd:ee:ff, aa-bb-cc-dd-ee-ff),
+#  Cisco dotted (aabb.ccdd.eeff) or bare (aabbccddeeff), as MACAddress
+#  parses them. The dash, dotted and bare forms are also matched within
+#  plain words, so they are guarded by word boundaries: no word character,
+#  separator or following ".x" may touch them (e.g. "id-aabbccddeeff" and
+#  "0xaabbccddeeff" are not MACs, while a sentence may end with one). Any
+#  12-digit number is a valid bare MAC and is reported as one.
+_HEX = "[0-9A-Fa-f]"
+_BEFORE_WORD = "(?<![0-9A-Za-z_.:-])"
+_AFTER_WORD = "(?![0-9A-Za-z_:-]|\\.[0-9A-Za-z_])"
+_PATTERN = re.compile(
+    "(?P<" + IPV6 + ">(?<![0-9A-Fa-f:])" + _HEX + "{1,4}(?::" + _HEX +
+    "{1,4}){7}(?![0-9A-Fa-f:]))|" +
+    "(?P<" + MAC + ">(?<![0-9A-Fa-f:])" + _HEX + "{1,2}(?::" + _HEX +
+    "{1,2}){5}(?![0-9A-Fa-f:])|" +
+    _BEFORE_WORD + "(?:" + _HEX + "{1,2}(?:-" + _HEX + "{1,2}){5}|" +
+    _HEX + "{4}\\." + _HEX + "{4}\\." + _HEX + "{4}|" +
+    _HEX + "{12})" + _AFTER_WORD + ")|" +
+    "(?P<" + IPV4 + ">(?<![0-9.])[0-9]{1,3}(?:\\.[0-9]{1,3}){3}(?![0-9]|\\.[0-9]))" )
+
+# Every candidate is a run of these characters, and runs are found much
+#  faster than the full pattern; the full pattern only runs inside them
+_RUN = re.compile( "[0-9A-Fa-f:.-]{7,}" )
+
+# Longest possible candidate (fully extended IPv6) plus one character of
+#  lookahead; chunked scanning holds back this many bytes at each boundary
+_MARGIN = 40
+
+# Default number of bytes read per chunk by scanStream()
+CHUNK_SIZE = 1 << 20
+
+# Maximum number of validated candidates cached by one scan; the cache is
+#  cleared when full so memory stays bounded on inputs with many distinct
+#  addresses
+CACHE_SIZE = 1 << 16
+
+# Validates candidates with the address class parsers. Results are cached
+#  by candidate string since logs repeat the same addresses many times.
+class _Validator(object):
+
+    def __init__(self, families):
+        self._classes = dict( ( family, getAddressClass( family ) )
+            for family in families )
+        self._cache = {}
+
+    # Returns the integer value of "candidate", or None if it is not a
+    #  valid address of "family" (or "family" was not requested)
+    def getValue(self, family, candidate):
+        try:
+            return self._cache[ candidate ]
+        except KeyError:
+            pass
+
+        value = None
+        addressClass = self._classes.get( family )
+        if( addressClass is not None ):
+            try:
+                value = addressClass( candidate ).toInteger()
+            except ( AttributeError, ValueError ):
+                value = None
+
+        if( len( self._cache ) >= CACHE_SIZE ):
+            self._cache.clear()
+        self._cache[ candidate ] = value
+        return value
+
+    # Returns the result tuple for a validated candidate
+    def buildResult(self, offset, family, value, asIntegers):
+        if( asIntegers ):
+            return ( offset, family, value )
+        return ( offset, self._classes[ family ].fromInteger( value ) )
+
+# Yields the pattern matches in "text" starting at "start". Candidates only
+#  hold run characters, so matching inside the runs finds exactly what
+#  matching the whole text would. Lookbehinds see the text before a run;
+#  the character after it is included so that lookaheads see it too.
+def _findCandidates( text, start = 0 ):
+    for run in _RUN.finditer( text, start ):
+        for match in _PATTERN.finditer( text, run.start(), run.end() + 1 ):
+            yield match
+
+# Yields the valid addresses found in the string or buffer "text", where
+#  "baseOffset" is the offset of "text" within the overall input. See
+#  scanFile() for the meaning of "families" and "asIntegers".
+def scanText( text, families = ( IPV4, IPV6, MAC ), asIntegers = False,
+baseOffset = 0 ):
+    validator = _Validator( families )
+    for match in _findCandidates( text ):
+        family = match.lastgroup
+        value = validator.getValue( family, match.group( family ) )
+        if( value is not None ):
+            yield validator.buildResult( baseOffset + match.start(), family,
+                value, asIntegers )
+
+# Yields the valid addresses in the file at "path", which is memory-mapped
+#  so that the pattern runs over the file contents without copying them.
+#  Only the families listed in "families" are returned. Results are
+#  ( offset, address ) tuples, or ( offset, family, value ) tuples holding
+#  the integer value when "asIntegers" is true (no objects are built).
+def scanFile( path, families = ( IPV4, IPV6, MAC ), asIntegers = False ):
+    with open( path, "rb" ) as inputFile:
+
+        # Empty files cannot be memory-mapped; there is nothing to find
+        if( os.fstat( inputFile.fileno() ).st_size == 0 ):
+            return
+
+        text = mmap.mmap( inputFile.fileno(), 0, access = mmap.ACCESS_READ )
+        try:
+            for result in scanText( text, families, asIntegers ):
+                yield result
+        finally:
+            text.close()
+
+# Yields the valid addresses read from the file object "stream" (e.g. a pipe
+#  or standard input) in chunks of "chunkSize" bytes. Candidates that may
+#  continue into the next chunk are held back and scanned again with it.
+def scanStream( stream, families = ( IPV4, IPV6, MAC ), asIntegers = False,
+chunkSize = CHUNK_SIZE ):
+    validator = _Validator( families )
+    buffer = ""
+    bufferOffset = 0
+    scanFrom = 0
+
+    while( True ):
+        chunk = stream.read( chunkSize )
+        isEnd = ( len( chunk ) == 0 )
+        buffer += chunk
+
+        # Matches ending inside the margin might still grow; stop there
+        limit = len( buffer ) if isEnd else len( buffer ) - _MARGIN
+        nextFrom = max( scanFrom, limit )
+        for match in _findCandidates( buffer, scanFrom ):
+            if( match.end() > limit ):
+                nextFrom = match.start()
+                break
+
+            family = match.lastgroup
+            value = validator.getValue( family, match.group( family ) )
+            if( value is not None ):
+                yield validator.buildResult( bufferOffset + match.start(),
+                    family, value, asIntegers )
+
+        if( isEnd ):
+            return
+
+        # Keep one character before the next scan position for lookbehinds
+        keepFrom = max( 0, nextFrom - 1 )
+        buffer = buffer[ keepFrom: ]
+        bufferOffset += keepFrom
+        scanFrom = nextFrom - keepFrom
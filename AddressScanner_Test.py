@@ -0,0 +1,123 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: AddressScanner_Test.py
+# Author: Nicholas Russo
+# Description: This file includes a class that represents a test case for the
+#  AddressScanner functions. Candidate detection, validation of noise, byte
+#  offsets, and agreement between the memory-mapped and chunked scanners
+#  are tested here.
+###############################################################################
+
+from NetAddressFactory import IPV4, IPV6, MAC
+import AddressScanner
+import StringIO
+import os
+import random
+import tempfile
+import unittest
+
+# Defines an address scanner test case
+class AddressScanner_Test( unittest.TestCase ):
+
+    # Builds a test suite from all of the methods defined in this class
+    @staticmethod
+    def buildTestSuite():
+        return unittest.TestLoader().loadTestsFromTestCase( 
+            AddressScanner_Test )
+
+    # Builds a log excerpt holding valid addresses and near-miss noise
+    def setUp(self):
+        self._text = ( "Jan 1 12:30:45 host1 sshd: accept 10.1.2.3 port 22\n"
+            "bad ip 999.1.1.1 version 1.2.3.4.5 time 12:30:45\n"
+            "nd fe80:0000:0000:0000:021a:2bff:fe3c:4d5e lladdr 00:1a:2b:3c:4d:5e\n"
+            "short fe80::1 long 00:1a:2b:3c:4d:5e:6f mask 255.255.255.0" )
+
+    def tearDown(self):
+        self._text = None
+
+    # Tests which candidates are returned, and their offsets
+    def test_scanText(self):
+        results = list( AddressScanner.scanText( self._text ) )
+        strings = [ address.toString() for offset, address in results ]
+        self.assertTrue( strings == [ "10.1.2.3",
+            "fe80:0000:0000:0000:021a:2bff:fe3c:4d5e", "00:1a:2b:3c:4d:5e",
+            "255.255.255.0" ] )
+
+        for offset, address in results:
+            self.assertTrue( self._text[ offset: ].lower().startswith( 
+                address.toString() ) )
+
+    # Dash, Cisco dotted and bare MACs are found only as whole words; a
+    #  sentence may end with one
+    def test_macFormats(self):
+        text = ( "a 00-1A-2B-3C-4D-5E b 001a.2b3c.4d5e c 001A2B3C4D5E d "
+            "0-1a-2b-3c-4d-5e.\n"
+            "miss 00-1a-2b-3c-4d-5e-6f 1001a.2b3c.4d5e 001a.2b3c.4d5e.1 "
+            "001a2b3c4d5e7 0x001a2b3c4d5e id-001a2b3c4d5e 001a2b3c4d5eg "
+            "host_001a.2b3c.4d5e 001a2b3c4d5e_x 00-1a-2b-3c-4d-5g" )
+        results = list( AddressScanner.scanText( text, asIntegers = True ) )
+        self.assertTrue( [ value for offset, family, value in results ] ==
+            [ 0x001a2b3c4d5e ] * 4 )
+        self.assertTrue( [ offset for offset, family, value in results ] ==
+            [ text.index( candidate ) for candidate in ( "00-1A", "001a.",
+            "001A2B", "0-1a" ) ] )
+        self.assertTrue( [ family for offset, family, value in results ] ==
+            [ MAC ] * 4 )
+
+    # Tests the family filter and integer results
+    def test_asIntegers(self):
+        results = list( AddressScanner.scanText( self._text, ( MAC, ), True ) )
+        self.assertTrue( len( results ) == 1 )
+        self.assertTrue( results[0][1] == MAC )
+        self.assertTrue( results[0][2] == 0x001a2b3c4d5e )
+
+    # The memory-mapped and chunked scanners must return the same results as
+    #  scanning the whole text, regardless of where chunk boundaries fall
+    def test_scanFileAndStream(self):
+        generator = random.Random( 30 )
+        pieces = [ self._text ] + [ generator.choice( ( "1.2.3.", "4", " ",
+            "\n", ":", "ab", "10.0.0.1", "00:11:22:33:44:55", "0000",
+            "2001:0db8:0000:0000:0000:0000:0000:0001", "-", ".", "x", "_",
+            "00-11-22-33-44-55", "0011.2233.4455", "001122334455" ) )
+            for i in range( 0, 5000 ) ]
+        text = "".join( pieces )
+        expected = list( AddressScanner.scanText( text, asIntegers = True ) )
+        self.assertTrue( len( expected ) > 100 )
+
+        # Matching only inside the runs finds the same candidates as
+        #  matching the whole text
+        self.assertTrue( [ match.span() for match in
+            AddressScanner._findCandidates( text ) ] == [ match.span()
+            for match in AddressScanner._PATTERN.finditer( text ) ] )
+
+        for chunkSize in ( 1, 7, 41, 100, 4096 ):
+            self.assertTrue( list( AddressScanner.scanStream( 
+                StringIO.StringIO( text ), asIntegers = True,
+                chunkSize = chunkSize ) ) == expected )
+
+        handle, path = tempfile.mkstemp()
+        os.write( handle, text )
+        os.close( handle )
+        try:
+            self.assertTrue( list( AddressScanner.scanFile( path,
+                asIntegers = True ) ) == expected )
+        finally:
+            os.remove( path )
+
+    # The validation cache must stay bounded without changing the results
+    def test_cacheSize(self):
+        text = " ".join( "10.0.%d.%d" % ( i / 256, i % 256 )
+            for i in range( 0, 1000 ) )
+        expected = list( AddressScanner.scanText( text, asIntegers = True ) )
+        cacheSize = AddressScanner.CACHE_SIZE
+        AddressScanner.CACHE_SIZE = 100
+        try:
+            validator = AddressScanner._Validator( ( IPV4, ) )
+            for i in range( 0, 1000 ):
+                validator.getValue( IPV4, "10.0.0.%d" % i )
+                self.assertTrue( len( validator._cache ) <= 100 )
+            self.assertTrue( list( AddressScanner.scanText( text,
+                asIntegers = True ) ) == expected )
+        finally:
+            AddressScanner.CACHE_SIZE = cacheSize
@@ -0,0 +1,248 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: BindingTable.py
+# Author: Nicholas Russo
+# Description: This file includes a class that models an ARP/ND cache: a
+#  table of bindings between IP addresses (IPv4 or IPv6) and MAC addresses
+#  that can be searched in both directions and whose entries age out. Keys
+#  are the integer values of the addresses (see NetAddress.toInteger) rather
+#  than objects or strings. Expiry times are kept in a timer wheel of time
+#  slots, so aging only visits the slots that have come due instead of
+#  scanning the whole table.
+###############################################################################
+
+from NetAddressFactory import IPV4, IPV6, MAC, getAddressClass
+import time
+
+# IPv6 keys carry this extra bit so they never collide with IPv4 keys; one
+#  integer per IP is much smaller than a ( width, value ) tuple
+_IPV6_TAG = 1 << 128
+
+# Defines a bidirectional IP/MAC binding table with aging
+class BindingTable(object):
+
+    # Builds an empty table where bindings expire "timeout" seconds after
+    #  they were last updated. Expiry is tracked in slots of "resolution"
+    #  seconds; entries are found no later than one slot after expiring.
+    def __init__(self, timeout, resolution = 1.0):
+        if ( timeout <= 0 ):
+            raise ValueError( "timeout is not positive: " + str( timeout ) )
+        if ( resolution <= 0 ):
+            raise ValueError( "resolution is not positive: " +
+                str( resolution ) )
+
+        self._timeout = timeout
+        self._resolution = float( resolution )
+
+        # IP key -> MAC value and IP key -> expiry time
+        self._ipToMac = {}
+        self._expiry = {}
+
+        # MAC value -> IP key, or a list of IP keys for a MAC with several
+        #  IPs (most hosts have one IP per family, so lists are the exception)
+        self._macToIps = {}
+
+        # Timer wheel: slot number -> list of IP keys. Keys are not removed
+        #  from their old slot when refreshed; a slot entry is only acted on
+        #  if it still matches the binding's current expiry.
+        self._slots = {}
+        self._nextSlot = None
+
+    # Returns the IP key for the "numBits" wide integer "ipValue"
+    @staticmethod
+    def _toKey(ipValue, numBits):
+        if ( numBits == 32 ):
+            return ipValue
+        elif ( numBits == 128 ):
+            return ipValue | _IPV6_TAG
+        raise ValueError( "numBits is not 32 or 128: " + str( numBits ) )
+
+    # Returns the ( width, IP value ) for the IP key "ipKey"
+    @staticmethod
+    def _fromKey(ipKey):
+        if ( ipKey & _IPV6_TAG ):
+            return ( 128, ipKey ^ _IPV6_TAG )
+        return ( 32, ipKey )
+
+    # Returns the IP key for an IPv4Address or IPv6Address object
+    def _toObjectKey(self, ip):
+        return self._toKey( ip.toInteger(), ip.__class__._maxAddrLen )
+
+    # Returns the timer wheel slot for the time "when"
+    def _getSlot(self, when):
+        return int( when // self._resolution )
+
+    # Adds or refreshes the binding of "ipKey" to the integer "macValue" at
+    #  time "now"
+    def _update(self, ipKey, macValue, now):
+        oldMac = self._ipToMac.get( ipKey )
+        if ( oldMac != macValue ):
+            if ( oldMac is not None ):
+                self._unlinkMac( oldMac, ipKey )
+            self._ipToMac[ ipKey ] = macValue
+            self._linkMac( macValue, ipKey )
+
+        # Refreshes within the same slot do not need another reference
+        expiry = now + self._timeout
+        oldExpiry = self._expiry.get( ipKey )
+        self._expiry[ ipKey ] = expiry
+        slot = self._getSlot( expiry )
+        if ( oldExpiry is not None and self._getSlot( oldExpiry ) == slot ):
+            return
+        self._slots.setdefault( slot, [] ).append( ipKey )
+        if ( self._nextSlot is None or slot < self._nextSlot ):
+            self._nextSlot = slot
+
+    # Adds "ipKey" to the IPs bound to "macValue"
+    def _linkMac(self, macValue, ipKey):
+        ips = self._macToIps.get( macValue )
+        if ( ips is None ):
+            self._macToIps[ macValue ] = ipKey
+        elif ( isinstance( ips, list ) ):
+            ips.append( ipKey )
+        else:
+            self._macToIps[ macValue ] = [ ips, ipKey ]
+
+    # Removes "ipKey" from the IPs bound to "macValue"
+    def _unlinkMac(self, macValue, ipKey):
+        ips = self._macToIps[ macValue ]
+        if ( not isinstance( ips, list ) ):
+            del self._macToIps[ macValue ]
+            return
+        ips.remove( ipKey )
+        if ( len( ips ) == 1 ):
+            self._macToIps[ macValue ] = ips[0]
+
+    # Adds or refreshes the binding between the IPv4Address/IPv6Address
+    #  "ip" and the MACAddress "mac". The time "now" defaults to the clock.
+    def update(self, ip, mac, now = None):
+        if ( now is None ):
+            now = time.time()
+        self._update( self._toObjectKey( ip ), mac.toInteger(), now )
+
+    # Adds or refreshes many bindings at once from parallel sequences of
+    #  integer values (e.g. arrays); "numBits" is 32 for IPv4, 128 for IPv6
+    def updateAll(self, ipValues, macValues, now = None, numBits = 32):
+        tag = self._toKey( 0, numBits )
+        if ( len( ipValues ) != len( macValues ) ):
+            raise ValueError( "ipValues and macValues differ in length" )
+        if ( now is None ):
+            now = time.time()
+
+        update = self._update
+        for ipValue, macValue in zip( ipValues, macValues ):
+            update( ipValue | tag, macValue, now )
+
+    # Returns the integer MAC value bound to the "numBits" wide "ipValue",
+    #  or None if there is no binding
+    def getMacValue(self, ipValue, numBits = 32):
+        return self._ipToMac.get( self._toKey( ipValue, numBits ) )
+
+    # Returns the MACAddress bound to "ip", or None if there is no binding
+    def getMac(self, ip):
+        macValue = self._ipToMac.get( self._toObjectKey( ip ) )
+        if ( macValue is None ):
+            return None
+        return getAddressClass( MAC ).fromInteger( macValue )
+
+    # Returns the list of ( width, IP value ) bound to the integer "macValue"
+    def getIpValues(self, macValue):
+        ips = self._macToIps.get( macValue )
+        if ( ips is None ):
+            return []
+        elif ( not isinstance( ips, list ) ):
+            ips = [ ips ]
+        return [ self._fromKey( ipKey ) for ipKey in ips ]
+
+    # Returns the list of IPv4Address/IPv6Address objects bound to "mac"
+    def getIps(self, mac):
+        classes = { 32: getAddressClass( IPV4 ), 128: getAddressClass( IPV6 ) }
+        return [ classes[ numBits ].fromInteger( ipValue )
+            for numBits, ipValue in self.getIpValues( mac.toInteger() ) ]
+
+    # Removes the binding of "ip", if any. Returns true if one was removed.
+    def remove(self, ip):
+        return self._remove( self._toObjectKey( ip ) )
+
+    # Removes the binding of "ipKey"; the stale timer wheel references are
+    #  dropped lazily when their slot comes due
+    def _remove(self, ipKey):
+        macValue = self._ipToMac.pop( ipKey, None )
+        if ( macValue is None ):
+            return False
+        del self._expiry[ ipKey ]
+        self._unlinkMac( macValue, ipKey )
+        return True
+
+    # Returns the sorted list of timer wheel slots that are due at "nowSlot".
+    #  The wheel is walked from the earliest slot in use unless that would
+    #  visit more slot numbers than there are slots.
+    def _getDueSlots(self, nowSlot):
+        if ( self._nextSlot is None or self._nextSlot > nowSlot ):
+            return []
+        if ( nowSlot - self._nextSlot < len( self._slots ) ):
+            return [ slot for slot in xrange( self._nextSlot, nowSlot + 1 )
+                if slot in self._slots ]
+        return sorted( slot for slot in self._slots if slot <= nowSlot )
+
+    # Yields ( IP key, expiry ) for every binding that has expired at time
+    #  "now". Only the due slots of the timer wheel are visited.
+    def _iterStaleKeys(self, now):
+        for slot in self._getDueSlots( self._getSlot( now ) ):
+            seen = set()
+            for ipKey in self._slots[ slot ]:
+                expiry = self._expiry.get( ipKey )
+
+                # Skip references left behind by refreshes and removals, and
+                #  the duplicate left when a binding is removed and re-added
+                if ( expiry is None or self._getSlot( expiry ) != slot or
+                expiry > now or ipKey in seen ):
+                    continue
+                seen.add( ipKey )
+                yield ( ipKey, expiry )
+
+    # Yields ( width, IP value, MAC value, expiry ) for every binding that
+    #  has expired at time "now", without removing anything
+    def iterStale(self, now = None):
+        if ( now is None ):
+            now = time.time()
+        for ipKey, expiry in self._iterStaleKeys( now ):
+            yield self._fromKey( ipKey ) + ( self._ipToMac[ ipKey ], expiry )
+
+    # Removes every binding that has expired at time "now" and returns the
+    #  list of ( width, IP value, MAC value ) that were removed. The cost is
+    #  proportional to the number of due slot entries, not the table size.
+    def expire(self, now = None):
+        if ( now is None ):
+            now = time.time()
+
+        expired = []
+        for ipKey, expiry in list( self._iterStaleKeys( now ) ):
+            expired.append( self._fromKey( ipKey ) +
+                ( self._ipToMac[ ipKey ], ) )
+            self._remove( ipKey )
+
+        # Drop the due slots, keeping any entry that expires later in the
+        #  current slot (only possible for the slot containing "now")
+        nowSlot = self._getSlot( now )
+        for slot in self._getDueSlots( nowSlot - 1 ):
+            del self._slots[ slot ]
+        if ( nowSlot in self._slots ):
+            pending = [ ipKey for ipKey in self._slots[ nowSlot ]
+                if self._expiry.get( ipKey, -1 ) > now ]
+            if ( len( pending ) > 0 ):
+                self._slots[ nowSlot ] = pending
+            else:
+                del self._slots[ nowSlot ]
+
+        # Every remaining slot is at or after the current one
+        if ( len( self._slots ) > 0 and self._nextSlot is not None ):
+            self._nextSlot = max( self._nextSlot, nowSlot )
+        else:
+            self._nextSlot = None
+        return expired
+
+    # Implements the len() function by returning the number of bindings
+    def __len__(self):
+        return len( self._ipToMac )
@@ -0,0 +1,114 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: BindingTable_Test.py
+# Author: Nicholas Russo
+# Description: This file includes a class that represents a test case for the
+#  BindingTable class. Lookups in both directions, rebinding, batch updates
+#  and aging through the timer wheel are tested here.
+###############################################################################
+
+from BindingTable import BindingTable
+from IPv4Address import IPv4Address
+from IPv6Address import IPv6Address
+from MACAddress import MACAddress
+import random
+import unittest
+
+# Defines a binding table test case
+class BindingTable_Test( unittest.TestCase ):
+
+    # Builds a test suite from all of the methods defined in this class
+    @staticmethod
+    def buildTestSuite():
+        return unittest.TestLoader().loadTestsFromTestCase( BindingTable_Test )
+
+    # Builds a table with a 60 second timeout holding one dual-stack host
+    def setUp(self):
+        self._table = BindingTable( 60 )
+        self._mac = MACAddress( "00:1a:2b:3c:4d:5e" )
+        self._ipv4 = IPv4Address( "10.1.2.3" )
+        self._ipv6 = IPv6Address( "fe80:0000:0000:0000:021a:2bff:fe3c:4d5e" )
+        self._table.update( self._ipv4, self._mac, 0 )
+        self._table.update( self._ipv6, self._mac, 10 )
+
+    def tearDown(self):
+        self._table = None
+
+    # Ensures invalid parameters raise errors
+    def test_invalidInstances(self):
+        self.assertRaises( ValueError, BindingTable, 0 )
+        self.assertRaises( ValueError, BindingTable, 10, 0 )
+        self.assertRaises( ValueError, self._table.updateAll, [ 1 ], [ 1 ], 0, 64 )
+        self.assertRaises( ValueError, self._table.updateAll, [ 1 ], [], 0 )
+
+    # Both directions must be searchable, and rebinding an IP moves it
+    def test_lookups(self):
+        self.assertTrue( self._table.getMac( self._ipv4 ) == self._mac )
+        self.assertTrue( self._table.getMac( self._ipv6 ) == self._mac )
+        self.assertTrue( set( self._table.getIps( self._mac ) ) ==
+            set( [ self._ipv4, self._ipv6 ] ) )
+        self.assertTrue( len( self._table ) == 2 )
+
+        otherMac = MACAddress( "02:00:00:00:00:01" )
+        self._table.update( self._ipv4, otherMac, 20 )
+        self.assertTrue( self._table.getIps( self._mac ) == [ self._ipv6 ] )
+        self.assertTrue( self._table.getIps( otherMac ) == [ self._ipv4 ] )
+
+        self.assertTrue( self._table.remove( self._ipv6 ) )
+        self.assertFalse( self._table.remove( self._ipv6 ) )
+        self.assertTrue( self._table.getMac( self._ipv6 ) is None )
+        self.assertTrue( self._table.getIps( self._mac ) == [] )
+
+    # Entries expire "timeout" seconds after their last update only
+    def test_expire(self):
+        self._table.update( self._ipv4, self._mac, 30 )
+        self.assertTrue( list( self._table.iterStale( 69 ) ) == [] )
+        self.assertTrue( self._table.expire( 70 ) == [ ( 128,
+            self._ipv6.toInteger(), self._mac.toInteger() ) ] )
+        self.assertTrue( self._table.getMac( self._ipv4 ) == self._mac )
+        self.assertTrue( len( self._table ) == 1 )
+
+        self.assertTrue( len( list( self._table.iterStale( 100 ) ) ) == 1 )
+        self.assertTrue( len( self._table.expire( 1000 ) ) == 1 )
+        self.assertTrue( len( self._table ) == 0 )
+        self.assertTrue( self._table.expire( 2000 ) == [] )
+
+    # A binding expiring later in the slot holding "now" is kept for the
+    #  next call to expire()
+    def test_expireWithinSlot(self):
+        table = BindingTable( 10, 5 )
+        table.updateAll( [ 1 ], [ 7 ], 0 )
+        table.updateAll( [ 2 ], [ 8 ], 1 )
+        self.assertTrue( table.expire( 10.5 ) == [ ( 32, 1, 7 ) ] )
+        self.assertTrue( table.getMacValue( 2 ) == 8 )
+        self.assertTrue( table.expire( 10.9 ) == [] )
+        self.assertTrue( table.expire( 12 ) == [ ( 32, 2, 8 ) ] )
+        self.assertTrue( len( table ) == 0 )
+        self.assertTrue( table.expire( 100 ) == [] )
+
+    # Random batches of updates and removals must expire exactly the
+    #  bindings a full scan would find
+    def test_updateAll(self):
+        generator = random.Random( 35 )
+        table = BindingTable( 50, 3 )
+        lastSeen = {}
+        for now in range( 0, 500, 5 ):
+            ipValues = [ generator.randint( 0, 300 ) for i in range( 0, 20 ) ]
+            macValues = [ ipValue % 17 for ipValue in ipValues ]
+            table.updateAll( ipValues, macValues, now )
+            for ipValue in ipValues:
+                lastSeen[ ipValue ] = now
+            if ( now % 35 == 0 and len( lastSeen ) > 0 ):
+                ipValue = generator.choice( lastSeen.keys() )
+                table._remove( ipValue )
+                del lastSeen[ ipValue ]
+
+            expected = sorted( ipValue for ipValue, seen in lastSeen.items()
+                if seen + 50 <= now )
+            expired = sorted( ipValue for numBits, ipValue, macValue in
+                table.expire( now ) )
+            self.assertTrue( expired == expected )
+            for ipValue in expected:
+                del lastSeen[ ipValue ]
+            self.assertTrue( len( table ) == len( lastSeen ) )
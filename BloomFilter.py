@@ -0,0 +1,216 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: BloomFilter.py
+# Author: Nicholas Russo
+# Description: This file includes a compact probabilistic membership filter
+#  for large sets of network addresses (e.g. blocklists). Addresses are
+#  stored by their integer values (see NetAddress.toInteger) and widths in a
+#  bit array of a few bits per entry, rather than as objects or strings, so
+#  equal integers of different families (e.g. 10.0.0.1 and ::a00:1) are
+#  distinct entries. Membership
+#  tests never return false negatives; false positives occur at roughly the
+#  configured rate. Filters can be saved to a file and memory-mapped back;
+#  close() (or a with statement) releases the memory map.
+###############################################################################
+
+from IntegerHash import hashInteger, mix64
+from NetAddress import NetAddress
+import math
+import mmap
+import struct
+
+# Defines a Bloom filter over the integer values of network addresses
+class BloomFilter(object):
+
+    # File header: magic, version, number of hashes, number of bits, count
+    _headerFormat = ">4sHHQQ"
+    _headerSize = struct.calcsize( _headerFormat )
+    _magic = "NABF"
+    _version = 1
+
+    # Sizes the bit array and number of hash functions so that "capacity"
+    #  entries can be inserted with a false positive rate of "errorRate".
+    #  Standard sizing: m = -n ln(p) / ln(2)^2 bits and k = (m/n) ln(2) hashes
+    def __init__(self, capacity, errorRate = 0.01):
+        if ( capacity <= 0 ):
+            raise ValueError("capacity is not positive: " + str( capacity ) )
+        if ( errorRate <= 0 or errorRate >= 1 ):
+            raise ValueError("errorRate is out of range: " + str( errorRate ) )
+
+        numBits = int( math.ceil( -capacity * math.log( errorRate ) /
+            ( math.log( 2 ) ** 2 ) ) )
+        numHashes = int( round( float( numBits ) / capacity * math.log( 2 ) ) )
+
+        # Round the bit count up to a whole number of bytes
+        numBits = ( ( numBits + 7 ) / 8 ) * 8
+        self._setState( bytearray( numBits / 8 ), 0, numBits,
+            max( 1, numHashes ), 0, False )
+
+    # Stores the filter state; shared by the constructor and load()
+    def _setState(self, bits, offset, numBits, numHashes, count, readOnly):
+        self._bits = bits
+        self._offset = offset
+        self._numBits = numBits
+        self._numHashes = numHashes
+        self._count = count
+        self._readOnly = readOnly
+
+    # Converts an address object, or an integer of the "addrBits" wide
+    #  family, into the ( value, width ) used as the key
+    @staticmethod
+    def _toKey(item, addrBits):
+        if ( isinstance( item, NetAddress ) ):
+            return ( item.toInteger(), item.__class__._maxAddrLen )
+        return ( item, addrBits )
+
+    # Returns the list of bit indices for the "addrBits" wide integer "value".
+    #  The width is mixed into the first hash so equal values of different
+    #  families set different bits. Two hashes are combined to derive all k
+    #  indices (Kirsch-Mitzenmacher double hashing).
+    def _getIndices(self, value, addrBits):
+        firstHash = mix64( hashInteger( value ) ^ addrBits )
+        secondHash = mix64( firstHash ) | 1
+        numBits = self._numBits
+        return [ ( firstHash + i * secondHash ) % numBits
+            for i in range( 0, self._numHashes ) ]
+
+    # Raises an error if the filter is backed by a read-only memory map
+    def _testWritable(self):
+        if ( self._readOnly ):
+            raise ValueError( "filter is memory-mapped read-only" )
+
+    # Inserts a single address object or integer value into the filter; an
+    #  integer is taken to be of the "addrBits" wide family (128 for IPv6)
+    def add(self, item, addrBits = 32):
+        self._testWritable()
+        bits = self._bits
+        for index in self._getIndices( *self._toKey( item, addrBits ) ):
+            bits[ index >> 3 ] |= 1 << ( index & 7 )
+        self._count += 1
+
+    # Inserts every integer in the sequence "values" (e.g. an array.array);
+    #  "addrBits" is 32 for IPv4, 128 for IPv6 and 48 for MAC values
+    def addAll(self, values, addrBits = 32):
+        self._testWritable()
+        bits = self._bits
+        getIndices = self._getIndices
+        for value in values:
+            for index in getIndices( value, addrBits ):
+                bits[ index >> 3 ] |= 1 << ( index & 7 )
+            self._count += 1
+
+    # Returns true if the "addrBits" wide "value" may be in the filter, false
+    #  if it is not
+    def _containsValue(self, value, addrBits):
+        bits = self._bits
+        offset = self._offset
+
+        # Memory maps return single character strings rather than integers
+        if ( self._readOnly ):
+            for index in self._getIndices( value, addrBits ):
+                if ( not ord( bits[ offset + ( index >> 3 ) ] ) &
+                ( 1 << ( index & 7 ) ) ):
+                    return False
+            return True
+
+        for index in self._getIndices( value, addrBits ):
+            if ( not bits[ index >> 3 ] & ( 1 << ( index & 7 ) ) ):
+                return False
+        return True
+
+    # Returns true if the address object or the integer of the "addrBits"
+    #  wide family may be in the filter
+    def contains(self, item, addrBits = 32):
+        return self._containsValue( *self._toKey( item, addrBits ) )
+
+    # Tests every "addrBits" wide integer in the sequence "values". Returns a
+    #  bytearray of the same length holding 1 where the value may be present
+    #  and 0 otherwise.
+    def containsAll(self, values, addrBits = 32):
+        containsValue = self._containsValue
+        return bytearray( 1 if containsValue( value, addrBits ) else 0
+            for value in values )
+
+    # Implements the "in" operator (e.g. address in blocklist). The operator
+    #  has no way to pass a width, so a bare integer is always taken to be an
+    #  IPv4 value; an IPv6 or MAC integer would silently be looked up as a
+    #  different key. Integers wider than 32 bits therefore raise an error;
+    #  use contains( value, addrBits ) or an address object for them.
+    def __contains__(self, item):
+        if ( not isinstance( item, NetAddress ) and
+        ( item < 0 or item >> 32 != 0 ) ):
+            raise ValueError( "integer is not an IPv4 value; use contains() " +
+                "with its width: " + str( item ) )
+        return self.contains( item )
+
+    # Implements the len() function by returning the number of insertions
+    def __len__(self):
+        return self._count
+
+    # Returns the size of the bit array in bits
+    def getNumBits(self):
+        return self._numBits
+
+    # Returns the number of hash functions (bits set per entry)
+    def getNumHashes(self):
+        return self._numHashes
+
+    # Returns the expected false positive rate given the current count
+    def getEstimatedErrorRate(self):
+        return ( 1 - math.exp( -float( self._numHashes ) * self._count /
+            self._numBits ) ) ** self._numHashes
+
+    # Writes the filter to the file "path": a fixed-size header followed
+    #  by the raw bit array, which load() can memory-map directly
+    def save(self, path):
+        with open( path, "wb" ) as outputFile:
+            outputFile.write( struct.pack( self._headerFormat, self._magic,
+                self._version, self._numHashes, self._numBits, self._count ) )
+            outputFile.write( self._bits[ self._offset:
+                self._offset + self._numBits / 8 ] )
+
+    # Reads a filter written by save(). When "useMmap" is true, the bit array
+    #  is memory-mapped read-only so it is paged in on demand and shared by
+    #  every process that maps the same file; otherwise it is read into memory.
+    @staticmethod
+    def load(path, useMmap = True):
+        with open( path, "rb" ) as inputFile:
+            header = inputFile.read( BloomFilter._headerSize )
+            if ( len( header ) != BloomFilter._headerSize ):
+                raise ValueError( "file is too short: " + path )
+
+            magic, version, numHashes, numBits, count = struct.unpack(
+                BloomFilter._headerFormat, header )
+            if ( magic != BloomFilter._magic or
+            version != BloomFilter._version ):
+                raise ValueError( "not a bloom filter file: " + path )
+
+            if ( useMmap ):
+                bits = mmap.mmap( inputFile.fileno(), 0,
+                    access = mmap.ACCESS_READ )
+                offset = BloomFilter._headerSize
+            else:
+                bits = bytearray( inputFile.read() )
+                offset = 0
+
+        if ( len( bits ) - offset != numBits / 8 ):
+            raise ValueError( "bit array size mismatch: " + path )
+
+        # Bypass the constructor since the sizing is read from the file
+        bloomFilter = BloomFilter.__new__( BloomFilter )
+        bloomFilter._setState( bits, offset, numBits, numHashes, count,
+            useMmap )
+        return bloomFilter
+
+    # Closes the memory map of a filter from load( path, True ); lookups fail
+    #  afterwards. Does nothing for filters held in memory.
+    def close(self):
+        if ( self._readOnly ):
+            self._bits.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
@@ -0,0 +1,114 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: BloomFilter_Test.py
+# Author: Nicholas Russo
+# Description: This file includes a class that represents a test case for the
+#  BloomFilter class. Insertion, lookups, the false positive rate and the
+#  save/load (memory-mapped) round trip are tested here.
+###############################################################################
+
+from BloomFilter import BloomFilter
+from IPv4Address import IPv4Address
+from IPv6Address import IPv6Address
+from MACAddress import MACAddress
+import array
+import os
+import tempfile
+import unittest
+
+# Defines a Bloom filter test case
+class BloomFilter_Test( unittest.TestCase ):
+
+    # Builds a test suite from all of the methods defined in this class
+    @staticmethod
+    def buildTestSuite():
+        return unittest.TestLoader().loadTestsFromTestCase( BloomFilter_Test )
+
+    # Builds a filter holding the even integers in [0, 20000) before each test
+    def setUp(self):
+        self._bloomFilter = BloomFilter( 10000, 0.01 )
+        self._bloomFilter.addAll( array.array( "L", range( 0, 20000, 2 ) ) )
+
+    def tearDown(self):
+        self._bloomFilter = None
+
+    # Ensures invalid sizing parameters raise errors
+    def test_invalidInstances(self):
+        for capacity, errorRate in ( ( 0, 0.01 ), ( -1, 0.01 ),
+        ( 10, 0 ), ( 10, 1 ), ( 10, 1.5 ) ):
+            self.assertRaises( ValueError, BloomFilter, capacity, errorRate )
+
+    # Every inserted value must be found (no false negatives)
+    def test_noFalseNegatives(self):
+        flags = self._bloomFilter.containsAll( range( 0, 20000, 2 ) )
+        self.assertTrue( len( flags ) == 10000 )
+        self.assertTrue( all( flags ) )
+        self.assertTrue( len( self._bloomFilter ) == 10000 )
+
+    # The false positive rate over values never inserted should be close to
+    #  the configured rate (allow twice the rate to avoid a flaky test)
+    def test_falsePositiveRate(self):
+        flags = self._bloomFilter.containsAll( range( 1, 200000, 2 ) )
+        measuredRate = float( sum( flags ) ) / len( flags )
+        self.assertTrue( measuredRate < 0.02 )
+        self.assertTrue( self._bloomFilter.getEstimatedErrorRate() < 0.02 )
+
+    # Address objects and "in" are supported for all families
+    def test_addressObjects(self):
+        bloomFilter = BloomFilter( 100 )
+        ipv4 = IPv4Address( "10.1.2.3" )
+        ipv6 = IPv6Address( "2001:0db8:0000:0000:0000:0000:0000:0001" )
+        bloomFilter.add( ipv4 )
+        bloomFilter.add( ipv6 )
+        self.assertTrue( ipv4 in bloomFilter )
+        self.assertTrue( ipv4.toInteger() in bloomFilter )
+        self.assertTrue( bloomFilter.contains( ipv6.toInteger(), 128 ) )
+        self.assertTrue( bloomFilter.contains( IPv4Address( "10.1.2.3" ) ) )
+        # "in" cannot take a width, so integers wider than IPv4 are rejected
+        for value in ( ipv6.toInteger(), 1 << 32, -1 ):
+            self.assertRaises( ValueError, bloomFilter.__contains__, value )
+
+    # Equal integers of different families are distinct entries
+    def test_families(self):
+        addresses = [ IPv4Address( "10.0.0.1" ),
+            IPv6Address( "0000:0000:0000:0000:0000:0000:0a00:0001" ),
+            MACAddress( "00:00:0a:00:00:01" ) ]
+        for address in addresses:
+            bloomFilter = BloomFilter( 1000, 0.0001 )
+            bloomFilter.add( address )
+            self.assertTrue( bloomFilter.contains( address.toInteger(),
+                address.__class__._maxAddrLen ) )
+            for other in addresses:
+                self.assertTrue( ( other in bloomFilter ) == ( other is address ) )
+
+        bloomFilter = BloomFilter( 1000, 0.0001 )
+        bloomFilter.addAll( range( 0, 500 ), 128 )
+        self.assertTrue( all( bloomFilter.containsAll( range( 0, 500 ), 128 ) ) )
+        self.assertTrue( sum( bloomFilter.containsAll( range( 0, 500 ) ) ) < 5 )
+
+    # A saved filter must answer identically when read back into memory and
+    #  when memory-mapped; a mapped filter is read-only and unusable once closed
+    def test_saveLoad(self):
+        handle, path = tempfile.mkstemp()
+        os.close( handle )
+        try:
+            self._bloomFilter.save( path )
+            queries = range( 0, 40000 )
+            expected = self._bloomFilter.containsAll( queries )
+            for useMmap in ( False, True ):
+                with BloomFilter.load( path, useMmap ) as loaded:
+                    self.assertTrue( loaded.containsAll( queries ) == expected )
+                    self.assertTrue( len( loaded ) == len( self._bloomFilter ) )
+                    self.assertTrue( loaded.getNumBits() ==
+                        self._bloomFilter.getNumBits() )
+                # Closing releases the memory map; in-memory filters still work
+                if ( useMmap ):
+                    self.assertRaises( ValueError, loaded.contains, 1 )
+                else:
+                    self.assertTrue( loaded.containsAll( queries ) == expected )
+            loaded = BloomFilter.load( path, True )
+            self.assertRaises( ValueError, loaded.add, 1 )
+            loaded.close()
+        finally:
+            os.remove( path )
@@ -0,0 +1,277 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: ExternalSort.py
+# Author: Nicholas Russo
+# Description: This file includes a tool that sorts (and by default dedupes)
+#  text files of IPv4, IPv6 or MAC addresses, one per row, that are larger
+#  than memory. The input is cut into chunks at row boundaries; worker
+#  processes each parse a chunk with the address classes, sort its integer
+#  values and write them as a fixed width binary run (an AddressFile). The
+#  runs are then k-way merged, dropping duplicates, into a text file of
+#  canonical address strings or a sorted AddressFile. Only the byte offsets
+#  of the chunks are passed to the workers, never the data.
+###############################################################################
+
+from AddressConverter import getFormatter
+from AddressFile import AddressFileReader, AddressFileWriter, BLOCK_SIZE
+from NetAddressFactory import detectFamily, getAddressClass
+import heapq
+import itertools
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+
+# Output formats
+TEXT = "text"
+BINARY = "binary"
+
+# Default memory budget in bytes, shared by all of the worker processes
+DEFAULT_MEMORY = 256 << 20
+
+# Approximate number of bytes of memory used while sorting per byte of
+#  input text (integer objects and the list holding them)
+_EXPANSION = 4
+
+# Bounds on the number of runs merged at once; each open run holds one
+#  decoded block of values in memory
+_MIN_FAN_IN = 2
+_MAX_FAN_IN = 256
+
+# Usage text printed when the arguments are wrong
+USAGE = """Usage:   ExternalSort <input> <output> [options]
+Options:
+  --family <ipv4|ipv6|mac>    family of the input (default: detected from
+                              the first row)
+  --binary                    write a sorted AddressFile instead of text
+  --keep-duplicates           do not remove duplicate addresses
+  --memory <megabytes>        memory budget (default 256)
+  --temp <directory>          directory for the temporary runs
+  --processes <count>         number of worker processes (default: CPUs)
+Example:
+  python ExternalSort.py addresses.txt sorted.txt --memory 1024"""
+
+# Returns the family of the first non-empty row of the file "path"
+def _detectFileFamily( path ):
+    with open( path, "rb" ) as inputFile:
+        for line in inputFile:
+            if( line.strip() ):
+                return detectFamily( line.strip() )
+    raise ValueError( "input has no addresses: " + path )
+
+# Returns the list of ( start, end ) byte ranges that cut the file "path"
+#  into chunks of about "chunkBytes" bytes, each ending after a newline
+def _findChunks( path, chunkBytes ):
+    size = os.path.getsize( path )
+    chunks = []
+    with open( path, "rb" ) as inputFile:
+        start = 0
+        while( start < size ):
+            inputFile.seek( start + chunkBytes )
+            inputFile.readline()
+            end = min( inputFile.tell(), size )
+            chunks.append( ( start, end ) )
+            start = end
+    return chunks
+
+# Parses the rows in bytes [ start, end ) of "inputPath", sorts their
+#  values and writes them to the run "runPath". Runs in a worker process.
+#  Returns ( runPath, values written, rows read, invalid rows ).
+def _sortChunk( task ):
+    inputPath, start, end, family, unique, runPath = task
+    addressClass = getAddressClass( family )
+
+    values = []
+    numRows = 0
+    numInvalid = 0
+    with open( inputPath, "rb" ) as inputFile:
+        inputFile.seek( start )
+        remaining = end - start
+        for line in inputFile:
+            remaining -= len( line )
+            inputString = line.strip()
+            if( inputString ):
+                numRows += 1
+                try:
+                    values.append( addressClass( inputString ).toInteger() )
+                except ( AttributeError, ValueError ):
+                    numInvalid += 1
+            if( remaining <= 0 ):
+                break
+
+    values.sort()
+    if( unique ):
+        values = [ value for value, group in itertools.groupby( values ) ]
+    with AddressFileWriter( runPath, family ) as writer:
+        writer.addAll( values )
+    return ( runPath, len( values ), numRows, numInvalid )
+
+# Yields the values of the run "runPath", one block at a time
+def _iterRun( runPath ):
+    reader = AddressFileReader( runPath, useMmap = False )
+    try:
+        for block in xrange( 0, reader.getNumBlocks() ):
+            for value in reader.readBlock( block )[0]:
+                yield value
+    finally:
+        reader.close()
+
+# Yields the values of all of the runs in "runPaths" in order, once each if
+#  "unique" is true
+def _mergeRuns( runPaths, unique ):
+    merged = heapq.merge( *[ _iterRun( runPath ) for runPath in runPaths ] )
+    if( not unique ):
+        return merged
+    return ( value for value, group in itertools.groupby( merged ) )
+
+# Adds the values of the iterator "values" to the AddressFile "writer" one
+#  block at a time. Returns the number of values added.
+def _writeValues( writer, values ):
+    count = 0
+    while( True ):
+        batch = list( itertools.islice( values, BLOCK_SIZE ) )
+        if( len( batch ) == 0 ):
+            return count
+        writer.addAll( batch )
+        count += len( batch )
+
+# Sorts the addresses in the text file "inputPath" (one per row; blank rows
+#  are skipped, invalid rows are counted and skipped) into "outputPath" as
+#  canonical strings (TEXT) or a sorted AddressFile (BINARY). Duplicates are
+#  removed unless "unique" is false. The family is detected from the first
+#  row unless given. "memoryBudget" bytes are shared by "numProcesses"
+#  workers (default: one per CPU); runs go to a temporary directory in
+#  "tempDir" (default: the system one) which is removed afterwards.
+#  Returns ( rows read, invalid rows, addresses written ).
+def externalSort( inputPath, outputPath, family = None, outputFormat = TEXT,
+unique = True, memoryBudget = DEFAULT_MEMORY, tempDir = None,
+numProcesses = None ):
+    if( outputFormat not in ( TEXT, BINARY ) ):
+        raise ValueError( "Unknown output format: " + str( outputFormat ) )
+    if( memoryBudget <= 0 ):
+        raise ValueError( "memoryBudget is not positive: " + str( memoryBudget ) )
+    if( numProcesses is None ):
+        numProcesses = multiprocessing.cpu_count()
+    if( numProcesses <= 0 ):
+        raise ValueError( "numProcesses is not positive: " + str( numProcesses ) )
+    if( os.path.getsize( inputPath ) == 0 ):
+        raise ValueError( "input has no addresses: " + inputPath )
+    if( family is None ):
+        family = _detectFileFamily( inputPath )
+    getAddressClass( family )
+
+    # Every worker sorts one chunk at a time within its share of the budget;
+    #  the merge holds one block per run
+    chunkBytes = max( 1, memoryBudget / numProcesses / _EXPANSION )
+    fanIn = max( _MIN_FAN_IN, min( _MAX_FAN_IN, memoryBudget / ( BLOCK_SIZE *
+        64 ) ) )
+
+    workDir = tempfile.mkdtemp( prefix = "ExternalSort", dir = tempDir )
+    try:
+        tasks = [ ( inputPath, start, end, family, unique, os.path.join( workDir,
+            "run%d" % number ) ) for number, ( start, end ) in enumerate(
+            _findChunks( inputPath, chunkBytes ) ) ]
+        if( numProcesses == 1 or len( tasks ) == 1 ):
+            results = [ _sortChunk( task ) for task in tasks ]
+        else:
+            pool = multiprocessing.Pool( min( numProcesses, len( tasks ) ) )
+            try:
+                results = pool.map( _sortChunk, tasks, 1 )
+            finally:
+                pool.terminate()
+                pool.join()
+
+        numRows = sum( result[2] for result in results )
+        numInvalid = sum( result[3] for result in results )
+        runPaths = [ result[0] for result in results if result[1] > 0 ]
+
+        # Merge groups of runs into longer runs until one pass is enough
+        passNumber = 0
+        while( len( runPaths ) > fanIn ):
+            passNumber += 1
+            mergedPaths = []
+            for start in xrange( 0, len( runPaths ), fanIn ):
+                mergedPath = os.path.join( workDir, "pass%d-%d" % ( passNumber,
+                    len( mergedPaths ) ) )
+                with AddressFileWriter( mergedPath, family ) as writer:
+                    _writeValues( writer, _mergeRuns( runPaths[
+                        start:start + fanIn ], unique ) )
+                for runPath in runPaths[ start:start + fanIn ]:
+                    os.remove( runPath )
+                mergedPaths.append( mergedPath )
+            runPaths = mergedPaths
+
+        numWritten = 0
+        if( outputFormat == BINARY ):
+            with AddressFileWriter( outputPath, family, True ) as writer:
+                numWritten = _writeValues( writer, _mergeRuns( runPaths,
+                    unique ) )
+        else:
+            formatter = getFormatter( family )
+            with open( outputPath, "wb" ) as outputFile:
+                merged = _mergeRuns( runPaths, unique )
+                while( True ):
+                    rows = [ formatter( value ) for value in itertools.islice(
+                        merged, BLOCK_SIZE ) ]
+                    if( len( rows ) == 0 ):
+                        break
+                    outputFile.write( "\n".join( rows ) + "\n" )
+                    numWritten += len( rows )
+    finally:
+        shutil.rmtree( workDir, True )
+    return ( numRows, numInvalid, numWritten )
+
+# Sorts the input file named in "args" as described in USAGE and reports
+#  the counts on standard error. Returns 0 on success and 1 if usage was
+#  wrong, the sort failed or any row was invalid.
+def externalSortMain( args ):
+    if( len( args ) < 3 ):
+        print USAGE
+        return 1
+
+    options = { "family": None, "outputFormat": TEXT, "unique": True,
+        "memoryBudget": DEFAULT_MEMORY, "tempDir": None, "numProcesses": None }
+    position = 3
+    try:
+        while( position < len( args ) ):
+            option = args[ position ]
+            if( option == "--binary" ):
+                options[ "outputFormat" ] = BINARY
+            elif( option == "--keep-duplicates" ):
+                options[ "unique" ] = False
+            elif( option in ( "--family", "--memory", "--temp", "--processes" ) ):
+                position += 1
+                value = args[ position ]
+                if( option == "--family" ):
+                    options[ "family" ] = value
+                elif( option == "--memory" ):
+                    options[ "memoryBudget" ] = int( value ) << 20
+                elif( option == "--temp" ):
+                    options[ "tempDir" ] = value
+                else:
+                    options[ "numProcesses" ] = int( value )
+            else:
+                raise ValueError( "Unknown option: " + option )
+            position += 1
+    except ( IndexError, ValueError ):
+        print USAGE
+        return 1
+
+    try:
+        numRows, numInvalid, numWritten = externalSort( args[1], args[2],
+            **options )
+    except ( AttributeError, ValueError, IOError, OSError ) as e:
+        sys.stderr.write( str( e ) + "\n" )
+        return 1
+
+    sys.stderr.write( "%d rows read, %d invalid, %d addresses written\n" % (
+        numRows, numInvalid, numWritten ) )
+    return 1 if numInvalid > 0 else 0
+
+###############################################################################
+# Execution starts here; capture any command line arguments. The guard allows
+#  the sort to be imported by other tools
+if __name__ == "__main__":
+    sys.exit( externalSortMain( sys.argv ) )
@@ -0,0 +1,107 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: ExternalSort_Test.py
+# Author: Nicholas Russo
+# Description: This file includes a class that represents a test case for the
+#  external sort. Every family, both output formats, multiple merge passes,
+#  worker processes and invalid rows are tested here.
+###############################################################################
+
+from AddressFile import AddressFileReader
+from ExternalSort import externalSort, BINARY
+from IPv4Address import IPv4Address
+from IPv6Address import IPv6Address
+from MACAddress import MACAddress
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+# Defines an external sort test case
+class ExternalSort_Test( unittest.TestCase ):
+
+    # Builds a test suite from all of the methods defined in this class
+    @staticmethod
+    def buildTestSuite():
+        return unittest.TestLoader().loadTestsFromTestCase( ExternalSort_Test )
+
+    def setUp(self):
+        self._directory = tempfile.mkdtemp()
+        self._inputPath = os.path.join( self._directory, "input" )
+        self._outputPath = os.path.join( self._directory, "output" )
+
+    def tearDown(self):
+        shutil.rmtree( self._directory )
+
+    # Writes "rows" to the input file
+    def writeInput(self, rows):
+        with open( self._inputPath, "wb" ) as inputFile:
+            inputFile.write( "\n".join( rows ) + "\n" )
+
+    # Returns the rows of the text output file
+    def readOutput(self):
+        with open( self._outputPath, "rb" ) as outputFile:
+            return outputFile.read().splitlines()
+
+    # IPv4 input split into many runs and merged in several passes
+    def test_ipv4(self):
+        generator = random.Random( 43 )
+        values = [ generator.randint( 0, 0xFFFFFFFF ) for i in range( 0, 3000 ) ]
+        values += values[ 0:500 ]
+        addresses = [ IPv4Address.fromInteger( value ) for value in values ]
+        self.writeInput( [ address.toString() for address in addresses ] )
+
+        # A tiny budget makes runs of a few rows, merged two at a time
+        result = externalSort( self._inputPath, self._outputPath,
+            memoryBudget = 4096, numProcesses = 1, tempDir = self._directory )
+        expected = [ address.toString() for address in sorted( set( addresses ),
+            key = IPv4Address.toInteger ) ]
+        self.assertTrue( result == ( 3500, 0, len( expected ) ) )
+        self.assertTrue( self.readOutput() == expected )
+        self.assertTrue( sorted( os.listdir( self._directory ) ) ==
+            [ "input", "output" ] )
+
+        result = externalSort( self._inputPath, self._outputPath,
+            unique = False, memoryBudget = 16384, numProcesses = 2 )
+        self.assertTrue( result == ( 3500, 0, 3500 ) )
+        self.assertTrue( self.readOutput() == [ address.toString() for address in
+            sorted( addresses, key = IPv4Address.toInteger ) ] )
+
+    # IPv6 and MAC input; binary output; invalid and blank rows
+    def test_families(self):
+        generator = random.Random( 6 )
+        addresses = [ IPv6Address.fromInteger( generator.getrandbits( 128 ) )
+            for i in range( 0, 500 ) ]
+        self.writeInput( [ address.toString() for address in addresses ] +
+            [ "", "clown", addresses[0].toString().upper() ] )
+        result = externalSort( self._inputPath, self._outputPath,
+            outputFormat = BINARY, memoryBudget = 8192, numProcesses = 1 )
+        self.assertTrue( result == ( 502, 1, 500 ) )
+        with AddressFileReader( self._outputPath ) as reader:
+            self.assertTrue( reader.isSorted() )
+            self.assertTrue( list( reader ) == sorted( addresses,
+                key = IPv6Address.toInteger ) )
+
+        macs = [ MACAddress.fromInteger( generator.getrandbits( 48 ) )
+            for i in range( 0, 500 ) ]
+        self.writeInput( [ mac.toStringCisco() for mac in macs ] )
+        result = externalSort( self._inputPath, self._outputPath,
+            memoryBudget = 8192, numProcesses = 1 )
+        self.assertTrue( result == ( 500, 0, 500 ) )
+        self.assertTrue( self.readOutput() == [ mac.toString() for mac in
+            sorted( macs, key = MACAddress.toInteger ) ] )
+
+    # Invalid arguments
+    def test_errors(self):
+        self.writeInput( [ "10.1.1.1" ] )
+        self.assertRaises( ValueError, externalSort, self._inputPath,
+            self._outputPath, outputFormat = "csv" )
+        self.assertRaises( ValueError, externalSort, self._inputPath,
+            self._outputPath, memoryBudget = 0 )
+        self.assertRaises( ValueError, externalSort, self._inputPath,
+            self._outputPath, family = "ipx" )
+        self.writeInput( [ "", "" ] )
+        self.assertRaises( ValueError, externalSort, self._inputPath,
+            self._outputPath )
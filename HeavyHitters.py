@@ -0,0 +1,234 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: HeavyHitters.py
+# Author: Nicholas Russo
+# Description: This file includes classes that find the heaviest prefixes
+#  (top talkers) in unbounded streams of addresses using bounded memory.
+#  Each prefix level (e.g. /16 and /24) keeps a Misra-Gries frequent items
+#  summary, the counter-based dual of Space-Saving: at most a fixed number
+#  of counters, counts that are never overestimated and never underestimated
+#  by more than N/(capacity+1). Summaries from several workers can be merged
+#  with the same guarantee, and hierarchical heavy hitters are reported.
+###############################################################################
+
+import heapq
+import itertools
+
+# Default number of counters kept per prefix level
+CAPACITY = 1000
+
+# Defines a bounded, mergeable frequent items summary over integer keys
+class FrequentItems(object):
+
+    # Builds an empty summary holding at most "capacity" counters after
+    #  each reduction (up to twice that many between reductions)
+    def __init__(self, capacity = CAPACITY):
+        if ( capacity <= 0 ):
+            raise ValueError( "capacity is not positive: " + str( capacity ) )
+        self._capacity = capacity
+        self._counts = {}
+        self._total = 0
+        self._decrement = 0
+
+    # Adds the dictionary "counts" (key -> count), e.g. one batch of a
+    #  stream already aggregated, then reduces the summary if it is too big
+    def addCounts(self, counts, total = None):
+        summary = self._counts
+        for key, count in counts.iteritems():
+            summary[ key ] = summary.get( key, 0 ) + count
+        self._total += sum( counts.itervalues() ) if total is None else total
+        if ( len( summary ) > 2 * self._capacity ):
+            self._reduce()
+
+    # Subtracts the (capacity+1)-th largest count from every counter and
+    #  drops the counters that reach zero (the Misra-Gries reduction). The
+    #  subtracted amount is remembered since it bounds the estimation error.
+    def _reduce(self):
+        if ( len( self._counts ) <= self._capacity ):
+            return
+        threshold = heapq.nlargest( self._capacity + 1,
+            self._counts.itervalues() )[-1]
+        self._decrement += threshold
+        self._counts = dict( ( key, count - threshold )
+            for key, count in self._counts.iteritems() if count > threshold )
+
+    # Merges the summary "other" into this one (e.g. from another worker)
+    def merge(self, other):
+        self._decrement += other._decrement
+        self.addCounts( other._counts, other._total )
+        self._reduce()
+
+    # Returns the total count added to the summary
+    def getTotal(self):
+        return self._total
+
+    # Returns the maximum amount by which any estimate may be too low
+    def getMaxError(self):
+        return self._decrement
+
+    # Returns the estimated (lower bound) count for "key"
+    def getCount(self, key):
+        return self._counts.get( key, 0 )
+
+    # Returns the list of ( key, count ) for the "k" largest counters
+    def getTopK(self, k):
+        self._reduce()
+        return heapq.nlargest( k, self._counts.iteritems(),
+            key = lambda item: item[1] )
+
+    # Returns a plain (JSON or pickle friendly) copy of the summary
+    def toSnapshot(self):
+        return { "capacity": self._capacity, "total": self._total,
+            "decrement": self._decrement,
+            "counts": [ [ key, count ] for key, count in
+                self._counts.iteritems() ] }
+
+    # Builds a summary from a snapshot made by toSnapshot()
+    @staticmethod
+    def fromSnapshot(snapshot):
+        summary = FrequentItems( snapshot[ "capacity" ] )
+        summary._total = snapshot[ "total" ]
+        summary._decrement = snapshot[ "decrement" ]
+        summary._counts = dict( ( key, count )
+            for key, count in snapshot[ "counts" ] )
+        return summary
+
+# Defines a streaming heavy hitter aggregator over several prefix levels of
+#  a single address family
+class HeavyHitters(object):
+
+    # Builds an aggregator for "addressClass" (e.g. IPv4Address) that counts
+    #  every prefix length in "prefixLens" (e.g. ( 16, 24 ) or ( 48, 64 ))
+    #  with "capacity" counters per level
+    def __init__(self, addressClass, prefixLens, capacity = CAPACITY):
+        if ( len( prefixLens ) == 0 ):
+            raise ValueError( "prefixLens is empty" )
+        for prefixLen in prefixLens:
+            if ( prefixLen < 0 or prefixLen > addressClass._maxAddrLen ):
+                raise ValueError( "prefixLen is out of range: " +
+                    str( prefixLen ) )
+
+        self._addressClass = addressClass
+        self._prefixLens = sorted( set( prefixLens ) )
+        self._levels = dict( ( prefixLen, FrequentItems( capacity ) )
+            for prefixLen in self._prefixLens )
+
+    # Adds one batch of integer address values (e.g. an array.array or a
+    #  generator) with optional per-address "weights" such as byte or packet
+    #  counts. The batch is aggregated exactly once at the longest prefix
+    #  length, then each shorter level is folded from the next longer one.
+    def addAll(self, values, weights = None):
+        numBits = self._addressClass._maxAddrLen
+        prefixLen = self._prefixLens[-1]
+        shift = numBits - prefixLen
+        counts = {}
+        if ( weights is None ):
+            for value in values:
+                prefix = value >> shift
+                counts[ prefix ] = counts.get( prefix, 0 ) + 1
+        else:
+            for value, weight in itertools.izip( values, weights ):
+                prefix = value >> shift
+                counts[ prefix ] = counts.get( prefix, 0 ) + weight
+        self._levels[ prefixLen ].addCounts( counts )
+
+        for shorterLen in reversed( self._prefixLens[ :-1 ] ):
+            shift = prefixLen - shorterLen
+            shorterCounts = {}
+            for prefix, count in counts.iteritems():
+                prefix >>= shift
+                shorterCounts[ prefix ] = shorterCounts.get( prefix, 0 ) + count
+            self._levels[ shorterLen ].addCounts( shorterCounts )
+            prefixLen = shorterLen
+            counts = shorterCounts
+
+    # Adds a single address object or integer value
+    def add(self, address, weight = 1):
+        if ( not isinstance( address, ( int, long ) ) ):
+            address = address.toInteger()
+        self.addAll( ( address, ), ( weight, ) )
+
+    # Returns the prefix lengths being counted, shortest first
+    def getPrefixLens(self):
+        return list( self._prefixLens )
+
+    # Returns the total weight added so far
+    def getTotal(self):
+        return self._levels[ self._prefixLens[0] ].getTotal()
+
+    # Returns the maximum amount by which counts at "prefixLen" may be low
+    def getMaxError(self, prefixLen):
+        return self._levels[ prefixLen ].getMaxError()
+
+    # Converts a level key back into an address object of length "prefixLen"
+    def _toAddress(self, prefixLen, prefix):
+        return self._addressClass.fromInteger(
+            prefix << ( self._addressClass._maxAddrLen - prefixLen ), prefixLen )
+
+    # Returns the list of ( network address, count ) for the "k" heaviest
+    #  prefixes of length "prefixLen" (e.g. the top 10 /24s)
+    def getTopK(self, prefixLen, k):
+        return [ ( self._toAddress( prefixLen, prefix ), count )
+            for prefix, count in self._levels[ prefixLen ].getTopK( k ) ]
+
+    # Returns the hierarchical heavy hitters: prefixes whose count, after
+    #  discounting heavy hitters already reported below them at longer
+    #  prefix lengths, is at least "fraction" of the total. Results are
+    #  ( network address, discounted count ) from the longest prefix up.
+    def getHierarchicalHeavyHitters(self, fraction):
+        if ( fraction <= 0 or fraction > 1 ):
+            raise ValueError( "fraction is out of range: " + str( fraction ) )
+
+        threshold = fraction * self.getTotal()
+        heavyHitters = []
+        reported = []
+        for prefixLen in reversed( self._prefixLens ):
+            level = self._levels[ prefixLen ]
+            level._reduce()
+
+            # Sum the reported descendants under each prefix of this level
+            discounts = {}
+            for childLen, childPrefix, childCount in reported:
+                prefix = childPrefix >> ( childLen - prefixLen )
+                discounts[ prefix ] = discounts.get( prefix, 0 ) + childCount
+
+            levelReported = []
+            for prefix, count in level._counts.iteritems():
+                remaining = count - discounts.get( prefix, 0 )
+                if ( remaining >= threshold ):
+                    levelReported.append( ( prefixLen, prefix, remaining ) )
+
+            levelReported.sort( key = lambda item: -item[2] )
+            reported.extend( levelReported )
+            heavyHitters.extend( ( self._toAddress( prefixLen, prefix ), count )
+                for prefixLen, prefix, count in levelReported )
+        return heavyHitters
+
+    # Merges the aggregator "other" (same family and prefix lengths) into
+    #  this one, e.g. to combine the snapshots of several workers
+    def merge(self, other):
+        if ( other._addressClass != self._addressClass or
+        other._prefixLens != self._prefixLens ):
+            raise ValueError( "aggregators count different prefixes" )
+        for prefixLen in self._prefixLens:
+            self._levels[ prefixLen ].merge( other._levels[ prefixLen ] )
+
+    # Returns a plain (JSON or pickle friendly) snapshot of the aggregator.
+    #  The address class is recorded by its maximum address length.
+    def toSnapshot(self):
+        return { "numBits": self._addressClass._maxAddrLen,
+            "levels": [ [ prefixLen, self._levels[ prefixLen ].toSnapshot() ]
+                for prefixLen in self._prefixLens ] }
+
+    # Builds an aggregator for "addressClass" from a snapshot made by
+    #  toSnapshot() (e.g. received from a worker)
+    @staticmethod
+    def fromSnapshot(snapshot, addressClass):
+        if ( snapshot[ "numBits" ] != addressClass._maxAddrLen ):
+            raise ValueError( "snapshot is for a different address family" )
+        heavyHitters = HeavyHitters( addressClass,
+            [ prefixLen for prefixLen, level in snapshot[ "levels" ] ] )
+        for prefixLen, level in snapshot[ "levels" ]:
+            heavyHitters._levels[ prefixLen ] = FrequentItems.fromSnapshot( level )
+        return heavyHitters
@@ -0,0 +1,146 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: HeavyHitters_Test.py
+# Author: Nicholas Russo
+# Description: This file includes a class that represents a test case for the
+#  FrequentItems and HeavyHitters classes. Exact counting below capacity,
+#  the error bound above capacity, merging, snapshots and hierarchical heavy
+#  hitter reports are tested here.
+###############################################################################
+
+from HeavyHitters import FrequentItems, HeavyHitters
+from IPv4Address import IPv4Address
+from IPv6Address import IPv6Address
+import json
+import random
+import unittest
+
+# Defines a heavy hitters test case
+class HeavyHitters_Test( unittest.TestCase ):
+
+    # Builds a test suite from all of the methods defined in this class
+    @staticmethod
+    def buildTestSuite():
+        return unittest.TestLoader().loadTestsFromTestCase( HeavyHitters_Test )
+
+    # Builds a skewed IPv4 stream: a third of the traffic from 10.1.1.0/24,
+    #  a sixth spread over 10.2.0.0/16, and the rest uniformly random
+    def setUp(self):
+        generator = random.Random( 32 )
+        self._values = []
+        for i in range( 0, 30000 ):
+            choice = generator.random()
+            if ( choice < 0.33 ):
+                value = ( 10 << 24 ) | ( 1 << 16 ) | ( 1 << 8 ) | generator.getrandbits( 8 )
+            elif ( choice < 0.5 ):
+                value = ( 10 << 24 ) | ( 2 << 16 ) | generator.getrandbits( 16 )
+            else:
+                value = generator.getrandbits( 32 )
+            self._values.append( value )
+
+    def tearDown(self):
+        self._values = None
+
+    # Returns the exact count of every prefix of "prefixLen" in the stream
+    def _exactCounts(self, prefixLen):
+        counts = {}
+        for value in self._values:
+            prefix = value >> ( 32 - prefixLen )
+            counts[ prefix ] = counts.get( prefix, 0 ) + 1
+        return counts
+
+    # Ensures invalid parameters raise errors
+    def test_invalidInstances(self):
+        self.assertRaises( ValueError, FrequentItems, 0 )
+        self.assertRaises( ValueError, HeavyHitters, IPv4Address, () )
+        self.assertRaises( ValueError, HeavyHitters, IPv4Address, ( 33, ) )
+        self.assertRaises( ValueError, HeavyHitters( IPv4Address, ( 8, ) )
+            .getHierarchicalHeavyHitters, 0 )
+
+    # Counts are exact while there are fewer prefixes than counters, and
+    #  never off by more than N/(capacity+1) otherwise
+    def test_errorBound(self):
+        heavyHitters = HeavyHitters( IPv4Address, ( 8, 24 ), capacity = 300 )
+        for start in range( 0, len( self._values ), 1000 ):
+            heavyHitters.addAll( self._values[ start:start + 1000 ] )
+        self.assertTrue( heavyHitters.getTotal() == len( self._values ) )
+        self.assertTrue( heavyHitters.getMaxError( 8 ) == 0 )
+
+        bound = len( self._values ) / 301
+        self.assertTrue( heavyHitters.getMaxError( 24 ) <= bound )
+        for prefixLen in ( 8, 24 ):
+            exact = self._exactCounts( prefixLen )
+            level = heavyHitters._levels[ prefixLen ]
+            for prefix, count in exact.iteritems():
+                estimate = level.getCount( prefix )
+                self.assertTrue( estimate <= count and count - estimate <= bound )
+
+        address, count = heavyHitters.getTopK( 24, 1 )[0]
+        self.assertTrue( address.toString() == "10.1.1.0" )
+        self.assertTrue( address.getAddrLen() == 24 )
+
+    # Merging the summaries of two workers must keep the same guarantees,
+    #  including after a JSON round trip of the snapshots
+    def test_merge(self):
+        first = HeavyHitters( IPv4Address, ( 16, 24 ), capacity = 200 )
+        second = HeavyHitters( IPv4Address, ( 16, 24 ), capacity = 200 )
+        half = len( self._values ) / 2
+        first.addAll( self._values[ :half ] )
+        second.addAll( self._values[ half: ] )
+
+        merged = HeavyHitters.fromSnapshot( json.loads( json.dumps( 
+            first.toSnapshot() ) ), IPv4Address )
+        merged.merge( HeavyHitters.fromSnapshot( second.toSnapshot(), IPv4Address ) )
+        self.assertTrue( merged.getTotal() == len( self._values ) )
+
+        exact = self._exactCounts( 24 )
+        error = merged.getMaxError( 24 )
+        self.assertTrue( error <= len( self._values ) / 201 )
+        for prefix, count in exact.iteritems():
+            estimate = merged._levels[ 24 ].getCount( prefix )
+            self.assertTrue( estimate <= count and count - estimate <= error )
+
+        self.assertRaises( ValueError, merged.merge, 
+            HeavyHitters( IPv4Address, ( 16, ) ) )
+        self.assertRaises( ValueError, HeavyHitters.fromSnapshot,
+            merged.toSnapshot(), IPv6Address )
+
+    # The /24 is reported once; its /16 and /8 are only reported for the
+    #  traffic not already attributed to it
+    def test_hierarchicalHeavyHitters(self):
+        heavyHitters = HeavyHitters( IPv4Address, ( 8, 16, 24 ), capacity = 500 )
+        heavyHitters.addAll( self._values )
+        results = [ ( address.toString() + "/" + str( address.getAddrLen() ), count )
+            for address, count in heavyHitters.getHierarchicalHeavyHitters( 0.1 ) ]
+        self.assertTrue( [ name for name, count in results ] == 
+            [ "10.1.1.0/24", "10.2.0.0/16" ] )
+        self.assertTrue( abs( results[1][1] - 0.17 * len( self._values ) ) < 1000 )
+
+    # Weighted ingest of IPv6 addresses at /48 and /64
+    def test_weights(self):
+        heavyHitters = HeavyHitters( IPv6Address, ( 48, 64 ) )
+        address = IPv6Address( "2001:0db8:0001:0002:0000:0000:0000:0001" )
+        heavyHitters.add( address, 1500 )
+        heavyHitters.addAll( [ address.toInteger() + 1 ], [ 500 ] )
+        network, count = heavyHitters.getTopK( 48, 1 )[0]
+        self.assertTrue( count == 2000 )
+        self.assertTrue( network.toString() == "2001:0db8:0001:0000:0000:0000:0000:0000" )
+
+    # One-shot iterables (e.g. generators) reach every level, not only the
+    #  first one counted
+    def test_generator(self):
+        levels = ( 8, 16, 24 )
+        fromList = HeavyHitters( IPv4Address, levels, capacity = 100000 )
+        fromList.addAll( self._values )
+        fromGenerator = HeavyHitters( IPv4Address, levels, capacity = 100000 )
+        fromGenerator.addAll( value for value in self._values )
+        weighted = HeavyHitters( IPv4Address, levels, capacity = 100000 )
+        weighted.addAll( iter( self._values ), ( 2 for value in self._values ) )
+        for prefixLen in levels:
+            expected = sorted( self._exactCounts( prefixLen ).values() )
+            for heavyHitters, factor in ( ( fromList, 1 ), ( fromGenerator, 1 ),
+            ( weighted, 2 ) ):
+                self.assertTrue( sorted( count for address, count in
+                    heavyHitters.getTopK( prefixLen, len( expected ) ) ) ==
+                    [ count * factor for count in expected ] )
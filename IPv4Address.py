@@ -10,11 +10,18 @@
 #  parent class (NetAddress).
 ###############################################################################
 
-from NetAddress import NetAddress
+from NetAddress import NetAddress, memoized, memoizedFlag
+import ParserBackend
 
 # Defines an IPv4 address, inheriting from NetAddress
 class IPv4Address(NetAddress):
     
+    # Number of bits in the address, also the maximum address length
+    _maxAddrLen = 32
+    
+    # Slots for the cached string forms specific to this class
+    __slots__ = ( "_stringHex", "_reverseName" )
+    
     # Invokes the parent constructor to build the network address, which
     #  performs most of the heavy lifting. Performs upper-bound checking
     #  on the address length to ensure it is not greater than 32. Note
@@ -29,6 +36,12 @@ class IPv4Address(NetAddress):
     #  list is returned from the method
     def _parseInputString( self, inputString ):
         
+        # Strictly formatted input is handled by the native backend, if in
+        #  use; everything else (including all invalid input) is parsed below
+        integerOctets = ParserBackend.parseIPv4( inputString )
+        if( integerOctets is not None ):
+            return integerOctets
+        
         # Split the input string into 4 separate octets; any errors
         #  raised by this method are passed up the recursion stack
         ipStringOctets = self._splitInputString( inputString, ".", 4 )
@@ -106,6 +119,7 @@ class IPv4Address(NetAddress):
         return prefix
     '''
     # Return the IPv4 address in dotted-decimal format (xx.xx.xx.xx)
+    @memoized( "_string" )
     def toString(self): 
         
         # Start with an empty string
@@ -131,6 +145,7 @@ class IPv4Address(NetAddress):
             
     # Return the IPv4 address in contiguous hexadecimal format 
     #  which includes the leading "0x" string (0xaabbccdd)
+    @memoized( "_stringHex" )
     def toStringHex(self): 
         ipString = "0x"
         ipStringLen = len( self._octet )
@@ -139,21 +154,38 @@ class IPv4Address(NetAddress):
         
         return ipString
     
+    # Return the reverse DNS (PTR) owner name of the address (e.g.
+    #  4.3.2.1.in-addr.arpa for 1.2.3.4)
+    @memoized( "_reverseName" )
+    def toReverseName(self):
+        from ReverseDNS import toReverseName
+        return toReverseName( self.toInteger(), 32 )
+    
+    # Return the reverse DNS zone name for the address length, cut at the
+    #  last whole label (e.g. 2.1.in-addr.arpa for 1.2.0.0/16)
+    def toReverseZone(self):
+        from ReverseDNS import toReverseZone
+        return toReverseZone( self.toInteger(), 32, self.getAddrLen() )
+    
     # Test for Class A, B, or C addressing   
+    @memoizedFlag
     def isUnicast(self):   
         return ( self._octet[0] < 224 )  
           
     # Test for Class D addressing    
+    @memoizedFlag
     def isMulticast(self):
         return ( self._octet[0] >= 224 and self._octet[0] <= 239 )
     
     # Test for Class E addressing    
+    @memoizedFlag
     def isExperimental(self):
         return ( self._octet[0] > 239 )
     
     # Test for link local addressing (LLA), used for link-level communications
     #  Returns true if the address begins with 169.254.0.0 for unicast
     #  or 224.0.0.x for multicast
+    @memoizedFlag
     def isLinkLocalAddress(self):
          
         if( self._octet[0] == 169 and self._octet[1] == 254 ):
@@ -168,6 +200,7 @@ class IPv4Address(NetAddress):
     # Tests for private addressing defined in RFC 1918. Also tests for
     #  administratively-scoped multicast addressing. Private addresses:
     #  10.0.0.0/8, 172.16.0.0/12, 192.168.0.0/16, 239.0.0.0/8    
+    @memoizedFlag
     def isPrivateAddress(self):
         
         # Test for 10.x.x.x
@@ -10,11 +10,18 @@
 #  parent class (NetAddress).
 ###############################################################################
 
-from NetAddress import NetAddress
+from NetAddress import NetAddress, memoized, memoizedFlag
+import ParserBackend
 
 # Defines an IPv6 address, inheriting from NetAddress
 class IPv6Address(NetAddress):
     
+    # Number of bits in the address, also the maximum address length
+    _maxAddrLen = 128
+    
+    # Slots for the cached string forms specific to this class
+    __slots__ = ( "_reverseName", )
+    
     # Invokes the parent constructor to build the network address, which
     #  performs most of the heavy lifting. Performs upper-bound checking
     #  on the address length to ensure it is not greater than 128. Note
@@ -29,6 +36,12 @@ class IPv6Address(NetAddress):
     #  list is returned from the method
     def _parseInputString( self, inputString ):
         
+        # Strictly formatted input is handled by the native backend, if in
+        #  use; everything else (including all invalid input) is parsed below
+        integerOctets = ParserBackend.parseIPv6( inputString )
+        if( integerOctets is not None ):
+            return integerOctets
+        
         # Split the input string into 8 separate double-octets; any errors
         #  raised by this method are passed up the recursion stack
         ipStringOctets = self._splitInputString( inputString, ":", 8 )
@@ -81,6 +94,7 @@ class IPv6Address(NetAddress):
 
     # Return the IPv6 address in fully extended EUI format 
     # (xxxx:xxxx:xxxx:xxxx:xxxx:xxxx:xxxx:xxxx)
+    @memoized( "_string" )
     def toString(self): 
         
         # Start with an empty string
@@ -100,25 +114,101 @@ class IPv6Address(NetAddress):
                 
         return ipv6String
     
+    # Return the reverse DNS (PTR) owner name of the address: one label per
+    #  nibble, lowest-order first, under ip6.arpa
+    @memoized( "_reverseName" )
+    def toReverseName(self):
+        from ReverseDNS import toReverseName
+        return toReverseName( self.toInteger(), 128 )
+    
+    # Return the reverse DNS zone name for the address length, cut at the
+    #  last whole label (e.g. 8.b.d.0.1.0.0.2.ip6.arpa for 2001:db8::/32)
+    def toReverseZone(self):
+        from ReverseDNS import toReverseZone
+        return toReverseZone( self.toInteger(), 128, self.getAddrLen() )
+    
+    # Return the solicited-node multicast group used by neighbor discovery
+    #  for this address (ff02::1:ff00:0/104 plus the low-order 24 bits)
+    def getSolicitedNodeAddress(self):
+        from NeighborDiscovery import ipv6ToSolicitedNodeValue
+        return IPv6Address.fromInteger( 
+            ipv6ToSolicitedNodeValue( self.toInteger() ) )
+    
+    # Return the multicast MACAddress for this address (33:33 plus the
+    #  low-order 32 bits, per RFC 2464). Returns None if not multicast.
+    def toMulticastMAC(self):
+        if( not self.isMulticast() ):
+            return None
+        
+        from MACAddress import MACAddress
+        from NeighborDiscovery import ipv6ToMulticastMACValue
+        return MACAddress.fromInteger( 
+            ipv6ToMulticastMACValue( self.toInteger() ) )
+    
     # Test for unicast addressing; returns true if the first octet is not 0xFF
+    @memoizedFlag
     def isUnicast(self):   
         return self._octet[0] != 0xff
           
     # Test for multicast addressing; returns true if the first octet is 0xFF  
+    @memoizedFlag
     def isMulticast(self):
         return self._octet[0] == 0xff
         
-    # Test for 6to4 tunneling; returns true if the first 2 octets are 0x2001
+    # Test for 6to4 tunneling; returns true if the first 2 octets are 0x2002
+    @memoizedFlag
     def is6to4(self):
         return self._octet[0] == 0x20 and self._octet[1] == 0x02
-        
+
+    # Return the transition format of the address (e.g. "teredo", see
+    #  IPv6Transition.py), or None if no IPv4 address is embedded in it
+    def getTransitionFormat(self):
+        from IPv6Transition import getTransitionFormat
+        return getTransitionFormat( self.toInteger() )
+
+    # Return the IPv4Address embedded in a transition address (the client
+    #  address for Teredo), or None for other addresses
+    def getEmbeddedIPv4(self):
+        from IPv6Transition import ipv6ToEmbeddedIPv4Value
+        value = ipv6ToEmbeddedIPv4Value( self.toInteger() )
+        if( value is None ):
+            return None
+
+        from IPv4Address import IPv4Address
+        return IPv4Address.fromInteger( value )
+
+    # Test for IPv4-mapped addressing; returns true within ::ffff:0:0/96
+    @memoizedFlag
+    def isIPv4Mapped(self):
+        return self._octet[ :12 ] == ( 0, ) * 10 + ( 0xff, 0xff )
+
+    # Test for (deprecated) IPv4-compatible addressing; returns true within
+    #  ::/96 except for the unspecified (::) and loopback (::1) addresses
+    @memoizedFlag
+    def isIPv4Compatible(self):
+        return ( self._octet[ :12 ] == ( 0, ) * 12 and
+            self._octet[ 12: ] > ( 0, 0, 0, 1 ) )
+
+    # Test for NAT64 addressing; returns true within the well-known prefix
+    #  64:ff9b::/96
+    @memoizedFlag
+    def isNAT64(self):
+        return self._octet[ :12 ] == ( 0x00, 0x64, 0xff, 0x9b ) + ( 0, ) * 8
+
+    # Test for Teredo tunneling; returns true within 2001::/32
+    @memoizedFlag
+    def isTeredo(self):
+        return self._octet[ :4 ] == ( 0x20, 0x01, 0x00, 0x00 )
+
     # Test for unique local addressing (ULA), used for intranets
     #  Returns true if the first otet is 0xFEBF through 0xFEBF (FE80::/10)
+    @memoizedFlag
     def isLinkLocalAddress(self):
         return ( self._octet[0] == 0xfe and 
         self._octet[1] >= 0x80 and self._octet[1] <= 0xbf )
         
     # Test for link local addressing (LLA), used for link-level communications
     #  Returns true if the first otet is 0xFC or 0xFD (FC00::/7)
+    @memoizedFlag
     def isUniqueLocalAddress(self):
         return self._octet[0] == 0xfc or self._octet[0] == 0xfd
@@ -0,0 +1,83 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: IPv6Transition.py
+# Author: Nicholas Russo
+# Description: This file includes the classification of IPv6 transition
+#  addresses and the extraction of the IPv4 address embedded in them:
+#  IPv4-mapped (::ffff:0:0/96) and IPv4-compatible (::/96, RFC 4291), NAT64
+#  well-known prefix (64:ff9b::/96, RFC 6052), Teredo (2001::/32, RFC 4380,
+#  the client address) and 6to4 (2002::/16, RFC 3056). Each function works
+#  on integer values (see NetAddress.toInteger) and has a batch form that
+#  processes a whole sequence in one pass without building any objects. The
+#  IPv6Address class uses the scalar forms for its transition methods.
+###############################################################################
+
+import array
+
+# Transition formats; FORMATS[ code ] is the format of each code in the
+#  batch results, code 0 meaning no format
+IPV4_MAPPED = "ipv4Mapped"
+IPV4_COMPATIBLE = "ipv4Compatible"
+NAT64 = "nat64"
+TEREDO = "teredo"
+SIX_TO_FOUR = "6to4"
+FORMATS = [ None, IPV4_MAPPED, IPV4_COMPATIBLE, NAT64, TEREDO, SIX_TO_FOUR ]
+
+# Codes of the formats identified by the high-order 96 bits of an address;
+#  IPv4-compatible also excludes the unspecified (::) and loopback (::1)
+#  addresses
+_PREFIX96_CODES = { 0xffff: 1, 0: 2, 0x64ff9b << 64: 3 }
+
+# High-order 32 bits of Teredo and 16 bits of 6to4 addresses
+_TEREDO_PREFIX32 = 0x20010000
+_SIX_TO_FOUR_PREFIX16 = 0x2002
+
+# Returns the code of the transition format of the 128-bit IPv6 "value" and
+#  its embedded 32-bit IPv4 value, or ( 0, 0 ) if it is not a transition
+#  address
+def _classify( value ):
+    high = value >> 96
+    if( high == _TEREDO_PREFIX32 ):
+        return ( 4, ( value & 0xffffffff ) ^ 0xffffffff )
+    elif( high >> 16 == _SIX_TO_FOUR_PREFIX16 ):
+        return ( 5, ( value >> 80 ) & 0xffffffff )
+    code = _PREFIX96_CODES.get( value >> 32, 0 )
+    if( code == 0 or ( code == 2 and value <= 1 ) ):
+        return ( 0, 0 )
+    return ( code, value & 0xffffffff )
+
+# Returns the transition format (e.g. TEREDO) of the 128-bit IPv6 "value",
+#  or None
+def getTransitionFormat( value ):
+    return FORMATS[ _classify( value )[0] ]
+
+# Returns the 32-bit IPv4 value embedded in the 128-bit IPv6 "value", or
+#  None if it is not a transition address
+def ipv6ToEmbeddedIPv4Value( value ):
+    code, ipv4Value = _classify( value )
+    if( code == 0 ):
+        return None
+    return ipv4Value
+
+# Batch form of getTransitionFormat() and ipv6ToEmbeddedIPv4Value(); returns
+#  a bytearray of format codes (see FORMATS) and an array of unsigned longs
+#  holding the embedded IPv4 values (0 where the code is 0)
+def ipv6sToEmbeddedIPv4( ipv6Values ):
+    codes = bytearray( len( ipv6Values ) )
+    ipv4Values = array.array( "L", [ 0 ] ) * len( ipv6Values )
+    prefix96Codes = _PREFIX96_CODES
+    for index, value in enumerate( ipv6Values ):
+        high = value >> 96
+        if( high == _TEREDO_PREFIX32 ):
+            codes[ index ] = 4
+            ipv4Values[ index ] = ( value & 0xffffffff ) ^ 0xffffffff
+        elif( high >> 16 == _SIX_TO_FOUR_PREFIX16 ):
+            codes[ index ] = 5
+            ipv4Values[ index ] = ( value >> 80 ) & 0xffffffff
+        elif( high == 0 or high == 0x64ff9b ):
+            code = prefix96Codes.get( value >> 32, 0 )
+            if( code != 0 and ( code != 2 or value > 1 ) ):
+                codes[ index ] = code
+                ipv4Values[ index ] = value & 0xffffffff
+    return codes, ipv4Values
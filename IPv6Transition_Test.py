@@ -0,0 +1,93 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: IPv6Transition_Test.py
+# Author: Nicholas Russo
+# Description: This file includes a class that represents a test case for the
+#  IPv6 transition addresses. The transition methods of the IPv6Address class
+#  are tested against the examples of the RFCs, and the batch function is
+#  tested against the scalar methods.
+###############################################################################
+
+from IPv4Address import IPv4Address
+from IPv6Address import IPv6Address
+import IPv6Transition
+import random
+import unittest
+
+# Defines an IPv6 transition address test case
+class IPv6Transition_Test( unittest.TestCase ):
+
+    # Builds a test suite from all of the methods defined in this class
+    @staticmethod
+    def buildTestSuite():
+        return unittest.TestLoader().loadTestsFromTestCase( IPv6Transition_Test )
+
+    # Builds the transition addresses, their formats and embedded IPv4
+    #  addresses used by every test
+    def setUp(self):
+        self._examples = [
+            ( "0000:0000:0000:0000:0000:ffff:c000:0280", "isIPv4Mapped",
+                "192.0.2.128" ),
+            ( "0000:0000:0000:0000:0000:0000:c000:0280", "isIPv4Compatible",
+                "192.0.2.128" ),
+            ( "0000:0000:0000:0000:0000:0000:0000:0002", "isIPv4Compatible",
+                "0.0.0.2" ),
+            ( "0064:ff9b:0000:0000:0000:0000:c000:0221", "isNAT64",
+                "192.0.2.33" ),
+            ( "2001:0000:4136:e378:8000:63bf:3fff:fdd2", "isTeredo",
+                "192.0.2.45" ),
+            ( "2002:c000:0204:0000:0000:0000:0000:0001", "is6to4",
+                "192.0.2.4" ),
+            ( "0000:0000:0000:0000:0000:0000:0000:0000", None, None ),
+            ( "0000:0000:0000:0000:0000:0000:0000:0001", None, None ),
+            ( "0000:0000:0000:0000:0000:fffe:c000:0280", None, None ),
+            ( "0064:ff9b:0001:0000:0000:0000:c000:0221", None, None ),
+            ( "2001:0db8:0000:0000:0000:0000:0000:0001", None, None ),
+            ( "fe80:0000:0000:0000:0000:ffff:c000:0280", None, None ) ]
+        self._predicates = [ "isIPv4Mapped", "isIPv4Compatible", "isNAT64",
+            "isTeredo", "is6to4" ]
+
+    def tearDown(self):
+        self._examples = None
+        self._predicates = None
+
+    # Tests the transition predicates and getEmbeddedIPv4() in IPv6Address
+    def test_methods(self):
+        for ipString, predicate, ipv4String in self._examples:
+            ip = IPv6Address( ipString )
+            for name in self._predicates:
+                self.assertTrue( getattr( ip, name )() == ( name == predicate ),
+                    ipString + " " + name )
+            if( ipv4String is None ):
+                self.assertTrue( ip.getEmbeddedIPv4() is None )
+                self.assertTrue( ip.getTransitionFormat() is None )
+            else:
+                self.assertTrue( ip.getEmbeddedIPv4() == IPv4Address( ipv4String ) )
+                self.assertTrue( ip.getTransitionFormat() is not None )
+        self.assertTrue( IPv6Address( self._examples[4][0] ).getTransitionFormat()
+            == IPv6Transition.TEREDO )
+
+    # Tests the batch function against the scalar methods
+    def test_batch(self):
+        generator = random.Random( 49 )
+        values = [ IPv6Address( ipString ).toInteger()
+            for ipString, predicate, ipv4String in self._examples ]
+        for prefix, prefixLen in ( ( 0xffff << 32, 96 ), ( 0, 96 ),
+        ( 0x64ff9b << 96, 96 ), ( 0x20010000 << 96, 32 ), ( 0x2002 << 112, 16 ),
+        ( 0, 0 ) ):
+            values += [ prefix | generator.getrandbits( 128 - prefixLen )
+                for i in range( 0, 100 ) ]
+
+        codes, ipv4Values = IPv6Transition.ipv6sToEmbeddedIPv4( values )
+        self.assertTrue( len( codes ) == len( values ) == len( ipv4Values ) )
+        for value, code, ipv4Value in zip( values, codes, ipv4Values ):
+            ip = IPv6Address.fromInteger( value )
+            self.assertTrue( IPv6Transition.FORMATS[ code ] ==
+                ip.getTransitionFormat() )
+            embedded = ip.getEmbeddedIPv4()
+            self.assertTrue( ipv4Value == ( 0 if embedded is None else
+                embedded.toInteger() ) )
+        self.assertTrue( len( set( codes ) ) == len( IPv6Transition.FORMATS ) )
+        codes, ipv4Values = IPv6Transition.ipv6sToEmbeddedIPv4( [] )
+        self.assertTrue( len( codes ) == 0 and len( ipv4Values ) == 0 )
@@ -0,0 +1,117 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: IncrementalInput.py
+# Author: Nicholas Russo
+# Description: This file includes a class that reads only the rows appended
+#  to a growing text file since the last run. A checkpoint file records the
+#  inode of the input, the byte offset just past the last complete row read
+#  and a checksum of the first bytes of the file. If the input was rotated
+#  (new inode), truncated (shorter than the offset) or rewritten in place
+#  (different first bytes), reading starts over from the beginning. A row
+#  still being written (no trailing newline yet) is left for the next run.
+###############################################################################
+
+import os
+import zlib
+
+# Number of leading bytes of the input covered by the checkpoint checksum
+FINGERPRINT_LEN = 256
+
+# Defines a reader of the rows appended to a file since its checkpoint
+class IncrementalInput(object):
+
+    # Opens "path" for reading from the offset saved in "checkpointPath";
+    #  a missing or unreadable checkpoint means reading from the beginning
+    def __init__(self, path, checkpointPath):
+        if( path is None or len( path ) == 0 ):
+            raise AttributeError( "path is None or empty" )
+        if( checkpointPath is None or len( checkpointPath ) == 0 ):
+            raise AttributeError( "checkpointPath is None or empty" )
+
+        self._checkpointPath = checkpointPath
+        self._file = open( path, "rb" )
+        self._inode = os.fstat( self._file.fileno() ).st_ino
+
+        self._wasReset = False
+        self._offset = 0
+        checkpoint = self._loadCheckpoint()
+        if( checkpoint is not None ):
+            inode, offset, fingerprintLen, fingerprint = checkpoint
+            size = os.fstat( self._file.fileno() ).st_size
+            if( inode == self._inode and offset <= size and
+            self._readFingerprint( fingerprintLen ) == fingerprint ):
+                self._offset = offset
+            else:
+                self._wasReset = True
+        self._startOffset = self._offset
+
+    # Returns ( length, checksum ) of the first "length" bytes of the input
+    #  (default: up to FINGERPRINT_LEN)
+    def _readFingerprint(self, length = FINGERPRINT_LEN):
+        self._file.seek( 0 )
+        data = self._file.read( length )
+        return ( len( data ), zlib.crc32( data ) & 0xFFFFFFFF )
+
+    # Returns ( inode, offset, fingerprint length, fingerprint ) from the
+    #  checkpoint file, or None if there is no valid checkpoint
+    def _loadCheckpoint(self):
+        try:
+            with open( self._checkpointPath, "r" ) as checkpointFile:
+                fields = [ int( field ) for field in
+                    checkpointFile.read().split() ]
+        except ( IOError, ValueError ):
+            return None
+        if( len( fields ) != 4 or min( fields ) < 0 ):
+            return None
+        return ( fields[0], fields[1], fields[2], ( fields[2], fields[3] ) )
+
+    # Returns True if the checkpoint was discarded because the input was
+    #  rotated, truncated or rewritten
+    def wasReset(self):
+        return self._wasReset
+
+    # Returns the offset from which this run started reading
+    def getStartOffset(self):
+        return self._startOffset
+
+    # Returns the offset just past the last complete row read so far
+    def getOffset(self):
+        return self._offset
+
+    # Yields every complete row appended since the checkpoint, without its
+    #  line terminator. The offset advances past each row as it is yielded.
+    def iterRows(self):
+        self._file.seek( self._offset )
+        for line in self._file:
+            if( not line.endswith( "\n" ) ):
+                break
+            self._offset += len( line )
+            yield line.rstrip( "\r\n" )
+
+    # Saves the current offset as the checkpoint. Call it only after the
+    #  output for the rows read has been written: a failure in between
+    #  repeats those rows on the next run, but never skips any. The file is
+    #  replaced atomically so a crash never leaves a partial checkpoint.
+    def commit(self):
+        fingerprintLen = min( self._offset, FINGERPRINT_LEN )
+        length, fingerprint = self._readFingerprint( fingerprintLen )
+        temporaryPath = self._checkpointPath + ".tmp"
+        with open( temporaryPath, "w" ) as checkpointFile:
+            checkpointFile.write( "%d %d %d %d\n" % ( self._inode,
+                self._offset, length, fingerprint ) )
+            checkpointFile.flush()
+            os.fsync( checkpointFile.fileno() )
+        os.rename( temporaryPath, self._checkpointPath )
+
+    # Closes the input without saving the checkpoint
+    def close(self):
+        self._file.close()
+
+    # Implements the context manager protocol; the input is closed on exit
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+        return False
@@ -0,0 +1,144 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: IncrementalInput_Test.py
+# Author: Nicholas Russo
+# Description: This file includes a class that represents a test case for the
+#  incremental reader. Appended rows, partial rows, truncation, rotation and
+#  the incremental mode of nettools are tested here.
+###############################################################################
+
+from IncrementalInput import IncrementalInput
+from nettools import nettools
+import os
+import shutil
+import StringIO
+import sys
+import tempfile
+import unittest
+
+# Defines an incremental reader test case
+class IncrementalInput_Test( unittest.TestCase ):
+
+    # Builds a test suite from all of the methods defined in this class
+    @staticmethod
+    def buildTestSuite():
+        return unittest.TestLoader().loadTestsFromTestCase( IncrementalInput_Test )
+
+    def setUp(self):
+        self._directory = tempfile.mkdtemp()
+        self._path = os.path.join( self._directory, "input" )
+        self._checkpointPath = os.path.join( self._directory, "checkpoint" )
+
+    def tearDown(self):
+        shutil.rmtree( self._directory )
+
+    # Appends "data" to the input file
+    def append(self, data, mode = "ab"):
+        with open( self._path, mode ) as inputFile:
+            inputFile.write( data )
+
+    # Returns the rows read since the checkpoint and whether it was reset;
+    #  the checkpoint is saved afterwards
+    def readRows(self):
+        with IncrementalInput( self._path, self._checkpointPath ) as reader:
+            rows = list( reader.iterRows() )
+            reader.commit()
+            return rows, reader.wasReset()
+
+    # Only complete rows appended since the last run are read
+    def test_append(self):
+        self.append( "10.1.1.1\n10.1.1.2\r\n10.1." )
+        self.assertTrue( self.readRows() == ( [ "10.1.1.1", "10.1.1.2" ], False ) )
+        self.assertTrue( self.readRows() == ( [], False ) )
+        self.append( "1.3\n\n10.1.1.4\n" )
+        self.assertTrue( self.readRows() == ( [ "10.1.1.3", "", "10.1.1.4" ],
+            False ) )
+
+        # Rows not committed are read again
+        self.append( "10.1.1.5\n" )
+        with IncrementalInput( self._path, self._checkpointPath ) as reader:
+            self.assertTrue( list( reader.iterRows() ) == [ "10.1.1.5" ] )
+            self.assertTrue( reader.getOffset() == os.path.getsize( self._path ) )
+        self.assertTrue( self.readRows() == ( [ "10.1.1.5" ], False ) )
+
+    # Truncated, rotated and rewritten inputs are read from the beginning
+    def test_reset(self):
+        self.append( "10.1.1.1\n10.1.1.2\n" )
+        self.readRows()
+        self.append( "10.2.2.2\n", "wb" )
+        self.assertTrue( self.readRows() == ( [ "10.2.2.2" ], True ) )
+
+        os.rename( self._path, self._path + ".1" )
+        self.append( "10.3.3.3\n" )
+        self.assertTrue( self.readRows() == ( [ "10.3.3.3" ], True ) )
+
+        # Same inode and a longer file, but different first bytes
+        self.append( "10.4.4.4\n10.4.4.5\n", "r+b" )
+        self.assertTrue( self.readRows() == ( [ "10.4.4.4", "10.4.4.5" ], True ) )
+
+        # A corrupt checkpoint is ignored
+        with open( self._checkpointPath, "w" ) as checkpointFile:
+            checkpointFile.write( "clown" )
+        self.assertTrue( self.readRows() == ( [ "10.4.4.4", "10.4.4.5" ], False ) )
+        self.assertRaises( AttributeError, IncrementalInput, None,
+            self._checkpointPath )
+        self.assertRaises( IOError, IncrementalInput, self._path + ".2",
+            self._checkpointPath )
+
+    # nettools appends the results of new rows to its output
+    def test_nettools(self):
+        outputPath = os.path.join( self._directory, "output" )
+        args = [ "nettools", "mip2mac", "--incremental", self._path, outputPath ]
+        self.append( "239.1.1.1\n" )
+        self.assertTrue( nettools( args ) == 0 )
+        self.append( "239.2.2.2\n10.1.1.1\n" )
+        self.assertTrue( nettools( args ) == 0 )
+        self.assertTrue( nettools( args ) == 0 )
+        with open( outputPath ) as outputFile:
+            self.assertTrue( outputFile.read() ==
+                "01:00:5e:01:01:01\n01:00:5e:02:02:02\n" )
+        self.assertTrue( os.path.exists( outputPath + ".checkpoint" ) )
+
+        # Missing output path; usage is printed
+        stdout = sys.stdout
+        sys.stdout = StringIO.StringIO()
+        try:
+            self.assertTrue( nettools( args[0:4] ) == 1 )
+        finally:
+            sys.stdout = stdout
+
+    # nettools convert appends the rows of new input, with one CSV header
+    def test_nettoolsConvert(self):
+        outputPath = os.path.join( self._directory, "output" )
+        args = [ "nettools", "convert", "--columns", "input,string",
+            "--incremental", self._path, outputPath, self._checkpointPath ]
+        self.append( "10.1.1.1\n" )
+        self.assertTrue( nettools( args ) == 0 )
+        self.append( "0.0.0.1\n" )
+        self.assertTrue( nettools( args ) == 0 )
+        self.assertTrue( nettools( args ) == 0 )
+        with open( outputPath ) as outputFile:
+            self.assertTrue( outputFile.read() ==
+                "input,string\n10.1.1.1,10.1.1.1\n0.0.0.1,0.0.0.1\n" )
+
+        # Invalid rows are reported and skipped; the checkpoint still moves
+        stderr = sys.stderr
+        stdout = sys.stdout
+        sys.stderr = StringIO.StringIO()
+        sys.stdout = StringIO.StringIO()
+        try:
+            self.append( "clown\n10.2.2.2\n" )
+            self.assertTrue( nettools( args ) == 1 )
+            self.assertTrue( "Invalid input 'clown'" in sys.stderr.getvalue() )
+            self.assertTrue( nettools( args ) == 0 )
+
+            # Missing output path; usage is printed
+            self.assertTrue( nettools( args[0:6] ) == 1 )
+            self.assertTrue( sys.stdout.getvalue().startswith( "Usage:" ) )
+        finally:
+            sys.stderr = stderr
+            sys.stdout = stdout
+        with open( outputPath ) as outputFile:
+            self.assertTrue( outputFile.read().endswith(
+                "0.0.0.1,0.0.0.1\n10.2.2.2,10.2.2.2\n" ) )
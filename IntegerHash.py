@@ -0,0 +1,34 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: IntegerHash.py
+# Author: Nicholas Russo
+# Description: This file includes fast, deterministic hash functions for the
+#  unsigned integer values of network addresses (see NetAddress.toInteger).
+#  Unlike the built-in hash(), the results are identical across processes
+#  and hosts, so they can be stored in files or shared between workers.
+###############################################################################
+
+# All arithmetic is performed modulo 2^64
+MASK64 = 0xFFFFFFFFFFFFFFFF
+
+# Scrambles the 64-bit integer "value" using the SplitMix64 finalizer. Every
+#  input bit affects every output bit, which is what derived indices need.
+def mix64( value ):
+    value = ( value + 0x9E3779B97F4A7C15 ) & MASK64
+    value = ( ( value ^ ( value >> 30 ) ) * 0xBF58476D1CE4E5B9 ) & MASK64
+    value = ( ( value ^ ( value >> 27 ) ) * 0x94D049BB133111EB ) & MASK64
+    return value ^ ( value >> 31 )
+
+# Returns a 64-bit hash of the unsigned integer "value", which may be wider
+#  than 64 bits (e.g. IPv6). The "seed" selects an independent hash function.
+def hashInteger( value, seed = 0 ):
+    result = mix64( ( value ^ seed ) & MASK64 )
+    
+    # Fold in each additional 64-bit word so that wide values hash completely
+    value >>= 64
+    while( value ):
+        result = mix64( result ^ ( value & MASK64 ) )
+        value >>= 64
+    
+    return result
@@ -10,11 +10,56 @@
 #  parent class (NetAddress).
 ###############################################################################
 
-from NetAddress import NetAddress
+from NetAddress import NetAddress, memoized, memoizedFlag
+
+# Characters allowed in the hex digits of a MAC address
+_HEX_DIGITS = "0123456789abcdefABCDEF"
+
+# Returns the 48-bit integer value of the MAC address "inputString", which
+#  may be in colon (aa:bb:cc:dd:ee:ff, octets of 1 or 2 digits), dash
+#  (aa-bb-cc-dd-ee-ff), Cisco dotted (aabb.ccdd.eeff) or bare (aabbccddeeff)
+#  format. The format is picked from the length and delimiter positions, so
+#  the common forms are checked without splitting the string.
+def parseMacValue( inputString ):
+    
+    # Test for a null reference; raise error (same as _splitInputString)
+    if( inputString is None or len( inputString ) == 0 ):
+        raise AttributeError( "inputString is None or empty" )
+    
+    length = len( inputString )
+    if( length == 12 ):
+        digits = inputString
+    elif( length == 14 and inputString[4] == "." and inputString[9] == "." ):
+        digits = inputString[0:4] + inputString[5:9] + inputString[10:14]
+    elif( length == 17 and inputString[2] in ":-" and
+    inputString[2::3] == inputString[2] * 5 ):
+        digits = inputString.replace( inputString[2], "" )
+    else:
+        # Separated octets of 1 or 2 digits (e.g. 0:1b:2:3c:4:5e)
+        digits = ""
+        for delim in ":-":
+            stringOctets = inputString.split( delim )
+            if( len( stringOctets ) == 6 and all( 1 <= len( stringOctet ) <= 2
+            for stringOctet in stringOctets ) ):
+                digits = "".join( stringOctet.zfill( 2 )
+                    for stringOctet in stringOctets )
+                break
+    
+    # Every character left must be a hex digit (int() alone would also
+    #  accept signs, whitespace and "0x")
+    if( len( digits ) != 12 or digits.strip( _HEX_DIGITS ) != "" ):
+        raise ValueError( "Unable to parse MAC address: " + inputString )
+    return int( digits, 16 )
 
 # Defines a MAC address, inheriting from NetAddress
 class MACAddress(NetAddress):
     
+    # Number of bits in the address, also the maximum address length
+    _maxAddrLen = 48
+    
+    # Slots for the cached string forms specific to this class
+    __slots__ = ( "_stringCisco", )
+    
     # Invokes the parent constructor to build the network address, which
     #  performs most of the heavy lifting. Performs upper-bound checking
     #  on the address length to ensure it is not greater than 48. Note
@@ -27,37 +72,14 @@ class MACAddress(NetAddress):
             
         NetAddress.__init__(self, inputString, addrLen)
     
-    # Implements the abstract method defined in NetAddress. Breaks an
-    #  EUI-formatted MAC address into a list of 6 integers; this
-    #  list is returned from the method      
+    # Implements the abstract method defined in NetAddress. Breaks a MAC
+    #  address in any of the formats accepted by parseMacValue() into a list
+    #  of 6 integers; this list is returned from the method
     def _parseInputString( self, inputString ):
         
-        # Split the input string into 6 separate octets; any errors
-        #  raised by this method are passed up the recursion stack
-        ipStringOctets = self._splitInputString( inputString, ":", 6 )
-        
-        # Iterate over all of the substrings, which should be 
-        #  8-bit unsigned integers
-        integerOctets = []
-        for ipStringOctet in ipStringOctets:
-            
-            # Test for valid range 0 <= x <= 255
-            current = int( ipStringOctet, 16 )
-            if( current < 0 or current > 255 ):
-                # Range invalid; raise error
-                raise ValueError( "current out of range: " + str( current ) )
-            
-            # Range valid; add current to list    
-            integerOctets.append( current )
-            
-        # Final sanity check; there should be exactly 4 octets in the list
-        if( len( integerOctets ) != 6 ):
-            raise ValueError( "len( integerOctets ) is not 6:" + 
-            str( len( integerOctets )  ) )
-            
-        # Return the list of integer octets after parsing.
-        #  This typically will be returned to the parent's constructor
-        return integerOctets
+        # Errors raised by the parser are passed up the recursion stack
+        value = parseMacValue( inputString )
+        return [ ( value >> shift ) & 0xFF for shift in range( 40, -8, -8 ) ]
         
     # Returns the host length of a given address. In this case, it
     #  is 48 minus the prefix length, which identifies how many
@@ -66,6 +88,7 @@ class MACAddress(NetAddress):
         return 48 - self.getAddrLen()
 
     # Return the MAC address in EUI format (xx:xx:xx:xx:xx:xx)
+    @memoized( "_string" )
     def toString(self): 
         
         # Start with an empty string
@@ -86,6 +109,7 @@ class MACAddress(NetAddress):
         return macString
         
     # Return the MAC address in Cisco format (xxxx.xxxx.xxxx)
+    @memoized( "_stringCisco" )
     def toStringCisco(self): 
         
         # Start with an empty string
@@ -111,17 +135,35 @@ class MACAddress(NetAddress):
         return self.toString()
     
     # Return true if the seventh bit of the first byte is set
+    @memoizedFlag
     def isULset(self):
         return self._isBitset( 6, 0 )
     
     # Return true if the eigth bit of the first byte is set
+    @memoizedFlag
     def isIGset(self):
         return self._isBitset( 7, 0 )
             
+    # Return the modified EUI-64 interface ID (RFC 4291) as a 64-bit integer
+    #  (e.g. 00:1a:2b:3c:4d:5e -> 0x021a2bfffe3c4d5e)
+    def toEUI64(self):
+        from NeighborDiscovery import macToEUI64Value
+        return macToEUI64Value( self.toInteger() )
+    
+    # Return the SLAAC link-local IPv6Address (fe80::/64 plus the modified
+    #  EUI-64 interface ID); the address length is 64
+    def toLinkLocalAddress(self):
+        from IPv6Address import IPv6Address
+        from NeighborDiscovery import macToLinkLocalValue
+        return IPv6Address.fromInteger( 
+            macToLinkLocalValue( self.toInteger() ), 64 )
+    
     # Test for multicast MAC addressing (I/G clear)  
+    @memoizedFlag
     def isUnicast(self):   
         return not self.isIGset()
           
     # Test for multicast MAC addressing (I/G set)  
+    @memoizedFlag
     def isMulticast(self):
         return self.isIGset()
\ No newline at end of file
@@ -178,4 +178,21 @@ class MACAddress_Test( NetAddress_Test ):
                 
                 # Increment the iterator by 2 since two assertions are
                 #  performed on each double-octet (one per octet)
-                i += 2           
\ No newline at end of file
+                i += 2
+
+    # Tests that every supported input format parses to the same address,
+    #  including the output of toStringCisco(), and that mixed or malformed
+    #  delimiters are rejected
+    def test_parseFormats(self):
+        for mac in self.getNetAddressList():
+            digits = "%012x" % mac.toInteger()
+            for inputString in ( mac.toString(), mac.toStringCisco(),
+            mac.toString().replace( ":", "-" ), digits, digits.upper() ):
+                self.assertTrue( MACAddress( inputString ).toInteger() ==
+                    mac.toInteger() )
+
+        self.assertTrue( MACAddress( "0:1b:2:3c:4:5e" ) ==
+            MACAddress( "00:1b:02:3c:04:5e" ) )
+        for bogusInputString in ( "00:1b:02-3c:04:5e", "001b.023c.045",
+        "001b:023c:045e", "+01b023c045e", "001b023c045e0", "00-1b-02-3c-04" ):
+            self.assertRaises( ValueError, MACAddress, bogusInputString )
@@ -0,0 +1,75 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: MACNormalizer.py
+# Author: Nicholas Russo
+# Description: This file includes a function that normalizes columns of MAC
+#  addresses written in mixed formats (colon, dash, Cisco dotted or bare hex,
+#  see MACAddress.parseMacValue) in bulk. Each row is parsed once into its
+#  integer value and rendered in one canonical format; no MACAddress objects
+#  are built. Results are cached by input string since inventories repeat
+#  the same MACs many times. Invalid rows are flagged rather than raised.
+###############################################################################
+
+from MACAddress import parseMacValue
+import array
+
+# Canonical output formats
+COLON = "colon"
+DASH = "dash"
+CISCO = "cisco"
+BARE = "bare"
+
+# Values are returned in an array of unsigned longs where those are 64 bits
+#  wide. Python 2 has no array type of 64 bits on every platform (on Windows
+#  and 32-bit builds "L" is 32 bits, too narrow for 48-bit values), so a list
+#  is used there.
+_LONG_TYPE = "L" if array.array( "L" ).itemsize >= 8 else None
+
+# Returns the string of "digits" (12 hex digits) in the format "style"
+def _formatDigits( digits, style ):
+    if( style == CISCO ):
+        return digits[0:4] + "." + digits[4:8] + "." + digits[8:12]
+    elif( style == BARE ):
+        return digits
+
+    delim = ":" if style == COLON else "-"
+    return digits[0:2] + delim + digits[2:4] + delim + digits[4:6] + delim + \
+        digits[6:8] + delim + digits[8:10] + delim + digits[10:12]
+
+# Returns the canonical string of the 48-bit integer "value" in the format
+#  "style" (lower case hex; COLON matches MACAddress.toString())
+def formatMacValue( value, style = COLON ):
+    if( style not in ( COLON, DASH, CISCO, BARE ) ):
+        raise ValueError( "Unknown MAC format: " + str( style ) )
+    return _formatDigits( "%012x" % value, style )
+
+# Normalizes every string in the sequence "column" (surrounding whitespace is
+#  ignored). Returns a tuple of three parallel sequences: an array of the
+#  integer values (a list where unsigned longs are too narrow), a list of canonical strings in the format "style" and a
+#  bytearray error mask. Rows that are not valid MACs have value 0, string
+#  None and mask 1; every other row has mask 0.
+def normalizeMacs( column, style = COLON ):
+    if( style not in ( COLON, DASH, CISCO, BARE ) ):
+        raise ValueError( "Unknown MAC format: " + str( style ) )
+
+    values = array.array( _LONG_TYPE ) if _LONG_TYPE is not None else []
+    strings = []
+    errors = bytearray( len( column ) )
+    cache = {}
+    for row, inputString in enumerate( column ):
+        try:
+            value, canonical = cache[ inputString ]
+        except KeyError:
+            try:
+                value = parseMacValue( inputString.strip() )
+                canonical = _formatDigits( "%012x" % value, style )
+            except ( AttributeError, ValueError ):
+                value, canonical = 0, None
+            cache[ inputString ] = ( value, canonical )
+
+        if( canonical is None ):
+            errors[ row ] = 1
+        values.append( value )
+        strings.append( canonical )
+    return values, strings, errors
@@ -0,0 +1,65 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: MACNormalizer_Test.py
+# Author: Nicholas Russo
+# Description: This file includes a class that represents a test case for the
+#  bulk MAC normalizer. Mixed input formats, every output format and the
+#  error mask are tested here.
+###############################################################################
+
+from MACNormalizer import normalizeMacs, formatMacValue, COLON, DASH, CISCO, BARE
+import MACNormalizer
+from MACAddress import MACAddress
+import unittest
+
+# Defines a MAC normalizer test case
+class MACNormalizer_Test( unittest.TestCase ):
+
+    # Builds a test suite from all of the methods defined in this class
+    @staticmethod
+    def buildTestSuite():
+        return unittest.TestLoader().loadTestsFromTestCase( MACNormalizer_Test )
+
+    # Mixed formats must normalize to the same value and canonical string
+    def test_normalize(self):
+        column = [ "00:1B:2c:3d:4e:5f", "00-1b-2c-3d-4e-5f", " 001b.2c3d.4e5f\n",
+            "001b2c3d4e5f", "0:1b:2c:3d:4e:5f", "00:1b:2c:3d:4e:5f" ]
+        values, strings, errors = normalizeMacs( column )
+        self.assertTrue( list( values ) == [ 0x001b2c3d4e5f ] * len( column ) )
+        self.assertTrue( strings == [ "00:1b:2c:3d:4e:5f" ] * len( column ) )
+        self.assertTrue( errors == bytearray( len( column ) ) )
+        self.assertTrue( strings[0] == MACAddress( column[1] ).toString() )
+
+        for style, expected in ( ( DASH, "00-1b-2c-3d-4e-5f" ),
+        ( CISCO, "001b.2c3d.4e5f" ), ( BARE, "001b2c3d4e5f" ) ):
+            self.assertTrue( normalizeMacs( column, style )[1] ==
+                [ expected ] * len( column ) )
+            self.assertTrue( formatMacValue( 0x001b2c3d4e5f, style ) ==
+                expected )
+        self.assertTrue( MACAddress( formatMacValue( 0x001b2c3d4e5f, CISCO ) )
+            .toStringCisco() == "001b.2c3d.4e5f" )
+
+    # Invalid rows are flagged in the mask without stopping the others, with
+    #  the values in an array and in the list used where unsigned longs are
+    #  too narrow
+    def test_errors(self):
+        longType = MACNormalizer._LONG_TYPE
+        try:
+            for testType in ( longType, None ):
+                MACNormalizer._LONG_TYPE = testType
+                self.checkErrors()
+        finally:
+            MACNormalizer._LONG_TYPE = longType
+
+    # Normalizes a column with invalid rows and checks the results
+    def checkErrors(self):
+        column = [ "ff:ff:ff:ff:ff:ff", "", None, "clown", "00:1b:2c:3d:4e",
+            "0x1b2c3d4e5f", "ff:ff:ff:ff:ff:ff" ]
+        values, strings, errors = normalizeMacs( column )
+        self.assertTrue( list( errors ) == [ 0, 1, 1, 1, 1, 1, 0 ] )
+        self.assertTrue( list( values ) == [ 0xffffffffffff, 0, 0, 0, 0, 0,
+            0xffffffffffff ] )
+        self.assertTrue( strings[1:6] == [ None ] * 5 )
+        self.assertRaises( ValueError, normalizeMacs, column, "dotted" )
+        self.assertRaises( ValueError, formatMacValue, 0, "dotted" )
@@ -0,0 +1,85 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: NeighborDiscovery.py
+# Author: Nicholas Russo
+# Description: This file includes the address derivations used by IPv6
+#  neighbor discovery: MAC to modified EUI-64 interface identifiers (RFC 4291),
+#  SLAAC link-local addresses, and IPv6 to solicited-node multicast groups and
+#  their multicast MACs (RFC 2464). Each derivation works on integer values
+#  (see NetAddress.toInteger) and has a batch form that processes a whole
+#  sequence in one pass without building any objects. The MACAddress and
+#  IPv6Address classes use the scalar forms for their conversion methods.
+###############################################################################
+
+import array
+
+# Fixed bits of the derived addresses
+_EUI64_FFFE = 0xfffe << 24
+_EUI64_UL_BIT = 0x02 << 56
+_LINK_LOCAL_PREFIX = 0xfe80 << 112
+_SOLICITED_NODE_PREFIX = ( 0xff02 << 112 ) | ( 0x0001 << 32 ) | ( 0xff << 24 )
+_MULTICAST_MAC_PREFIX = 0x3333 << 32
+
+# The 48 and 64-bit batch results are arrays of unsigned longs where those
+#  are 64 bits wide. Python 2 has no array type of 64 bits on every platform
+#  (on Windows and 32-bit builds "L" is 32 bits), so lists are used there.
+_LONG_TYPE = "L" if array.array( "L" ).itemsize >= 8 else None
+
+# Returns the 48 or 64-bit integers "values" as an array of unsigned longs,
+#  or as a list where those are too narrow
+def _toLongs( values ):
+    if( _LONG_TYPE is None ):
+        return values
+    return array.array( _LONG_TYPE, values )
+
+# Returns the 64-bit modified EUI-64 interface ID for the 48-bit MAC "value":
+#  0xfffe is inserted between the OUI and NIC halves and the U/L bit is flipped
+def macToEUI64Value( value ):
+    return ( ( ( value >> 24 ) << 40 ) | _EUI64_FFFE |
+        ( value & 0xffffff ) ) ^ _EUI64_UL_BIT
+
+# Returns the 128-bit SLAAC link-local address (fe80::/64 + EUI-64 interface
+#  ID) for the 48-bit MAC "value"
+def macToLinkLocalValue( value ):
+    return _LINK_LOCAL_PREFIX | macToEUI64Value( value )
+
+# Returns the 128-bit solicited-node multicast group (ff02::1:ff00:0/104 plus
+#  the low-order 24 bits) for the 128-bit IPv6 "value"
+def ipv6ToSolicitedNodeValue( value ):
+    return _SOLICITED_NODE_PREFIX | ( value & 0xffffff )
+
+# Returns the 48-bit multicast MAC (33:33 plus the low-order 32 bits) for the
+#  128-bit IPv6 multicast "value"
+def ipv6ToMulticastMACValue( value ):
+    return _MULTICAST_MAC_PREFIX | ( value & 0xffffffff )
+
+# Batch form of macToEUI64Value(); returns an array of unsigned longs (see
+#  _toLongs)
+def macsToEUI64( macValues ):
+    return _toLongs( [ ( ( ( value >> 24 ) << 40 ) | _EUI64_FFFE |
+        ( value & 0xffffff ) ) ^ _EUI64_UL_BIT for value in macValues ] )
+
+# Batch form of macToLinkLocalValue(); returns a list since the 128-bit
+#  values do not fit in an array element
+def macsToLinkLocal( macValues ):
+    return [ _LINK_LOCAL_PREFIX | value for value in macsToEUI64( macValues ) ]
+
+# Batch form of ipv6ToSolicitedNodeValue(); returns a list of 128-bit values
+def ipv6sToSolicitedNode( ipv6Values ):
+    return [ _SOLICITED_NODE_PREFIX | ( value & 0xffffff )
+        for value in ipv6Values ]
+
+# Returns an array of the 48-bit MACs of the solicited-node groups for the
+#  IPv6 values. Equivalent to ipv6sToMulticastMAC( ipv6sToSolicitedNode() )
+#  without building the intermediate 128-bit values (33:33:ff + low 24 bits).
+def ipv6sToSolicitedNodeMAC( ipv6Values ):
+    prefix = _MULTICAST_MAC_PREFIX | ( 0xff << 24 )
+    return _toLongs( [ prefix | ( value & 0xffffff )
+        for value in ipv6Values ] )
+
+# Batch form of ipv6ToMulticastMACValue(); returns an array of unsigned longs
+#  (see _toLongs)
+def ipv6sToMulticastMAC( ipv6Values ):
+    return _toLongs( [ _MULTICAST_MAC_PREFIX | ( value & 0xffffffff )
+        for value in ipv6Values ] )
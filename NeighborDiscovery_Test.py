@@ -0,0 +1,101 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: NeighborDiscovery_Test.py
+# Author: Nicholas Russo
+# Description: This file includes a class that represents a test case for the
+#  neighbor discovery derivations. The scalar conversion methods on the
+#  MACAddress and IPv6Address classes are tested against known values, and
+#  the batch functions are tested against the scalar methods.
+###############################################################################
+
+from IPv6Address import IPv6Address
+from MACAddress import MACAddress
+import NeighborDiscovery
+import unittest
+
+# Defines a neighbor discovery test case
+class NeighborDiscovery_Test( unittest.TestCase ):
+
+    # Builds a test suite from all of the methods defined in this class
+    @staticmethod
+    def buildTestSuite():
+        return unittest.TestLoader().loadTestsFromTestCase( 
+            NeighborDiscovery_Test )
+
+    # Builds the MAC and IPv6 addresses used by every test
+    def setUp(self):
+        self._macList = [ MACAddress( "00:1a:2b:3c:4d:5e" ),
+            MACAddress( "02:00:00:00:00:01" ), MACAddress( "ff:ff:ff:ff:ff:ff" ),
+            MACAddress( "00:00:00:00:00:00" ) ]
+        self._ipv6List = [ 
+            IPv6Address( "2001:0db8:0000:0000:0001:0002:0003:0004" ),
+            IPv6Address( "fe80:0000:0000:0000:021a:2bff:fe3c:4d5e" ),
+            IPv6Address( "ff02:0000:0000:0000:0000:0000:0000:0001" ) ]
+
+    def tearDown(self):
+        self._macList = None
+        self._ipv6List = None
+
+    # Tests the toEUI64() and toLinkLocalAddress() methods in MACAddress
+    def test_toLinkLocalAddress(self):
+        mac = self._macList[0]
+        self.assertTrue( mac.toEUI64() == 0x021a2bfffe3c4d5e )
+
+        linkLocal = mac.toLinkLocalAddress()
+        self.assertTrue( linkLocal.toString() == 
+            "fe80:0000:0000:0000:021a:2bff:fe3c:4d5e" )
+        self.assertTrue( linkLocal.getAddrLen() == 64 )
+        self.assertTrue( linkLocal.isLinkLocalAddress() )
+
+        # Locally administered MACs have the U/L bit cleared in the ID
+        self.assertTrue( self._macList[1].toEUI64() == 0x000000fffe000001 )
+
+    # Tests the getSolicitedNodeAddress() method in IPv6Address
+    def test_getSolicitedNodeAddress(self):
+        solicitedNode = self._ipv6List[0].getSolicitedNodeAddress()
+        self.assertTrue( solicitedNode.toString() == 
+            "ff02:0000:0000:0000:0000:0001:ff03:0004" )
+        self.assertTrue( solicitedNode.isMulticast() )
+
+    # Tests the toMulticastMAC() method in IPv6Address
+    def test_toMulticastMAC(self):
+        self.assertTrue( self._ipv6List[0].toMulticastMAC() is None )
+        self.assertTrue( self._ipv6List[2].toMulticastMAC().toString() == 
+            "33:33:00:00:00:01" )
+
+        mac = self._ipv6List[1].getSolicitedNodeAddress().toMulticastMAC()
+        self.assertTrue( mac.toString() == "33:33:ff:3c:4d:5e" )
+        self.assertTrue( mac.isMulticast() )
+
+    # The batch functions must agree with the scalar methods, with arrays
+    #  and with the lists used where unsigned longs are too narrow
+    def test_batchFunctions(self):
+        macValues = [ mac.toInteger() for mac in self._macList ]
+        ipv6Values = [ ip.toInteger() for ip in self._ipv6List ]
+        longType = NeighborDiscovery._LONG_TYPE
+        try:
+            for testType in ( longType, None ):
+                NeighborDiscovery._LONG_TYPE = testType
+                self.checkBatchFunctions( macValues, ipv6Values )
+        finally:
+            NeighborDiscovery._LONG_TYPE = longType
+
+    # Compares the batch functions for "macValues" and "ipv6Values" with the
+    #  scalar methods
+    def checkBatchFunctions(self, macValues, ipv6Values):
+        self.assertTrue( list( NeighborDiscovery.macsToEUI64( macValues ) ) ==
+            [ mac.toEUI64() for mac in self._macList ] )
+        self.assertTrue( NeighborDiscovery.macsToLinkLocal( macValues ) ==
+            [ mac.toLinkLocalAddress().toInteger() for mac in self._macList ] )
+
+        solicitedNodes = [ ip.getSolicitedNodeAddress()
+            for ip in self._ipv6List ]
+        self.assertTrue( NeighborDiscovery.ipv6sToSolicitedNode( ipv6Values ) ==
+            [ ip.toInteger() for ip in solicitedNodes ] )
+        self.assertTrue( list( 
+            NeighborDiscovery.ipv6sToSolicitedNodeMAC( ipv6Values ) ) ==
+            [ ip.toMulticastMAC().toInteger() for ip in solicitedNodes ] )
+        self.assertTrue( list( 
+            NeighborDiscovery.ipv6sToMulticastMAC( ipv6Values[2:] ) ) ==
+            [ self._ipv6List[2].toMulticastMAC().toInteger() ] )
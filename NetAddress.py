@@ -10,19 +10,108 @@
 ###############################################################################
 
 import abc
+import functools
+import itertools
 
-# Defines a generic network address object
+# Decorator for methods without arguments whose result depends only on the
+#  (immutable) address. The first call computes the result and stores it in
+#  the slot named "slotName" through object.__setattr__, the same way
+#  toInteger() caches its value; later calls read the slot. Storing the same
+#  value twice from two threads is harmless, so no lock is needed.
+def memoized( slotName ):
+    def decorator( method ):
+        
+        @functools.wraps( method )
+        def wrapper( self ):
+            try:
+                return getattr( self, slotName )
+            except AttributeError:
+                value = method( self )
+                object.__setattr__( self, slotName, value )
+                return value
+        return wrapper
+    return decorator
+
+# Every predicate decorated with memoizedFlag takes the next bit pair of the
+#  "_flags" slot, shared by all address classes
+_nextFlag = itertools.count()
+
+# Decorator for the boolean classification methods (the is* predicates).
+#  Each one owns two bits of the "_flags" integer: one set once the result
+#  is known and one holding the result. Two threads caching different
+#  predicates at once may lose one of the bits, which only means that
+#  predicate is computed again later.
+def memoizedFlag( method ):
+    index = _nextFlag.next()
+    known = 1 << ( 2 * index )
+    isSet = known << 1
+    
+    @functools.wraps( method )
+    def wrapper( self ):
+        try:
+            flags = self._flags
+        except AttributeError:
+            flags = 0
+        if( flags & known ):
+            return flags & isSet != 0
+        value = bool( method( self ) )
+        if( value ):
+            flags |= isSet
+        object.__setattr__( self, "_flags", flags | known )
+        return value
+    return wrapper
+
+# Defines a generic network address object. Objects are immutable once
+#  built, so they can be shared freely (e.g. between threads or as dict keys)
 class NetAddress(object):
     __metaclass__ = abc.ABCMeta
     
-    # Constructor stores each byte separately in an array after parsing the
+    # The octets and address length, then the values cached on first use.
+    #  Child classes add slots for their own string forms.
+    __slots__ = ( "_octet", "_addrLen", "_flags", "_integer", "_prefixKey",
+        "_network", "_endOfSubnet", "_string" )
+    
+    # Constructor stores each byte separately in a tuple after parsing the
     #  input string according to a child-defined method. Perform lower-bound
     #  error-checking on the address length to ensure it is non-negative.
     def __init__(self, inputString, addrLen):
-        self._octet = self._parseInputString( inputString )
+        octets = tuple( self._parseInputString( inputString ) )
         if ( addrLen < 0 ):
             raise ValueError("addrLen is negative: " + str( addrLen ) )
-        self._addrLen = addrLen
+        self._initialize( octets, addrLen )
+    
+    # Stores the octets and address length; apart from the cached values
+    #  (see memoized and memoizedFlag), the only place attributes are ever
+    #  set since __setattr__ refuses to modify the object
+    def _initialize(self, octets, addrLen):
+        object.__setattr__( self, "_octet", octets )
+        object.__setattr__( self, "_addrLen", addrLen )
+    
+    # Addresses are immutable; any attempt to set or delete an attribute fails
+    def __setattr__(self, name, value):
+        raise AttributeError( "NetAddress objects are immutable" )
+    
+    def __delattr__(self, name):
+        raise AttributeError( "NetAddress objects are immutable" )
+    
+    # Pickle only the octets and address length, never the cached values
+    def __getstate__(self):
+        return ( self._octet, self._addrLen )
+    
+    def __setstate__(self, state):
+        self._initialize( *state )
+    
+    # Two addresses are equal if they are the same type, have the same octets
+    #  and the same address length
+    def __eq__(self, other):
+        return ( self.__class__ == other.__class__ and 
+        self._octet == other._octet and self._addrLen == other._addrLen )
+    
+    def __ne__(self, other):
+        return not self.__eq__( other )
+    
+    def __hash__(self):
+        return hash( ( self.__class__, self._octet, self._addrLen ) )
         
     # Consumes the "inputString" parameter and turns it into a list of octets
     #  for use with arithmetic functions. Implemented by child classes since
@@ -65,66 +154,109 @@ class NetAddress(object):
             # Index out of bounds condition, return -1 to signal error
             # TODO: Could raise an error alternatively
             return -1
-            
-    def _setOctet(self, octet, value):
-        
-        # Test validity of the octet index and the value.
-        #  If either is invalid, make no change.
-        if ( ( octet >= 1 and octet <= len( self._octet ) ) 
-        and ( value >= 0 and value <= 255 ) ):
-            self._octet[octet - 1] = value
     
     # Returns the address length (aka prefix length) of the given address        
     def getAddrLen(self):
         return self._addrLen
+    
+    # Returns the address as one unsigned integer built from the octets in
+    #  network (big endian) order (e.g. 10.0.0.1 -> 167772161). Bulk tools
+    #  store and compare these values instead of whole objects. The value is
+    #  computed once and cached; storing it twice from two threads is
+    #  harmless, so no lock is needed.
+    def toInteger(self):
+        try:
+            return self._integer
+        except AttributeError:
+            value = 0
+            for octet in self._octet:
+                value = ( value << 8 ) | octet
+            object.__setattr__( self, "_integer", value )
+            return value
+    
+    # Builds an object of the calling child class directly from the unsigned
+    #  integer "value", skipping string parsing altogether. The address
+    #  length defaults to the full length of the address, like constructors.
+    @classmethod
+    def fromInteger( cls, value, addrLen = None ):
+        if ( addrLen is None ):
+            addrLen = cls._maxAddrLen
+        
+        # Perform the same bounds checking as the constructors
+        if ( addrLen < 0 or addrLen > cls._maxAddrLen ):
+            raise ValueError("addrLen is out of range: " + str( addrLen ) )
+        if ( value < 0 or value >> cls._maxAddrLen != 0 ):
+            raise ValueError("value is out of range: " + str( value ) )
+        
+        # Peel off the octets from the low-order end, then reverse them
+        octets = []
+        for i in range( 0, cls._maxAddrLen / 8 ):
+            octets.append( int( value & 0xFF ) )
+            value >>= 8
+        octets.reverse()
+        
+        # Bypass the constructor since there is no string to parse
+        address = cls.__new__( cls )
+        address._initialize( tuple( octets ), addrLen )
+        return address
         
     # Returns the last host address in the subnet, effectively the same
-    #  as getNetwork() except with all 1s in the host address TODO
+    #  as getNetwork() except with all 1s in the host address
+    #  (e.g. 10.4.6.68/28 -> 10.4.6.79/28)
+    @memoized( "_endOfSubnet" )
     def getEndOfSubnet(self):
-        raise NotImplementedError()
+        hostMask = ( 1 << self.getHostLen() ) - 1
+        return self.__class__.fromInteger( self.toInteger() | hostMask,
+            self._addrLen )
         
     # Returns the beginning of the network range (the "network")
-    #  based on the address length (e.g. 10.4.6.68/28 -> 10.4.6.64/28)    
+    #  based on the address length (e.g. 10.4.6.68/28 -> 10.4.6.64/28).
+    #  A new object is returned; "self" is never modified.
+    @memoized( "_network" )
     def getNetwork(self):
         
-        # Create a copy of the original object for modification
-        prefix = self
-        
-        # Determine the number of octets to totally clear; this simplifies
-        #  operations since we don't have to iterate over bits if the
-        #  entire byte needs to be zero
-        octetsToClear = self.getHostLen() / 8
-        for i in range (octetsToClear, 0, -1):
-            prefix._setOctet( ( len( self ) + 1 ) - i, 0)
-        
-        # If all octets were cleared completely, the addrLen was 0
-        #  so there is nothing more to do. Return now to avoid errors
-        if( octetsToClear >  len( self ) - 1 ):
-            return prefix
-        
-        # Identify the current octet where further bitwise clearing
-        #  may need to be done    
-        currentOctet = len( self ) - octetsToClear
-        
-        # Find the remainder of bits not cleanly divisible by 8 where
-        #  manual iteration over the bits is necessary in a given byte
-        remainingBitsToClear = self.getHostLen() % 8
-        
-        # Raise 2^bits and end up with a number 1<=x<=2^(maxPrefLen)
-        #  Subtracting 1 reveals the bits that need to be cleared.
-        #  Currently the mask is the opposite of what we need it to be, so
-        #  use XOR to flip the bits by XOR'ing with all ones (11111111)
-        mask = ( pow( 2, remainingBitsToClear ) - 1 ) ^ 0xFF
-        
-        # At this point, the mask should be something like 11110000 where
-        #  the ones are contiguous on the left and zeroes are contiguous
-        #  on the right. Perform bitwise AND to clean low-order bits
-        #prefix._octet[ currentOctet - 1 ] = self.getOctet( currentOctet ) & mask
-        prefix._setOctet( currentOctet, self.getOctet( currentOctet ) & mask )
-        
-        # Return the network prefix; note that "self" was never modified
-        return prefix
-        
+        # Clear the host bits using a mask of all 1s in the host portion
+        hostMask = ( 1 << self.getHostLen() ) - 1
+        return self.__class__.fromInteger( self.toInteger() & ~hostMask,
+            self._addrLen )
+
+    # Returns ( host length, value without its host bits ); every address in
+    #  the prefix shifts to the same value, so containment is one comparison.
+    #  Cached like toInteger().
+    def _getPrefixKey(self):
+        try:
+            return self._prefixKey
+        except AttributeError:
+            hostLen = self._maxAddrLen - self._addrLen
+            prefixKey = ( hostLen, self.toInteger() >> hostLen )
+            object.__setattr__( self, "_prefixKey", prefixKey )
+            return prefixKey
+
+    # Returns true if the address "other" (of any address length) lies
+    #  within the prefix of this address (e.g. 10.4.6.68 in 10.4.6.64/28).
+    #  Addresses of another class are never contained. Also implements the
+    #  "in" operator.
+    def contains(self, other):
+        hostLen, key = self._getPrefixKey()
+        return ( other.__class__ is self.__class__ and
+            other.toInteger() >> hostLen == key )
+
+    __contains__ = contains
+
+    # Returns true if the prefix of this address lies within the prefix of
+    #  "other" (equal prefixes included), e.g. 10.4.6.64/28 of 10.4.0.0/16
+    def subnetOf(self, other):
+        if( other.__class__ is not self.__class__ or
+        self._addrLen < other._addrLen ):
+            return False
+        hostLen, key = other._getPrefixKey()
+        return self.toInteger() >> hostLen == key
+
+    # Returns true if the prefix of "other" lies within the prefix of this
+    #  address (equal prefixes included)
+    def supernetOf(self, other):
+        return other.__class__ is self.__class__ and other.subnetOf( self )
+
     # Returns the host length of a given address
     @abc.abstractmethod
     def getHostLen(self):
@@ -0,0 +1,91 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: NetAddressFactory.py
+# Author: Nicholas Russo
+# Description: This file includes helper functions that detect the family of
+#  a network address string (IPv4, IPv6, or MAC) and build the matching
+#  NetAddress child object. The address classes are imported lazily so that
+#  tools which only handle one family never pay for importing the others.
+###############################################################################
+
+# Family names used throughout the tools; these are also the keys into the
+#  lazy class loader below
+IPV4 = "ipv4"
+IPV6 = "ipv6"
+MAC = "mac"
+
+# Characters allowed in the hex digits of an undelimited MAC address group
+_HEX_DIGITS = "0123456789abcdefABCDEF"
+
+# Returns true if every string in "groups" is exactly "width" hex digits
+def _isHexGroups( groups, width ):
+    return all( len( group ) == width and group.strip( _HEX_DIGITS ) == ""
+        for group in groups )
+
+# Returns the family name of the specified "inputString" based on its
+#  delimiters. Input strings may carry a "/len" suffix. Apart from the MAC
+#  formats without colons or dashes, which must be made of hex groups of the
+#  right width, no validation of the individual octets is done here; the
+#  class constructors do that.
+def detectFamily( inputString ):
+    
+    # Test for a null reference; raise error (same as _splitInputString)
+    if( inputString is None or len( inputString ) == 0 ):
+        raise AttributeError( "inputString is None or empty" )
+    
+    # Strip off the address length, if any, before counting delimiters
+    addressString = inputString.split( "/", 1 )[0]
+    colonCount = addressString.count( ":" )
+    
+    # Dotted decimal with no colons is IPv4
+    if( colonCount == 0 and addressString.count( "." ) == 3 ):
+        return IPV4
+    
+    # Fully extended IPv6 has 8 double-octets (7 colons) 
+    elif( colonCount == 7 ):
+        return IPV6
+    
+    # EUI formatted MAC addresses have 6 octets (5 colons or 5 dashes)
+    elif( colonCount == 5 or addressString.count( "-" ) == 5 ):
+        return MAC
+    
+    # Cisco formatted MAC addresses have 3 dotted groups of 4 hex digits,
+    #  bare ones 12 hex digits
+    elif( colonCount == 0 ):
+        groups = addressString.split( "." )
+        if( ( len( groups ) == 3 and _isHexGroups( groups, 4 ) ) or
+        ( len( groups ) == 1 and _isHexGroups( groups, 12 ) ) ):
+            return MAC
+    
+    raise ValueError( "Unrecognized address: " + inputString )
+
+# Returns the NetAddress child class for the specified family name, importing
+#  the module on first use only
+def getAddressClass( family ):
+    if( family == IPV4 ):
+        from IPv4Address import IPv4Address
+        return IPv4Address
+    elif( family == IPV6 ):
+        from IPv6Address import IPv6Address
+        return IPv6Address
+    elif( family == MAC ):
+        from MACAddress import MACAddress
+        return MACAddress
+    
+    raise ValueError( "Unknown address family: " + str( family ) )
+
+# Builds a NetAddress object from "inputString", which may optionally
+#  include an address length in "/len" notation (e.g. 10.1.2.3/24). If no
+#  length is supplied, the child class default (host length) is used.
+def buildAddress( inputString ):
+    
+    # Determine which class to build; errors are passed up the stack
+    addressClass = getAddressClass( detectFamily( inputString ) )
+    
+    # Separate the address from the optional address length
+    pieces = inputString.split( "/", 1 )
+    if( len( pieces ) == 1 ):
+        return addressClass( pieces[0] )
+    
+    return addressClass( pieces[0], int( pieces[1] ) )
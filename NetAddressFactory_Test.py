@@ -0,0 +1,109 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: NetAddressFactory_Test.py
+# Author: Nicholas Russo
+# Description: This file includes a class that represents a test case for the
+#  NetAddressFactory functions. Family detection for every supported format,
+#  the error paths, building addresses and the subcommand dispatch of
+#  nettools are tested here.
+###############################################################################
+
+from NetAddressFactory import IPV4, IPV6, MAC, detectFamily, getAddressClass
+from NetAddressFactory import buildAddress
+from IPv4Address import IPv4Address
+from IPv6Address import IPv6Address
+from MACAddress import MACAddress
+from nettools import nettools
+import StringIO
+import sys
+import unittest
+
+# Defines a network address factory test case
+class NetAddressFactory_Test( unittest.TestCase ):
+
+    # Builds a test suite from all of the methods defined in this class
+    @staticmethod
+    def buildTestSuite():
+        return unittest.TestLoader().loadTestsFromTestCase(
+            NetAddressFactory_Test )
+
+    # Runs nettools with "args" and returns ( result, stdout, stderr )
+    def runNettools(self, args):
+        stdout = sys.stdout
+        stderr = sys.stderr
+        sys.stdout = StringIO.StringIO()
+        sys.stderr = StringIO.StringIO()
+        try:
+            result = nettools( [ "nettools" ] + args )
+            return ( result, sys.stdout.getvalue(), sys.stderr.getvalue() )
+        finally:
+            sys.stdout = stdout
+            sys.stderr = stderr
+
+    # Tests detection of every supported format, with and without lengths
+    def test_detectFamily(self):
+        for inputString, family in (
+        ( "10.1.2.3", IPV4 ), ( "10.1.2.3/24", IPV4 ), ( "999.1.1.1", IPV4 ),
+        ( "2001:0db8:0000:0000:0000:0000:0000:0001", IPV6 ),
+        ( "2001:0db8:0000:0000:0000:0000:0000:0000/32", IPV6 ),
+        ( "00:1a:2b:3c:4d:5e", MAC ), ( "00:1a:2b:3c:4d:5e/24", MAC ),
+        ( "00-1A-2B-3C-4D-5E", MAC ), ( "001a.2b3c.4d5e", MAC ),
+        ( "001A2B3C4D5E", MAC ), ( "001a2b3c4d5e/24", MAC ) ):
+            self.assertTrue( detectFamily( inputString ) == family, inputString )
+
+    # Strings with a 2 dot or 12 character shape that are not hex groups of
+    #  the right width are not MAC addresses; nothing else is recognized
+    def test_unrecognized(self):
+        for inputString in ( None, "" ):
+            self.assertRaises( AttributeError, detectFamily, inputString )
+        for inputString in ( "hello", "1.2.3.4.5", "2001:0db8::1",
+        "abc", "/24", "1.2.3", "10.1.2", "001a.2b3c.4d5g", "001a.2b3c.4d5",
+        "01a.2b3c.4d5ef", "001a2b3c4d5x", "hello world!", "0x1a2b3c4d5e" ):
+            self.assertRaises( ValueError, detectFamily, inputString )
+        self.assertRaises( ValueError, getAddressClass, "ipx" )
+        self.assertRaises( ValueError, buildAddress, "hello" )
+        self.assertRaises( ValueError, buildAddress, "1.2.3" )
+
+    # Tests the classes and objects built from each family
+    def test_buildAddress(self):
+        self.assertTrue( getAddressClass( IPV4 ) is IPv4Address )
+        self.assertTrue( getAddressClass( IPV6 ) is IPv6Address )
+        self.assertTrue( getAddressClass( MAC ) is MACAddress )
+        address = buildAddress( "10.1.2.3/24" )
+        self.assertTrue( isinstance( address, IPv4Address ) )
+        self.assertTrue( address.toString() == "10.1.2.3" )
+        self.assertTrue( address.getAddrLen() == 24 )
+        address = buildAddress( "00:1A:2B:3C:4D:5E" )
+        self.assertTrue( isinstance( address, MACAddress ) )
+        self.assertTrue( address.toString() == "00:1a:2b:3c:4d:5e" )
+        self.assertTrue( buildAddress( "001a.2b3c.4d5e" ) == address )
+        self.assertRaises( ValueError, buildAddress, "999.1.1.1" )
+        self.assertRaises( ValueError, buildAddress, "10.1.2.3/33" )
+
+    # Tests that nettools dispatches to each subcommand and reports invalid
+    #  inputs and subcommands
+    def test_nettools(self):
+        for args, output in (
+        ( [ "classify", "239.1.1.1", "00:1a:2b:3c:4d:5e" ],
+            "239.1.1.1 ipv4 isMulticast,isPrivateAddress\n" +
+            "00:1a:2b:3c:4d:5e mac isUnicast\n" ),
+        ( [ "normalize", "00:1A:2B:3C:4D:5E" ], "00:1a:2b:3c:4d:5e\n" ),
+        ( [ "normalize", "aabb.ccdd.eeff" ], "aa:bb:cc:dd:ee:ff\n" ),
+        ( [ "network", "10.4.6.68/28" ], "10.4.6.64/28\n" ),
+        ( [ "mip2mac", "239.1.1.1", "10.1.1.1" ], "01:00:5e:01:01:01\n" ),
+        ( [ "mip2mac6", "ff02:0000:0000:0000:0000:0000:0000:0001" ],
+            "33:33:00:00:00:01\n" ) ):
+            self.assertTrue( self.runNettools( args ) == ( 0, output, "" ),
+                args[0] )
+
+        result, output, errors = self.runNettools( [ "normalize", "hello",
+            "10.1.2.3" ] )
+        self.assertTrue( result == 1 and output == "10.1.2.3\n" )
+        self.assertTrue( "Invalid input 'hello'" in errors )
+        errors = self.runNettools( [ "normalize", "1.2.3" ] )[2]
+        self.assertTrue( "Unrecognized address: 1.2.3" in errors )
+
+        for args in ( [], [ "unknown", "10.1.2.3" ] ):
+            result, output, errors = self.runNettools( args )
+            self.assertTrue( result == 1 and output.startswith( "Usage:" ) )
@@ -11,6 +11,7 @@
 ###############################################################################
 
 import abc
+import pickle
 import unittest
 from NetAddress import NetAddress
 
@@ -98,4 +99,120 @@ class NetAddress_Test(unittest.TestCase):
     #  against the internal addrLen variable
     def test_getAddrLen(self):
         for address in self.getNetAddressList():
-            self.assertTrue( address.getAddrLen() == address._addrLen )   
\ No newline at end of file
+            self.assertTrue( address.getAddrLen() == address._addrLen )
+    
+    # Tests the toInteger() and fromInteger() functions within the NetAddress
+    #  class. Converting to an integer and back must yield the same octets.
+    #  This test is common for all network addresses.
+    def test_toInteger(self):
+        for address in self.getNetAddressList():
+            value = address.toInteger()
+            self.assertTrue( value >= 0 and value >> ( len( address ) * 8 ) == 0 )
+            
+            copy = address.__class__.fromInteger( value, address.getAddrLen() )
+            self.assertTrue( copy.toString() == address.toString() )
+            self.assertTrue( copy.getAddrLen() == address.getAddrLen() )
+            
+            # Values that are negative or too wide are rejected
+            self.assertRaises( ValueError, address.__class__.fromInteger, -1 )
+            self.assertRaises( ValueError, address.__class__.fromInteger,
+                1 << ( len( address ) * 8 ) )
+    
+    # Tests the getNetwork() and getEndOfSubnet() functions within the
+    #  NetAddress class. Neither may modify the original address, and the
+    #  network and end of subnet must bracket the address.
+    def test_getEndOfSubnet(self):
+        for address in self.getNetAddressList():
+            original = address.toString()
+            network = address.getNetwork()
+            endOfSubnet = address.getEndOfSubnet()
+            self.assertTrue( address.toString() == original )
+            
+            hostMask = ( 1 << address.getHostLen() ) - 1
+            self.assertTrue( network.toInteger() & hostMask == 0 )
+            self.assertTrue( endOfSubnet.toInteger() & hostMask == hostMask )
+            self.assertTrue( network.toInteger() <= address.toInteger() <=
+                endOfSubnet.toInteger() )
+            self.assertTrue( network.getAddrLen() == address.getAddrLen() )
+            self.assertTrue( endOfSubnet.getNetwork() == network )
+            
+            # Derived values are computed once, then the cached object is
+            #  returned by every later call
+            self.assertTrue( address.toInteger() is address.toInteger() )
+            self.assertTrue( address.getNetwork() is network )
+            self.assertTrue( address.getEndOfSubnet() is endOfSubnet )
+            self.assertTrue( address.toString() is address.toString() )
+    
+    # Tests that the string forms and the classification flags are cached:
+    #  repeated calls return the same string object, and every predicate
+    #  gives the same result as on a fresh copy, before and after caching.
+    #  This test is common for all network addresses.
+    def test_memoized(self):
+        for address in self.getNetAddressList():
+            for name in ( "toString", "toStringHex", "toStringCisco",
+            "toReverseName" ):
+                if( hasattr( address, name ) ):
+                    method = getattr( address, name )
+                    self.assertTrue( method() is method(), name )
+            
+            names = [ name for name in dir( address ) if name.startswith( "is" ) ]
+            self.assertTrue( len( names ) > 0 )
+            for i in range( 0, 2 ):
+                copy = address.__class__.fromInteger( address.toInteger(),
+                    address.getAddrLen() )
+                for name in names:
+                    self.assertTrue( getattr( address, name )() is
+                        getattr( copy, name )(), name )
+    
+    # Tests that addresses are immutable and can be compared and hashed.
+    #  This test is common for all network addresses.
+    def test_immutable(self):
+        for address in self.getNetAddressList():
+            self.assertRaises( AttributeError, setattr, address, "_addrLen", 0 )
+            self.assertRaises( AttributeError, setattr, address, "_octet", () )
+            self.assertRaises( AttributeError, delattr, address, "_addrLen" )
+            
+            copy = address.__class__.fromInteger( address.toInteger(),
+                address.getAddrLen() )
+            self.assertTrue( copy == address and not copy != address )
+            self.assertTrue( hash( copy ) == hash( address ) )
+            self.assertTrue( len( set( [ copy, address ] ) ) == 1 )
+            
+            # Cached values are not pickled, and copies stay immutable
+            address.toString()
+            address.contains( address )
+            copy = pickle.loads( pickle.dumps( address, 2 ) )
+            self.assertFalse( hasattr( copy, "_string" ) or
+                hasattr( copy, "_prefixKey" ) )
+            self.assertTrue( copy == address )
+            self.assertTrue( copy.toString() == address.toString() )
+            self.assertRaises( AttributeError, setattr, copy, "_addrLen", 0 )
+    
+    # Tests the contains(), subnetOf() and supernetOf() functions within the
+    #  NetAddress class against getNetwork(). This test is common for all
+    #  network addresses.
+    def test_contains(self):
+        for address in self.getNetAddressList():
+            addressClass = address.__class__
+            network = address.getNetwork()
+            for addrLen in range( 0, addressClass._maxAddrLen + 1 ):
+                prefix = addressClass.fromInteger( address.toInteger(), addrLen )
+                other = addressClass.fromInteger( network.toInteger(), addrLen )
+                expected = prefix.getNetwork().toInteger() == addressClass.fromInteger(
+                    network.toInteger(), addrLen ).getNetwork().toInteger()
+                self.assertTrue( prefix.contains( network ) == expected )
+                self.assertTrue( ( network in prefix ) == expected )
+                self.assertTrue( address in prefix )
+                self.assertTrue( prefix.subnetOf( prefix ) and
+                    prefix.supernetOf( prefix ) )
+                self.assertTrue( address.subnetOf( prefix ) == (
+                    address.getAddrLen() >= addrLen ) )
+                self.assertTrue( prefix.supernetOf( address ) == (
+                    address.getAddrLen() >= addrLen ) )
+                self.assertTrue( other.subnetOf( address ) == (
+                    addrLen >= address.getAddrLen() ) )
+            
+            # Addresses of other classes are never contained
+            self.assertFalse( address.contains( object() ) )
+            self.assertFalse( address.subnetOf( None ) )
+            self.assertFalse( address.supernetOf( None ) )
@@ -0,0 +1,74 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: ParserBackend.py
+# Author: Nicholas Russo
+# Description: This file selects how IPv4Address and IPv6Address parse their
+#  input strings. The native backend hands strictly formatted input (e.g.
+#  10.1.2.3, or fully extended IPv6) to the C routines of the socket module
+#  and checks the result against the formatting rules of the address
+#  classes. Any input it does not accept, including every invalid input, is
+#  left to the Python parsers of the classes, so both backends accept the
+#  same inputs, produce the same octets and raise the same errors.
+###############################################################################
+
+import socket
+
+# Backend names
+PYTHON = "python"
+NATIVE = "native"
+
+# The native backend needs both directions of the C routines (the Windows
+#  builds of Python 2 lack them)
+_hasNative = hasattr( socket, "inet_pton" ) and hasattr( socket, "inet_ntop" )
+_useNative = _hasNative
+
+# Returns the list of backends available on this platform
+def getAvailableBackends():
+    if( _hasNative ):
+        return [ PYTHON, NATIVE ]
+    return [ PYTHON ]
+
+# Returns the name of the backend in use
+def getBackend():
+    return NATIVE if _useNative else PYTHON
+
+# Selects the backend used by every address class from now on
+def setBackend( name ):
+    global _useNative
+    if( name not in getAvailableBackends() ):
+        raise ValueError( "Unavailable parser backend: " + str( name ) )
+    _useNative = ( name == NATIVE )
+
+# Returns the list of 4 octets of the IPv4 "inputString" if the native
+#  backend is in use and the input is in canonical dotted decimal format;
+#  otherwise returns None and the caller parses the input itself. inet_pton
+#  alone accepts leading zeros on some platforms, so the input must also
+#  match the canonical string of its octets.
+def parseIPv4( inputString ):
+    if( not _useNative ):
+        return None
+    try:
+        packed = socket.inet_pton( socket.AF_INET, inputString )
+        if( socket.inet_ntop( socket.AF_INET, packed ) == inputString ):
+            return list( bytearray( packed ) )
+    except ( socket.error, TypeError, ValueError, UnicodeError ):
+        pass
+    return None
+
+# Returns the list of 16 octets of the IPv6 "inputString" if the native
+#  backend is in use and the input is fully extended (8 groups of 1 to 4 hex
+#  digits); otherwise returns None and the caller parses the input itself.
+#  inet_pton also accepts "::" and embedded IPv4, which the classes do not.
+def parseIPv6( inputString ):
+    if( not _useNative ):
+        return None
+    try:
+        if( inputString.count( ":" ) != 7 or "::" in inputString or
+        "." in inputString ):
+            return None
+        return list( bytearray( socket.inet_pton( socket.AF_INET6,
+            inputString ) ) )
+    except ( AttributeError, socket.error, TypeError, ValueError,
+    UnicodeError ):
+        return None
@@ -0,0 +1,99 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: ParserBackend_Test.py
+# Author: Nicholas Russo
+# Description: This file includes a class that represents a test case for the
+#  parser backends. Valid and invalid IPv4 and IPv6 inputs are parsed under
+#  every available backend, and the results (octets or exception types) must
+#  be identical.
+###############################################################################
+
+from IPv4Address import IPv4Address
+from IPv6Address import IPv6Address
+import ParserBackend
+import random
+import unittest
+
+# Defines a parser backend test case
+class ParserBackend_Test( unittest.TestCase ):
+
+    # Builds a test suite from all of the methods defined in this class
+    @staticmethod
+    def buildTestSuite():
+        return unittest.TestLoader().loadTestsFromTestCase( ParserBackend_Test )
+
+    def setUp(self):
+        self.backend = ParserBackend.getBackend()
+
+    def tearDown(self):
+        ParserBackend.setBackend( self.backend )
+
+    # Returns the octets of "addressClass" built from "inputString" under
+    #  "backend", or the type of the exception raised
+    def parse(self, addressClass, inputString, backend):
+        ParserBackend.setBackend( backend )
+        try:
+            return addressClass( inputString )._octet
+        except Exception as error:
+            return type( error )
+
+    # Asserts that every backend gives the same result for every input
+    def assertSameResults(self, addressClass, inputStrings):
+        for inputString in inputStrings:
+            results = [ self.parse( addressClass, inputString, backend )
+                for backend in ParserBackend.getAvailableBackends() ]
+            self.assertTrue( results.count( results[0] ) == len( results ),
+                repr( inputString ) + ": " + repr( results ) )
+
+    # Selecting backends
+    def test_backends(self):
+        self.assertTrue( ParserBackend.PYTHON in
+            ParserBackend.getAvailableBackends() )
+        ParserBackend.setBackend( ParserBackend.PYTHON )
+        self.assertTrue( ParserBackend.getBackend() == ParserBackend.PYTHON )
+        self.assertTrue( ParserBackend.parseIPv4( "1.2.3.4" ) is None )
+        self.assertRaises( ValueError, ParserBackend.setBackend, "fortran" )
+
+        if( ParserBackend.NATIVE in ParserBackend.getAvailableBackends() ):
+            ParserBackend.setBackend( ParserBackend.NATIVE )
+            self.assertTrue( ParserBackend.parseIPv4( "1.2.3.4" ) ==
+                [ 1, 2, 3, 4 ] )
+            self.assertTrue( ParserBackend.parseIPv4( "01.2.3.4" ) is None )
+            self.assertTrue( ParserBackend.parseIPv6( "::1" ) is None )
+
+    # IPv4 inputs, valid and invalid
+    def test_ipv4(self):
+        inputStrings = [ "0.0.0.0", "255.255.255.255", "10.1.2.3",
+            "192.168.100.1", "010.1.2.3", "1.2.3.04", " 1.2.3.4", "1.2.3.4\n",
+            "+1.2.3.4", "1.2.3.-0", "-1.2.3.4", "256.1.2.3", "1.2.3", "1.2.3.4.5",
+            "1..2.3", "1.2.3.", "a.b.c.d", "0x1.2.3.4", "1.2.3.4/24", "1 .2.3.4",
+            u"1.2.3.4", u"1.2.3.\u0664", "\x00.1.2.3", "1.2.3.4\x00", "", None,
+            "::1", "1.2.3.99999999999999999999" ]
+
+        generator = random.Random( 41 )
+        for i in range( 0, 500 ):
+            octets = [ generator.randint( 0, 300 ) for j in range( 0, 4 ) ]
+            inputStrings.append( ".".join( str( octet ) for octet in octets ) )
+        self.assertSameResults( IPv4Address, inputStrings )
+
+    # IPv6 inputs, valid and invalid
+    def test_ipv6(self):
+        inputStrings = [ "0:0:0:0:0:0:0:0", "ffff:ffff:ffff:ffff:ffff:ffff:ffff:ffff",
+            "2001:DB8:0:0:0:0:0:1", "2001:0db8:0000:0000:0000:0000:0000:0001",
+            "02001:db8:0:0:0:0:0:1", "12345:db8:0:0:0:0:0:1", "2001:db8::1", "::",
+            "::1", "0:0:0:0:0:ffff:1.2.3.4", "0:0:0:0:0:0:0:0:0",
+            "0:0:0:0:0:0:0", "0:0:0:0:0:0:0:", ":0:0:0:0:0:0:0", " 1:0:0:0:0:0:0:0",
+            "1:0:0:0:0:0:0:0 ", "+1:0:0:0:0:0:0:0", "-0:0:0:0:0:0:0:0",
+            "0x1:0:0:0:0:0:0:0", "g:0:0:0:0:0:0:0", "1:0:0:0:0:0:0:0%eth0",
+            u"fe80:0:0:0:0:0:0:1", u"\u0661:0:0:0:0:0:0:0", "", None, "1.2.3.4" ]
+
+        generator = random.Random( 6 )
+        for i in range( 0, 500 ):
+            groups = [ "%x" % generator.randint( 0, 0xFFFF )
+                for j in range( 0, 8 ) ]
+            if( i % 5 == 0 ):
+                groups[ generator.randint( 0, 7 ) ] = "0" * generator.randint(
+                    1, 6 )
+            inputStrings.append( ":".join( groups ) )
+        self.assertSameResults( IPv6Address, inputStrings )
@@ -0,0 +1,143 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: Partitioner.py
+# Author: Nicholas Russo
+# Description: This file includes classes that assign address-keyed work to
+#  a set of named nodes (workers), keyed on the integer value of IPv4, IPv6
+#  or MAC addresses (see NetAddress.toInteger). Assignments are stable
+#  across processes and hosts (see IntegerHash), and when a node joins or
+#  leaves only the keys of that node move. Rendezvous hashing picks the node
+#  with the highest score for each key; the consistent hash ring picks the
+#  first of many virtual points per node at or after the hash of the key,
+#  which needs one binary search instead of one score per node. Keys can be
+#  truncated to a network prefix so that whole subnets stay together.
+###############################################################################
+
+from IntegerHash import MASK64, hashInteger, mix64
+from NetAddress import NetAddress
+import bisect
+import hashlib
+
+# Default number of virtual points per node on a consistent hash ring
+RING_REPLICAS = 128
+
+# Returns the 64-bit seed of the node named "name", identical on every host
+def _getNodeSeed( name ):
+    if( isinstance( name, unicode ) ):
+        name = name.encode( "utf-8" )
+    return int( hashlib.md5( name ).hexdigest()[ 0:16 ], 16 )
+
+# Defines what the partitioners share: the node list and the keys
+class _Partitioner(object):
+
+    # Stores the node names "nodes" (strings, all different). With a
+    #  "prefixLen", every address is keyed on its prefix of that length,
+    #  which needs the "addressClass" of the addresses. The "seed" selects
+    #  an independent assignment.
+    def __init__(self, nodes, addressClass = None, prefixLen = None,
+    seed = 0):
+        if( nodes is None or len( nodes ) == 0 ):
+            raise AttributeError( "nodes is None or empty" )
+        if( len( set( nodes ) ) != len( nodes ) ):
+            raise ValueError( "nodes are not unique" )
+        self._nodes = list( nodes )
+        self._seed = seed
+
+        self._hostLen = 0
+        self._addressClass = addressClass
+        if( prefixLen is not None ):
+            if( addressClass is None ):
+                raise ValueError( "prefixLen needs an addressClass" )
+            if( prefixLen < 0 or prefixLen > addressClass._maxAddrLen ):
+                raise ValueError( "prefixLen is out of range: " +
+                    str( prefixLen ) )
+            self._hostLen = addressClass._maxAddrLen - prefixLen
+
+    # Returns the list of node names
+    def getNodes(self):
+        return list( self._nodes )
+
+    # Implements the len() function by returning the number of nodes
+    def __len__(self):
+        return len( self._nodes )
+
+    # Returns the 64-bit hash of the key of "address" (an address object or
+    #  an integer value)
+    def _hashKey(self, address):
+        if( isinstance( address, NetAddress ) ):
+            if( self._addressClass is not None and
+            address.__class__ is not self._addressClass ):
+                raise ValueError( "address is of a different class: " +
+                    str( address ) )
+            address = address.toInteger()
+        return hashInteger( address >> self._hostLen, self._seed )
+
+    # Returns the index of the node assigned "address" (an address object
+    #  or an integer value)
+    def getNodeIndex(self, address):
+        return self._getIndex( self._hashKey( address ) )
+
+    # Returns the name of the node assigned "address"
+    def getNode(self, address):
+        return self._nodes[ self.getNodeIndex( address ) ]
+
+    # Returns a list with the index of the node assigned every integer in
+    #  the sequence "values" (e.g. an array)
+    def assignAll(self, values):
+        hostLen = self._hostLen
+        seed = self._seed
+        getIndex = self._getIndex
+        return [ getIndex( hashInteger( value >> hostLen, seed ) )
+            for value in values ]
+
+    # Returns a list with the number of values of "values" assigned to each
+    #  node, in node order
+    def countAll(self, values):
+        counts = [ 0 ] * len( self._nodes )
+        for index in self.assignAll( values ):
+            counts[ index ] += 1
+        return counts
+
+# Defines a rendezvous (highest random weight) partitioner. Every node
+#  scores every key; the highest score wins. Balance is as good as the
+#  hash, but every lookup costs one score per node.
+class RendezvousPartitioner(_Partitioner):
+
+    def __init__(self, nodes, addressClass = None, prefixLen = None,
+    seed = 0):
+        _Partitioner.__init__( self, nodes, addressClass, prefixLen, seed )
+        self._nodeSeeds = [ _getNodeSeed( name ) for name in self._nodes ]
+
+    # Returns the index of the node with the highest score for the key hash
+    #  "keyHash"; ties go to the first node listed
+    def _getIndex(self, keyHash):
+        scores = map( mix64, [ keyHash ^ nodeSeed
+            for nodeSeed in self._nodeSeeds ] )
+        return scores.index( max( scores ) )
+
+# Defines a consistent hash ring partitioner. Each node owns "replicas"
+#  points on a ring of 64-bit hashes; a key belongs to the node owning the
+#  first point after its hash. More replicas give better balance at the
+#  cost of memory.
+class RingPartitioner(_Partitioner):
+
+    def __init__(self, nodes, addressClass = None, prefixLen = None,
+    seed = 0, replicas = RING_REPLICAS):
+        _Partitioner.__init__( self, nodes, addressClass, prefixLen, seed )
+        if( replicas <= 0 ):
+            raise ValueError( "replicas is not positive: " + str( replicas ) )
+
+        points = []
+        for index, name in enumerate( self._nodes ):
+            nodeSeed = _getNodeSeed( name )
+            points.extend( ( mix64( ( nodeSeed + replica ) & MASK64 ), index )
+                for replica in xrange( 0, replicas ) )
+        points.sort()
+
+        # The point past every hash wraps around to the first owner
+        self._points = [ point for point, index in points ] + [ 1 << 64 ]
+        self._owners = [ index for point, index in points ] + [ points[0][1] ]
+
+    def _getIndex(self, keyHash):
+        return self._owners[ bisect.bisect_right( self._points, keyHash ) ]
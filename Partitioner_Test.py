@@ -0,0 +1,128 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: Partitioner_Test.py
+# Author: Nicholas Russo
+# Description: This file includes a class that represents a test case for the
+#  address partitioners. Assignments are checked for agreement between the
+#  scalar and batch forms, balance, movement when a node joins or leaves,
+#  and prefix sharding.
+###############################################################################
+
+from IPv4Address import IPv4Address
+from IPv6Address import IPv6Address
+from MACAddress import MACAddress
+from Partitioner import RendezvousPartitioner, RingPartitioner
+import array
+import random
+import unittest
+
+# Defines a partitioner test case
+class Partitioner_Test( unittest.TestCase ):
+
+    # Builds a test suite from all of the methods defined in this class
+    @staticmethod
+    def buildTestSuite():
+        return unittest.TestLoader().loadTestsFromTestCase( Partitioner_Test )
+
+    # Returns a list of "count" node names
+    def getNodes(self, count):
+        return [ "worker-" + str( i ) for i in range( 0, count ) ]
+
+    # Scalar and batch assignments agree, for every address class
+    def test_assign(self):
+        generator = random.Random( 47 )
+        for partitionerClass in ( RendezvousPartitioner, RingPartitioner ):
+            partitioner = partitionerClass( self.getNodes( 5 ) )
+            self.assertTrue( len( partitioner ) == 5 )
+            for addressClass in ( IPv4Address, IPv6Address, MACAddress ):
+                values = [ generator.getrandbits( addressClass._maxAddrLen )
+                    for i in range( 0, 200 ) ]
+                if( addressClass._maxAddrLen <= 64 ):
+                    values = array.array( "L", values )
+                indices = partitioner.assignAll( values )
+                for value, index in zip( values, indices ):
+                    address = addressClass.fromInteger( value )
+                    self.assertTrue( partitioner.getNodeIndex( address ) == index )
+                    self.assertTrue( partitioner.getNode( value ) ==
+                        partitioner.getNodes()[ index ] )
+                self.assertTrue( sorted( partitioner.countAll( values ) ) ==
+                    sorted( [ indices.count( i ) for i in range( 0, 5 ) ] ) )
+
+            # Node order does not matter, only node names
+            reordered = partitionerClass( list( reversed( self.getNodes( 5 ) ) ) )
+            self.assertTrue( [ partitioner.getNode( value ) for value in values ] ==
+                [ reordered.getNode( value ) for value in values ] )
+
+    # Loads are roughly even, and only the keys of a changed node move
+    def test_movement(self):
+        generator = random.Random( 470 )
+        values = [ generator.getrandbits( 32 ) for i in range( 0, 20000 ) ]
+        for partitionerClass in ( RendezvousPartitioner, RingPartitioner ):
+            before = partitionerClass( self.getNodes( 10 ) )
+            counts = before.countAll( values )
+            self.assertTrue( max( counts ) < 1.5 * len( values ) / 10 )
+            self.assertTrue( min( counts ) > 0.5 * len( values ) / 10 )
+
+            # Adding a node moves keys only to the new node
+            after = partitionerClass( self.getNodes( 11 ) )
+            moved = 0
+            for old, new in zip( before.assignAll( values ),
+            after.assignAll( values ) ):
+                if( old != new ):
+                    self.assertTrue( new == 10 )
+                    moved += 1
+            self.assertTrue( 0 < moved < 2 * len( values ) / 11 )
+
+            # Removing a node moves only the keys of that node
+            nodes = self.getNodes( 10 )
+            del nodes[3]
+            after = partitionerClass( nodes )
+            for value, old in zip( values, before.assignAll( values ) ):
+                if( old != 3 ):
+                    self.assertTrue( after.getNode( value ) ==
+                        before.getNodes()[ old ] )
+
+            # Another seed gives another assignment
+            other = partitionerClass( self.getNodes( 10 ), seed = 1 )
+            self.assertTrue( other.assignAll( values ) != before.assignAll(
+                values ) )
+
+    # Prefix sharding keeps subnets together
+    def test_prefix(self):
+        generator = random.Random( 471 )
+        for partitionerClass in ( RendezvousPartitioner, RingPartitioner ):
+            for addressClass, prefixLen in ( ( IPv4Address, 24 ),
+            ( IPv6Address, 48 ) ):
+                partitioner = partitionerClass( self.getNodes( 7 ),
+                    addressClass, prefixLen )
+                hostLen = addressClass._maxAddrLen - prefixLen
+                for i in range( 0, 50 ):
+                    network = generator.getrandbits( prefixLen ) << hostLen
+                    subnet = [ network | generator.getrandbits( hostLen )
+                        for j in range( 0, 10 ) ]
+                    self.assertTrue( len( set( partitioner.assignAll(
+                        subnet ) ) ) == 1 )
+                    self.assertTrue( partitioner.getNode( addressClass.fromInteger(
+                        subnet[0], prefixLen ) ) == partitioner.getNode(
+                        subnet[1] ) )
+                self.assertRaises( ValueError, partitioner.getNode,
+                    MACAddress( "00:1b:2c:3d:4e:5f" ) )
+
+            # Subnets still spread over every node
+            partitioner = partitionerClass( self.getNodes( 7 ), IPv4Address, 24 )
+            self.assertTrue( min( partitioner.countAll( [ i << 8
+                for i in range( 0, 2000 ) ] ) ) > 0 )
+
+    # Invalid arguments
+    def test_invalid(self):
+        for partitionerClass in ( RendezvousPartitioner, RingPartitioner ):
+            self.assertRaises( AttributeError, partitionerClass, [] )
+            self.assertRaises( AttributeError, partitionerClass, None )
+            self.assertRaises( ValueError, partitionerClass, [ "a", "b", "a" ] )
+            self.assertRaises( ValueError, partitionerClass, [ "a" ], None, 24 )
+            self.assertRaises( ValueError, partitionerClass, [ "a" ],
+                IPv4Address, 33 )
+            self.assertTrue( partitionerClass( [ u"\u00e9" ] ).getNode( 1 ) ==
+                u"\u00e9" )
+        self.assertRaises( ValueError, RingPartitioner, [ "a" ], replicas = 0 )
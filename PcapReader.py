@@ -0,0 +1,433 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: PcapReader.py
+# Author: Nicholas Russo
+# Description: This file includes a reader for packet capture files in the
+#  pcap and pcapng formats. The file is memory-mapped and the Ethernet,
+#  VLAN (802.1Q/802.1ad), IPv4 and IPv6 headers of each packet are unpacked
+#  in place with precompiled structs, so no packet is ever copied. Packets
+#  are returned in batches holding arrays of the integer values (see
+#  NetAddress.toInteger) of the source and destination MAC and IP addresses,
+#  with the is*() predicates of the address classes already evaluated for
+#  the whole batch from the integers (see AddressConverter).
+###############################################################################
+
+from AddressConverter import computePredicate, getPredicateNames
+from NetAddressFactory import IPV4, IPV6, MAC, getAddressClass
+import array
+import itertools
+import mmap
+import os
+import struct
+
+# File formats
+PCAP = "pcap"
+PCAPNG = "pcapng"
+
+# Default number of packets per batch
+BATCH_SIZE = 16384
+
+# IP version of each packet in a batch; NO_IP for other packets (e.g. ARP)
+NO_IP = 0
+IPV4_PACKET = 4
+IPV6_PACKET = 6
+
+# VLAN identifier of untagged packets
+NO_VLAN = -1
+
+# Link type of Ethernet; packets of other link types are skipped
+LINKTYPE_ETHERNET = 1
+
+# Magic numbers of pcap files (microsecond and nanosecond timestamps) and
+#  of the pcapng blocks used here
+_PCAP_MAGIC_MICRO = 0xa1b2c3d4
+_PCAP_MAGIC_NANO = 0xa1b23c4d
+_PCAPNG_SECTION = 0x0a0d0d0a
+_PCAPNG_BYTE_ORDER = 0x1a2b3c4d
+_PCAPNG_INTERFACE = 1
+_PCAPNG_SIMPLE_PACKET = 3
+_PCAPNG_ENHANCED_PACKET = 6
+_PCAPNG_TSRESOL_OPTION = 9
+
+# EtherTypes of IPv4, IPv6 and VLAN tags
+_ETHERTYPE_IPV4 = 0x0800
+_ETHERTYPE_IPV6 = 0x86dd
+_ETHERTYPE_VLANS = frozenset( [ 0x8100, 0x88a8, 0x9100 ] )
+
+# Headers: destination MAC, source MAC (each as 16 + 32 bits) and EtherType;
+#  VLAN tag control and EtherType; IPv4 version, protocol and addresses;
+#  IPv6 version, next header and addresses (each as 2 x 64 bits)
+_ETHERNET = struct.Struct( "!HIHIH" )
+_VLAN = struct.Struct( "!HH" )
+_IPV4 = struct.Struct( "!B8xB2xII" )
+_IPV6 = struct.Struct( "!I2xB1xQQQQ" )
+
+# Defines a batch of packets read from a capture file. Packets are
+#  identified by their index in the batch.
+class PacketBatch(object):
+
+    # Stores the columns of the batch (see the get methods) and evaluates
+    #  the predicates "macPredicates" and "ipPredicates" on the addresses.
+    #  "srcMacs" and "dstMacs" are ( high 16 bits, low 32 bits ) pairs of
+    #  sequences, as unpacked from the Ethernet header.
+    def __init__(self, timestamps, lengths, srcMacs, dstMacs, vlans,
+    families, protocols, srcIPs, dstIPs, macPredicates, ipPredicates):
+        self._timestamps = array.array( "d", timestamps )
+        self._lengths = array.array( "L", lengths )
+        self._vlans = array.array( "l", vlans )
+        self._families = families
+        self._protocols = protocols
+        self._ipValues = ( srcIPs, dstIPs )
+
+        # MACs are stored as unsigned short and long arrays of their halves
+        #  since "L" is only 32 bits wide on Windows and 32-bit builds, too
+        #  narrow for 48-bit values
+        self._macHalves = tuple( ( array.array( "H", highs ),
+            array.array( "L", lows ) ) for highs, lows in ( srcMacs, dstMacs ) )
+
+        self._macFlags = {}
+        if( len( macPredicates ) > 0 ):
+            macValues = self.getMacValues()
+        for name in macPredicates:
+            self._macFlags[ name ] = tuple( bytearray( computePredicate( name,
+                MAC, values, [ 48 ] * len( values ) ) ) for values in
+                macValues )
+
+        # Each family is classified separately, then scattered into place
+        self._ipFlags = {}
+        for name in ipPredicates:
+            self._ipFlags[ name ] = ( bytearray( len( families ) ),
+                bytearray( len( families ) ) )
+        for code, family in ( ( IPV4_PACKET, IPV4 ), ( IPV6_PACKET, IPV6 ) ):
+            indices = [ index for index, packetFamily in enumerate( families )
+                if packetFamily == code ]
+            if( len( indices ) == 0 ):
+                continue
+            names = [ name for name in ipPredicates
+                if name in getPredicateNames( family ) ]
+            addrLens = [ getAddressClass( family )._maxAddrLen ] * len( indices )
+            for side, values in enumerate( self._ipValues ):
+                familyValues = [ values[ index ] for index in indices ]
+                for name in names:
+                    flags = self._ipFlags[ name ][ side ]
+                    for index in itertools.compress( indices, computePredicate(
+                    name, family, familyValues, addrLens ) ):
+                        flags[ index ] = 1
+
+    # Implements the len() function by returning the number of packets
+    def __len__(self):
+        return len( self._timestamps )
+
+    # Returns the array of capture times in seconds since the epoch (0.0 for
+    #  pcapng simple packet blocks, which have none)
+    def getTimestamps(self):
+        return self._timestamps
+
+    # Returns the array of packet lengths on the wire
+    def getLengths(self):
+        return self._lengths
+
+    # Returns ( source, destination ) lists of the 48-bit MAC values, built
+    #  from the stored halves on each call
+    def getMacValues(self):
+        return tuple( [ ( high << 32 ) | low for high, low in
+            itertools.izip( highs, lows ) ] for highs, lows in self._macHalves )
+
+    # Returns the array of VLAN identifiers of the outermost tag, or NO_VLAN
+    def getVlans(self):
+        return self._vlans
+
+    # Returns a bytearray of the IP version of each packet (e.g. IPV4_PACKET)
+    def getFamilies(self):
+        return self._families
+
+    # Returns a bytearray of the IPv4 protocol or IPv6 next header of each
+    #  packet (0 for packets without IP)
+    def getProtocols(self):
+        return self._protocols
+
+    # Returns ( source, destination ) lists of the IPv4 or IPv6 values (0
+    #  for packets without IP)
+    def getIPValues(self):
+        return self._ipValues
+
+    # Returns ( source, destination ) bytearrays holding 1 where the
+    #  MACAddress predicate "name" (e.g. "isMulticast") is true
+    def getMacFlags(self, name):
+        if( name not in self._macFlags ):
+            raise ValueError( "Predicate was not evaluated: " + str( name ) )
+        return self._macFlags[ name ]
+
+    # Returns ( source, destination ) bytearrays holding 1 where the
+    #  predicate "name" of the IPv4Address or IPv6Address class of each
+    #  packet is true (0 where the class has no such predicate)
+    def getIPFlags(self, name):
+        if( name not in self._ipFlags ):
+            raise ValueError( "Predicate was not evaluated: " + str( name ) )
+        return self._ipFlags[ name ]
+
+    # Returns the ( source, destination ) MACAddress objects of packet "index"
+    def getMacAddresses(self, index):
+        addressClass = getAddressClass( MAC )
+        return tuple( addressClass.fromInteger( ( highs[ index ] << 32 ) |
+            lows[ index ] ) for highs, lows in self._macHalves )
+
+    # Returns the ( source, destination ) IPv4Address or IPv6Address objects
+    #  of packet "index", or None for packets without IP
+    def getIPAddresses(self, index):
+        if( self._families[ index ] == NO_IP ):
+            return None
+        addressClass = getAddressClass( IPV4 if self._families[ index ] ==
+            IPV4_PACKET else IPV6 )
+        return tuple( addressClass.fromInteger( values[ index ] )
+            for values in self._ipValues )
+
+# Defines a reader of one pcap or pcapng file
+class PcapReader(object):
+
+    # Maps the capture file at "path". Batches hold up to "batchSize"
+    #  packets. The MACAddress predicates "macPredicates" and the IPv4Address
+    #  and IPv6Address predicates "ipPredicates" are evaluated for every
+    #  batch (None means all of them).
+    def __init__(self, path, batchSize = BATCH_SIZE, macPredicates = None,
+    ipPredicates = None):
+        if( batchSize <= 0 ):
+            raise ValueError( "batchSize is not positive: " + str( batchSize ) )
+        self._batchSize = batchSize
+
+        macNames = getPredicateNames( MAC )
+        ipNames = sorted( set( getPredicateNames( IPV4 ) +
+            getPredicateNames( IPV6 ) ) )
+        if( macPredicates is None ):
+            macPredicates = macNames
+        if( ipPredicates is None ):
+            ipPredicates = ipNames
+        for name in macPredicates:
+            if( name not in macNames ):
+                raise ValueError( "Unknown predicate: " + str( name ) )
+        for name in ipPredicates:
+            if( name not in ipNames ):
+                raise ValueError( "Unknown predicate: " + str( name ) )
+        self._macPredicates = list( macPredicates )
+        self._ipPredicates = list( ipPredicates )
+
+        self._file = open( path, "rb" )
+        self._map = None
+        try:
+            if( os.path.getsize( path ) < 4 ):
+                raise ValueError( "Not a pcap or pcapng file: " + path )
+            self._map = mmap.mmap( self._file.fileno(), 0,
+                access = mmap.ACCESS_READ )
+            magic = struct.unpack_from( "<I", self._map, 0 )[0]
+            if( magic == _PCAPNG_SECTION ):
+                self._format = PCAPNG
+            elif( magic in ( _PCAP_MAGIC_MICRO, _PCAP_MAGIC_NANO ) or
+            struct.unpack_from( ">I", self._map, 0 )[0] in (
+            _PCAP_MAGIC_MICRO, _PCAP_MAGIC_NANO ) ):
+                self._format = PCAP
+            else:
+                raise ValueError( "Not a pcap or pcapng file: " + path )
+        except:
+            self.close()
+            raise
+        self._skipped = 0
+
+    # Returns the format of the file (PCAP or PCAPNG)
+    def getFormat(self):
+        return self._format
+
+    # Returns the number of packets skipped by the last pass over the file:
+    #  packets of other link types than Ethernet or shorter than its header
+    def getSkipped(self):
+        return self._skipped
+
+    # Yields ( timestamp, offset, captured length, wire length, link type )
+    #  for every packet of a pcap file. A truncated last packet ends the file.
+    def _iterPcapRecords(self):
+        data = self._map
+        size = len( data )
+        endian = "<"
+        magic = struct.unpack_from( "<I", data, 0 )[0]
+        if( magic not in ( _PCAP_MAGIC_MICRO, _PCAP_MAGIC_NANO ) ):
+            endian = ">"
+            magic = struct.unpack_from( ">I", data, 0 )[0]
+        scale = 1e-9 if magic == _PCAP_MAGIC_NANO else 1e-6
+        if( size < 24 ):
+            raise ValueError( "Truncated pcap header" )
+        linkType = struct.unpack_from( endian + "I", data, 20 )[0] & 0xffff
+
+        record = struct.Struct( endian + "IIII" )
+        offset = 24
+        while( offset + 16 <= size ):
+            seconds, fraction, capLen, wireLen = record.unpack_from( data, offset )
+            offset += 16
+            if( offset + capLen > size ):
+                break
+            yield ( seconds + fraction * scale, offset, capLen, wireLen, linkType )
+            offset += capLen
+
+    # Returns the timestamp scale (seconds per unit) in the options of the
+    #  pcapng interface description block from "start" up to "end"
+    def _getTimestampScale(self, endian, start, end):
+        data = self._map
+        while( start + 4 <= end ):
+            code, length = struct.unpack_from( endian + "HH", data, start )
+            if( code == 0 ):
+                break
+            if( code == _PCAPNG_TSRESOL_OPTION and length >= 1 ):
+                resolution = ord( data[ start + 4 ] )
+                if( resolution & 0x80 ):
+                    return 2.0 ** -( resolution & 0x7f )
+                return 10.0 ** -resolution
+            start += 4 + ( ( length + 3 ) & ~3 )
+        return 1e-6
+
+    # Yields ( timestamp, offset, captured length, wire length, link type )
+    #  for every packet of a pcapng file. A truncated last block ends the file.
+    def _iterPcapngRecords(self):
+        data = self._map
+        size = len( data )
+        endian = "<"
+        interfaces = []
+        offset = 0
+        while( offset + 12 <= size ):
+            blockType = struct.unpack_from( endian + "I", data, offset )[0]
+            if( blockType == _PCAPNG_SECTION ):
+                # Each section sets its own byte order and interfaces
+                endian = "<"
+                if( struct.unpack_from( "<I", data, offset + 8 )[0] !=
+                _PCAPNG_BYTE_ORDER ):
+                    endian = ">"
+                interfaces = []
+            blockLen = struct.unpack_from( endian + "I", data, offset + 4 )[0]
+            if( blockLen < 12 or blockLen % 4 != 0 ):
+                raise ValueError( "Invalid pcapng block length at offset " +
+                    str( offset ) )
+            end = offset + blockLen
+            if( end > size ):
+                break
+            body = offset + 8
+
+            if( blockType == _PCAPNG_INTERFACE ):
+                linkType, snapLen = struct.unpack_from( endian + "H2xI", data,
+                    body )
+                interfaces.append( ( linkType, snapLen, self._getTimestampScale(
+                    endian, body + 8, end - 4 ) ) )
+            elif( blockType == _PCAPNG_ENHANCED_PACKET ):
+                interface, high, low, capLen, wireLen = struct.unpack_from(
+                    endian + "IIIII", data, body )
+                if( interface >= len( interfaces ) or body + 20 + capLen >
+                end - 4 ):
+                    raise ValueError( "Invalid pcapng packet at offset " +
+                        str( offset ) )
+                linkType, snapLen, scale = interfaces[ interface ]
+                yield ( ( ( high << 32 ) | low ) * scale, body + 20, capLen,
+                    wireLen, linkType )
+            elif( blockType == _PCAPNG_SIMPLE_PACKET ):
+                if( len( interfaces ) == 0 ):
+                    raise ValueError( "Invalid pcapng packet at offset " +
+                        str( offset ) )
+                linkType, snapLen, scale = interfaces[0]
+                wireLen = struct.unpack_from( endian + "I", data, body )[0]
+                capLen = min( wireLen, end - 4 - ( body + 4 ) )
+                if( snapLen > 0 ):
+                    capLen = min( capLen, snapLen )
+                yield ( 0.0, body + 4, capLen, wireLen, linkType )
+            offset = end
+
+    # Yields PacketBatch objects holding every Ethernet packet of the file,
+    #  in file order
+    def iterBatches(self):
+        if( self._format == PCAP ):
+            records = self._iterPcapRecords()
+        else:
+            records = self._iterPcapngRecords()
+        data = self._map
+        self._skipped = 0
+
+        ethernet = _ETHERNET.unpack_from
+        vlan = _VLAN.unpack_from
+        ipv4 = _IPV4.unpack_from
+        ipv6 = _IPV6.unpack_from
+        vlanTypes = _ETHERTYPE_VLANS
+        while( True ):
+            timestamps = []
+            lengths = []
+            srcMacs = ( [], [] )
+            dstMacs = ( [], [] )
+            addSrcHigh, addSrcLow = srcMacs[0].append, srcMacs[1].append
+            addDstHigh, addDstLow = dstMacs[0].append, dstMacs[1].append
+            vlans = []
+            families = bytearray()
+            protocols = bytearray()
+            srcIPs = []
+            dstIPs = []
+            for timestamp, offset, capLen, wireLen, linkType in records:
+                if( linkType != LINKTYPE_ETHERNET or capLen < 14 ):
+                    self._skipped += 1
+                    continue
+                end = offset + capLen
+                dstHigh, dstLow, srcHigh, srcLow, etherType = ethernet( data,
+                    offset )
+                timestamps.append( timestamp )
+                lengths.append( wireLen )
+                addDstHigh( dstHigh )
+                addDstLow( dstLow )
+                addSrcHigh( srcHigh )
+                addSrcLow( srcLow )
+
+                # Keep the outermost VLAN identifier, skip any inner tags
+                offset += 14
+                vlanId = NO_VLAN
+                while( etherType in vlanTypes and offset + 4 <= end ):
+                    control, etherType = vlan( data, offset )
+                    if( vlanId == NO_VLAN ):
+                        vlanId = control & 0xfff
+                    offset += 4
+                vlans.append( vlanId )
+
+                family = NO_IP
+                protocol = src = dst = 0
+                if( etherType == _ETHERTYPE_IPV4 and offset + 20 <= end ):
+                    version, protocol, src, dst = ipv4( data, offset )
+                    if( version >> 4 == 4 ):
+                        family = IPV4_PACKET
+                elif( etherType == _ETHERTYPE_IPV6 and offset + 40 <= end ):
+                    version, protocol, srcHigh, srcLow, dstHigh, dstLow = ipv6(
+                        data, offset )
+                    if( version >> 28 == 6 ):
+                        family = IPV6_PACKET
+                        src = ( srcHigh << 64 ) | srcLow
+                        dst = ( dstHigh << 64 ) | dstLow
+                if( family == NO_IP ):
+                    protocol = src = dst = 0
+                families.append( family )
+                protocols.append( protocol )
+                srcIPs.append( src )
+                dstIPs.append( dst )
+                if( len( timestamps ) == self._batchSize ):
+                    break
+
+            if( len( timestamps ) == 0 ):
+                return
+            yield PacketBatch( timestamps, lengths, srcMacs, dstMacs, vlans,
+                families, protocols, srcIPs, dstIPs, self._macPredicates,
+                self._ipPredicates )
+
+    # Implements iteration over the batches (see iterBatches)
+    def __iter__(self):
+        return self.iterBatches()
+
+    # Unmaps and closes the file
+    def close(self):
+        if( self._map is not None ):
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
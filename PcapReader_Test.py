@@ -0,0 +1,229 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: PcapReader_Test.py
+# Author: Nicholas Russo
+# Description: This file includes a class that represents a test case for the
+#  capture file reader. Small pcap and pcapng files are written with struct,
+#  read back in batches and compared with the packets written; the flags are
+#  compared with the predicates of the address objects.
+###############################################################################
+
+from IPv4Address import IPv4Address
+from IPv6Address import IPv6Address
+from MACAddress import MACAddress
+from PcapReader import PcapReader, PCAP, PCAPNG, NO_IP, IPV4_PACKET
+from PcapReader import IPV6_PACKET, NO_VLAN
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+
+# Returns an Ethernet frame from MAC "src" to "dst" with the VLAN
+#  identifiers "vlans" (outermost first), EtherType "etherType" and "payload"
+def _buildFrame( src, dst, vlans, etherType, payload ):
+    header = dst.decode( "hex" ) + src.decode( "hex" )
+    for vlan in vlans:
+        header += struct.pack( "!HH", 0x8100, ( 5 << 13 ) | vlan )
+    return header + struct.pack( "!H", etherType ) + payload
+
+# Returns an IPv4 header with "protocol" from "src" to "dst" (integers)
+def _buildIPv4( protocol, src, dst, version = 4 ):
+    return struct.pack( "!BBHHHBBHII", ( version << 4 ) | 5, 0, 40, 1, 0, 64,
+        protocol, 0, src, dst ) + "\0" * 20
+
+# Returns an IPv6 header with next header "protocol" from "src" to "dst"
+def _buildIPv6( protocol, src, dst ):
+    return struct.pack( "!IHBBQQQQ", 6 << 28, 0, protocol, 64, src >> 64,
+        src & ( ( 1 << 64 ) - 1 ), dst >> 64, dst & ( ( 1 << 64 ) - 1 ) )
+
+# Returns a pcapng block of type "blockType" with body "body" (padded)
+def _buildBlock( blockType, body, endian = "<" ):
+    body += "\0" * ( -len( body ) % 4 )
+    return ( struct.pack( endian + "II", blockType, len( body ) + 12 ) + body +
+        struct.pack( endian + "I", len( body ) + 12 ) )
+
+# Defines a capture file reader test case
+class PcapReader_Test( unittest.TestCase ):
+
+    # Builds a test suite from all of the methods defined in this class
+    @staticmethod
+    def buildTestSuite():
+        return unittest.TestLoader().loadTestsFromTestCase( PcapReader_Test )
+
+    def setUp(self):
+        self._directory = tempfile.mkdtemp()
+        ipv4Src = IPv4Address( "10.1.2.3" ).toInteger()
+        ipv4Dst = IPv4Address( "224.0.0.5" ).toInteger()
+        ipv6Src = IPv6Address( "fe80:0000:0000:0000:0000:0000:0000:0001" ).toInteger()
+        ipv6Dst = IPv6Address( "2001:0000:4136:e378:8000:63bf:3fff:fdd2" ).toInteger()
+        macA = "001b2c3d4e5f"
+        macB = "01005e000005"
+
+        # ( frame, expected MACs, VLAN, family, protocol, IPs ) per packet
+        self._packets = [
+            ( _buildFrame( macA, macB, [], 0x0800, _buildIPv4( 6, ipv4Src,
+                ipv4Dst ) ), NO_VLAN, IPV4_PACKET, 6, ipv4Src, ipv4Dst ),
+            ( _buildFrame( macB, macA, [ 100 ], 0x86dd, _buildIPv6( 58, ipv6Src,
+                ipv6Dst ) ), 100, IPV6_PACKET, 58, ipv6Src, ipv6Dst ),
+            ( _buildFrame( macA, "ffffffffffff", [ 7, 4094 ], 0x0800,
+                _buildIPv4( 17, ipv4Dst, ipv4Src ) ), 7, IPV4_PACKET, 17,
+                ipv4Dst, ipv4Src ),
+            ( _buildFrame( macA, "ffffffffffff", [], 0x0806, "\0" * 28 ),
+                NO_VLAN, NO_IP, 0, 0, 0 ),
+            ( _buildFrame( macA, macB, [], 0x0800, _buildIPv4( 6, ipv4Src,
+                ipv4Dst )[ 0:19 ] ), NO_VLAN, NO_IP, 0, 0, 0 ),
+            ( _buildFrame( macA, macB, [], 0x0800, _buildIPv4( 6, ipv4Src,
+                ipv4Dst, 6 ) ), NO_VLAN, NO_IP, 0, 0, 0 ) ]
+        self._macs = [ ( int( frame[ 6:12 ].encode( "hex" ), 16 ),
+            int( frame[ 0:6 ].encode( "hex" ), 16 ) )
+            for frame in [ packet[0] for packet in self._packets ] ]
+
+    def tearDown(self):
+        shutil.rmtree( self._directory )
+
+    # Writes "data" to a new file and returns its path
+    def writeFile(self, name, data):
+        path = os.path.join( self._directory, name )
+        with open( path, "wb" ) as outputFile:
+            outputFile.write( data )
+        return path
+
+    # Returns a pcap file with every packet, timestamps 1000 + i seconds and
+    #  i units, and a truncated last packet
+    def buildPcap(self, endian, magic):
+        data = struct.pack( endian + "IHHiIII", magic, 2, 4, 0, 0, 65535, 1 )
+        for i, packet in enumerate( self._packets ):
+            frame = packet[0]
+            data += struct.pack( endian + "IIII", 1000 + i, i, len( frame ),
+                len( frame ) + 4 ) + frame
+        return data + struct.pack( endian + "IIII", 0, 0, 100, 100 ) + "\0" * 50
+
+    # Reads every batch of the file at "path" and returns the concatenated
+    #  columns, checking the flags of every batch
+    def readAll(self, path, batchSize, expectedFormat):
+        rows = []
+        with PcapReader( path, batchSize ) as reader:
+            self.assertTrue( reader.getFormat() == expectedFormat )
+            for batch in reader:
+                self.assertTrue( 0 < len( batch ) <= batchSize )
+                self.checkFlags( batch )
+                srcMacs, dstMacs = batch.getMacValues()
+                srcIPs, dstIPs = batch.getIPValues()
+                rows.extend( zip( batch.getTimestamps(), batch.getLengths(),
+                    srcMacs, dstMacs, batch.getVlans(), batch.getFamilies(),
+                    batch.getProtocols(), srcIPs, dstIPs ) )
+            skipped = reader.getSkipped()
+        return rows, skipped
+
+    # Compares every flag of "batch" with the predicates of the addresses
+    def checkFlags(self, batch):
+        for index in range( 0, len( batch ) ):
+            for side, address in enumerate( batch.getMacAddresses( index ) ):
+                for name in [ "isMulticast", "isULset", "isUnicast", "isIGset" ]:
+                    self.assertTrue( batch.getMacFlags( name )[ side ][ index ] ==
+                        getattr( address, name )() )
+            addresses = batch.getIPAddresses( index )
+            for name in [ "isMulticast", "isLinkLocalAddress", "isTeredo",
+            "isPrivateAddress", "isExperimental" ]:
+                for side in ( 0, 1 ):
+                    expected = ( addresses is not None and hasattr(
+                        addresses[ side ], name ) and getattr(
+                        addresses[ side ], name )() )
+                    self.assertTrue( batch.getIPFlags( name )[ side ][ index ] ==
+                        expected, name )
+        self.assertRaises( ValueError, batch.getIPFlags, "toString" )
+
+    # Returns the expected rows for timestamps "timestamps"
+    def getExpected(self, timestamps, extraLength = 4):
+        return [ ( timestamp, len( packet[0] ) + extraLength, srcMac, dstMac ) +
+            packet[ 1: ] for timestamp, packet, ( srcMac, dstMac ) in zip(
+            timestamps, self._packets, self._macs ) ]
+
+    # Little endian microsecond and big endian nanosecond pcap files
+    def test_pcap(self):
+        for endian, magic, scale in ( ( "<", 0xa1b2c3d4, 1e-6 ),
+        ( ">", 0xa1b23c4d, 1e-9 ) ):
+            path = self.writeFile( "capture.pcap", self.buildPcap( endian, magic ) )
+            for batchSize in ( 1, 4, 1000 ):
+                rows, skipped = self.readAll( path, batchSize, PCAP )
+                self.assertTrue( skipped == 0 )
+                self.assertTrue( rows == self.getExpected( [ 1000 + i + i * scale
+                    for i in range( 0, len( self._packets ) ) ] ) )
+
+        # Another link type is skipped
+        data = struct.pack( "<IHHiIII", 0xa1b2c3d4, 2, 4, 0, 0, 65535, 101 )
+        data += struct.pack( "<IIII", 0, 0, 20, 20 ) + "\0" * 20
+        path = self.writeFile( "raw.pcap", data )
+        self.assertTrue( self.readAll( path, 10, PCAP ) == ( [], 1 ) )
+
+    # A pcapng file with two sections, interfaces with other link types and
+    #  timestamp resolutions, simple packets and unknown blocks
+    def test_pcapng(self):
+        frames = [ packet[0] for packet in self._packets ]
+        data = ""
+        for endian in ( "<", ">" ):
+            data += _buildBlock( 0x0a0d0d0a, struct.pack( endian + "IHHq",
+                0x1a2b3c4d, 1, 0, -1 ), endian )
+            data += _buildBlock( 1, struct.pack( endian + "HHI", 101, 0, 0 ),
+                endian )
+            data += _buildBlock( 1, struct.pack( endian + "HHIHHB3xHH", 1, 0, 0,
+                9, 1, 9, 0, 0 ), endian )
+            data += _buildBlock( 6, struct.pack( endian + "IIIII", 0, 0, 0, 20,
+                20 ) + "\0" * 20, endian )
+            data += _buildBlock( 0xbad, "clown", endian )
+            for i, frame in enumerate( frames[ 0:3 ] ):
+                stamp = ( 1000 + i ) * 10 ** 9 + i
+                data += _buildBlock( 6, struct.pack( endian + "IIIII", 1,
+                    stamp >> 32, stamp & 0xffffffff, len( frame ), len( frame ) +
+                    4 ) + frame, endian )
+        data += _buildBlock( 0x0a0d0d0a, struct.pack( "<IHHq", 0x1a2b3c4d, 1,
+            0, -1 ) )
+        data += _buildBlock( 1, struct.pack( "<HHI", 1, 0, 0 ) )
+        for frame in frames[ 3: ]:
+            data += _buildBlock( 3, struct.pack( "<I", len( frame ) ) + frame )
+        data += _buildBlock( 6, "\0" * 40 )[ 0:30 ]
+        path = self.writeFile( "capture.pcapng", data )
+
+        rows, skipped = self.readAll( path, 2, PCAPNG )
+        self.assertTrue( skipped == 2 )
+        expected = self.getExpected( [ 1000 + i + i * 1e-9 for i in range( 0, 3 ) ] )
+        expected = expected + expected + self.getExpected( [ 0.0 ] * 6, 0 )[ 3: ]
+        self.assertTrue( len( rows ) == len( expected ) )
+        for row, expectedRow in zip( rows, expected ):
+            self.assertAlmostEqual( row[0], expectedRow[0], 6 )
+            self.assertTrue( row[ 1: ] == expectedRow[ 1: ] )
+
+        # Blocks that do not fit the format
+        path = self.writeFile( "bad.pcapng", _buildBlock( 0x0a0d0d0a, struct.pack(
+            "<IHHq", 0x1a2b3c4d, 1, 0, -1 ) ) + _buildBlock( 6, "\0" * 20 ) )
+        with PcapReader( path ) as reader:
+            self.assertRaises( ValueError, list, reader )
+
+    # Predicate selection and invalid files
+    def test_invalid(self):
+        path = self.writeFile( "capture.pcap", self.buildPcap( "<", 0xa1b2c3d4 ) )
+        with PcapReader( path, macPredicates = [], ipPredicates = [
+        "isMulticast" ] ) as reader:
+            batch = list( reader )[0]
+            self.assertTrue( batch.getIPFlags( "isMulticast" ) == ( bytearray(
+                [ 0, 0, 1, 0, 0, 0 ] ), bytearray( [ 1, 0, 0, 0, 0, 0 ] ) ) )
+            self.assertRaises( ValueError, batch.getMacFlags, "isMulticast" )
+            self.assertRaises( ValueError, batch.getIPFlags, "isTeredo" )
+            self.assertTrue( batch.getIPAddresses( 1 ) == ( IPv6Address(
+                "fe80:0000:0000:0000:0000:0000:0000:0001" ), IPv6Address(
+                "2001:0000:4136:e378:8000:63bf:3fff:fdd2" ) ) )
+            self.assertTrue( batch.getIPAddresses( 3 ) is None )
+            self.assertTrue( batch.getMacAddresses( 0 ) == ( MACAddress(
+                "00:1b:2c:3d:4e:5f" ), MACAddress( "01:00:5e:00:00:05" ) ) )
+
+        self.assertRaises( ValueError, PcapReader, path, 0 )
+        self.assertRaises( ValueError, PcapReader, path, ipPredicates = [ "isULset" ] )
+        self.assertRaises( ValueError, PcapReader, path, macPredicates = [
+            "isTeredo" ] )
+        self.assertRaises( ValueError, PcapReader, self.writeFile( "empty", "" ) )
+        self.assertRaises( ValueError, PcapReader, self.writeFile( "text",
+            "10.1.2.3\n" ) )
+        self.assertRaises( IOError, PcapReader, os.path.join( self._directory,
+            "missing" ) )
@@ -0,0 +1,43 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: PredicateRanges.py
+# Author: Nicholas Russo
+# Description: This file includes the integer ranges (see NetAddress.toInteger)
+#  on which the is*() predicates of the IPv4Address and IPv6Address classes
+#  are true. Tools that handle addresses as integers (e.g. AddressSampler and
+#  AddressConverter) use them to evaluate or exclude predicates without
+#  building address objects.
+###############################################################################
+
+# Integer ranges ( first, last ) on which each address class predicate is
+#  true, per address width. These mirror the predicates exactly, including
+#  quirks such as isPrivateAddress() covering all of 192.168-255.x.x.
+_predicateRanges = {
+    32: {
+        "isUnicast": [ ( 0x00000000, 0xDFFFFFFF ) ],
+        "isMulticast": [ ( 0xE0000000, 0xEFFFFFFF ) ],
+        "isExperimental": [ ( 0xF0000000, 0xFFFFFFFF ) ],
+        "isLinkLocalAddress": [ ( 0xA9FE0000, 0xA9FEFFFF ),
+            ( 0xE0000000, 0xE00000FF ) ],
+        "isPrivateAddress": [ ( 0x0A000000, 0x0AFFFFFF ),
+            ( 0xAC100000, 0xAC1FFFFF ), ( 0xC0A80000, 0xC0FFFFFF ),
+            ( 0xEF000000, 0xEFFFFFFF ) ] },
+    128: {
+        "isUnicast": [ ( 0, ( 0xFF << 120 ) - 1 ) ],
+        "isMulticast": [ ( 0xFF << 120, ( 1 << 128 ) - 1 ) ],
+        "is6to4": [ ( 0x2002 << 112, ( 0x2003 << 112 ) - 1 ) ],
+        "isIPv4Mapped": [ ( 0xFFFF << 32, ( 0x10000 << 32 ) - 1 ) ],
+        "isIPv4Compatible": [ ( 2, 0xFFFFFFFF ) ],
+        "isNAT64": [ ( 0x64FF9B << 96, ( 0x64FF9B << 96 ) | 0xFFFFFFFF ) ],
+        "isTeredo": [ ( 0x20010000 << 96, ( 0x20010001 << 96 ) - 1 ) ],
+        "isLinkLocalAddress": [ ( 0xFE80 << 112, ( 0xFEC0 << 112 ) - 1 ) ],
+        "isUniqueLocalAddress": [ ( 0xFC << 120, ( 0xFE << 120 ) - 1 ) ] } }
+
+# Returns the list of integer ranges on which the predicate "name" of the
+#  "numBits" wide address class is true
+def getPredicateRanges( name, numBits ):
+    try:
+        return list( _predicateRanges[ numBits ][ name ] )
+    except KeyError:
+        raise ValueError( "No ranges for predicate: " + str( name ) )
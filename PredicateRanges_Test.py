@@ -0,0 +1,64 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: PredicateRanges_Test.py
+# Author: Nicholas Russo
+# Description: This file includes a class that represents a test case for the
+#  predicate ranges. Every range of every predicate is checked against the
+#  predicate of the address objects, directly and through the batch
+#  evaluation of AddressConverter.
+###############################################################################
+
+from AddressConverter import computePredicate, getPredicateNames
+from NetAddressFactory import IPV4, IPV6
+from PredicateRanges import getPredicateRanges, _predicateRanges
+from IPv4Address import IPv4Address
+from IPv6Address import IPv6Address
+import random
+import unittest
+
+# Defines a predicate ranges test case
+class PredicateRanges_Test( unittest.TestCase ):
+
+    # Builds a test suite from all of the methods defined in this class
+    @staticmethod
+    def buildTestSuite():
+        return unittest.TestLoader().loadTestsFromTestCase( PredicateRanges_Test )
+
+    # Every range must agree with the object predicate at its edges, just
+    #  outside of them, inside of them and at random addresses; the batch
+    #  evaluation must agree as well
+    def test_predicateRanges(self):
+        generator = random.Random( 40 )
+        for addressClass, family in ( ( IPv4Address, IPV4 ),
+        ( IPv6Address, IPV6 ) ):
+            numBits = addressClass._maxAddrLen
+            self.assertTrue( len( _predicateRanges[ numBits ] ) > 0 )
+            for name in _predicateRanges[ numBits ]:
+                self.assertTrue( name in getPredicateNames( family ), name )
+                ranges = getPredicateRanges( name, numBits )
+                values = [ generator.getrandbits( numBits ) for i in range( 0, 500 ) ]
+                for first, last in ranges:
+                    self.assertTrue( 0 <= first <= last < 1 << numBits )
+                    values.extend( ( first - 1, first, last, last + 1,
+                        generator.randint( first, last ) ) )
+                values = [ value for value in values
+                    if value >= 0 and value >> numBits == 0 ]
+
+                flags = computePredicate( name, family, values,
+                    [ numBits ] * len( values ) )
+                for value, flag in zip( values, flags ):
+                    expected = any( first <= value <= last
+                        for first, last in ranges )
+                    self.assertTrue( getattr( addressClass.fromInteger( value ),
+                        name )() == expected, name + " " + hex( value ) )
+                    self.assertTrue( flag == expected, name + " " + hex( value ) )
+
+    # Widths and names without ranges raise errors, and the returned lists
+    #  are copies
+    def test_getPredicateRanges(self):
+        self.assertRaises( ValueError, getPredicateRanges, "isPrivateAddress", 48 )
+        self.assertRaises( ValueError, getPredicateRanges, "toString", 32 )
+        getPredicateRanges( "isMulticast", 32 ).append( ( 0, 0 ) )
+        self.assertTrue( getPredicateRanges( "isMulticast", 32 ) ==
+            [ ( 0xE0000000, 0xEFFFFFFF ) ] )
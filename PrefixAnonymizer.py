@@ -0,0 +1,129 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: PrefixAnonymizer.py
+# Author: Nicholas Russo
+# Description: This file includes a keyed, deterministic, prefix-preserving
+#  anonymizer for IPv4, IPv6 and MAC addresses in the style of Crypto-PAn:
+#  each bit of the address is flipped according to a pseudorandom function
+#  of the key and all of the bits before it, so two addresses sharing an
+#  N-bit prefix still share exactly an N-bit prefix after anonymization.
+#  HMAC-SHA256 is used as the pseudorandom function; one digest supplies the
+#  flip bits for the next 8 bits of every address under a prefix. Digests
+#  and the anonymized upper bits of each final-octet block are cached since
+#  most addresses share their upper bits.
+###############################################################################
+
+from NetAddress import NetAddress
+import array
+import hashlib
+import hmac
+
+# Default number of entries of each cache; a cache is emptied when it fills
+#  up, which bounds memory regardless of how many addresses are processed.
+#  An entry takes about 270 bytes, so the two caches stay below about 35 MB
+#  by default; pass a larger cacheSize for inputs spread over more prefixes.
+CACHE_SIZE = 1 << 16
+
+# Values up to 64 bits wide are returned in arrays of unsigned longs where
+#  those are 64 bits wide. Python 2 has no array type of 64 bits on every
+#  platform (on Windows and 32-bit builds "L" is 32 bits), so 48-bit values
+#  are returned in lists there.
+_LONG_TYPE = "L" if array.array( "L" ).itemsize >= 8 else None
+
+# Defines a prefix-preserving anonymizer for a single secret key
+class PrefixAnonymizer(object):
+
+    # Builds an anonymizer for the secret "key" (a string of bytes, ideally
+    #  32 random bytes). The same key always yields the same mapping.
+    def __init__(self, key, cacheSize = CACHE_SIZE):
+        if ( key is None or len( key ) == 0 ):
+            raise AttributeError( "key is None or empty" )
+        if ( cacheSize <= 0 ):
+            raise ValueError( "cacheSize is not positive: " + str( cacheSize ) )
+
+        self._hmac = hmac.new( key, digestmod = hashlib.sha256 )
+        self._cacheSize = cacheSize
+        self._padCache = {}
+        self._prefixCache = {}
+
+    # Returns the 256-bit pad for the "level" upper bits of a "numBits" wide
+    #  address equal to "prefix". Bit n of the pad is the flip applied at
+    #  node n of the 8-level binary tree hanging below that prefix (node 0
+    #  is the root, node n has children 2n+1 and 2n+2).
+    def _getPad(self, numBits, level, prefix):
+        cacheKey = ( numBits, level, prefix )
+        try:
+            return self._padCache[ cacheKey ]
+        except KeyError:
+            pass
+
+        # Each family and level uses a distinct message so pads never repeat
+        digest = self._hmac.copy()
+        digest.update( "%d:%d:%x" % cacheKey )
+        pad = int( digest.hexdigest(), 16 )
+
+        if ( len( self._padCache ) >= self._cacheSize ):
+            self._padCache.clear()
+        self._padCache[ cacheKey ] = pad
+        return pad
+
+    # Returns "octet" with the flips from "pad" applied, walking the tree
+    #  along the bits of the octet from high-order to low-order
+    @staticmethod
+    def _flipOctet(octet, pad):
+        node = 0
+        flips = 0
+        for bitIndex in range( 7, -1, -1 ):
+            flips = ( flips << 1 ) | ( ( pad >> node ) & 1 )
+            node = 2 * node + 1 + ( ( octet >> bitIndex ) & 1 )
+        return octet ^ flips
+
+    # Returns the anonymized value of the "numBits" wide integer "value".
+    #  "numBits" must be a multiple of 8 (32, 48 and 128 all are).
+    def anonymizeValue(self, value, numBits):
+        if ( value < 0 or value >> numBits != 0 ):
+            raise ValueError( "value is out of range: " + str( value ) )
+
+        # Addresses in the same final-octet block (e.g. an IPv4 /24) share
+        #  everything but the last walk, so that result is cached on its own
+        cacheKey = ( numBits, value >> 8 )
+        try:
+            upper, lastPad = self._prefixCache[ cacheKey ]
+            return ( upper << 8 ) | self._flipOctet( value & 0xFF, lastPad )
+        except KeyError:
+            pass
+
+        upper = 0
+        for level in range( 0, numBits - 8, 8 ):
+            pad = self._getPad( numBits, level, value >> ( numBits - level ) )
+            octet = ( value >> ( numBits - level - 8 ) ) & 0xFF
+            upper = ( upper << 8 ) | self._flipOctet( octet, pad )
+        lastPad = self._getPad( numBits, numBits - 8, value >> 8 )
+
+        if ( len( self._prefixCache ) >= self._cacheSize ):
+            self._prefixCache.clear()
+        self._prefixCache[ cacheKey ] = ( upper, lastPad )
+        return ( upper << 8 ) | self._flipOctet( value & 0xFF, lastPad )
+
+    # Returns an anonymized copy of the address object "address", of the same
+    #  class and with the same address length
+    def anonymize(self, address):
+        if ( not isinstance( address, NetAddress ) ):
+            raise ValueError( "address is not a NetAddress: " + str( address ) )
+
+        addressClass = address.__class__
+        return addressClass.fromInteger( self.anonymizeValue(
+            address.toInteger(), addressClass._maxAddrLen ),
+            address.getAddrLen() )
+
+    # Anonymizes every "numBits" wide integer in the sequence "values".
+    #  Returns an array of unsigned longs for values that fit in one (32
+    #  bits, or 64 bits where longs are that wide; see _LONG_TYPE), or a list
+    #  for wider values (IPv6) which do not fit in an array element.
+    def anonymizeAll(self, values, numBits):
+        anonymizeValue = self.anonymizeValue
+        results = [ anonymizeValue( value, numBits ) for value in values ]
+        if ( numBits <= 32 or ( numBits <= 64 and _LONG_TYPE is not None ) ):
+            return array.array( "L", results )
+        return results
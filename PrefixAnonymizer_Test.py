@@ -0,0 +1,99 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: PrefixAnonymizer_Test.py
+# Author: Nicholas Russo
+# Description: This file includes a class that represents a test case for the
+#  PrefixAnonymizer class. Determinism, key sensitivity, the prefix-preserving
+#  property and the object and batch interfaces are tested here.
+###############################################################################
+
+from IPv4Address import IPv4Address
+from IPv6Address import IPv6Address
+from MACAddress import MACAddress
+from PrefixAnonymizer import PrefixAnonymizer
+import random
+import sys
+import unittest
+
+# Defines a prefix-preserving anonymizer test case
+class PrefixAnonymizer_Test( unittest.TestCase ):
+
+    # Builds a test suite from all of the methods defined in this class
+    @staticmethod
+    def buildTestSuite():
+        return unittest.TestLoader().loadTestsFromTestCase( 
+            PrefixAnonymizer_Test )
+
+    # Builds an anonymizer with a fixed key; a tiny cache forces evictions
+    def setUp(self):
+        self._anonymizer = PrefixAnonymizer( "0123456789abcdef0123456789abcdef",
+            cacheSize = 64 )
+
+    def tearDown(self):
+        self._anonymizer = None
+
+    # Returns the length of the common prefix of two "numBits" wide values
+    def _commonPrefixLen(self, first, second, numBits):
+        return numBits - ( first ^ second ).bit_length()
+
+    # Ensures invalid keys and values raise errors
+    def test_invalidInputs(self):
+        self.assertRaises( AttributeError, PrefixAnonymizer, "" )
+        self.assertRaises( AttributeError, PrefixAnonymizer, None )
+        self.assertRaises( ValueError, PrefixAnonymizer, "key", 0 )
+        self.assertRaises( ValueError, self._anonymizer.anonymizeValue, 1 << 32, 32 )
+        self.assertRaises( ValueError, self._anonymizer.anonymize, "10.0.0.1" )
+
+    # Two addresses sharing exactly N bits must share exactly N bits after
+    #  anonymization, for every family width
+    def test_prefixPreserving(self):
+        generator = random.Random( 31 )
+        for numBits in ( 32, 48, 128 ):
+            for i in range( 0, 300 ):
+                first = generator.getrandbits( numBits )
+                second = first ^ ( generator.getrandbits( numBits ) >> 
+                    generator.randint( 0, numBits ) )
+                self.assertTrue( self._commonPrefixLen( 
+                    self._anonymizer.anonymizeValue( first, numBits ),
+                    self._anonymizer.anonymizeValue( second, numBits ),
+                    numBits ) == self._commonPrefixLen( first, second, numBits ) )
+
+    # The mapping depends only on the key, and differs between keys
+    def test_deterministic(self):
+        values = range( 0, 1000 )
+        other = PrefixAnonymizer( "0123456789abcdef0123456789abcdef" )
+        results = self._anonymizer.anonymizeAll( values, 32 )
+        self.assertTrue( results == other.anonymizeAll( values, 32 ) )
+        self.assertTrue( len( set( results ) ) == len( values ) )
+        self.assertTrue( results != PrefixAnonymizer( "another key" ).anonymizeAll(
+            values, 32 ) )
+
+    # Objects keep their class and address length
+    def test_anonymize(self):
+        for address in ( IPv4Address( "10.1.2.3", 24 ), MACAddress( "00:1a:2b:3c:4d:5e" ),
+        IPv6Address( "2001:0db8:0000:0000:0000:0000:0000:0001", 64 ) ):
+            anonymized = self._anonymizer.anonymize( address )
+            self.assertTrue( anonymized.__class__ == address.__class__ )
+            self.assertTrue( anonymized.getAddrLen() == address.getAddrLen() )
+            self.assertTrue( anonymized.toInteger() == self._anonymizer.anonymizeValue(
+                address.toInteger(), address.__class__._maxAddrLen ) )
+            self.assertTrue( self._anonymizer.anonymizeAll( 
+                [ address.toInteger() ], address.__class__._maxAddrLen )[0] ==
+                anonymized.toInteger() )
+
+    # 48-bit results are the same in arrays and in the lists used where
+    #  unsigned longs are too narrow
+    def test_anonymizeAllMacs(self):
+        values = [ ( 0xFFFFFF << 24 ) | value for value in range( 0, 100 ) ]
+        expected = [ self._anonymizer.anonymizeValue( value, 48 )
+            for value in values ]
+        module = sys.modules[ PrefixAnonymizer.__module__ ]
+        longType = module._LONG_TYPE
+        try:
+            for testType in ( longType, None ):
+                module._LONG_TYPE = testType
+                self.assertTrue( list( self._anonymizer.anonymizeAll( values,
+                    48 ) ) == expected )
+        finally:
+            module._LONG_TYPE = longType
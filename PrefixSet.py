@@ -0,0 +1,120 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: PrefixSet.py
+# Author: Nicholas Russo
+# Description: This file includes a function and a class that test many
+#  addresses for containment in one prefix or in a small set of prefixes,
+#  given as integer values (see NetAddress.toInteger) so no objects are
+#  built. A prefix is a range of integers; a set of prefixes is compiled
+#  into the sorted boundaries of the intervals on which the longest matching
+#  prefix does not change, so every test is a single binary search.
+###############################################################################
+
+from NetAddress import NetAddress
+import bisect
+
+# Index reported when no prefix contains an address
+NO_MATCH = -1
+
+# Returns the range ( first, last ) of integers in the prefix of "prefix"
+def _getRange( prefix ):
+    hostLen = prefix._maxAddrLen - prefix.getAddrLen()
+    first = ( prefix.toInteger() >> hostLen ) << hostLen
+    return ( first, first | ( ( 1 << hostLen ) - 1 ) )
+
+# Tests every integer in the sequence "values" (e.g. an array) for
+#  containment in the prefix of the address object "prefix". Returns a
+#  bytearray of the same length holding 1 where the value is contained and
+#  0 otherwise.
+def containsValues( prefix, values ):
+    first, last = _getRange( prefix )
+    return bytearray( [ first <= value <= last for value in values ] )
+
+# Defines a compiled set of prefixes of one address class
+class PrefixSet(object):
+
+    # Compiles the address objects with address lengths in "prefixes" (e.g.
+    #  IPv4Address( "10.0.0.0", 8 )), all of one class
+    def __init__(self, prefixes):
+        if( prefixes is None or len( prefixes ) == 0 ):
+            raise AttributeError( "prefixes is None or empty" )
+        self._addressClass = prefixes[0].__class__
+        for prefix in prefixes:
+            if( prefix.__class__ != self._addressClass ):
+                raise ValueError( "prefixes are of different classes: " +
+                    str( prefix ) )
+        self._prefixes = list( prefixes )
+        ranges = [ _getRange( prefix ) for prefix in prefixes ]
+
+        # Every first value and every value past a last one starts an interval
+        self._boundaries = sorted( set( [ first for first, last in ranges ] +
+            [ last + 1 for first, last in ranges ] ) )
+
+        # _indices[ i ] is the prefix matching the values from boundary i - 1
+        #  up to boundary i. Longer prefixes are painted over shorter ones,
+        #  and earlier prefixes over equal later ones.
+        self._indices = [ NO_MATCH ] * ( len( self._boundaries ) + 1 )
+        for index in sorted( range( 0, len( ranges ) ), key = lambda index: (
+        prefixes[ index ].getAddrLen(), -index ) ):
+            first, last = ranges[ index ]
+            for interval in xrange( bisect.bisect_right( self._boundaries,
+            first ), bisect.bisect_right( self._boundaries, last ) + 1 ):
+                self._indices[ interval ] = index
+        self._hits = [ 0 if index == NO_MATCH else 1
+            for index in self._indices ]
+
+    # Implements the len() function by returning the number of prefixes
+    def __len__(self):
+        return len( self._prefixes )
+
+    # Returns the prefix at index "index"
+    def getPrefix(self, index):
+        return self._prefixes[ index ]
+
+    # Returns the integer value of "address" (an address object of the class
+    #  of the set, or an integer value), or None for other classes
+    def _toValue(self, address):
+        if( isinstance( address, NetAddress ) ):
+            if( address.__class__ is not self._addressClass ):
+                return None
+            return address.toInteger()
+        return address
+
+    # Returns true if any prefix contains "address" (an address object or
+    #  an integer value)
+    def contains(self, address):
+        value = self._toValue( address )
+        return value is not None and self._hits[ bisect.bisect_right(
+            self._boundaries, value ) ] == 1
+
+    # Implements the "in" operator (e.g. address in prefixSet)
+    def __contains__(self, address):
+        return self.contains( address )
+
+    # Returns the index of the longest prefix containing "address" (the
+    #  first such prefix if it is listed several times), or NO_MATCH
+    def matchIndex(self, address):
+        value = self._toValue( address )
+        if( value is None ):
+            return NO_MATCH
+        return self._indices[ bisect.bisect_right( self._boundaries, value ) ]
+
+    # Tests every integer in the sequence "values". Returns a bytearray of the
+    #  same length holding 1 where some prefix contains the value and 0
+    #  otherwise.
+    def containsAll(self, values):
+        bisectRight = bisect.bisect_right
+        boundaries = self._boundaries
+        hits = self._hits
+        return bytearray( [ hits[ bisectRight( boundaries, value ) ]
+            for value in values ] )
+
+    # Returns a list with the index of the longest prefix containing every
+    #  integer in the sequence "values" (NO_MATCH where none does)
+    def matchAllIndices(self, values):
+        bisectRight = bisect.bisect_right
+        boundaries = self._boundaries
+        indices = self._indices
+        return [ indices[ bisectRight( boundaries, value ) ]
+            for value in values ]
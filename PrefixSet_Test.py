@@ -0,0 +1,83 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: PrefixSet_Test.py
+# Author: Nicholas Russo
+# Description: This file includes a class that represents a test case for the
+#  batch containment tests. Results are compared with the scalar contains()
+#  function of the address objects for random IPv4 and IPv6 prefixes.
+###############################################################################
+
+from IPv4Address import IPv4Address
+from IPv6Address import IPv6Address
+from PrefixSet import PrefixSet, containsValues, NO_MATCH
+import array
+import random
+import unittest
+
+# Defines a prefix set test case
+class PrefixSet_Test( unittest.TestCase ):
+
+    # Builds a test suite from all of the methods defined in this class
+    @staticmethod
+    def buildTestSuite():
+        return unittest.TestLoader().loadTestsFromTestCase( PrefixSet_Test )
+
+    # Returns the index of the longest prefix in "prefixes" containing
+    #  "address" (the first one of that length), found with contains()
+    def getExpectedIndex(self, prefixes, address):
+        best = NO_MATCH
+        for index, prefix in enumerate( prefixes ):
+            if( prefix.contains( address ) and ( best == NO_MATCH or
+            prefix.getAddrLen() > prefixes[ best ].getAddrLen() ) ):
+                best = index
+        return best
+
+    # Random nested prefixes and addresses near them, for each class
+    def test_matches(self):
+        generator = random.Random( 46 )
+        for addressClass in ( IPv4Address, IPv6Address ):
+            numBits = addressClass._maxAddrLen
+            base = generator.getrandbits( numBits )
+            prefixes = [ addressClass.fromInteger( base ^ generator.randrange(
+                1 << ( numBits - addrLen ) ), addrLen ) for addrLen in [
+                generator.randint( numBits / 2, numBits ) for i in range( 0, 30 ) ] ]
+            prefixes.append( prefixes[3] )
+            values = [ base ^ generator.randrange( 1 << generator.randint( 0,
+                numBits / 2 + 8 ) ) for i in range( 0, 2000 ) ]
+            values += [ prefix.toInteger() for prefix in prefixes ]
+            if( numBits <= 64 ):
+                values = array.array( "L", values )
+            addresses = [ addressClass.fromInteger( value ) for value in values ]
+
+            prefixSet = PrefixSet( prefixes )
+            self.assertTrue( len( prefixSet ) == len( prefixes ) )
+            expected = [ self.getExpectedIndex( prefixes, address )
+                for address in addresses ]
+            self.assertTrue( prefixSet.matchAllIndices( values ) == expected )
+            self.assertTrue( prefixSet.containsAll( values ) == bytearray(
+                [ index != NO_MATCH for index in expected ] ) )
+            self.assertTrue( NO_MATCH in expected )
+            for address, index in zip( addresses[0:200], expected ):
+                self.assertTrue( prefixSet.matchIndex( address ) == index )
+                self.assertTrue( ( address in prefixSet ) == ( index != NO_MATCH ) )
+            self.assertTrue( prefixSet.matchIndex( prefixes[-1] ) == 3 )
+
+            prefix = prefixes[0]
+            self.assertTrue( containsValues( prefix, values ) == bytearray(
+                [ prefix.contains( address ) for address in addresses ] ) )
+
+    # Edge prefixes and invalid input
+    def test_edges(self):
+        prefixSet = PrefixSet( [ IPv4Address( "0.0.0.0", 0 ),
+            IPv4Address( "255.255.255.255", 32 ), IPv4Address( "10.0.0.0", 8 ) ] )
+        self.assertTrue( prefixSet.matchAllIndices( [ 0, 0xFFFFFFFF,
+            0xFFFFFFFE, 0x0A000000, 0x0AFFFFFF, 0x0B000000 ] ) ==
+            [ 0, 1, 0, 2, 2, 0 ] )
+        self.assertTrue( IPv6Address( "0:0:0:0:0:0:0:1" ) not in prefixSet )
+        self.assertTrue( prefixSet.matchIndex( IPv6Address(
+            "0:0:0:0:0:0:0:1" ) ) == NO_MATCH )
+        self.assertTrue( prefixSet.getPrefix( 2 ) == IPv4Address( "10.0.0.0", 8 ) )
+        self.assertRaises( AttributeError, PrefixSet, [] )
+        self.assertRaises( ValueError, PrefixSet, [ IPv4Address( "10.0.0.0", 8 ),
+            IPv6Address( "0:0:0:0:0:0:0:0", 8 ) ] )
@@ -0,0 +1,190 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: ReverseDNS.py
+# Author: Nicholas Russo
+# Description: This file includes functions that build reverse DNS (PTR)
+#  owner names for IPv4 (in-addr.arpa) and IPv6 (ip6.arpa) addresses and
+#  parse them back. Names are built from integer values (see
+#  NetAddress.toInteger): the labels for the low-order 8 bits (IPv4) or 16
+#  bits (IPv6, four nibbles) come from precomputed tables and the rest of
+#  the name, shared by every address in that block, is cached. Whole
+#  prefixes and arrays of values are streamed without building objects.
+###############################################################################
+
+# Default number of cached name suffixes; the cache is emptied when it fills
+#  up, which bounds memory regardless of how many names are generated
+CACHE_SIZE = 1 << 16
+
+_IPV4_DOMAIN = "in-addr.arpa"
+_IPV6_DOMAIN = "ip6.arpa"
+_HEX_DIGITS = "0123456789abcdefABCDEF"
+
+# Labels (with their trailing dot) for the low-order 8 bits of an IPv4
+#  address; the IPv6 table of 65536 four-nibble labels is built on first use
+_octetLabels = [ str( octet ) + "." for octet in range( 0, 256 ) ]
+_nibbleLabels = []
+
+# Values of the canonical decimal labels of IPv4 reverse names
+_octetValues = dict( ( str( octet ), octet ) for octet in range( 0, 256 ) )
+
+# Suffixes keyed by ( width, value without its low-order block )
+_suffixCache = {}
+
+# Returns the number of low-order bits whose labels come from a table
+def _getBlockLen( numBits ):
+    if( numBits == 32 ):
+        return 8
+    elif( numBits == 128 ):
+        return 16
+    raise ValueError( "numBits is not 32 or 128: " + str( numBits ) )
+
+# Returns the label table for the low-order block of "numBits" wide values
+def _getLabels( numBits ):
+    if( numBits == 32 ):
+        return _octetLabels
+    if( len( _nibbleLabels ) == 0 ):
+        _nibbleLabels.extend( "%x.%x.%x.%x." % ( block & 0xF,
+            ( block >> 4 ) & 0xF, ( block >> 8 ) & 0xF, block >> 12 )
+            for block in xrange( 0, 1 << 16 ) )
+    return _nibbleLabels
+
+# Returns the reverse name of the "numBits" wide "value" without the labels
+#  of its low-order block (e.g. 3.2.1.in-addr.arpa for 1.2.3.4)
+def _getSuffix( numBits, upper ):
+    cacheKey = ( numBits, upper )
+    try:
+        return _suffixCache[ cacheKey ]
+    except KeyError:
+        pass
+
+    if( numBits == 32 ):
+        suffix = "%d.%d.%d.%s" % ( upper & 0xFF, ( upper >> 8 ) & 0xFF,
+            upper >> 16, _IPV4_DOMAIN )
+    else:
+        suffix = ".".join( reversed( "%028x" % upper ) ) + "." + _IPV6_DOMAIN
+
+    if( len( _suffixCache ) >= CACHE_SIZE ):
+        _suffixCache.clear()
+    _suffixCache[ cacheKey ] = suffix
+    return suffix
+
+# Returns the reverse DNS name of the "numBits" wide integer "value" (32 for
+#  IPv4, 128 for IPv6), e.g. 4.3.2.1.in-addr.arpa for 1.2.3.4
+def toReverseName( value, numBits ):
+    blockLen = _getBlockLen( numBits )
+    if( value < 0 or value >> numBits != 0 ):
+        raise ValueError( "value is out of range: " + str( value ) )
+    return _getLabels( numBits )[ value & ( ( 1 << blockLen ) - 1 ) ] + \
+        _getSuffix( numBits, value >> blockLen )
+
+# Returns the reverse DNS zone name for the "numBits" wide prefix "value" of
+#  length "prefixLen". Zones are cut at label boundaries (8 bits for IPv4, 4
+#  for IPv6), so other lengths give the zone of the enclosing prefix.
+def toReverseZone( value, numBits, prefixLen ):
+    _getBlockLen( numBits )
+    if( prefixLen < 0 or prefixLen > numBits ):
+        raise ValueError( "prefixLen is out of range: " + str( prefixLen ) )
+
+    if( numBits == 32 ):
+        labels = [ str( ( value >> ( 24 - 8 * position ) ) & 0xFF )
+            for position in range( 0, prefixLen / 8 ) ]
+        domain = _IPV4_DOMAIN
+    else:
+        labels = list( ( "%032x" % value )[ 0:prefixLen / 4 ] )
+        domain = _IPV6_DOMAIN
+    return ".".join( labels[ ::-1 ] + [ domain ] )
+
+# Yields the reverse DNS name of every "numBits" wide integer in the
+#  sequence "values" (e.g. an array)
+def iterReverseNames( values, numBits ):
+    blockLen = _getBlockLen( numBits )
+    blockMask = ( 1 << blockLen ) - 1
+    labels = _getLabels( numBits )
+
+    # Consecutive values usually share their suffix; skip the cache for them
+    upper = None
+    suffix = None
+    for value in values:
+        if( value >> blockLen != upper ):
+            if( value < 0 or value >> numBits != 0 ):
+                raise ValueError( "value is out of range: " + str( value ) )
+            upper = value >> blockLen
+            suffix = _getSuffix( numBits, upper )
+        yield labels[ value & blockMask ] + suffix
+
+# Returns the list of reverse DNS names for the sequence "values"
+def toReverseNames( values, numBits ):
+    return list( iterReverseNames( values, numBits ) )
+
+# Yields the reverse DNS name of every address in the "numBits" wide prefix
+#  "value" of length "prefixLen", in order (e.g. 65536 names for an IPv4
+#  /16). Each suffix is built once per block of names.
+def iterPrefixReverseNames( value, numBits, prefixLen ):
+    blockLen = _getBlockLen( numBits )
+    if( prefixLen < 0 or prefixLen > numBits ):
+        raise ValueError( "prefixLen is out of range: " + str( prefixLen ) )
+
+    hostLen = numBits - prefixLen
+    first = ( value >> hostLen ) << hostLen
+    last = first | ( ( 1 << hostLen ) - 1 )
+    labels = _getLabels( numBits )
+    blockMask = ( 1 << blockLen ) - 1
+
+    upper = first >> blockLen
+    while( upper <= last >> blockLen ):
+        suffix = _getSuffix( numBits, upper )
+        for label in labels[ first & blockMask:( last & blockMask ) + 1 ]:
+            yield label + suffix
+        upper += 1
+
+# Returns ( width, value, address length ) for the reverse DNS name "name"
+#  (case insensitive, with or without the trailing dot). Names with fewer
+#  labels than a full address (zone names) give a shorter address length.
+def parseReverseValue( name ):
+
+    # Test for a null reference; raise error
+    if( name is None or len( name ) == 0 ):
+        raise AttributeError( "name is None or empty" )
+
+    labelString = name[ :-1 ] if name.endswith( "." ) else name
+    domain = labelString[ -len( _IPV4_DOMAIN ) - 1: ].lower()
+    if( domain == "." + _IPV4_DOMAIN ):
+        labels = labelString[ 0:-len( _IPV4_DOMAIN ) - 1 ].split( "." )
+        if( len( labels ) > 4 ):
+            raise ValueError( "Too many labels: " + name )
+
+        # Only canonical decimal octets are looked up successfully
+        value = 0
+        try:
+            for label in reversed( labels ):
+                value = ( value << 8 ) | _octetValues[ label ]
+        except KeyError:
+            raise ValueError( "Invalid IPv4 label: " + name )
+        addrLen = 8 * len( labels )
+        return ( 32, value << ( 32 - addrLen ), addrLen )
+
+    elif( domain.endswith( "." + _IPV6_DOMAIN ) ):
+        labelString = labelString[ 0:-len( _IPV6_DOMAIN ) - 1 ]
+
+        # Every label is a single nibble, so every other character is a dot
+        numLabels = ( len( labelString ) + 1 ) / 2
+        if( numLabels > 32 or len( labelString ) != 2 * numLabels - 1 or
+        labelString[ 1::2 ] != "." * ( numLabels - 1 ) or
+        labelString[ 0::2 ].strip( _HEX_DIGITS ) != "" ):
+            raise ValueError( "Invalid IPv6 labels: " + name )
+        addrLen = 4 * numLabels
+        return ( 128, int( labelString[ -1::-2 ], 16 ) << ( 128 - addrLen ),
+            addrLen )
+
+    raise ValueError( "Not a reverse DNS name: " + name )
+
+# Returns the IPv4Address or IPv6Address for the reverse DNS name "name",
+#  with an address length of the number of bits named
+def parseReverseName( name ):
+    numBits, value, addrLen = parseReverseValue( name )
+    if( numBits == 32 ):
+        from IPv4Address import IPv4Address
+        return IPv4Address.fromInteger( value, addrLen )
+    from IPv6Address import IPv6Address
+    return IPv6Address.fromInteger( value, addrLen )
@@ -0,0 +1,102 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: ReverseDNS_Test.py
+# Author: Nicholas Russo
+# Description: This file includes a class that represents a test case for the
+#  reverse DNS name functions. Names for single addresses, arrays and whole
+#  prefixes, zone names and the reverse parser are tested here.
+###############################################################################
+
+from ReverseDNS import toReverseName, toReverseNames, toReverseZone, \
+    iterPrefixReverseNames, parseReverseValue, parseReverseName
+from IPv4Address import IPv4Address
+from IPv6Address import IPv6Address
+import random
+import unittest
+
+# Defines a reverse DNS test case
+class ReverseDNS_Test( unittest.TestCase ):
+
+    # Builds a test suite from all of the methods defined in this class
+    @staticmethod
+    def buildTestSuite():
+        return unittest.TestLoader().loadTestsFromTestCase( ReverseDNS_Test )
+
+    # Returns the reverse name built by reversing the address string, the
+    #  slow way the cached tables must agree with
+    @staticmethod
+    def _slowReverseName(address):
+        if( isinstance( address, IPv4Address ) ):
+            return ".".join( reversed( address.toString().split( "." ) ) ) + \
+                ".in-addr.arpa"
+        return ".".join( reversed( address.toString().replace( ":", "" ) ) ) + \
+            ".ip6.arpa"
+
+    # Names of single addresses and arrays match the string reversal and
+    #  parse back to the same address
+    def test_reverseName(self):
+        self.assertTrue( IPv4Address( "1.2.3.4" ).toReverseName() ==
+            "4.3.2.1.in-addr.arpa" )
+        self.assertTrue( IPv6Address( "2001:0db8:0000:0000:0000:0000:0000:0001" )
+            .toReverseName() == "1.0.0.0.0.0.0.0.0.0.0.0.0.0.0.0.0.0.0.0.0.0.0.0" +
+            ".8.b.d.0.1.0.0.2.ip6.arpa" )
+
+        generator = random.Random( 39 )
+        for addressClass, numBits in ( ( IPv4Address, 32 ),
+        ( IPv6Address, 128 ) ):
+            values = [ generator.getrandbits( numBits ) for i in range( 0, 300 ) ]
+            values += [ values[0] + i for i in range( 0, 300 ) ]
+            values = [ value & ( ( 1 << numBits ) - 1 ) for value in values ]
+            names = toReverseNames( values, numBits )
+            for value, name in zip( values, names ):
+                address = addressClass.fromInteger( value )
+                self.assertTrue( name == self._slowReverseName( address ) )
+                self.assertTrue( name == toReverseName( value, numBits ) )
+                self.assertTrue( parseReverseValue( name ) ==
+                    ( numBits, value, numBits ) )
+                self.assertTrue( parseReverseName( name.upper() + "." ) ==
+                    address )
+            self.assertRaises( ValueError, toReverseName, 1 << numBits, numBits )
+            self.assertRaises( ValueError, toReverseNames, [ -1 ], numBits )
+        self.assertRaises( ValueError, toReverseName, 0, 48 )
+
+    # Prefixes stream every name in order, including blocks that are only
+    #  partly inside the prefix
+    def test_prefixNames(self):
+        for address in ( IPv4Address( "10.1.0.0", 16 ),
+        IPv4Address( "10.1.2.200", 29 ), IPv4Address( "10.1.2.3" ),
+        IPv6Address( "2001:0db8:0000:0000:0000:0000:0001:fff0", 108 ) ):
+            numBits = address.__class__._maxAddrLen
+            first = address.getNetwork().toInteger()
+            count = 1 << address.getHostLen()
+            names = list( iterPrefixReverseNames( address.toInteger(), numBits,
+                address.getAddrLen() ) )
+            self.assertTrue( names == toReverseNames( range( first,
+                first + count ), numBits ) )
+
+    # Zone names are cut at label boundaries and parse back as prefixes
+    def test_reverseZone(self):
+        self.assertTrue( IPv4Address( "10.1.2.3", 16 ).toReverseZone() ==
+            "1.10.in-addr.arpa" )
+        self.assertTrue( IPv4Address( "10.1.2.3", 20 ).toReverseZone() ==
+            "1.10.in-addr.arpa" )
+        self.assertTrue( IPv4Address( "10.1.2.3", 0 ).toReverseZone() ==
+            "in-addr.arpa" )
+        zone = IPv6Address( "2001:0db8:00ab:0000:0000:0000:0000:0001", 48
+            ).toReverseZone()
+        self.assertTrue( zone == "b.a.0.0.8.b.d.0.1.0.0.2.ip6.arpa" )
+        self.assertTrue( parseReverseName( zone ) == IPv6Address(
+            "2001:0db8:00ab:0000:0000:0000:0000:0000", 48 ) )
+        self.assertTrue( parseReverseValue( "2.10.in-addr.arpa." ) ==
+            ( 32, 0x0A020000, 16 ) )
+
+    # Malformed names must raise errors
+    def test_invalidNames(self):
+        self.assertRaises( AttributeError, parseReverseValue, None )
+        self.assertRaises( AttributeError, parseReverseValue, "" )
+        for name in ( "4.3.2.1.example.com", "in-addr.arpa", "256.1.in-addr.arpa",
+        "+1.1.in-addr.arpa", "01.1.in-addr.arpa", "5.4.3.2.1.in-addr.arpa", "1..2.in-addr.arpa",
+        "10.ip6.arpa", "g.ip6.arpa", "1..2.ip6.arpa", ".ip6.arpa",
+        ".".join( "0" * 33 ) + ".ip6.arpa" ):
+            self.assertRaises( ValueError, parseReverseValue, name )
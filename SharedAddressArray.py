@@ -0,0 +1,268 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: SharedAddressArray.py
+# Author: Nicholas Russo
+# Description: This file includes a class that holds the integer values (see
+#  NetAddress.toInteger) and address lengths of many addresses of one family
+#  in shared memory, and functions that classify, compute the networks of or
+#  format such an array with a pool of worker processes. The workers attach
+#  to the shared memory when they start; afterwards only the offsets of the
+#  chunks to process are sent to them, and they write their results into
+#  shared output memory, so no address objects or values are ever pickled.
+###############################################################################
+
+from AddressConverter import computePredicate, getFormatter
+from IntegerHash import MASK64
+from NetAddressFactory import IPV4, IPV6, MAC, getAddressClass
+import ctypes
+import multiprocessing
+import multiprocessing.sharedctypes
+
+# Largest number of addresses in one chunk sent to a worker
+CHUNK_SIZE = 65536
+
+# Length of the longest string toString() returns for each family
+_FORMAT_WIDTHS = { IPV4: 15, IPV6: 39, MAC: 17 }
+
+# Returns the family name of the address class "addressClass"
+def _getFamily( addressClass ):
+    for family in ( IPV4, IPV6, MAC ):
+        if( getAddressClass( family ) is addressClass ):
+            return family
+    raise ValueError( "Unknown address class: " + str( addressClass ) )
+
+# Defines an array of addresses of one family in shared memory. Values wider
+#  than 64 bits (IPv6) are split into high and low 64-bit halves.
+class SharedAddressArray(object):
+
+    # Allocates zeroed shared memory for "size" addresses of "family" (e.g.
+    #  NetAddressFactory.IPV4)
+    def __init__(self, family, size):
+        if( size < 0 ):
+            raise ValueError( "size is negative: " + str( size ) )
+        addressClass = getAddressClass( family )
+        RawArray = multiprocessing.sharedctypes.RawArray
+        high = None
+        if( addressClass._maxAddrLen > 64 ):
+            high = RawArray( ctypes.c_uint64, size )
+        self._attach( ( family, high, RawArray( ctypes.c_uint64, size ),
+            RawArray( ctypes.c_uint8, size ) ) )
+
+    # Uses the shared memory of the state "state" (see getState)
+    def _attach(self, state):
+        self._family, self._high, self._low, self._addrLens = state
+        self._addressClass = getAddressClass( self._family )
+
+    # Returns the state of the array: the family and the shared memory
+    #  objects. Passing it to a new process (e.g. in the "initargs" of a
+    #  multiprocessing.Pool) and calling fromState() there gives a view of
+    #  the same memory. The state can only be passed when a process starts.
+    def getState(self):
+        return ( self._family, self._high, self._low, self._addrLens )
+
+    # Builds a view of the shared memory of the state "state" (see getState);
+    #  writes to either array are seen by both
+    @classmethod
+    def fromState( cls, state ):
+        array = cls.__new__( cls )
+        array._attach( state )
+        return array
+
+    # Builds an array holding the address objects "addresses", all of one class
+    @classmethod
+    def fromAddresses( cls, addresses ):
+        if( addresses is None or len( addresses ) == 0 ):
+            raise AttributeError( "addresses is None or empty" )
+        addressClass = addresses[0].__class__
+        for address in addresses:
+            if( address.__class__ is not addressClass ):
+                raise ValueError( "addresses are of different classes: " +
+                    str( address ) )
+        array = cls( _getFamily( addressClass ), len( addresses ) )
+        array.setValues( 0, [ address.toInteger() for address in addresses ],
+            [ address.getAddrLen() for address in addresses ] )
+        return array
+
+    # Builds an array of "family" holding the integers "values" with the
+    #  address lengths "addrLens" (None means full length)
+    @classmethod
+    def fromValues( cls, family, values, addrLens = None ):
+        array = cls( family, len( values ) )
+        array.setValues( 0, values, addrLens )
+        return array
+
+    # Returns the family name of the addresses
+    def getFamily(self):
+        return self._family
+
+    # Returns the address class of the addresses
+    def getAddressClass(self):
+        return self._addressClass
+
+    # Implements the len() function by returning the number of addresses
+    def __len__(self):
+        return len( self._low )
+
+    # Stores the integers "values" with the address lengths "addrLens" (None
+    #  means full length) from index "start" on
+    def setValues(self, start, values, addrLens = None):
+        stop = start + len( values )
+        if( start < 0 or stop > len( self ) ):
+            raise ValueError( "values do not fit at index: " + str( start ) )
+        numBits = self._addressClass._maxAddrLen
+        if( addrLens is None ):
+            addrLens = [ numBits ] * len( values )
+        elif( len( addrLens ) != len( values ) ):
+            raise ValueError( "values and addrLens differ in length" )
+        for value in values:
+            if( value < 0 or value >> numBits != 0 ):
+                raise ValueError( "value is out of range: " + str( value ) )
+        for addrLen in addrLens:
+            if( addrLen < 0 or addrLen > numBits ):
+                raise ValueError( "addrLen is out of range: " + str( addrLen ) )
+
+        if( self._high is not None ):
+            self._high[ start:stop ] = [ value >> 64 for value in values ]
+            self._low[ start:stop ] = [ value & MASK64 for value in values ]
+        else:
+            self._low[ start:stop ] = values
+        self._addrLens[ start:stop ] = addrLens
+
+    # Returns the list of integer values from index "start" up to "stop"
+    #  (None means the end)
+    def getValues(self, start = 0, stop = None):
+        if( stop is None ):
+            stop = len( self )
+        if( self._high is None ):
+            return self._low[ start:stop ]
+        return [ ( high << 64 ) | low for high, low in zip(
+            self._high[ start:stop ], self._low[ start:stop ] ) ]
+
+    # Returns the list of address lengths from index "start" up to "stop"
+    def getAddrLens(self, start = 0, stop = None):
+        if( stop is None ):
+            stop = len( self )
+        return self._addrLens[ start:stop ]
+
+    # Returns the address object at index "index"
+    def getAddress(self, index):
+        if( index < 0 or index >= len( self ) ):
+            raise IndexError( "index is out of range: " + str( index ) )
+        return self._addressClass.fromInteger( self.getValues( index,
+            index + 1 )[0], self._addrLens[ index ] )
+
+    # Stores the address object "address" at index "index"
+    def setAddress(self, index, address):
+        if( address.__class__ is not self._addressClass ):
+            raise ValueError( "address is of a different class: " +
+                str( address ) )
+        self.setValues( index, [ address.toInteger() ],
+            [ address.getAddrLen() ] )
+
+# Array and outputs attached in each worker process
+_workerArray = None
+_workerOutputs = None
+
+# Attaches a worker process to the array state "state" and the shared
+#  output objects "outputs"
+def _attachWorker( state, outputs ):
+    global _workerArray, _workerOutputs
+    _workerArray = SharedAddressArray.fromState( state )
+    _workerOutputs = outputs
+
+# Runs a chunk task ( function, start, stop, args ) in a worker process
+def _runChunk( task ):
+    function, start, stop, args = task
+    function( _workerArray, _workerOutputs, start, stop, *args )
+
+# Calls "function" with ( array, outputs, start, stop, *args ) for chunks
+#  of "array" covering every index, using "numProcesses" worker processes
+#  (None means one per CPU). The function writes its results into the
+#  shared "outputs".
+def _runParallel( function, array, outputs, args = (), numProcesses = None ):
+    if( numProcesses is None ):
+        numProcesses = multiprocessing.cpu_count()
+    if( numProcesses <= 0 ):
+        raise ValueError( "numProcesses is not positive: " + str( numProcesses ) )
+    size = len( array )
+    chunkSize = max( 1, min( CHUNK_SIZE, -( -size // numProcesses ) ) )
+    tasks = [ ( function, start, min( start + chunkSize, size ), args )
+        for start in xrange( 0, size, chunkSize ) ]
+
+    if( numProcesses == 1 or len( tasks ) <= 1 ):
+        for function, start, stop, args in tasks:
+            function( array, outputs, start, stop, *args )
+        return
+    pool = multiprocessing.Pool( min( numProcesses, len( tasks ) ),
+        _attachWorker, ( array.getState(), outputs ) )
+    try:
+        pool.map( _runChunk, tasks, 1 )
+    finally:
+        pool.terminate()
+        pool.join()
+
+# Writes predicate "names" of the addresses from "start" up to "stop" into
+#  the shared bytes "outputs", one row of len( array ) bytes per name
+def _classifyChunk( array, outputs, start, stop, names ):
+    values = array.getValues( start, stop )
+    addrLens = array.getAddrLens( start, stop )
+    size = len( array )
+    for row, name in enumerate( names ):
+        outputs[ row * size + start:row * size + stop ] = computePredicate(
+            name, array.getFamily(), values, addrLens )
+
+# Evaluates the is*() predicates "names" (e.g. [ "isMulticast" ]) of the
+#  address class of "array" for every address, in parallel. Returns a list
+#  of bytearrays, one per name, holding 1 where the predicate is true.
+def classifyAll( array, names, numProcesses = None ):
+    addressClass = array.getAddressClass()
+    for name in names:
+        if( not name.startswith( "is" ) or not callable( getattr(
+        addressClass, name, None ) ) ):
+            raise ValueError( "Unknown predicate: " + str( name ) )
+    size = len( array )
+    outputs = multiprocessing.sharedctypes.RawArray( ctypes.c_uint8,
+        size * len( names ) )
+    _runParallel( _classifyChunk, array, outputs, ( tuple( names ), ),
+        numProcesses )
+    address = ctypes.addressof( outputs )
+    return [ bytearray( ctypes.string_at( address + row * size, size ) )
+        for row in xrange( 0, len( names ) ) ]
+
+# Writes the networks of the addresses from "start" up to "stop" into the
+#  shared array state "outputs"
+def _networkChunk( array, outputs, start, stop ):
+    numBits = array.getAddressClass()._maxAddrLen
+    addrLens = array.getAddrLens( start, stop )
+    allOnes = ( 1 << numBits ) - 1
+    networks = [ value & ( allOnes ^ ( ( 1 << ( numBits - addrLen ) ) - 1 ) )
+        for value, addrLen in zip( array.getValues( start, stop ), addrLens ) ]
+    SharedAddressArray.fromState( outputs ).setValues( start, networks,
+        addrLens )
+
+# Returns a new SharedAddressArray holding the network of every address of
+#  "array" (see NetAddress.getNetwork), computed in parallel
+def networkAll( array, numProcesses = None ):
+    networks = SharedAddressArray( array.getFamily(), len( array ) )
+    _runParallel( _networkChunk, array, networks.getState(), (),
+        numProcesses )
+    return networks
+
+# Writes the strings of the addresses from "start" up to "stop" into the
+#  shared characters "outputs", in slots of "width" padded with zero bytes
+def _formatChunk( array, outputs, start, stop, width ):
+    formatter = getFormatter( array.getFamily() )
+    outputs[ start * width:stop * width ] = "".join( [ formatter( value ).ljust(
+        width, "\0" ) for value in array.getValues( start, stop ) ] )
+
+# Returns the list of strings toString() returns for every address of
+#  "array", formatted in parallel
+def formatAll( array, numProcesses = None ):
+    width = _FORMAT_WIDTHS[ array.getFamily() ]
+    outputs = multiprocessing.sharedctypes.RawArray( ctypes.c_char,
+        len( array ) * width )
+    _runParallel( _formatChunk, array, outputs, ( width, ), numProcesses )
+    text = outputs.raw
+    return [ text[ start:start + width ].rstrip( "\0" )
+        for start in xrange( 0, len( text ), width ) ]
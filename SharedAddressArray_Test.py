@@ -0,0 +1,117 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: SharedAddressArray_Test.py
+# Author: Nicholas Russo
+# Description: This file includes a class that represents a test case for the
+#  shared address arrays. Stored addresses are read back, and the parallel
+#  classification, network and formatting results are compared with the
+#  methods of the address objects, in this process and in worker processes.
+###############################################################################
+
+from IPv4Address import IPv4Address
+from IPv6Address import IPv6Address
+from MACAddress import MACAddress
+from NetAddressFactory import IPV4, IPV6
+from SharedAddressArray import SharedAddressArray, classifyAll, formatAll
+from SharedAddressArray import networkAll
+import multiprocessing
+import random
+import unittest
+
+# Sets the address at index "index" of the array with state "state" from a
+#  worker process
+def _setInWorker( state, index, value ):
+    SharedAddressArray.fromState( state ).setValues( index, [ value ], [ 8 ] )
+
+# Defines a shared address array test case
+class SharedAddressArray_Test( unittest.TestCase ):
+
+    # Builds a test suite from all of the methods defined in this class
+    @staticmethod
+    def buildTestSuite():
+        return unittest.TestLoader().loadTestsFromTestCase( SharedAddressArray_Test )
+
+    # Returns a list of "count" random addresses of "addressClass" with
+    #  random address lengths, biased towards special ranges
+    def getAddresses(self, generator, addressClass, count):
+        numBits = addressClass._maxAddrLen
+        addresses = []
+        for i in range( 0, count ):
+            value = generator.getrandbits( numBits )
+            if( i % 2 == 0 ):
+                value = ( generator.choice( [ 0x0A, 0xE0, 0xFE, 0xFF, 0x01,
+                    0x7F ] ) << ( numBits - 8 ) ) | ( value >> 8 )
+            addresses.append( addressClass.fromInteger( value,
+                generator.randint( 0, numBits ) ) )
+        return addresses
+
+    # Addresses read back as stored; views share the memory
+    def test_storage(self):
+        generator = random.Random( 48 )
+        for addressClass in ( IPv4Address, IPv6Address, MACAddress ):
+            addresses = self.getAddresses( generator, addressClass, 100 )
+            array = SharedAddressArray.fromAddresses( addresses )
+            self.assertTrue( len( array ) == 100 )
+            self.assertTrue( array.getAddressClass() is addressClass )
+            self.assertTrue( [ array.getAddress( i ) for i in range( 0, 100 ) ] ==
+                addresses )
+            self.assertTrue( array.getValues( 10, 20 ) == [ address.toInteger()
+                for address in addresses[ 10:20 ] ] )
+
+            view = SharedAddressArray.fromState( array.getState() )
+            view.setAddress( 5, addresses[7] )
+            self.assertTrue( array.getAddress( 5 ) == addresses[7] )
+            self.assertRaises( IndexError, array.getAddress, 100 )
+
+        array = SharedAddressArray.fromValues( IPV6, [ 1, ( 1 << 128 ) - 1 ] )
+        self.assertTrue( array.getAddress( 1 ) == IPv6Address(
+            "ffff:ffff:ffff:ffff:ffff:ffff:ffff:ffff" ) )
+        self.assertTrue( array.getAddrLens() == [ 128, 128 ] )
+        self.assertRaises( ValueError, array.setValues, 0, [ 1 << 128 ] )
+        self.assertRaises( ValueError, array.setValues, 0, [ 1 ], [ 129 ] )
+        self.assertRaises( ValueError, array.setValues, 1, [ 1, 2 ] )
+        self.assertRaises( ValueError, array.setAddress, 0,
+            IPv4Address( "10.0.0.1" ) )
+        self.assertRaises( AttributeError, SharedAddressArray.fromAddresses, [] )
+        self.assertRaises( ValueError, SharedAddressArray.fromAddresses, [
+            IPv4Address( "10.0.0.1" ), MACAddress( "00:1b:2c:3d:4e:5f" ) ] )
+        self.assertRaises( ValueError, SharedAddressArray, "clown", 1 )
+
+        # A worker process writes into the memory of this process
+        array = SharedAddressArray( IPV4, 4 )
+        process = multiprocessing.Process( target = _setInWorker,
+            args = ( array.getState(), 2, 0x0A000000 ) )
+        process.start()
+        process.join()
+        self.assertTrue( array.getAddress( 2 ) == IPv4Address( "10.0.0.0", 8 ) )
+
+    # Parallel results match the address objects, with and without workers
+    def test_parallel(self):
+        generator = random.Random( 480 )
+        for addressClass in ( IPv4Address, IPv6Address, MACAddress ):
+            addresses = self.getAddresses( generator, addressClass, 500 )
+            array = SharedAddressArray.fromAddresses( addresses )
+            names = [ name for name in dir( addressClass )
+                if name.startswith( "is" ) ]
+            for numProcesses in ( 1, 3 ):
+                flags = classifyAll( array, names, numProcesses )
+                for name, row in zip( names, flags ):
+                    self.assertTrue( row == bytearray( [ bool( getattr(
+                        address, name )() ) for address in addresses ] ), name )
+
+                networks = networkAll( array, numProcesses )
+                self.assertTrue( [ networks.getAddress( i ) for i in range(
+                    0, len( networks ) ) ] == [ address.getNetwork()
+                    for address in addresses ] )
+
+                self.assertTrue( formatAll( array, numProcesses ) == [
+                    address.toString() for address in addresses ] )
+
+        array = SharedAddressArray( IPV4, 0 )
+        self.assertTrue( formatAll( array, 2 ) == [] )
+        self.assertTrue( classifyAll( array, [ "isPrivateAddress" ] ) ==
+            [ bytearray() ] )
+        self.assertRaises( ValueError, classifyAll, array, [ "toString" ] )
+        self.assertRaises( ValueError, classifyAll, array, [ "isULset" ] )
+        self.assertRaises( ValueError, networkAll, array, 0 )
@@ -0,0 +1,192 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: SubnetAllocator.py
+# Author: Nicholas Russo
+# Description: This file includes a buddy-style subnet allocator that carves
+#  prefixes of varying lengths out of an IPv4 or IPv6 pool. Free space is
+#  tracked as one free list per prefix length, so allocating, releasing and
+#  reserving a prefix never rescans the allocated prefixes: blocks are split
+#  in halves ("buddies") on the way down and freed buddies are merged back
+#  automatically. The allocator state can be saved to and loaded from a file.
+###############################################################################
+
+import heapq
+import json
+
+# Defines a buddy allocator over a single pool prefix
+class SubnetAllocator(object):
+
+    # Builds an allocator whose entire pool is free. The pool is an address
+    #  object with an address length (e.g. IPv4Address( "10.0.0.0", 8 ));
+    #  host bits of the pool address are ignored.
+    def __init__(self, pool):
+        self._addressClass = pool.__class__
+        self._poolLen = pool.getAddrLen()
+        numBits = self._addressClass._maxAddrLen
+        self._reset( ( pool.toInteger() >> ( numBits - self._poolLen ) ) <<
+            ( numBits - self._poolLen ) )
+        self._addFree( self._poolValue, self._poolLen )
+
+    # Empties every free list and the allocation table
+    def _reset(self, poolValue):
+        numBits = self._addressClass._maxAddrLen
+        self._poolValue = poolValue
+        self._allocated = {}
+
+        # Free blocks per prefix length: a set for membership tests and a heap
+        #  (with lazy deletion) so the lowest free block is found quickly
+        self._freeSets = [ set() for i in range( 0, numBits + 1 ) ]
+        self._freeHeaps = [ [] for i in range( 0, numBits + 1 ) ]
+
+    # Adds the block "value"/"prefixLen" to its free list
+    def _addFree(self, value, prefixLen):
+        self._freeSets[ prefixLen ].add( value )
+        heapq.heappush( self._freeHeaps[ prefixLen ], value )
+
+    # Removes and returns the lowest free block of "prefixLen", or None
+    def _popFree(self, prefixLen):
+        freeSet = self._freeSets[ prefixLen ]
+        freeHeap = self._freeHeaps[ prefixLen ]
+        while( len( freeHeap ) > 0 ):
+            value = heapq.heappop( freeHeap )
+            if( value in freeSet ):
+                freeSet.remove( value )
+                return value
+        return None
+
+    # Returns the integer value of the buddy of block "value"/"prefixLen"
+    def _getBuddy(self, value, prefixLen):
+        return value ^ ( 1 << ( self._addressClass._maxAddrLen - prefixLen ) )
+
+    # Returns the prefix value and length of "prefix" after checking that
+    #  it is the same family as the pool and lies within the pool
+    def _toBlock(self, prefix):
+        if( prefix.__class__ != self._addressClass ):
+            raise ValueError( "prefix is not in the pool family: " + str( prefix ) )
+
+        numBits = self._addressClass._maxAddrLen
+        prefixLen = prefix.getAddrLen()
+        value = ( prefix.toInteger() >> ( numBits - prefixLen ) ) << (
+            numBits - prefixLen )
+
+        poolHostLen = numBits - self._poolLen
+        if( prefixLen < self._poolLen or
+        value >> poolHostLen != self._poolValue >> poolHostLen ):
+            raise ValueError( "prefix is outside of the pool: " + str( prefix ) )
+        return value, prefixLen
+
+    # Splits the free block "value"/"fromLen" (already removed from its
+    #  free list) down to "toLen", freeing the buddy at each step that does
+    #  not contain "target". Returns the block of length "toLen".
+    def _split(self, value, fromLen, toLen, target):
+        numBits = self._addressClass._maxAddrLen
+        for prefixLen in range( fromLen + 1, toLen + 1 ):
+            halfBit = 1 << ( numBits - prefixLen )
+            if( target & halfBit ):
+                self._addFree( value, prefixLen )
+                value |= halfBit
+            else:
+                self._addFree( value | halfBit, prefixLen )
+        return value
+
+    # Allocates the lowest free prefix of length "prefixLen" and returns it
+    #  as an address object with that address length
+    def allocate(self, prefixLen):
+        if( prefixLen < self._poolLen or
+        prefixLen > self._addressClass._maxAddrLen ):
+            raise ValueError( "prefixLen is out of range: " + str( prefixLen ) )
+
+        # Use the smallest free block that is large enough
+        for blockLen in range( prefixLen, self._poolLen - 1, -1 ):
+            value = self._popFree( blockLen )
+            if( value is not None ):
+                value = self._split( value, blockLen, prefixLen, value )
+                self._allocated[ value ] = prefixLen
+                return self._addressClass.fromInteger( value, prefixLen )
+
+        raise ValueError( "no free prefix of length " + str( prefixLen ) )
+
+    # Allocates the specific prefix "prefix" (e.g. one that is already in
+    #  use on the network). Raises an error if any part of it is not free.
+    def reserve(self, prefix):
+        value, prefixLen = self._toBlock( prefix )
+        numBits = self._addressClass._maxAddrLen
+
+        # Find the free block containing the prefix, if there is one
+        for blockLen in range( prefixLen, self._poolLen - 1, -1 ):
+            hostLen = numBits - blockLen
+            blockValue = ( value >> hostLen ) << hostLen
+            if( blockValue in self._freeSets[ blockLen ] ):
+                self._freeSets[ blockLen ].remove( blockValue )
+                self._split( blockValue, blockLen, prefixLen, value )
+                self._allocated[ value ] = prefixLen
+                return self._addressClass.fromInteger( value, prefixLen )
+
+        raise ValueError( "prefix is not free: " + str( prefix ) )
+
+    # Releases a prefix returned by allocate() or reserve(), merging it
+    #  with its buddy as long as the buddy is free too
+    def release(self, prefix):
+        value, prefixLen = self._toBlock( prefix )
+        if( self._allocated.get( value ) != prefixLen ):
+            raise ValueError( "prefix is not allocated: " + str( prefix ) )
+        del self._allocated[ value ]
+
+        while( prefixLen > self._poolLen ):
+            buddy = self._getBuddy( value, prefixLen )
+            if( buddy not in self._freeSets[ prefixLen ] ):
+                break
+            self._freeSets[ prefixLen ].remove( buddy )
+            value = min( value, buddy )
+            prefixLen -= 1
+        self._addFree( value, prefixLen )
+
+    # Returns the list of allocated prefixes as address objects, in order
+    def getAllocated(self):
+        return [ self._addressClass.fromInteger( value, prefixLen )
+            for value, prefixLen in sorted( self._allocated.iteritems() ) ]
+
+    # Returns the list of free blocks as address objects, in order
+    def getFree(self):
+        return [ self._addressClass.fromInteger( value, prefixLen )
+            for value, prefixLen in sorted( ( value, prefixLen )
+            for prefixLen in range( 0, len( self._freeSets ) )
+            for value in self._freeSets[ prefixLen ] ) ]
+
+    # Returns the number of free addresses left in the pool
+    def getFreeCount(self):
+        numBits = self._addressClass._maxAddrLen
+        return sum( len( self._freeSets[ prefixLen ] ) << ( numBits - prefixLen )
+            for prefixLen in range( 0, len( self._freeSets ) ) )
+
+    # Writes the allocator state to the file "path" as JSON
+    def save(self, path):
+        state = { "numBits": self._addressClass._maxAddrLen,
+            "pool": [ self._poolValue, self._poolLen ],
+            "allocated": sorted( self._allocated.iteritems() ),
+            "free": [ [ prefixLen, sorted( self._freeSets[ prefixLen ] ) ]
+                for prefixLen in range( 0, len( self._freeSets ) )
+                if len( self._freeSets[ prefixLen ] ) > 0 ] }
+        with open( path, "w" ) as outputFile:
+            json.dump( state, outputFile )
+
+    # Reads an allocator for "addressClass" from a file written by save().
+    #  The free lists are restored as saved (sorted lists are valid heaps).
+    @staticmethod
+    def load(path, addressClass):
+        with open( path, "r" ) as inputFile:
+            state = json.load( inputFile )
+        if( state[ "numBits" ] != addressClass._maxAddrLen ):
+            raise ValueError( "state is for a different address family" )
+
+        allocator = SubnetAllocator.__new__( SubnetAllocator )
+        allocator._addressClass = addressClass
+        allocator._poolLen = state[ "pool" ][1]
+        allocator._reset( state[ "pool" ][0] )
+        allocator._allocated = dict( ( value, prefixLen )
+            for value, prefixLen in state[ "allocated" ] )
+        for prefixLen, values in state[ "free" ]:
+            allocator._freeSets[ prefixLen ] = set( values )
+            allocator._freeHeaps[ prefixLen ] = values
+        return allocator
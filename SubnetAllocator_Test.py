@@ -0,0 +1,104 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: SubnetAllocator_Test.py
+# Author: Nicholas Russo
+# Description: This file includes a class that represents a test case for the
+#  SubnetAllocator class. Allocation order, reservations, buddy merging on
+#  release, exhaustion and the save/load round trip are tested here.
+###############################################################################
+
+from IPv4Address import IPv4Address
+from IPv6Address import IPv6Address
+from SubnetAllocator import SubnetAllocator
+import os
+import random
+import tempfile
+import unittest
+
+# Defines a subnet allocator test case
+class SubnetAllocator_Test( unittest.TestCase ):
+
+    # Builds a test suite from all of the methods defined in this class
+    @staticmethod
+    def buildTestSuite():
+        return unittest.TestLoader().loadTestsFromTestCase( 
+            SubnetAllocator_Test )
+
+    # Builds an allocator over 10.0.0.0/16 before each test
+    def setUp(self):
+        self._allocator = SubnetAllocator( IPv4Address( "10.0.0.0", 16 ) )
+
+    def tearDown(self):
+        self._allocator = None
+
+    # Returns the string form (with length) of every address in "addresses"
+    def _toStrings(self, addresses):
+        return [ address.toString() + "/" + str( address.getAddrLen() )
+            for address in addresses ]
+
+    # Prefixes are carved from the lowest free space, smallest block first
+    def test_allocate(self):
+        allocated = [ self._allocator.allocate( prefixLen )
+            for prefixLen in ( 24, 26, 24, 17 ) ]
+        self.assertTrue( self._toStrings( allocated ) == [ "10.0.0.0/24",
+            "10.0.1.0/26", "10.0.2.0/24", "10.0.128.0/17" ] )
+        self.assertTrue( self._allocator.getFreeCount() == 
+            32768 - 256 - 64 - 256 )
+        self.assertRaises( ValueError, self._allocator.allocate, 17 )
+        self.assertRaises( ValueError, self._allocator.allocate, 15 )
+        self.assertRaises( ValueError, self._allocator.allocate, 33 )
+
+    # Reserved prefixes are taken out of the free space, and overlapping
+    #  or foreign prefixes are refused
+    def test_reserve(self):
+        self._allocator.reserve( IPv4Address( "10.0.77.0", 24 ) )
+        self.assertRaises( ValueError, self._allocator.reserve,
+            IPv4Address( "10.0.77.128", 25 ) )
+        self.assertRaises( ValueError, self._allocator.reserve,
+            IPv4Address( "10.0.64.0", 18 ) )
+        self.assertRaises( ValueError, self._allocator.reserve,
+            IPv4Address( "10.1.0.0", 24 ) )
+        self.assertRaises( ValueError, self._allocator.reserve,
+            IPv6Address( "2001:0db8:0000:0000:0000:0000:0000:0000", 64 ) )
+        self.assertTrue( self._allocator.getFreeCount() == 65536 - 256 )
+        self.assertTrue( "10.0.76.0/24" in self._toStrings( 
+            self._allocator.getFree() ) )
+
+    # Releasing everything in random order must merge back to the pool
+    def test_releaseMerges(self):
+        generator = random.Random( 33 )
+        allocated = []
+        for i in range( 0, 300 ):
+            allocated.append( self._allocator.allocate( generator.randint( 24, 30 ) ) )
+        self.assertRaises( ValueError, self._allocator.release,
+            IPv4Address( "10.0.0.0", 16 ) )
+
+        generator.shuffle( allocated )
+        for prefix in allocated:
+            self._allocator.release( prefix )
+        self.assertTrue( self._toStrings( self._allocator.getFree() ) == 
+            [ "10.0.0.0/16" ] )
+        self.assertTrue( self._allocator.getAllocated() == [] )
+        self.assertRaises( ValueError, self._allocator.release, allocated[0] )
+
+    # A saved allocator must continue exactly where the original left off
+    def test_saveLoad(self):
+        allocator = SubnetAllocator( IPv6Address( 
+            "2001:0db8:0000:0000:0000:0000:0000:0000", 32 ) )
+        for prefixLen in ( 48, 56, 64, 48 ):
+            allocator.allocate( prefixLen )
+
+        handle, path = tempfile.mkstemp()
+        os.close( handle )
+        try:
+            allocator.save( path )
+            loaded = SubnetAllocator.load( path, IPv6Address )
+            self.assertRaises( ValueError, SubnetAllocator.load, path, IPv4Address )
+        finally:
+            os.remove( path )
+
+        self.assertTrue( self._toStrings( loaded.getAllocated() ) == 
+            self._toStrings( allocator.getAllocated() ) )
+        self.assertTrue( self._toStrings( [ loaded.allocate( 60 ) ] ) ==
+            self._toStrings( [ allocator.allocate( 60 ) ] ) )
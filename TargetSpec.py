@@ -0,0 +1,374 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: TargetSpec.py
+# Author: Nicholas Russo
+# Description: This file includes a class that represents a list of IPv4
+#  scan targets written as nmap-style expressions (e.g. 10.0-3.1-254.1,5,9
+#  or 192.168.0.0/16) minus a list of excluded targets, without expanding
+#  the list. Every expression is an increasing sequence of integers, so the
+#  targets it holds within any address range are a contiguous run of its
+#  indices; exclusions are kept as runs of excluded indices. The total count
+#  is known up front, any target can be looked up by number, and the list
+#  can be split into balanced shards for parallel workers.
+###############################################################################
+
+from IPv4Address import IPv4Address
+import bisect
+import copy
+import itertools
+
+# Defines a CIDR prefix (or any range of consecutive addresses)
+class _RangeTerm(object):
+
+    def __init__(self, first, last):
+        self._first = first
+        self._count = last - first + 1
+
+    # Returns the number of addresses in the term
+    def getCount(self):
+        return self._count
+
+    # Returns the integer value at index "index" of the term
+    def getValue(self, index):
+        return self._first + index
+
+    # Returns the number of values in the term below the integer "value"
+    def getRank(self, value):
+        return min( max( value - self._first, 0 ), self._count )
+
+    # Returns the ( first, last ) values of the term
+    def getBounds(self):
+        return ( self._first, self._first + self._count - 1 )
+
+    # Returns None since any octet may appear in the term (see _OctetTerm)
+    def getOctetSets(self):
+        return None
+
+    # Returns the list of ( first, last ) ranges covered by the term that
+    #  overlap the range from "first" to "last" ("octetSets" is unused)
+    def getRanges(self, first, last, octetSets = None):
+        termFirst, termLast = self.getBounds()
+        if( termLast < first or termFirst > last ):
+            return []
+        return [ ( termFirst, termLast ) ]
+
+    # Yields the values at the indices in the sorted, half-open index
+    #  intervals "intervals"
+    def iterValues(self, intervals):
+        for start, end in intervals:
+            for value in xrange( self._first + start, self._first + end ):
+                yield value
+
+# Defines an octet range expression: the product of four sorted octet lists
+class _OctetTerm(object):
+
+    def __init__(self, octetLists):
+        self._octetLists = octetLists
+
+        # Number of values covered by one step of each octet
+        self._strides = [ 1, 1, 1, 1 ]
+        for position in range( 2, -1, -1 ):
+            self._strides[ position ] = self._strides[ position + 1 ] * len(
+                octetLists[ position + 1 ] )
+        self._count = self._strides[0] * len( octetLists[0] )
+
+    def getCount(self):
+        return self._count
+
+    def getValue(self, index):
+        value = 0
+        for octetList, stride in zip( self._octetLists, self._strides ):
+            value = ( value << 8 ) | octetList[ index // stride ]
+            index %= stride
+        return value
+
+    # Counts the values below "value" one octet at a time: every smaller
+    #  choice of an octet accounts for a full stride of values
+    def getRank(self, value):
+        if( value < 0 ):
+            return 0
+        if( value >> 32 != 0 ):
+            return self._count
+
+        rank = 0
+        for position in range( 0, 4 ):
+            octet = ( value >> ( 24 - 8 * position ) ) & 0xFF
+            octetList = self._octetLists[ position ]
+            choice = bisect.bisect_left( octetList, octet )
+            rank += choice * self._strides[ position ]
+            if( choice == len( octetList ) or octetList[ choice ] != octet ):
+                break
+        return rank
+
+    def getBounds(self):
+        return ( self.getValue( 0 ), self.getValue( self._count - 1 ) )
+
+    # Returns the set of octets allowed at each position
+    def getOctetSets(self):
+        return [ set( octetList ) for octetList in self._octetLists ]
+
+    # Returns the list of ( first, last ) ranges covered by the term that
+    #  overlap the range from "first" to "last". Trailing octets covering
+    #  0-255 make consecutive values, so each run of consecutive octets
+    #  before them is a single range. The octets before the runs are walked
+    #  one position at a time, skipping every octet whose values all lie
+    #  outside of the range or, given the sets of octets allowed at each
+    #  position "octetSets" (e.g. those of a target term), that is not
+    #  allowed. Only the ranges that can hold a target are built, rather
+    #  than one per combination of the octets.
+    def getRanges(self, first, last, octetSets = None):
+        fullLen = 0
+        while( fullLen < 4 and len( self._octetLists[ 3 - fullLen ] ) == 256 ):
+            fullLen += 1
+        if( fullLen == 4 ):
+            return [ ( 0, 0xFFFFFFFF ) ]
+
+        runs = []
+        for octet in self._octetLists[ 3 - fullLen ]:
+            if( len( runs ) > 0 and runs[-1][1] == octet - 1 ):
+                runs[-1][1] = octet
+            else:
+                runs.append( [ octet, octet ] )
+        runPosition = 3 - fullLen
+        if( octetSets is not None ):
+            runs = [ ( runFirst, runLast ) for runFirst, runLast in runs
+                if not octetSets[ runPosition ].isdisjoint( xrange( runFirst,
+                runLast + 1 ) ) ]
+
+        ranges = []
+        hostLen = 8 * fullLen
+        prefixes = [ 0 ] if len( runs ) > 0 else []
+        for position in range( 0, runPosition ):
+
+            # Each prefix covers the values from prefix << shift up to the
+            #  next prefix
+            shift = 8 * ( 3 - position )
+            octets = self._octetLists[ position ]
+            if( octetSets is not None ):
+                octets = [ octet for octet in octets
+                    if octet in octetSets[ position ] ]
+            prefixes = [ ( prefix << 8 ) | octet for prefix in prefixes
+                for octet in octets
+                if ( ( ( prefix << 8 ) | octet ) << shift ) <= last and
+                ( ( ( ( prefix << 8 ) | octet ) + 1 ) << shift ) > first ]
+
+        for prefix in prefixes:
+            for runFirst, runLast in runs:
+                rangeFirst = ( ( prefix << 8 ) | runFirst ) << hostLen
+                rangeLast = ( ( ( prefix << 8 ) | runLast ) << hostLen ) | (
+                    ( 1 << hostLen ) - 1 )
+                if( rangeFirst <= last and rangeLast >= first ):
+                    ranges.append( ( rangeFirst, rangeLast ) )
+        return ranges
+
+    # Walks one product iterator over the whole term, skipping the gaps
+    #  between intervals without building their values
+    def iterValues(self, intervals):
+        octets = itertools.product( *self._octetLists )
+        position = 0
+        for start, end in intervals:
+            if( start > position ):
+                next( itertools.islice( octets, start - position - 1, None ) )
+            for octet0, octet1, octet2, octet3 in itertools.islice( octets,
+            end - start ):
+                yield ( octet0 << 24 ) | ( octet1 << 16 ) | ( octet2 << 8 ) | \
+                    octet3
+            position = end
+
+# Returns the sorted list of octets described by "octetString", a comma
+#  separated list of octets and ranges; "*", "-" and open ranges such as
+#  "-10" or "200-" extend to 0 or 255
+def _parseOctetList( octetString, targetString ):
+    octets = set()
+    for item in octetString.split( "," ):
+        if( item == "*" ):
+            item = "-"
+        pieces = item.split( "-" )
+        if( len( pieces ) > 2 or ( len( pieces ) == 1 and pieces[0] == "" ) ):
+            raise ValueError( "Unable to parse target: " + targetString )
+
+        try:
+            first = int( pieces[0] ) if pieces[0] != "" else 0
+            last = int( pieces[-1] ) if pieces[-1] != "" else 255
+        except ValueError:
+            raise ValueError( "Unable to parse target: " + targetString )
+        if( first < 0 or last > 255 or first > last ):
+            raise ValueError( "Octet range is invalid: " + targetString )
+        octets.update( range( first, last + 1 ) )
+    return sorted( octets )
+
+# Returns the term for the target expression "targetString"
+def _parseTerm( targetString ):
+    if( "/" in targetString ):
+        addressString, addrLen = targetString.split( "/", 1 )
+        address = IPv4Address( addressString, int( addrLen ) )
+        first = address.getNetwork().toInteger()
+        return _RangeTerm( first, first + ( 1 << address.getHostLen() ) - 1 )
+
+    octetStrings = targetString.split( "." )
+    if( len( octetStrings ) != 4 ):
+        raise ValueError( "Unable to parse target: " + targetString )
+    return _OctetTerm( [ _parseOctetList( octetString, targetString )
+        for octetString in octetStrings ] )
+
+# Returns the list of terms for "targets": a string of whitespace separated
+#  target expressions or a list of such strings
+def _parseTerms( targets ):
+    if( isinstance( targets, basestring ) ):
+        targets = [ targets ]
+    return [ _parseTerm( targetString ) for targetSpec in targets
+        for targetString in targetSpec.split() ]
+
+# Returns the sorted list of disjoint half-open intervals covering the
+#  half-open "intervals"
+def _mergeIntervals( intervals ):
+    merged = []
+    for start, end in sorted( intervals ):
+        if( len( merged ) > 0 and start <= merged[-1][1] ):
+            merged[-1][1] = max( merged[-1][1], end )
+        else:
+            merged.append( [ start, end ] )
+    return [ tuple( interval ) for interval in merged ]
+
+# Defines a lazily expanded list of IPv4 targets
+class TargetSpec(object):
+
+    # Builds the target list for "targets", less the targets in "excludes".
+    #  Both are strings of whitespace separated expressions, or lists of
+    #  such strings, where an expression is a CIDR prefix or four octet lists
+    #  (e.g. "10.0.0.0/8", "10.0-3.1-254.1,5,9", "192.168.*.1"). Targets
+    #  listed twice are kept twice, as nmap does.
+    def __init__(self, targets, excludes = None):
+        if( targets is None or len( targets ) == 0 ):
+            raise AttributeError( "targets is None or empty" )
+
+        self._terms = _parseTerms( targets )
+        excludeTerms = _parseTerms( excludes or [] )
+
+        # Per term: the excluded index intervals, the number of targets kept
+        #  before each of them and the number excluded through each of them
+        self._excluded = []
+        self._keptBefore = []
+        self._excludedThrough = []
+        self._termStarts = []
+        count = 0
+        for term in self._terms:
+
+            # Only the excluded ranges that can hold targets of the term
+            termFirst, termLast = term.getBounds()
+            octetSets = term.getOctetSets()
+            intervals = _mergeIntervals( ( term.getRank( first ),
+                term.getRank( last + 1 ) ) for excludeTerm in excludeTerms
+                for first, last in excludeTerm.getRanges( termFirst, termLast,
+                octetSets ) )
+            intervals = [ ( start, end ) for start, end in intervals
+                if start < end ]
+
+            excludedCount = 0
+            keptBefore = []
+            excludedThrough = []
+            for start, end in intervals:
+                keptBefore.append( start - excludedCount )
+                excludedCount += end - start
+                excludedThrough.append( excludedCount )
+
+            self._excluded.append( intervals )
+            self._keptBefore.append( keptBefore )
+            self._excludedThrough.append( excludedThrough )
+            self._termStarts.append( count )
+            count += term.getCount() - excludedCount
+
+        self._start = 0
+        self._end = count
+
+    # Implements the len() function by returning the number of targets
+    def __len__(self):
+        return self._end - self._start
+
+    # Returns the number of targets; unlike len() this is not limited to
+    #  the size of a machine integer
+    def getCount(self):
+        return self._end - self._start
+
+    # Returns the term number and the index within the term of the target
+    #  at absolute position "position"
+    def _locate(self, position):
+        termIndex = bisect.bisect_right( self._termStarts, position ) - 1
+
+        # Skip the excluded intervals that lie before the kept target
+        keptIndex = position - self._termStarts[ termIndex ]
+        interval = bisect.bisect_right( self._keptBefore[ termIndex ],
+            keptIndex )
+        if( interval > 0 ):
+            keptIndex += self._excludedThrough[ termIndex ][ interval - 1 ]
+        return termIndex, keptIndex
+
+    # Returns the integer value of target number "index"
+    def getValue(self, index):
+        if( index < 0 or index >= self.getCount() ):
+            raise ValueError( "index is out of range: " + str( index ) )
+        termIndex, termPosition = self._locate( self._start + index )
+        return self._terms[ termIndex ].getValue( termPosition )
+
+    # Returns target number "index" as an IPv4Address
+    def getAddress(self, index):
+        return IPv4Address.fromInteger( self.getValue( index ) )
+
+    # Returns the half-open index intervals of term "termIndex" that are
+    #  kept, starting at index "start" and holding "count" targets
+    def _getKeptIntervals(self, termIndex, start, count):
+        intervals = []
+        for excludedStart, excludedEnd in self._excluded[ termIndex ] + [ (
+        self._terms[ termIndex ].getCount(), None ) ]:
+            if( count == 0 ):
+                break
+            if( start < excludedStart ):
+                end = min( excludedStart, start + count )
+                intervals.append( ( start, end ) )
+                count -= end - start
+            if( excludedEnd is not None ):
+                start = max( start, excludedEnd )
+        return intervals
+
+    # Yields the integer value of every target, in order
+    def iterValues(self):
+        position = self._start
+        while( position < self._end ):
+            termIndex, termPosition = self._locate( position )
+            term = self._terms[ termIndex ]
+            termEnd = self._termStarts[ termIndex + 1 ] if termIndex + 1 < len(
+                self._terms ) else self._end
+            count = min( termEnd, self._end ) - position
+            for value in term.iterValues( self._getKeptIntervals( termIndex,
+            termPosition, count ) ):
+                yield value
+            position += count
+
+    # Yields every target as an IPv4Address
+    def __iter__(self):
+        for value in self.iterValues():
+            yield IPv4Address.fromInteger( value )
+
+    # Returns shard number "shardIndex" of "numShards": a TargetSpec holding
+    #  a contiguous part of the targets. Shard sizes differ by at most one.
+    def getShard(self, shardIndex, numShards):
+        if( numShards <= 0 ):
+            raise ValueError( "numShards is not positive: " + str( numShards ) )
+        if( shardIndex < 0 or shardIndex >= numShards ):
+            raise ValueError( "shardIndex is out of range: " +
+                str( shardIndex ) )
+
+        # Shards share the parsed terms and exclusions, which are read-only
+        count = self.getCount()
+        shard = copy.copy( self )
+        shard._start = self._start + count * shardIndex // numShards
+        shard._end = self._start + count * ( shardIndex + 1 ) // numShards
+        return shard
+
+    # Returns the list of all "numShards" shards, in order
+    def getShards(self, numShards):
+        if( numShards <= 0 ):
+            raise ValueError( "numShards is not positive: " + str( numShards ) )
+        return [ self.getShard( shardIndex, numShards )
+            for shardIndex in range( 0, numShards ) ]
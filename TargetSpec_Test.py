@@ -0,0 +1,125 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: TargetSpec_Test.py
+# Author: Nicholas Russo
+# Description: This file includes a class that represents a test case for the
+#  TargetSpec class. Parsing, counting, indexing, exclusions and sharding are
+#  tested here against fully expanded target lists.
+###############################################################################
+
+from TargetSpec import TargetSpec
+from IPv4Address import IPv4Address
+import itertools
+import random
+import unittest
+
+# Defines a target specification test case
+class TargetSpec_Test( unittest.TestCase ):
+
+    # Builds a test suite from all of the methods defined in this class
+    @staticmethod
+    def buildTestSuite():
+        return unittest.TestLoader().loadTestsFromTestCase( TargetSpec_Test )
+
+    # Returns the expanded list of integer values for an octet expression
+    #  given as four lists of octets
+    @staticmethod
+    def _expand(octetLists):
+        return [ ( octet0 << 24 ) | ( octet1 << 16 ) | ( octet2 << 8 ) | octet3
+            for octet0, octet1, octet2, octet3 in itertools.product(
+            *octetLists ) ]
+
+    # Checks every access path of "spec" against the list "expected"
+    def _check(self, spec, expected):
+        self.assertTrue( len( spec ) == len( expected ) )
+        self.assertTrue( list( spec.iterValues() ) == expected )
+        for index in range( 0, len( expected ), 7 ) + [ len( expected ) - 1 ]:
+            if( index >= 0 ):
+                self.assertTrue( spec.getValue( index ) == expected[ index ] )
+        self.assertRaises( ValueError, spec.getValue, len( expected ) )
+        self.assertRaises( ValueError, spec.getValue, -1 )
+
+    # Ensures invalid expressions raise errors
+    def test_invalidInstances(self):
+        self.assertRaises( AttributeError, TargetSpec, None )
+        self.assertRaises( AttributeError, TargetSpec, "" )
+        for targets in ( "10.0.0", "10.0.0.0.0", "10.0.0.256", "10.5-1.0.0",
+        "10.0.0.1-2-3", "10.0.x.1", "10.0.0.,1", "10.0.0.0/33" ):
+            self.assertRaises( ValueError, TargetSpec, targets )
+
+    # Octet ranges, lists, wildcards and CIDRs expand in order
+    def test_expand(self):
+        spec = TargetSpec( "10.0-3.1-254.1,5,9 192.168.1.0/30" )
+        expected = self._expand( ( [ 10 ], range( 0, 4 ), range( 1, 255 ),
+            [ 1, 5, 9 ] ) ) + range( 0xC0A80100, 0xC0A80104 )
+        self._check( spec, expected )
+        self.assertTrue( spec.getAddress( 0 ) == IPv4Address( "10.0.1.1" ) )
+        self.assertTrue( list( spec )[-1] == IPv4Address( "192.168.1.3" ) )
+
+        spec = TargetSpec( [ "1.*.-.200-", "1.2.3.-1" ] )
+        self.assertTrue( len( spec ) == 256 * 256 * 56 + 2 )
+        self.assertTrue( spec.getAddress( len( spec ) - 1 ) ==
+            IPv4Address( "1.2.3.1" ) )
+
+    # Exclusions of every form must remove exactly the excluded targets
+    def test_exclude(self):
+        generator = random.Random( 37 )
+        for trial in range( 0, 30 ):
+            octetLists = [ sorted( generator.sample( range( 0, 8 ),
+                generator.randint( 1, 4 ) ) ) for position in range( 0, 4 ) ]
+            targets = ".".join( ",".join( str( octet ) for octet in octetList )
+                for octetList in octetLists )
+            excludes = [ "%d.%d.%d.%d" % tuple( generator.randint( 0, 7 )
+                for position in range( 0, 4 ) ) for i in range( 0, 20 ) ]
+            excludes.append( "%d.%d.0-3.*" % ( generator.randint( 0, 7 ),
+                generator.randint( 0, 7 ) ) )
+            excludes.append( "%d.%d.%d.0/30" % tuple( generator.randint( 0, 7 )
+                for position in range( 0, 3 ) ) )
+
+            excluded = set( value for exclude in excludes
+                for value in TargetSpec( exclude ).iterValues() )
+            expected = [ value for value in self._expand( octetLists ) +
+                range( 0x00000000, 0x00040000, 0x100 ) if value not in excluded ]
+            spec = TargetSpec( [ targets, "0.0-3.*.0" ], excludes )
+            self._check( spec, expected )
+
+    # Shards must be balanced and cover the targets exactly once, in order
+    def test_shards(self):
+        spec = TargetSpec( "10.0.0-9.* 172.16.0.0/20", "10.0.5.0/24 10.0.*.7" )
+        expected = list( spec.iterValues() )
+        for numShards in ( 1, 3, 7, 64 ):
+            shards = spec.getShards( numShards )
+            sizes = [ len( shard ) for shard in shards ]
+            self.assertTrue( max( sizes ) - min( sizes ) <= 1 )
+            self.assertTrue( [ value for shard in shards
+                for value in shard.iterValues() ] == expected )
+            self.assertTrue( [ shard.getValue( 0 ) for shard in shards ] ==
+                [ expected[ sum( sizes[ 0:i ] ) ] for i in range( 0, numShards ) ] )
+
+        shard = spec.getShards( 3 )[1].getShard( 1, 2 )
+        start = len( expected ) / 3 + ( len( expected ) / 3 ) / 2
+        self.assertTrue( list( shard.iterValues() ) ==
+            expected[ start:start + len( shard ) ] )
+        self.assertRaises( ValueError, spec.getShard, 3, 3 )
+        self.assertRaises( ValueError, spec.getShards, 0 )
+
+    # Excluding everything leaves an empty list
+    def test_excludeAll(self):
+        spec = TargetSpec( "10.0.0.0/24 10.0.0.1,2", "10.0.0.0/8" )
+        self.assertTrue( len( spec ) == 0 )
+        self.assertTrue( list( spec ) == [] )
+        self.assertTrue( [ len( shard ) for shard in spec.getShards( 2 ) ] ==
+            [ 0, 0 ] )
+
+    # Wide exclusions only expand where they overlap the targets, so these
+    #  are built without walking the whole address space
+    def test_excludeWide(self):
+        spec = TargetSpec( "10.0.0.0/24", "*.*.*.1" )
+        self._check( spec, [ value for value in range( 0x0A000000, 0x0A000100 )
+            if value != 0x0A000001 ] )
+
+        spec = TargetSpec( "10.*.0-1.1,2", "*.*.*.2 *.*.1.*" )
+        self._check( spec, self._expand( ( [ 10 ], range( 0, 256 ), [ 0 ],
+            [ 1 ] ) ) )
+        self.assertTrue( len( TargetSpec( "10.*.*.1", "*.*.*.2" ) ) == 65536 )
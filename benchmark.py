@@ -0,0 +1,469 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: benchmark.py
+# Author: Nicholas Russo
+# Description: Measures the speed and memory footprint of the network object
+#  constructs. Each measurement is a mode that builds its own seeded random
+#  inputs up front so that only the operation under test is measured and runs
+#  are comparable.
+###############################################################################
+
+import gc
+import json
+import multiprocessing
+import platform
+import random
+import sys
+import time
+
+# Usage text printed when no (or an unknown) mode is supplied
+USAGE = """Usage:   benchmark <mode> [count] [baseline]
+Modes:
+  parse      construct IPv4Address and IPv6Address objects from strings
+             with every available parser backend
+  convert    convert a mix of IPv4, IPv6 and MAC strings to CSV and JSON
+             Lines with every column (see AddressConverter.py)
+  partition  assign count random IPv4 values to nodes (32 nodes, or the
+             number given as baseline) with every partitioner and print
+             the keys/s, the largest and smallest load relative to the
+             mean and the share of keys moved when a node joins or leaves
+             (see Partitioner.py); hashing modulo the node count is shown
+             for comparison
+  shared     classify (isMulticast), compute the networks of and format
+             count IPv4 and IPv6 addresses with a pool of processes (2, or
+             the number given as baseline), once by sending address
+             objects to the workers and once through shared memory (see
+             SharedAddressArray.py), and print the addresses/s of each
+  pcap       read the pcap or pcapng file given as baseline (or a pcap
+             file of count generated packets) in batches (see
+             PcapReader.py), with every predicate and with none, and
+             print the packets/s and megabytes/s of each; the count is
+             unused, and may be 0, when a file is given
+  memory     print the bytes per IPv4Address, IPv6Address and MACAddress,
+             the peak memory and garbage collector load of constructing
+             count of each as JSON; given the JSON of an earlier run as
+             baseline, the ratio of every measurement to it is added
+The count is the number of inputs per measurement (default 200000).
+Example:
+  python benchmark.py parse 100000
+  python benchmark.py partition 100000 64
+  python benchmark.py shared 100000 4
+  python benchmark.py pcap 0 capture.pcapng
+  python benchmark.py memory 100000 > current.json
+  python benchmark.py memory 100000 baseline.json"""
+
+# Default number of inputs per measurement
+DEFAULT_COUNT = 200000
+
+# Returns "count" seeded random IPv4 and IPv6 input strings
+def _buildInputStrings( count ):
+    generator = random.Random( count )
+    ipv4Strings = [ "%d.%d.%d.%d" % tuple( generator.randint( 0, 255 )
+        for j in range( 0, 4 ) ) for i in xrange( 0, count ) ]
+    ipv6Strings = [ ":".join( "%x" % generator.randint( 0, 0xFFFF )
+        for j in range( 0, 8 ) ) for i in xrange( 0, count ) ]
+    return ipv4Strings, ipv6Strings
+
+# Returns "count" seeded random MAC input strings
+def _buildMacStrings( count ):
+    generator = random.Random( count )
+    return [ ":".join( "%02x" % generator.randint( 0, 255 )
+        for j in range( 0, 6 ) ) for i in xrange( 0, count ) ]
+
+# Returns the number of calls of "function" per second over "inputs"
+def _measureRate( function, inputs ):
+    start = time.time()
+    for inputString in inputs:
+        function( inputString )
+    return len( inputs ) / max( time.time() - start, 1e-9 )
+
+# Measures address construction with each parser backend
+def _parse( count, args ):
+    if( len( args ) > 0 ):
+        raise ValueError( "Unexpected arguments: " + " ".join( args ) )
+    from IPv4Address import IPv4Address
+    from IPv6Address import IPv6Address
+    import ParserBackend
+
+    ipv4Strings, ipv6Strings = _buildInputStrings( count )
+    backend = ParserBackend.getBackend()
+    rows = []
+    try:
+        for name in ParserBackend.getAvailableBackends():
+            ParserBackend.setBackend( name )
+            for addressClass, inputs in ( ( IPv4Address, ipv4Strings ),
+            ( IPv6Address, ipv6Strings ) ):
+                rows.append( "%-12s %-7s %12.0f addresses/s" % (
+                    addressClass.__name__, name, _measureRate( addressClass,
+                    inputs ) ) )
+    finally:
+        ParserBackend.setBackend( backend )
+    return rows
+
+# Measures the rows per second written by AddressConverter for each output
+#  format, from one third each of IPv4, IPv6 and MAC strings
+def _convert( count, args ):
+    from AddressConverter import writeConverted, CSV, JSONL
+    import StringIO
+    if( len( args ) > 0 ):
+        raise ValueError( "Unexpected arguments: " + " ".join( args ) )
+
+    ipv4Strings, ipv6Strings = _buildInputStrings( count / 3 + 1 )
+    inputs = [ inputString for row in zip( ipv4Strings, ipv6Strings,
+        _buildMacStrings( count / 3 + 1 ) ) for inputString in row ][ 0:count ]
+    rows = []
+    for outputFormat in ( CSV, JSONL ):
+        start = time.time()
+        writeConverted( inputs, StringIO.StringIO(), outputFormat )
+        rows.append( "%-12s %12.0f rows/s" % ( outputFormat, len( inputs ) /
+            max( time.time() - start, 1e-9 ) ) )
+    return rows
+
+# Assigns the values of "values" with a partitioner of the class
+#  "partitionerClass" (None for hashing modulo the node count) over the node
+#  names "nodes"; returns the list of node names, one per value
+def _assignNames( partitionerClass, nodes, values ):
+    from IntegerHash import hashInteger
+    if( partitionerClass is None ):
+        return [ nodes[ hashInteger( value ) % len( nodes ) ]
+            for value in values ]
+    return [ nodes[ index ] for index in
+        partitionerClass( nodes ).assignAll( values ) ]
+
+def _partition( count, args ):
+    from Partitioner import RendezvousPartitioner, RingPartitioner
+    import array
+    if( len( args ) > 1 ):
+        raise ValueError( "Unexpected arguments: " + " ".join( args[1:] ) )
+    numNodes = int( args[0] ) if len( args ) > 0 else 32
+    if( numNodes < 2 ):
+        raise ValueError( "At least 2 nodes are needed: " + str( numNodes ) )
+
+    generator = random.Random( 0 )
+    values = array.array( "L", [ generator.getrandbits( 32 )
+        for i in range( 0, count ) ] )
+    nodes = [ "worker-" + str( i ) for i in range( 0, numNodes ) ]
+    rows = [ "%-12s %12s %8s %8s %8s %8s" % ( "partitioner", "keys/s",
+        "max/mean", "min/mean", "join", "leave" ) ]
+    for name, partitionerClass in ( ( "rendezvous", RendezvousPartitioner ),
+    ( "ring", RingPartitioner ), ( "modulo", None ) ):
+        start = time.time()
+        before = _assignNames( partitionerClass, nodes, values )
+        rate = len( values ) / max( time.time() - start, 1e-9 )
+        loads = {}
+        for node in before:
+            loads[ node ] = loads.get( node, 0 ) + 1
+        mean = float( len( values ) ) / numNodes
+
+        # Share of keys on a different node after a join and after a leave
+        moved = []
+        for changed in ( nodes + [ "worker-" + str( numNodes ) ], nodes[1:] ):
+            after = _assignNames( partitionerClass, changed, values )
+            moved.append( sum( 1 for old, new in zip( before, after )
+                if old != new ) / float( len( values ) ) )
+        rows.append( "%-12s %12.0f %8.3f %8.3f %8.3f %8.3f" % ( name, rate,
+            max( loads.values() ) / mean, min( [ loads.get( node, 0 )
+            for node in nodes ] ) / mean, moved[0], moved[1] ) )
+    rows.append( "ideal: join %.3f, leave %.3f" % ( 1.0 / ( numNodes + 1 ),
+        1.0 / numNodes ) )
+    return rows
+
+# Returns what the shared mode computes for the address object "address"
+def _describe( address ):
+    return ( address.isMulticast(), address.getNetwork(), address.toString() )
+
+def _shared( count, args ):
+    from IPv4Address import IPv4Address
+    from IPv6Address import IPv6Address
+    from SharedAddressArray import SharedAddressArray, CHUNK_SIZE
+    from SharedAddressArray import classifyAll, formatAll, networkAll
+    if( len( args ) > 1 ):
+        raise ValueError( "Unexpected arguments: " + " ".join( args[1:] ) )
+    numProcesses = int( args[0] ) if len( args ) > 0 else 2
+    if( numProcesses < 1 ):
+        raise ValueError( "numProcesses is not positive: " + str( numProcesses ) )
+
+    generator = random.Random( count )
+    rows = []
+    for addressClass in ( IPv4Address, IPv6Address ):
+        numBits = addressClass._maxAddrLen
+        addresses = [ addressClass.fromInteger( generator.getrandbits( numBits ),
+            generator.randint( 0, numBits ) ) for i in xrange( 0, count ) ]
+        chunkSize = max( 1, min( CHUNK_SIZE, -( -count // numProcesses ) ) )
+
+        start = time.time()
+        pool = multiprocessing.Pool( numProcesses )
+        try:
+            pool.map( _describe, addresses, chunkSize )
+        finally:
+            pool.terminate()
+            pool.join()
+        objectsTime = max( time.time() - start, 1e-9 )
+
+        start = time.time()
+        array = SharedAddressArray.fromAddresses( addresses )
+        classifyAll( array, [ "isMulticast" ], numProcesses )
+        networkAll( array, numProcesses )
+        formatAll( array, numProcesses )
+        sharedTime = max( time.time() - start, 1e-9 )
+
+        rows.append( "%-12s objects %10.0f/s   shared %10.0f/s   %5.2fx" % (
+            addressClass.__name__, count / objectsTime, count / sharedTime,
+            objectsTime / sharedTime ) )
+    return rows
+
+# Writes a pcap file of "count" Ethernet packets of 64 to 1514 bytes to
+#  "path": IPv4 (some with a VLAN tag), IPv6 and ARP
+def _writePcap( path, count ):
+    import struct
+    generator = random.Random( count )
+    frames = []
+    for i in xrange( 0, 4096 ):
+        header = struct.pack( "!HIHI", generator.getrandbits( 16 ),
+            generator.getrandbits( 32 ), generator.getrandbits( 16 ) & 0xfeff,
+            generator.getrandbits( 32 ) )
+        kind = generator.random()
+        if( kind < 0.15 ):
+            header += struct.pack( "!HH", 0x8100, generator.randint( 1, 4094 ) )
+        if( kind < 0.65 ):
+            header += struct.pack( "!HBBHHHBBHII", 0x0800, 0x45, 0, 0, 0, 0, 64,
+                6, 0, generator.getrandbits( 32 ), generator.getrandbits( 32 ) )
+        elif( kind < 0.95 ):
+            header += struct.pack( "!HIHBB", 0x86dd, 6 << 28, 0, 17, 64 ) + "".join(
+                struct.pack( "!Q", generator.getrandbits( 64 ) )
+                for j in range( 0, 4 ) )
+        else:
+            header += struct.pack( "!H", 0x0806 )
+        frame = header + "\0" * max( 0, generator.randint( 64, 1514 ) -
+            len( header ) )
+        frames.append( struct.pack( "<IIII", 1500000000 + i, i, len( frame ),
+            len( frame ) ) + frame )
+
+    with open( path, "wb" ) as outputFile:
+        outputFile.write( struct.pack( "<IHHiIII", 0xa1b2c3d4, 2, 4, 0, 0,
+            65535, 1 ) )
+        for start in xrange( 0, count, len( frames ) ):
+            outputFile.write( "".join( frames[ 0:min( len( frames ),
+                count - start ) ] ) )
+
+def _pcap( count, args ):
+    from PcapReader import PcapReader
+    import os
+    import shutil
+    import tempfile
+    if( len( args ) > 1 ):
+        raise ValueError( "Unexpected arguments: " + " ".join( args[1:] ) )
+
+    directory = None
+    try:
+        if( len( args ) > 0 ):
+            path = args[0]
+        else:
+            directory = tempfile.mkdtemp( prefix = "benchmark" )
+            path = os.path.join( directory, "capture.pcap" )
+            _writePcap( path, count )
+        megabytes = os.path.getsize( path ) / 1e6
+
+        rows = []
+        for name, predicates in ( ( "predicates", None ), ( "none", [] ) ):
+            start = time.time()
+            with PcapReader( path, macPredicates = predicates,
+            ipPredicates = predicates ) as reader:
+                packets = sum( len( batch ) for batch in reader )
+            elapsed = max( time.time() - start, 1e-9 )
+            rows.append( "%-12s %10d packets %12.0f packets/s %8.1f MB/s" % (
+                name, packets, packets / elapsed, megabytes / elapsed ) )
+        return rows
+    finally:
+        if( directory is not None ):
+            shutil.rmtree( directory )
+
+# Returns the number of bytes held by "root" and every object reachable
+#  from it, counting each object once. Classes, modules and functions are
+#  shared by all instances and are not counted.
+def _getDeepSize( root ):
+    import types
+    sharedTypes = ( type, types.ClassType, types.ModuleType,
+        types.FunctionType, types.BuiltinFunctionType )
+    seen = set()
+    size = 0
+    pending = [ root ]
+    while( len( pending ) > 0 ):
+        item = pending.pop()
+        if( id( item ) in seen or isinstance( item, sharedTypes ) ):
+            continue
+        seen.add( id( item ) )
+        size += sys.getsizeof( item )
+        pending.extend( gc.get_referents( item ) )
+    return size
+
+# Builds "count" objects of the class named "className" and returns their
+#  peak memory and garbage collector load. Runs in a fresh worker process
+#  so that the peak resident size belongs to this measurement alone; with
+#  tracemalloc (Python 3.4 and later) the peak of traced allocations is used
+#  instead.
+def _measureBuild( className, count ):
+    from NetAddressFactory import IPV4, IPV6, MAC, getAddressClass
+    addressClass = getAddressClass( { "IPv4Address": IPV4,
+        "IPv6Address": IPV6, "MACAddress": MAC }[ className ] )
+    if( className == "MACAddress" ):
+        inputs = _buildMacStrings( count )
+    else:
+        inputs = _buildInputStrings( count )[ className == "IPv6Address" ]
+
+    try:
+        import tracemalloc
+    except ImportError:
+        tracemalloc = None
+    import resource
+
+    # The garbage collector is off during the first build, so the growth of
+    #  its allocation counter is the number of tracked objects created
+    gc.collect()
+    gc.disable()
+    try:
+        trackedBefore = gc.get_count()[0]
+        if( tracemalloc is not None ):
+            tracemalloc.start()
+        else:
+            peakBefore = resource.getrusage( resource.RUSAGE_SELF ).ru_maxrss
+        start = time.time()
+        addresses = [ addressClass( inputString ) for inputString in inputs ]
+        buildSecondsNoGc = time.time() - start
+        if( tracemalloc is not None ):
+            peakBytes = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        else:
+            # ru_maxrss is in kilobytes, except on Mac OS X where it is bytes
+            peakBytes = ( resource.getrusage( resource.RUSAGE_SELF ).ru_maxrss -
+                peakBefore ) * ( 1 if sys.platform == "darwin" else 1024 )
+        tracked = gc.get_count()[0] - trackedBefore
+    finally:
+        gc.enable()
+
+    # A full collection must visit every tracked object that is alive
+    start = time.time()
+    gc.collect()
+    fullCollectSeconds = time.time() - start
+
+    del addresses
+    gc.collect()
+    start = time.time()
+    addresses = [ addressClass( inputString ) for inputString in inputs ]
+    buildSeconds = time.time() - start
+
+    return { "peakBytes": peakBytes,
+        "peakBytesPerInstance": float( peakBytes ) / count,
+        "peakMethod": "maxrss" if tracemalloc is None else "tracemalloc",
+        "gcTrackedPerInstance": float( tracked ) / count,
+        "fullCollectSeconds": fullCollectSeconds,
+        "buildSeconds": buildSeconds,
+        "buildSecondsNoGc": buildSecondsNoGc }
+
+# Returns the ratio of every number in "current" to the number at the same
+#  place in "baseline", for the places present in both
+def _getRatios( current, baseline ):
+    ratios = {}
+    for key, value in current.iteritems():
+        if( key not in baseline ):
+            continue
+        if( isinstance( value, dict ) and isinstance( baseline[ key ], dict ) ):
+            ratios[ key ] = _getRatios( value, baseline[ key ] )
+        elif( isinstance( value, ( int, long, float ) ) and
+        isinstance( baseline[ key ], ( int, long, float ) ) and
+        baseline[ key ] != 0 ):
+            ratios[ key ] = float( value ) / baseline[ key ]
+    return ratios
+
+# Measures the memory footprint of each address class: the size of one
+#  object, per object in a collection (before and after the integer value
+#  is cached) and the results of _measureBuild(). Returns the JSON document
+#  as a single row.
+def _memory( count, args ):
+    from IPv4Address import IPv4Address
+    from IPv6Address import IPv6Address
+    from MACAddress import MACAddress
+    if( len( args ) > 1 ):
+        raise ValueError( "Unexpected arguments: " + " ".join( args ) )
+    baseline = None
+    if( len( args ) == 1 ):
+        with open( args[0] ) as baselineFile:
+            baseline = json.load( baselineFile )
+
+    results = { "count": count, "python": platform.python_version(),
+        "platform": sys.platform, "classes": {} }
+    sampleSize = min( count, 10000 )
+    for addressClass, inputs in ( ( IPv4Address, _buildInputStrings(
+    sampleSize )[0] ), ( IPv6Address, _buildInputStrings( sampleSize )[1] ),
+    ( MACAddress, _buildMacStrings( sampleSize ) ) ):
+        addresses = [ addressClass( inputString ) for inputString in inputs ]
+        listSize = sys.getsizeof( addresses )
+        classResults = {
+            "shallowBytes": sys.getsizeof( addresses[0] ),
+            "bytesPerInstance": float( _getDeepSize( addresses ) - listSize ) /
+                sampleSize }
+        for address in addresses:
+            address.toInteger()
+        classResults[ "bytesPerInstanceMemoized" ] = float( _getDeepSize(
+            addresses ) - listSize ) / sampleSize
+
+        pool = multiprocessing.Pool( 1 )
+        try:
+            classResults.update( pool.apply( _measureBuild, (
+                addressClass.__name__, count ) ) )
+        finally:
+            pool.terminate()
+            pool.join()
+        results[ "classes" ][ addressClass.__name__ ] = classResults
+
+    if( baseline is not None ):
+        results[ "baselineRatios" ] = _getRatios( results[ "classes" ],
+            baseline.get( "classes", {} ) )
+    return [ json.dumps( results, indent = 2, sort_keys = True ) ]
+
+# Map of mode names to the functions that run them
+MODES = {
+    "parse": _parse,
+    "convert": _convert,
+    "partition": _partition,
+    "shared": _shared,
+    "pcap": _pcap,
+    "memory": _memory }
+
+# Runs the mode named in "args" and prints one row per measurement. Returns
+#  0 on success and 1 if usage was wrong or a baseline could not be read.
+def benchmark( args ):
+
+    # Test for a valid mode (first element is the script name)
+    if( len( args ) < 2 or args[1] not in MODES ):
+        print USAGE
+        return 1
+
+    try:
+        count = int( args[2] ) if len( args ) > 2 else DEFAULT_COUNT
+    except ValueError:
+        print USAGE
+        return 1
+    # A pcap file given as baseline replaces the generated packets, so its
+    #  count may be 0
+    if( count < 0 or ( count == 0 and ( args[1] != "pcap" or
+    len( args ) < 4 ) ) ):
+        print USAGE
+        return 1
+
+    try:
+        rows = MODES[ args[1] ]( count, args[3:] )
+    except ValueError:
+        print USAGE
+        return 1
+    except IOError as e:
+        sys.stderr.write( str( e ) + "\n" )
+        return 1
+    sys.stdout.write( "\n".join( rows ) + "\n" )
+    return 0
+
+###############################################################################
+# Execution starts here; capture any command line arguments
+if __name__ == "__main__":
+    sys.exit( benchmark( sys.argv ) )
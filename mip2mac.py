@@ -30,21 +30,33 @@ def mip2mac( args ):
     for mipArg in args:
 
         # Creat an IPv4Address object by parsing the CLI argument string
-        mip = IPv4Address( mipArg )
+        mac = mipToMac( IPv4Address( mipArg ) )
         
         # If the MIP isn't multicast, this script doesn't make sense; skip this
-        if( not mip.isMulticast() ):
+        if( mac is None ):
             continue
-         
-        # First IP address octet means nothing (per RFC 1112)
-        macInputString = "01:00:5E:" + str( hex( mip.getOctet(2) % 128 )[2:].zfill(2) )
-        macInputString += ":" + str( hex( mip.getOctet(3) )[2:].zfill(2) )
-        macInputString += ":" + str( hex( mip.getOctet(4) )[2:].zfill(2) )
         
-        # Create a MAC address object and print it as a string
-        mac = MACAddress( macInputString )
+        # Print the MAC address object as a string
         print mac
+
+# Converts the IPv4Address "mip" into its multicast MACAddress. Returns None
+#  if "mip" is not a multicast address since there is no mapping for it.
+def mipToMac( mip ):
+    
+    # If the MIP isn't multicast, the conversion doesn't make sense
+    if( not mip.isMulticast() ):
+        return None
+     
+    # First IP address octet means nothing (per RFC 1112)
+    macInputString = "01:00:5E:" + str( hex( mip.getOctet(2) % 128 )[2:].zfill(2) )
+    macInputString += ":" + str( hex( mip.getOctet(3) )[2:].zfill(2) )
+    macInputString += ":" + str( hex( mip.getOctet(4) )[2:].zfill(2) )
+    
+    # Create a MAC address object from the string
+    return MACAddress( macInputString )
         
 ###############################################################################
-# Execution starts here; capture any command line arguments
-mip2mac( sys.argv )
\ No newline at end of file
+# Execution starts here; capture any command line arguments. The guard allows
+#  the conversion functions to be imported by other tools (e.g. nettools.py)
+if __name__ == "__main__":
+    mip2mac( sys.argv )
\ No newline at end of file
@@ -30,24 +30,36 @@ def mip2mac6( args ):
     for mipArg in args:
 
         # Creat an IPv6Address object by parsing the CLI argument string
-        mip = IPv6Address( mipArg )
+        mac = mipToMac6( IPv6Address( mipArg ) )
         
         # If the MIP isn't multicast, this script doesn't make sense; skip this
-        if( not mip.isMulticast() ):
+        if( mac is None ):
             continue
-          
-        #return MACAddress( [ 0x33, 0x33, ipv6.getOctet(13), ipv6.getOctet(14), ipv6.getOctet(15), ipv6.getOctet(16) ] )
-   
-        # First 12 IPv6 address octet mean nothing (per RFC 2464)
-        #  The last 4 octets (13 through 16) 
-        macInputString = "33:33" 
-        for i in range(13,17):
-            macInputString += ":" + str( hex( mip.getOctet(i) )[2:].zfill(2) )
         
-        # Create a MAC address object and print it as a string
-        mac = MACAddress( macInputString )   
+        # Print the MAC address object as a string
         print mac
+
+# Converts the IPv6Address "mip" into its multicast MACAddress. Returns None
+#  if "mip" is not a multicast address since there is no mapping for it.
+def mipToMac6( mip ):
+    
+    # If the MIP isn't multicast, the conversion doesn't make sense
+    if( not mip.isMulticast() ):
+        return None
+      
+    #return MACAddress( [ 0x33, 0x33, ipv6.getOctet(13), ipv6.getOctet(14), ipv6.getOctet(15), ipv6.getOctet(16) ] )
+
+    # First 12 IPv6 address octet mean nothing (per RFC 2464)
+    #  The last 4 octets (13 through 16) 
+    macInputString = "33:33" 
+    for i in range(13,17):
+        macInputString += ":" + str( hex( mip.getOctet(i) )[2:].zfill(2) )
+    
+    # Create a MAC address object from the string
+    return MACAddress( macInputString )
         
 ###############################################################################
-# Execution starts here; capture any command line arguments
-mip2mac6( sys.argv )
\ No newline at end of file
+# Execution starts here; capture any command line arguments. The guard allows
+#  the conversion functions to be imported by other tools (e.g. nettools.py)
+if __name__ == "__main__":
+    mip2mac6( sys.argv )
\ No newline at end of file
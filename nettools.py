@@ -0,0 +1,251 @@
+#!/usr/bin/python
+
+###############################################################################
+# File: nettools.py
+# Author: Nicholas Russo
+# Description: Single entry point for the basic network tools. Each tool is
+#  a subcommand that only imports the modules it needs, which keeps the
+#  interpreter start-up cost low. Any number of addresses can be supplied
+#  either as CLI arguments or on standard input (one per row) so that large
+#  inputs are handled by one process instead of one process per address.
+###############################################################################
+
+import os
+import sys
+
+# Usage text printed when no (or an unknown) subcommand is supplied
+USAGE = """Usage:   nettools <subcommand> [address1 address2 addressn | -]
+Subcommands:
+  mip2mac    convert IPv4 multicast addresses to MAC addresses
+  mip2mac6   convert IPv6 multicast addresses to MAC addresses
+  classify   print the family and the flags that are set for each address
+  normalize  print each address in its canonical string format
+  network    print the network of each address (e.g. 10.4.6.68/28)
+  convert    print every representation and flag of each address as CSV
+             (or JSON Lines with --format jsonl); --columns a,b,... selects
+             the columns (see AddressConverter.getColumns())
+Addresses are read from standard input (one per row) when none are
+supplied or when the only argument is "-". Example:
+  cat mip2mac.inputfile | python nettools.py mip2mac
+Incremental mode:
+  nettools <subcommand> --incremental <input> <output> [checkpoint]
+  processes only the rows appended to the input file since the last run
+  and appends the results to the output file; the read position is kept
+  in the checkpoint file (default: <output>.checkpoint). For convert, the
+  --format and --columns options come before --incremental, and the CSV
+  header is written only while the output file is empty."""
+
+# Returns the list of input strings for a subcommand. CLI arguments take
+#  priority; otherwise every non-empty row of standard input is used.
+def _readInputs( args ):
+    if( len( args ) > 0 and args != [ "-" ] ):
+        return args
+
+    # Nothing to read if a user is typing at a terminal; signal usage
+    if( len( args ) == 0 and sys.stdin.isatty() ):
+        return []
+
+    return [ line.strip() for line in sys.stdin if line.strip() ]
+
+# Converts IPv4 multicast addresses to MACs; non-multicast input is skipped
+#  which matches the behavior of mip2mac.py
+def _mip2mac( inputString ):
+    from IPv4Address import IPv4Address
+    from mip2mac import mipToMac
+    mac = mipToMac( IPv4Address( inputString ) )
+    if( mac is None ):
+        return None
+    return mac.toString()
+
+# Converts IPv6 multicast addresses to MACs; non-multicast input is skipped
+#  which matches the behavior of mip2mac6.py
+def _mip2mac6( inputString ):
+    from IPv6Address import IPv6Address
+    from mip2mac6 import mipToMac6
+    mac = mipToMac6( IPv6Address( inputString ) )
+    if( mac is None ):
+        return None
+    return mac.toString()
+
+# Cache of predicate method names per address class, built on first use
+_predicateNames = {}
+
+# Returns the names of all of the is*() predicates for the object's class
+#  in alphabetical order (e.g. isMulticast, isUnicast)
+def _getPredicateNames( address ):
+    addressClass = address.__class__
+    if( addressClass not in _predicateNames ):
+        _predicateNames[addressClass] = [ name for name in dir( addressClass )
+            if name.startswith( "is" ) and callable( getattr( addressClass, name ) ) ]
+    return _predicateNames[addressClass]
+
+# Prints the address, its family, and a comma separated list of the
+#  predicates which are true (e.g. 239.1.1.1 ipv4 isMulticast,isPrivateAddress)
+def _classify( inputString ):
+    from NetAddressFactory import detectFamily, buildAddress
+    address = buildAddress( inputString )
+    flags = [ name for name in _getPredicateNames( address )
+        if getattr( address, name )() ]
+    return address.toString() + " " + detectFamily( inputString ) + " " + ",".join( flags )
+
+# Prints the address in its canonical format
+def _normalize( inputString ):
+    from NetAddressFactory import buildAddress
+    return buildAddress( inputString ).toString()
+
+# Prints the network of an address in "/len" notation
+def _network( inputString ):
+    from NetAddressFactory import buildAddress
+    address = buildAddress( inputString )
+    return address.getNetwork().toString() + "/" + str( address.getAddrLen() )
+
+# Maps each subcommand to the function that handles a single input string
+SUBCOMMANDS = {
+    "mip2mac": _mip2mac,
+    "mip2mac6": _mip2mac6,
+    "classify": _classify,
+    "normalize": _normalize,
+    "network": _network }
+
+# Runs "handler" against every string in "inputs". Invalid inputs are
+#  reported on standard error without stopping the remaining inputs.
+#  Returns the list of output rows and 0, or 1 if any input was invalid.
+def _runHandler( handler, inputs ):
+    result = 0
+    outputRows = []
+    for inputString in inputs:
+        try:
+            outputRow = handler( inputString )
+        except ( AttributeError, ValueError ) as e:
+            sys.stderr.write( "Invalid input '" + inputString + "': " + str( e ) + "\n" )
+            result = 1
+            continue
+
+        if( outputRow is not None ):
+            outputRows.append( outputRow )
+    return outputRows, result
+
+# Returns the ( input, output, checkpoint ) paths of the incremental mode
+#  arguments "args" (which follow "--incremental"), or None if there are
+#  too few or too many of them
+def _parseIncremental( args ):
+    if( len( args ) not in ( 2, 3 ) ):
+        return None
+    checkpointPath = args[2] if len( args ) == 3 else args[1] + ".checkpoint"
+    return ( args[0], args[1], checkpointPath )
+
+# Passes the non-empty rows appended to the file "inputPath" since the
+#  checkpoint to the function "writeRows", along with the file "outputPath"
+#  opened for appending; "writeRows" returns 0 or 1 as nettools(). The
+#  checkpoint is saved only once the output is on disk, so an interrupted
+#  run repeats rows rather than losing them.
+def _runIncremental( writeRows, inputPath, outputPath, checkpointPath ):
+    from IncrementalInput import IncrementalInput
+    with IncrementalInput( inputPath, checkpointPath ) as incrementalInput:
+        if( incrementalInput.wasReset() ):
+            sys.stderr.write( "Input '" + inputPath + "' was rotated or " +
+                "truncated; processing it from the beginning\n" )
+
+        rows = ( row.strip() for row in incrementalInput.iterRows()
+            if row.strip() )
+        with open( outputPath, "a" ) as outputFile:
+            result = writeRows( rows, outputFile )
+            outputFile.flush()
+            os.fsync( outputFile.fileno() )
+        incrementalInput.commit()
+    return result
+
+# Streams every input through AddressConverter, reading standard input
+#  row by row rather than all at once. Options come before the addresses
+#  (or before --incremental and its paths, which stream the appended rows
+#  of the input file instead). Returns 0 or 1 as nettools().
+def _convert( args ):
+    from AddressConverter import writeConverted, CSV
+    options = { "outputFormat": CSV, "columns": None }
+    while( len( args ) >= 2 and args[0] in ( "--format", "--columns" ) ):
+        if( args[0] == "--format" ):
+            options[ "outputFormat" ] = args[1]
+        else:
+            options[ "columns" ] = args[1].split( "," )
+        args = args[2:]
+
+    def reportError( inputString ):
+        sys.stderr.write( "Invalid input '" + inputString.strip() + "'\n" )
+
+    # Writes the converted "inputs" to "outputFile"; appended runs only
+    #  write the CSV header to an empty file so that they share one header
+    def writeRows( inputs, outputFile, append = False ):
+        header = not append or os.fstat( outputFile.fileno() ).st_size == 0
+        numWritten, numInvalid = writeConverted( inputs, outputFile,
+            header = header, onError = reportError, **options )
+        return 1 if numInvalid > 0 else 0
+
+    try:
+        if( len( args ) > 0 and args[0] == "--incremental" ):
+            paths = _parseIncremental( args[1:] )
+            if( paths is None ):
+                print USAGE
+                return 1
+            return _runIncremental( lambda inputs, outputFile: writeRows(
+                inputs, outputFile, True ), *paths )
+        elif( len( args ) > 0 and args != [ "-" ] ):
+            return writeRows( args, sys.stdout )
+        elif( len( args ) == 0 and sys.stdin.isatty() ):
+            print USAGE
+            return 1
+        return writeRows( sys.stdin, sys.stdout )
+    except ( IOError, OSError, ValueError ) as e:
+        sys.stderr.write( str( e ) + "\n" )
+        return 1
+
+# Maps each subcommand that streams its inputs itself to its function
+STREAM_SUBCOMMANDS = {
+    "convert": _convert }
+
+# Runs the subcommand named in "args" against every input. Invalid inputs
+#  are reported on standard error without stopping the remaining inputs.
+#  Returns 0 on success and 1 if usage was wrong or any input was invalid.
+def nettools( args ):
+
+    # Test for a valid subcommand (first element is the script name)
+    if( len( args ) >= 2 and args[1] in STREAM_SUBCOMMANDS ):
+        return STREAM_SUBCOMMANDS[ args[1] ]( args[2:] )
+    if( len( args ) < 2 or args[1] not in SUBCOMMANDS ):
+        print USAGE
+        return 1
+    handler = SUBCOMMANDS[ args[1] ]
+
+    # Incremental mode reads and writes files instead of the standard streams
+    if( len( args ) > 2 and args[2] == "--incremental" ):
+        paths = _parseIncremental( args[3:] )
+        if( paths is None ):
+            print USAGE
+            return 1
+
+        def writeRows( inputs, outputFile ):
+            outputRows, result = _runHandler( handler, list( inputs ) )
+            if( len( outputRows ) > 0 ):
+                outputFile.write( "\n".join( outputRows ) + "\n" )
+            return result
+        try:
+            return _runIncremental( writeRows, *paths )
+        except ( IOError, OSError ) as e:
+            sys.stderr.write( str( e ) + "\n" )
+            return 1
+
+    # Collect all inputs up front; usage is printed if there are none
+    inputs = _readInputs( args[2:] )
+    if( len( inputs ) == 0 ):
+        print USAGE
+        return 1
+
+    # Buffer the output rows and write them in one call to limit I/O
+    outputRows, result = _runHandler( handler, inputs )
+    if( len( outputRows ) > 0 ):
+        sys.stdout.write( "\n".join( outputRows ) + "\n" )
+    return result
+
+###############################################################################
+# Execution starts here; capture any command line arguments
+if __name__ == "__main__":
+    sys.exit( nettools( sys.argv ) )
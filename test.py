@@ -11,6 +11,30 @@
 from IPv4Address_Test import IPv4Address_Test
 from IPv6Address_Test import IPv6Address_Test
 from MACAddress_Test import MACAddress_Test
+from NetAddressFactory_Test import NetAddressFactory_Test
+from BloomFilter_Test import BloomFilter_Test
+from NeighborDiscovery_Test import NeighborDiscovery_Test
+from AccessList_Test import AccessList_Test
+from AddressScanner_Test import AddressScanner_Test
+from PrefixAnonymizer_Test import PrefixAnonymizer_Test
+from HeavyHitters_Test import HeavyHitters_Test
+from SubnetAllocator_Test import SubnetAllocator_Test
+from BindingTable_Test import BindingTable_Test
+from AddressFile_Test import AddressFile_Test
+from TargetSpec_Test import TargetSpec_Test
+from MACNormalizer_Test import MACNormalizer_Test
+from ReverseDNS_Test import ReverseDNS_Test
+from AddressSampler_Test import AddressSampler_Test
+from ParserBackend_Test import ParserBackend_Test
+from IncrementalInput_Test import IncrementalInput_Test
+from ExternalSort_Test import ExternalSort_Test
+from AddressConverter_Test import AddressConverter_Test
+from PrefixSet_Test import PrefixSet_Test
+from Partitioner_Test import Partitioner_Test
+from SharedAddressArray_Test import SharedAddressArray_Test
+from IPv6Transition_Test import IPv6Transition_Test
+from PcapReader_Test import PcapReader_Test
+from PredicateRanges_Test import PredicateRanges_Test
 import unittest
 import sys
 import os
@@ -37,7 +61,31 @@ def test( args ):
     testSuiteList = [
         IPv4Address_Test.buildTestSuite(),
         IPv6Address_Test.buildTestSuite(),
-        MACAddress_Test.buildTestSuite() ]
+        MACAddress_Test.buildTestSuite(),
+        NetAddressFactory_Test.buildTestSuite(),
+        BloomFilter_Test.buildTestSuite(),
+        NeighborDiscovery_Test.buildTestSuite(),
+        AccessList_Test.buildTestSuite(),
+        AddressScanner_Test.buildTestSuite(),
+        PrefixAnonymizer_Test.buildTestSuite(),
+        HeavyHitters_Test.buildTestSuite(),
+        SubnetAllocator_Test.buildTestSuite(),
+        BindingTable_Test.buildTestSuite(),
+        AddressFile_Test.buildTestSuite(),
+        TargetSpec_Test.buildTestSuite(),
+        MACNormalizer_Test.buildTestSuite(),
+        ReverseDNS_Test.buildTestSuite(),
+        AddressSampler_Test.buildTestSuite(),
+        ParserBackend_Test.buildTestSuite(),
+        IncrementalInput_Test.buildTestSuite(),
+        ExternalSort_Test.buildTestSuite(),
+        AddressConverter_Test.buildTestSuite(),
+        PrefixSet_Test.buildTestSuite(),
+        Partitioner_Test.buildTestSuite(),
+        SharedAddressArray_Test.buildTestSuite(),
+        IPv6Transition_Test.buildTestSuite(),
+        PcapReader_Test.buildTestSuite(),
+        PredicateRanges_Test.buildTestSuite() ]
     
     # Create test runner to execute each test suite in series with the proper
     #  level of verbosity